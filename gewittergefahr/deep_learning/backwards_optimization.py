@@ -28,6 +28,8 @@ DEFAULT_LEARNING_RATE = 0.001
 DEFAULT_NUM_ITERATIONS = 200
 DEFAULT_L2_WEIGHT = 1.2533
 DEFAULT_IDEAL_ACTIVATION = 2.
+DEFAULT_NUM_EXAMPLES_PER_BATCH = 32
+DEFAULT_EARLY_STOPPING_TOLERANCE = 1e-6
 
 NORM_INPUT_MATRICES_KEY = 'normalized_input_matrices'
 NORM_OUTPUT_MATRICES_KEY = 'normalized_output_matrices'
@@ -321,6 +323,286 @@ def _minmax_constraints_to_loss_fn(model_object, model_metadata_dict, weight):
         cnn_metadata_dict=model_metadata_dict)
 
 
+def _create_batched_activation_and_loss(
+        model_object, component_type_string, target_class, layer_name,
+        neuron_indices, channel_index, stat_function_for_neuron_activations,
+        ideal_activation):
+    """Creates per-example activation and loss tensors for batched optimization.
+
+    These are the same as in `optimize_input_for_class`,
+    `optimize_input_for_neuron`, and `optimize_input_for_channel`, except that
+    they are computed for every example in the batch, rather than only the
+    first.
+
+    B = number of examples in batch
+
+    :param model_object: See doc for `optimize_many_inputs`.
+    :param component_type_string: Same.
+    :param target_class: Same.
+    :param layer_name: Same.
+    :param neuron_indices: Same.
+    :param channel_index: Same.
+    :param stat_function_for_neuron_activations: Same.
+    :param ideal_activation: Same.
+    :return: activation_tensor: Keras tensor (length B) of activations.
+    :return: loss_tensor: Keras tensor (length B) of losses.
+    """
+
+    if (component_type_string ==
+            model_interpretation.CLASS_COMPONENT_TYPE_STRING):
+        num_output_neurons = (
+            model_object.layers[-1].output.get_shape().as_list()[-1]
+        )
+
+        if num_output_neurons == 1:
+            error_checking.assert_is_leq(target_class, 1)
+            activation_tensor = model_object.layers[-1].output[..., 0]
+
+            if target_class == 1:
+                return activation_tensor, (activation_tensor - 1) ** 2
+
+            return activation_tensor, activation_tensor ** 2
+
+        error_checking.assert_is_less_than(target_class, num_output_neurons)
+        activation_tensor = model_object.layers[-1].output[..., target_class]
+
+        return activation_tensor, (activation_tensor - 1) ** 2
+
+    if (component_type_string ==
+            model_interpretation.NEURON_COMPONENT_TYPE_STRING):
+        neuron_indices_as_tuple = (slice(None),) + tuple(neuron_indices)
+        activation_tensor = model_object.get_layer(name=layer_name).output[
+            neuron_indices_as_tuple
+        ]
+    else:
+        activation_tensor = K.map_fn(
+            stat_function_for_neuron_activations,
+            model_object.get_layer(name=layer_name).output[..., channel_index]
+        )
+
+    if ideal_activation is None:
+        loss_tensor = -K.sign(activation_tensor) * activation_tensor ** 2
+    else:
+        loss_tensor = (activation_tensor - ideal_activation) ** 2
+
+    return activation_tensor, loss_tensor
+
+
+def _create_batched_gradient_function(
+        model_object, activation_tensor, loss_tensor, l2_weight,
+        constraint_loss_tensor):
+    """Creates Keras function for batched gradient descent.
+
+    The total loss is the sum of per-example losses, plus B times the
+    constraint loss (which is averaged over the batch).  Thus, the gradient
+    with respect to each example is the same as if the example were optimized
+    alone.  Gradients are then normalized separately for each example, as in
+    `_do_gradient_descent`.
+
+    T = number of input tensors to the model
+    B = number of examples in batch
+
+    :param model_object: See doc for `_do_gradient_descent`.
+    :param activation_tensor: Keras tensor (length B) of activations.
+    :param loss_tensor: Keras tensor (length B) of losses.
+    :param l2_weight: See doc for `_do_gradient_descent`.
+    :param constraint_loss_tensor: Keras tensor (scalar) with loss from physical
+        constraints.  May be None.
+    :return: gradient_function: Keras function.  Inputs are the T input tensors
+        (current values), the T original input tensors (before optimization),
+        and the learning phase.  Outputs are the length-B activation and loss
+        tensors, followed by the T normalized gradient tensors.
+    """
+
+    if isinstance(model_object.input, list):
+        list_of_input_tensors = model_object.input
+    else:
+        list_of_input_tensors = [model_object.input]
+
+    list_of_original_tensors = [
+        K.placeholder(shape=K.int_shape(t)) for t in list_of_input_tensors
+    ]
+
+    if l2_weight is not None:
+        for this_input_tensor, this_original_tensor in zip(
+                list_of_input_tensors, list_of_original_tensors):
+            this_squared_diff_tensor = (
+                (this_input_tensor - this_original_tensor) ** 2
+            )
+            loss_tensor += l2_weight * K.mean(
+                K.batch_flatten(this_squared_diff_tensor), axis=1
+            )
+
+    total_loss_tensor = K.sum(loss_tensor)
+
+    if constraint_loss_tensor is not None:
+        num_examples_tensor = K.cast(
+            K.shape(list_of_input_tensors[0])[0], K.floatx()
+        )
+        total_loss_tensor += num_examples_tensor * constraint_loss_tensor
+
+    list_of_gradient_tensors = K.gradients(
+        total_loss_tensor, list_of_input_tensors)
+
+    for i in range(len(list_of_gradient_tensors)):
+        these_rms_values = K.sqrt(K.mean(
+            K.batch_flatten(list_of_gradient_tensors[i] ** 2), axis=1
+        ))
+        these_rms_values = K.reshape(
+            these_rms_values,
+            [-1] + [1] * (K.ndim(list_of_gradient_tensors[i]) - 1)
+        )
+
+        list_of_gradient_tensors[i] /= K.maximum(these_rms_values, K.epsilon())
+
+    return K.function(
+        list_of_input_tensors + list_of_original_tensors + [K.learning_phase()],
+        [activation_tensor, loss_tensor] + list_of_gradient_tensors
+    )
+
+
+def _update_early_stopping(
+        loss_values, best_loss_values, num_iters_without_improvement,
+        patience, tolerance):
+    """Updates early-stopping criteria for each example.
+
+    An example stops (is no longer updated) after its loss has failed to
+    decrease by more than `tolerance` for `patience` iterations in a row.
+
+    E = number of examples still being optimized
+
+    :param loss_values: length-E numpy array of current losses.
+    :param best_loss_values: length-E numpy array of best losses so far.
+    :param num_iters_without_improvement: length-E numpy array with number of
+        iterations since loss last improved.
+    :param patience: See discussion above.  If None, examples never stop.
+    :param tolerance: See discussion above.
+    :return: best_loss_values: Same as input but updated.
+    :return: num_iters_without_improvement: Same as input but updated.
+    :return: stop_flags: length-E numpy array of Boolean flags, indicating which
+        examples should stop.
+    """
+
+    improved_flags = loss_values < best_loss_values - tolerance
+    best_loss_values = numpy.minimum(best_loss_values, loss_values)
+
+    num_iters_without_improvement = numpy.where(
+        improved_flags, 0, num_iters_without_improvement + 1
+    )
+
+    if patience is None:
+        stop_flags = numpy.full(len(loss_values), False, dtype=bool)
+    else:
+        stop_flags = num_iters_without_improvement >= patience
+
+    return best_loss_values, num_iters_without_improvement, stop_flags
+
+
+def _do_batched_gradient_descent(
+        gradient_function, input_matrices, num_iterations, learning_rate,
+        early_stopping_patience, early_stopping_tolerance):
+    """Does gradient descent for a batch of examples at once.
+
+    T = number of input tensors to the model
+    B = number of examples in batch
+
+    :param gradient_function: Function created by
+        `_create_batched_gradient_function`.
+    :param input_matrices: length-T list of numpy arrays, where the first axis
+        of each has length B.
+    :param num_iterations: See doc for `_do_gradient_descent`.
+    :param learning_rate: Same.
+    :param early_stopping_patience: See doc for `_update_early_stopping`.
+    :param early_stopping_tolerance: Same.
+    :return: result_dict: Dictionary with the following keys.
+    result_dict["normalized_input_matrices"]: length-T list of input matrices
+        (before backwards optimization).
+    result_dict["normalized_output_matrices"]: length-T list of output matrices
+        (after backwards optimization).
+    result_dict["initial_activations"]: length-B numpy array of initial
+        activations.
+    result_dict["final_activations"]: length-B numpy array of final
+        activations.
+    """
+
+    num_examples = input_matrices[0].shape[0]
+    num_input_tensors = len(input_matrices)
+    output_matrices = [a + 0. for a in input_matrices]
+
+    initial_activations = numpy.full(num_examples, numpy.nan)
+    final_activations = numpy.full(num_examples, numpy.nan)
+    best_loss_values = numpy.full(num_examples, numpy.inf)
+    num_iters_without_improvement = numpy.full(num_examples, 0, dtype=int)
+    active_indices = numpy.linspace(
+        0, num_examples - 1, num=num_examples, dtype=int)
+
+    for j in range(num_iterations):
+        these_outputs = gradient_function(
+            [a[active_indices, ...] for a in output_matrices] +
+            [a[active_indices, ...] for a in input_matrices] + [0]
+        )
+
+        these_activations = these_outputs[0]
+        these_loss_values = these_outputs[1]
+
+        if j == 0:
+            initial_activations = these_activations + 0.
+        final_activations[active_indices] = these_activations
+
+        if numpy.mod(j, 100) == 0:
+            print((
+                'Mean loss after {0:d} of {1:d} iterations = {2:.2e} ... '
+                'mean activation = {3:.2e} ... {4:d} of {5:d} examples still '
+                'being optimized'
+            ).format(
+                j, num_iterations, numpy.mean(these_loss_values),
+                numpy.mean(these_activations), len(active_indices),
+                num_examples
+            ))
+
+        these_best_loss_values, these_num_iters, these_stop_flags = (
+            _update_early_stopping(
+                loss_values=these_loss_values,
+                best_loss_values=best_loss_values[active_indices],
+                num_iters_without_improvement=num_iters_without_improvement[
+                    active_indices],
+                patience=early_stopping_patience,
+                tolerance=early_stopping_tolerance)
+        )
+
+        best_loss_values[active_indices] = these_best_loss_values
+        num_iters_without_improvement[active_indices] = these_num_iters
+
+        these_update_indices = numpy.where(numpy.invert(these_stop_flags))[0]
+
+        for i in range(num_input_tensors):
+            output_matrices[i][active_indices[these_update_indices], ...] -= (
+                these_outputs[i + 2][these_update_indices, ...] *
+                learning_rate
+            )
+
+        active_indices = active_indices[these_update_indices]
+
+        if len(active_indices) == 0:
+            print('All examples stopped early after {0:d} iterations.'.format(
+                j + 1
+            ))
+            break
+
+    print((
+        'Mean activation after backwards optimization = {0:.2e}'
+    ).format(
+        numpy.mean(final_activations)
+    ))
+
+    return {
+        NORM_INPUT_MATRICES_KEY: input_matrices,
+        NORM_OUTPUT_MATRICES_KEY: output_matrices,
+        INITIAL_ACTIVATIONS_KEY: initial_activations,
+        FINAL_ACTIVATIONS_KEY: final_activations
+    }
+
+
 def check_metadata(
         component_type_string, num_iterations, learning_rate, target_class=None,
         layer_name=None, ideal_activation=None, neuron_indices=None,
@@ -861,6 +1143,211 @@ def optimize_input_for_channel(
         l2_weight=l2_weight)
 
 
+def create_many_input_gradient_function(
+        model_object, component_type_string, target_class=None,
+        layer_name=None, neuron_indices=None, channel_index=None,
+        stat_function_for_neuron_activations=K.max,
+        l2_weight=DEFAULT_L2_WEIGHT, ideal_activation=DEFAULT_IDEAL_ACTIVATION,
+        radar_constraint_weight=None, minmax_constraint_weight=None,
+        model_metadata_dict=None):
+    """Creates gradient function for `optimize_many_inputs`.
+
+    The batch dimension of the function is variable, so the same function can
+    be passed to many calls of `optimize_many_inputs` (e.g., one per output
+    file), and the Keras graph is built only once.
+
+    :param model_object: See doc for `optimize_many_inputs`.
+    :param component_type_string: Same.
+    :param target_class: Same.
+    :param layer_name: Same.
+    :param neuron_indices: Same.
+    :param channel_index: Same.
+    :param stat_function_for_neuron_activations: Same.
+    :param l2_weight: Same.
+    :param ideal_activation: Same.
+    :param radar_constraint_weight: Same.
+    :param minmax_constraint_weight: Same.
+    :param model_metadata_dict: Same.
+    :return: gradient_function: Keras function (see doc for
+        `_create_batched_gradient_function`).
+    """
+
+    activation_tensor, loss_tensor = _create_batched_activation_and_loss(
+        model_object=model_object, component_type_string=component_type_string,
+        target_class=target_class, layer_name=layer_name,
+        neuron_indices=neuron_indices, channel_index=channel_index,
+        stat_function_for_neuron_activations=
+        stat_function_for_neuron_activations,
+        ideal_activation=ideal_activation)
+
+    constraint_loss_tensor = None
+
+    if radar_constraint_weight is not None:
+        constraint_loss_tensor = _radar_constraints_to_loss_fn(
+            model_object=model_object, model_metadata_dict=model_metadata_dict,
+            weight=radar_constraint_weight)
+
+    if minmax_constraint_weight is not None:
+        this_loss_tensor = _minmax_constraints_to_loss_fn(
+            model_object=model_object, model_metadata_dict=model_metadata_dict,
+            weight=minmax_constraint_weight)
+
+        if constraint_loss_tensor is None:
+            constraint_loss_tensor = this_loss_tensor
+        else:
+            constraint_loss_tensor += this_loss_tensor
+
+    return _create_batched_gradient_function(
+        model_object=model_object, activation_tensor=activation_tensor,
+        loss_tensor=loss_tensor, l2_weight=l2_weight,
+        constraint_loss_tensor=constraint_loss_tensor)
+
+
+def optimize_many_inputs(
+        model_object, component_type_string, input_matrices,
+        num_examples_per_batch=DEFAULT_NUM_EXAMPLES_PER_BATCH,
+        target_class=None, layer_name=None, neuron_indices=None,
+        channel_index=None, stat_function_for_neuron_activations=K.max,
+        num_iterations=DEFAULT_NUM_ITERATIONS,
+        learning_rate=DEFAULT_LEARNING_RATE, l2_weight=DEFAULT_L2_WEIGHT,
+        ideal_activation=DEFAULT_IDEAL_ACTIVATION,
+        radar_constraint_weight=None, minmax_constraint_weight=None,
+        model_metadata_dict=None, early_stopping_patience=None,
+        early_stopping_tolerance=DEFAULT_EARLY_STOPPING_TOLERANCE,
+        gradient_function=None):
+    """Optimizes many input examples, in batches.
+
+    This is equivalent to calling `optimize_input_for_class`,
+    `optimize_input_for_neuron`, or `optimize_input_for_channel` once per
+    example, except that each batch of examples is optimized in one Keras graph
+    (built only once) and each example may stop early.
+
+    T = number of input tensors to the model
+    E = number of examples
+
+    :param model_object: Trained instance of `keras.models.Model` or
+        `keras.models.Sequential`.
+    :param component_type_string: Component type (must be accepted by
+        `model_interpretation.check_component_type`).
+    :param input_matrices: length-T list of numpy arrays, where the first axis
+        of each has length E.  See doc for `_do_gradient_descent`.
+    :param num_examples_per_batch: Number of examples optimized at once.
+    :param target_class: See doc for `optimize_input_for_class`.
+    :param layer_name: See doc for `optimize_input_for_neuron` or
+        `optimize_input_for_channel`.
+    :param neuron_indices: See doc for `optimize_input_for_neuron`.
+    :param channel_index: See doc for `optimize_input_for_channel`.
+    :param stat_function_for_neuron_activations: Same.
+    :param num_iterations: See doc for `_do_gradient_descent`.
+    :param learning_rate: Same.
+    :param l2_weight: Same.
+    :param ideal_activation: See doc for `optimize_input_for_neuron` or
+        `optimize_input_for_channel`.
+    :param radar_constraint_weight: See doc for `_radar_constraints_to_loss_fn`.
+    :param minmax_constraint_weight: See doc for
+        `_minmax_constraints_to_loss_fn`.
+    :param model_metadata_dict: Same.
+    :param early_stopping_patience: An example stops being optimized after its
+        loss (not counting physical constraints, which are computed for the
+        whole batch) has failed to decrease by more than
+        `early_stopping_tolerance` for this many iterations in a row.  If None,
+        there is no early stopping.
+    :param early_stopping_tolerance: See above.
+    :param gradient_function: Function created by
+        `create_many_input_gradient_function`, with the same settings as the
+        other input args.  If None, will be created here.
+    :return: result_dict: Dictionary with the following keys.
+    result_dict["normalized_input_matrices"]: length-T list of input matrices
+        (before backwards optimization).
+    result_dict["normalized_output_matrices"]: length-T list of output matrices
+        (after backwards optimization).
+    result_dict["initial_activations"]: length-E numpy array of initial
+        activations.
+    result_dict["final_activations"]: length-E numpy array of final
+        activations.
+    """
+
+    check_metadata(
+        component_type_string=component_type_string,
+        num_iterations=num_iterations, learning_rate=learning_rate,
+        target_class=target_class, layer_name=layer_name,
+        ideal_activation=ideal_activation, neuron_indices=neuron_indices,
+        channel_index=channel_index, l2_weight=l2_weight,
+        radar_constraint_weight=radar_constraint_weight,
+        minmax_constraint_weight=minmax_constraint_weight)
+
+    _check_in_and_out_matrices(input_matrices)
+    error_checking.assert_is_integer(num_examples_per_batch)
+    error_checking.assert_is_greater(num_examples_per_batch, 0)
+
+    if early_stopping_patience is not None:
+        error_checking.assert_is_integer(early_stopping_patience)
+        error_checking.assert_is_greater(early_stopping_patience, 0)
+        error_checking.assert_is_geq(early_stopping_tolerance, 0.)
+
+    if gradient_function is None:
+        gradient_function = create_many_input_gradient_function(
+            model_object=model_object,
+            component_type_string=component_type_string,
+            target_class=target_class, layer_name=layer_name,
+            neuron_indices=neuron_indices, channel_index=channel_index,
+            stat_function_for_neuron_activations=
+            stat_function_for_neuron_activations,
+            l2_weight=l2_weight, ideal_activation=ideal_activation,
+            radar_constraint_weight=radar_constraint_weight,
+            minmax_constraint_weight=minmax_constraint_weight,
+            model_metadata_dict=model_metadata_dict)
+
+    num_examples = input_matrices[0].shape[0]
+    output_matrices = [None] * len(input_matrices)
+    initial_activations = numpy.full(num_examples, numpy.nan)
+    final_activations = numpy.full(num_examples, numpy.nan)
+
+    for i in range(0, num_examples, num_examples_per_batch):
+        this_first_index = i
+        this_last_index = min(
+            [i + num_examples_per_batch - 1, num_examples - 1]
+        )
+
+        print('\nOptimizing examples {0:d}-{1:d} of {2:d}...'.format(
+            this_first_index + 1, this_last_index + 1, num_examples
+        ))
+
+        this_result_dict = _do_batched_gradient_descent(
+            gradient_function=gradient_function,
+            input_matrices=[
+                a[this_first_index:(this_last_index + 1), ...]
+                for a in input_matrices
+            ],
+            num_iterations=num_iterations, learning_rate=learning_rate,
+            early_stopping_patience=early_stopping_patience,
+            early_stopping_tolerance=early_stopping_tolerance)
+
+        initial_activations[this_first_index:(this_last_index + 1)] = (
+            this_result_dict[INITIAL_ACTIVATIONS_KEY]
+        )
+        final_activations[this_first_index:(this_last_index + 1)] = (
+            this_result_dict[FINAL_ACTIVATIONS_KEY]
+        )
+
+        these_output_matrices = this_result_dict[NORM_OUTPUT_MATRICES_KEY]
+
+        for k in range(len(output_matrices)):
+            if output_matrices[k] is None:
+                output_matrices[k] = these_output_matrices[k]
+            else:
+                output_matrices[k] = numpy.concatenate(
+                    (output_matrices[k], these_output_matrices[k]), axis=0
+                )
+
+    return {
+        NORM_INPUT_MATRICES_KEY: input_matrices,
+        NORM_OUTPUT_MATRICES_KEY: output_matrices,
+        INITIAL_ACTIVATIONS_KEY: initial_activations,
+        FINAL_ACTIVATIONS_KEY: final_activations
+    }
+
+
 def write_standard_file(
         pickle_file_name, denorm_input_matrices, denorm_output_matrices,
         initial_activations, final_activations, model_file_name, metadata_dict,
@@ -187,6 +187,17 @@ INIT_RADAR_MATRIX_5D = numpy.stack(
 )
 INIT_RADAR_MATRIX_5D = numpy.expand_dims(INIT_RADAR_MATRIX_5D, axis=0)
 
+# The following constants are used to test _update_early_stopping.
+LOSS_VALUES = numpy.array([1., 2., 3., 4.])
+BEST_LOSS_VALUES_BEFORE = numpy.array([2., 2., 3.5, 3.])
+NUM_ITERS_WITHOUT_IMPROVEMENT_BEFORE = numpy.array([3, 1, 2, 2], dtype=int)
+EARLY_STOPPING_PATIENCE = 3
+EARLY_STOPPING_TOLERANCE = 0.1
+
+BEST_LOSS_VALUES_AFTER = numpy.array([1., 2., 3., 3.])
+NUM_ITERS_WITHOUT_IMPROVEMENT_AFTER = numpy.array([0, 2, 0, 3], dtype=int)
+STOP_FLAGS = numpy.array([0, 0, 0, 1], dtype=bool)
+
 
 class FeatureOptimizationTests(unittest.TestCase):
     """Each method is a unit test for backwards_optimization.py."""
@@ -400,6 +411,42 @@ class FeatureOptimizationTests(unittest.TestCase):
         this_matrix = this_init_function(ARRAY_DIMENSIONS_2D)
         self.assertTrue(this_matrix is None)
 
+    def test_update_early_stopping(self):
+        """Ensures correct output from _update_early_stopping."""
+
+        (these_best_loss_values, these_num_iters, these_stop_flags
+        ) = backwards_opt._update_early_stopping(
+            loss_values=LOSS_VALUES,
+            best_loss_values=BEST_LOSS_VALUES_BEFORE + 0.,
+            num_iters_without_improvement=
+            NUM_ITERS_WITHOUT_IMPROVEMENT_BEFORE + 0,
+            patience=EARLY_STOPPING_PATIENCE,
+            tolerance=EARLY_STOPPING_TOLERANCE)
+
+        self.assertTrue(numpy.allclose(
+            these_best_loss_values, BEST_LOSS_VALUES_AFTER, atol=TOLERANCE
+        ))
+        self.assertTrue(numpy.array_equal(
+            these_num_iters, NUM_ITERS_WITHOUT_IMPROVEMENT_AFTER
+        ))
+        self.assertTrue(numpy.array_equal(these_stop_flags, STOP_FLAGS))
+
+    def test_update_early_stopping_no_patience(self):
+        """Ensures correct output from _update_early_stopping.
+
+        In this case there is no patience, so no example should stop.
+        """
+
+        these_stop_flags = backwards_opt._update_early_stopping(
+            loss_values=LOSS_VALUES,
+            best_loss_values=BEST_LOSS_VALUES_BEFORE + 0.,
+            num_iters_without_improvement=
+            NUM_ITERS_WITHOUT_IMPROVEMENT_BEFORE + 0,
+            patience=None, tolerance=EARLY_STOPPING_TOLERANCE
+        )[-1]
+
+        self.assertFalse(numpy.any(these_stop_flags))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -24,6 +24,7 @@ import netCDF4
 import keras.losses
 import keras.optimizers
 import keras.models
+import keras.layers
 import keras.callbacks
 from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
 from gewittergefahr.deep_learning import keras_metrics
@@ -74,6 +75,11 @@ METADATA_KEYS = [
     TRAINING_OPTION_DICT_KEY, LAYER_OPERATIONS_KEY, NUM_EX_PER_VALIDN_BATCH_KEY
 ]
 
+TIMING_KEYS = [
+    trainval_io.READING_TIME_KEY, trainval_io.NORMALIZATION_TIME_KEY,
+    trainval_io.AUGMENTATION_TIME_KEY, trainval_io.WAITING_TIME_KEY
+]
+
 STORM_OBJECT_DIMENSION_KEY = 'storm_object'
 FEATURE_DIMENSION_KEY = 'feature'
 SPATIAL_DIMENSION_KEYS = [
@@ -215,6 +221,75 @@ def _remove_data_augmentation(validation_option_dict):
     return validation_option_dict
 
 
+def _create_generator(generator_function, generator_args,
+                      num_prefetch_workers, use_prefetch_processes,
+                      timing_dict=None):
+    """Creates training or validation generator.
+
+    :param generator_function: Generator function in
+        training_validation_io.py (e.g., `generator_2d_or_3d`).
+    :param generator_args: List of positional arguments for
+        `generator_function`.
+    :param num_prefetch_workers: Number of background workers used to prefetch
+        batches (see doc for `training_validation_io.prefetch_generator`).  If
+        0, batches will be created in the foreground, with no prefetching.
+    :param use_prefetch_processes: [used only if `num_prefetch_workers > 0`]
+        See doc for `use_processes` in
+        `training_validation_io.prefetch_generator`.
+    :param timing_dict: Dictionary of counters, kept up to date by the
+        generator (see doc for `training_validation_io.prefetch_generator`).
+        If None, no timing.
+    :return: generator_object: Generator object.
+    """
+
+    error_checking.assert_is_integer(num_prefetch_workers)
+    error_checking.assert_is_geq(num_prefetch_workers, 0)
+
+    if num_prefetch_workers == 0:
+        return generator_function(*generator_args, timing_dict=timing_dict)
+
+    return trainval_io.prefetch_generator(
+        generator_function=generator_function, generator_args=generator_args,
+        num_workers=num_prefetch_workers, use_processes=use_prefetch_processes,
+        timing_dict=timing_dict)
+
+
+def _get_timing_callback(timing_dict, generator_name):
+    """Creates callback that logs time spent by generator in each epoch.
+
+    :param timing_dict: Dictionary of counters, kept up to date by the
+        generator (see doc for `_create_generator`).
+    :param generator_name: Name of generator (used only in log messages).
+    :return: callback_object: Instance of `keras.callbacks.LambdaCallback`.
+    """
+
+    last_timing_dict = {}
+
+    def _log_timing(epoch, logs):
+        """Logs time spent by generator since the last epoch.
+
+        :param epoch: Epoch number (zero-based).
+        :param logs: Dictionary of metrics (not used).
+        """
+
+        this_message_string = 'Time spent by {0:s} generator in epoch {1:d}:'
+        this_message_string = this_message_string.format(
+            generator_name, epoch + 1)
+
+        for this_key in TIMING_KEYS:
+            this_time_sec = (
+                timing_dict.get(this_key, 0.) -
+                last_timing_dict.get(this_key, 0.)
+            )
+            this_message_string += ' {0:s} = {1:.1f};'.format(
+                this_key, this_time_sec)
+
+        print(this_message_string)
+        last_timing_dict.update(timing_dict)
+
+    return keras.callbacks.LambdaCallback(on_epoch_end=_log_timing)
+
+
 def get_connected_input_layers(model_object, target_layer_name):
     """Gets input layers connected to target layer.
 
@@ -272,6 +347,138 @@ def model_to_feature_generator(model_object, feature_layer_name):
         outputs=model_object.get_layer(name=feature_layer_name).output)
 
 
+def _get_inbound_layers(layer_object):
+    """Returns layers feeding into the given layer.
+
+    Only the first inbound node (the one created when the model was built) is
+    used.
+
+    :param layer_object: Instance of `keras.layers.Layer`.
+    :return: inbound_layer_objects: 1-D list of layers (instances of
+        `keras.layers.Layer`).  If the given layer is an input layer, this is
+        empty.
+    """
+
+    inbound_layer_objects = layer_object._inbound_nodes[0].inbound_layers
+
+    if isinstance(inbound_layer_objects, list):
+        return inbound_layer_objects
+
+    return [inbound_layer_objects]
+
+
+def split_model_by_input(model_object):
+    """Splits multi-input model into one branch per input and a head.
+
+    The "branch" for the [i]th input contains all layers connected only to the
+    [i]th input layer.  The "head" contains all layers connected to more than
+    one input layer (i.e., the merge layer and everything after it).  Outputs
+    of the [i]th branch that feed into the head are the "branch features" for
+    the [i]th input.
+
+    T = number of input layers
+
+    :param model_object: Instance of `keras.models.Model`.
+    :return: branch_model_objects: length-T list of models (instances of
+        `keras.models.Model`).  The [i]th model takes the [i]th input and
+        returns branch features for the [i]th input.
+    :return: head_model_object: Instance of `keras.models.Model`.  This takes
+        branch features for all inputs (in order) and returns the same outputs
+        as `model_object`.
+
+    If the model cannot be split (e.g., because it has only one input), both
+    return values are None.
+    """
+
+    input_layer_names = model_object.input_names
+    num_inputs = len(input_layer_names)
+    if num_inputs < 2:
+        return None, None
+
+    input_indices_by_layer = {}
+
+    for this_layer_object in model_object.layers:
+        this_layer_name = this_layer_object.name
+
+        if this_layer_name in input_layer_names:
+            input_indices_by_layer[this_layer_name] = {
+                input_layer_names.index(this_layer_name)
+            }
+            continue
+
+        input_indices_by_layer[this_layer_name] = set().union(*[
+            input_indices_by_layer[l.name]
+            for l in _get_inbound_layers(this_layer_object)
+        ])
+
+    head_layer_objects = [
+        l for l in model_object.layers
+        if len(input_indices_by_layer[l.name]) > 1
+    ]
+
+    output_layer_names = model_object.output_names
+    if any([len(input_indices_by_layer[n]) < 2 for n in output_layer_names]):
+        return None, None
+
+    boundary_layers_by_input = [[] for _ in range(num_inputs)]
+
+    for this_head_layer_object in head_layer_objects:
+        for this_layer_object in _get_inbound_layers(this_head_layer_object):
+            these_input_indices = input_indices_by_layer[this_layer_object.name]
+            if len(these_input_indices) > 1:
+                continue
+
+            i = list(these_input_indices)[0]
+            if this_layer_object not in boundary_layers_by_input[i]:
+                boundary_layers_by_input[i].append(this_layer_object)
+
+    if any([len(b) == 0 for b in boundary_layers_by_input]):
+        return None, None
+
+    branch_model_objects = [
+        keras.models.Model(
+            inputs=model_object.get_layer(
+                name=input_layer_names[i]
+            ).get_output_at(0),
+            outputs=[l.get_output_at(0) for l in boundary_layers_by_input[i]]
+        )
+        for i in range(num_inputs)
+    ]
+
+    # Rebuild head on new input tensors (one per branch feature), reusing the
+    # trained layers.
+    tensor_by_layer = {}
+    head_input_tensors = []
+
+    for i in range(num_inputs):
+        for this_layer_object in boundary_layers_by_input[i]:
+            this_input_tensor = keras.layers.Input(
+                shape=this_layer_object.get_output_shape_at(0)[1:]
+            )
+
+            tensor_by_layer[this_layer_object.name] = this_input_tensor
+            head_input_tensors.append(this_input_tensor)
+
+    for this_layer_object in head_layer_objects:
+        these_input_tensors = [
+            tensor_by_layer[l.name]
+            for l in _get_inbound_layers(this_layer_object)
+        ]
+
+        if len(these_input_tensors) == 1:
+            these_input_tensors = these_input_tensors[0]
+
+        tensor_by_layer[this_layer_object.name] = this_layer_object(
+            these_input_tensors)
+
+    head_model_object = keras.models.Model(
+        inputs=head_input_tensors,
+        outputs=[tensor_by_layer[n] for n in output_layer_names]
+    )
+
+    return branch_model_objects, head_model_object
+
+
 def read_model(hdf5_file_name):
     """Reads model from HDF5 file.
 
@@ -410,7 +617,8 @@ def train_cnn_2d_or_3d(
         monitor_string=LOSS_FUNCTION_STRING, weight_loss_function=False,
         num_validation_batches_per_epoch=0, validation_file_names=None,
         first_validn_time_unix_sec=None, last_validn_time_unix_sec=None,
-        num_examples_per_validn_batch=None):
+        num_examples_per_validn_batch=None, num_prefetch_workers=0,
+        use_prefetch_processes=False):
     """Trains CNN with radar images, which are either all 2-D or all 3-D.
 
     :param model_object: Instance of `keras.models.Model` or
@@ -443,6 +651,8 @@ def train_cnn_2d_or_3d(
         [used only if num_validation_batches_per_epoch > 0]
         Number of examples per validation batch.  If left alone, this will
         default to num examples per training batch.
+    :param num_prefetch_workers: See doc for `_create_generator`.
+    :param use_prefetch_processes: Same.
     """
 
     class_to_weight_dict = _check_training_args(
@@ -460,7 +670,12 @@ def train_cnn_2d_or_3d(
         output_model_file_name=model_file_name, monitor_string=monitor_string,
         use_validation=num_validation_batches_per_epoch > 0)
 
-    list_of_callback_objects = [history_object, checkpoint_object]
+    training_timing_dict = {}
+    list_of_callback_objects = [
+        history_object, checkpoint_object,
+        _get_timing_callback(
+            timing_dict=training_timing_dict, generator_name='training')
+    ]
 
     if num_validation_batches_per_epoch > 0:
         early_stopping_object = keras.callbacks.EarlyStopping(
@@ -472,7 +687,13 @@ def train_cnn_2d_or_3d(
             patience=PLATEAU_PATIENCE_EPOCHS, verbose=1, mode='min',
             min_delta=CROSS_ENTROPY_PATIENCE, cooldown=PLATEAU_COOLDOWN_EPOCHS)
 
-        list_of_callback_objects += [early_stopping_object, plateau_object]
+        validation_timing_dict = {}
+        list_of_callback_objects += [
+            early_stopping_object, plateau_object,
+            _get_timing_callback(
+                timing_dict=validation_timing_dict,
+                generator_name='validation')
+        ]
 
         validation_option_dict = copy.deepcopy(training_option_dict)
         validation_option_dict[
@@ -491,16 +712,30 @@ def train_cnn_2d_or_3d(
             validation_option_dict)
 
         model_object.fit_generator(
-            generator=trainval_io.generator_2d_or_3d(training_option_dict),
+            generator=_create_generator(
+                generator_function=trainval_io.generator_2d_or_3d,
+                generator_args=[training_option_dict],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=training_timing_dict),
             steps_per_epoch=num_training_batches_per_epoch, epochs=num_epochs,
             verbose=1, class_weight=class_to_weight_dict,
             callbacks=list_of_callback_objects,
-            validation_data=trainval_io.generator_2d_or_3d(
-                validation_option_dict),
+            validation_data=_create_generator(
+                generator_function=trainval_io.generator_2d_or_3d,
+                generator_args=[validation_option_dict],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=validation_timing_dict),
             validation_steps=num_validation_batches_per_epoch)
     else:
         model_object.fit_generator(
-            generator=trainval_io.generator_2d_or_3d(training_option_dict),
+            generator=_create_generator(
+                generator_function=trainval_io.generator_2d_or_3d,
+                generator_args=[training_option_dict],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=training_timing_dict),
             steps_per_epoch=num_training_batches_per_epoch, epochs=num_epochs,
             verbose=1, class_weight=class_to_weight_dict,
             callbacks=list_of_callback_objects)
@@ -512,7 +747,8 @@ def train_cnn_with_soundings(
         monitor_string=LOSS_FUNCTION_STRING, weight_loss_function=False,
         num_validation_batches_per_epoch=0, validation_file_names=None,
         first_validn_time_unix_sec=None, last_validn_time_unix_sec=None,
-        num_examples_per_validn_batch=None):
+        num_examples_per_validn_batch=None, num_prefetch_workers=0,
+        use_prefetch_processes=False):
     """Trains CNN with soundings only.
 
     :param model_object: See doc for `train_cnn_2d_or_3d`.
@@ -530,6 +766,8 @@ def train_cnn_with_soundings(
     :param first_validn_time_unix_sec: Same.
     :param last_validn_time_unix_sec: Same.
     :param num_examples_per_validn_batch: Same.
+    :param num_prefetch_workers: Same.
+    :param use_prefetch_processes: Same.
     """
 
     class_to_weight_dict = _check_training_args(
@@ -547,7 +785,12 @@ def train_cnn_with_soundings(
         output_model_file_name=model_file_name, monitor_string=monitor_string,
         use_validation=num_validation_batches_per_epoch > 0)
 
-    list_of_callback_objects = [history_object, checkpoint_object]
+    training_timing_dict = {}
+    list_of_callback_objects = [
+        history_object, checkpoint_object,
+        _get_timing_callback(
+            timing_dict=training_timing_dict, generator_name='training')
+    ]
 
     if num_validation_batches_per_epoch > 0:
         early_stopping_object = keras.callbacks.EarlyStopping(
@@ -559,7 +802,13 @@ def train_cnn_with_soundings(
             patience=PLATEAU_PATIENCE_EPOCHS, verbose=1, mode='min',
             min_delta=CROSS_ENTROPY_PATIENCE, cooldown=PLATEAU_COOLDOWN_EPOCHS)
 
-        list_of_callback_objects += [early_stopping_object, plateau_object]
+        validation_timing_dict = {}
+        list_of_callback_objects += [
+            early_stopping_object, plateau_object,
+            _get_timing_callback(
+                timing_dict=validation_timing_dict,
+                generator_name='validation')
+        ]
 
         validation_option_dict = copy.deepcopy(training_option_dict)
         validation_option_dict[
@@ -575,16 +824,30 @@ def train_cnn_with_soundings(
             ] = num_examples_per_validn_batch
 
         model_object.fit_generator(
-            generator=trainval_io.sounding_generator(training_option_dict),
+            generator=_create_generator(
+                generator_function=trainval_io.sounding_generator,
+                generator_args=[training_option_dict],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=training_timing_dict),
             steps_per_epoch=num_training_batches_per_epoch, epochs=num_epochs,
             verbose=1, class_weight=class_to_weight_dict,
             callbacks=list_of_callback_objects,
-            validation_data=trainval_io.sounding_generator(
-                validation_option_dict),
+            validation_data=_create_generator(
+                generator_function=trainval_io.sounding_generator,
+                generator_args=[validation_option_dict],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=validation_timing_dict),
             validation_steps=num_validation_batches_per_epoch)
     else:
         model_object.fit_generator(
-            generator=trainval_io.sounding_generator(training_option_dict),
+            generator=_create_generator(
+                generator_function=trainval_io.sounding_generator,
+                generator_args=[training_option_dict],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=training_timing_dict),
             steps_per_epoch=num_training_batches_per_epoch, epochs=num_epochs,
             verbose=1, class_weight=class_to_weight_dict,
             callbacks=list_of_callback_objects)
@@ -596,7 +859,8 @@ def train_cnn_2d3d_myrorss(
         monitor_string=LOSS_FUNCTION_STRING, weight_loss_function=False,
         num_validation_batches_per_epoch=0, validation_file_names=None,
         first_validn_time_unix_sec=None, last_validn_time_unix_sec=None,
-        num_examples_per_validn_batch=None):
+        num_examples_per_validn_batch=None, num_prefetch_workers=0,
+        use_prefetch_processes=False):
     """Trains CNN with both 2-D and 3-D radar images.
 
     :param model_object: See doc for `train_cnn_2d_or_3d`.
@@ -613,6 +877,8 @@ def train_cnn_2d3d_myrorss(
     :param first_validn_time_unix_sec: Same.
     :param last_validn_time_unix_sec: Same.
     :param num_examples_per_validn_batch: Same.
+    :param num_prefetch_workers: Same.
+    :param use_prefetch_processes: Same.
     """
 
     class_to_weight_dict = _check_training_args(
@@ -630,7 +896,12 @@ def train_cnn_2d3d_myrorss(
         output_model_file_name=model_file_name, monitor_string=monitor_string,
         use_validation=num_validation_batches_per_epoch > 0)
 
-    list_of_callback_objects = [history_object, checkpoint_object]
+    training_timing_dict = {}
+    list_of_callback_objects = [
+        history_object, checkpoint_object,
+        _get_timing_callback(
+            timing_dict=training_timing_dict, generator_name='training')
+    ]
 
     if num_validation_batches_per_epoch > 0:
         early_stopping_object = keras.callbacks.EarlyStopping(
@@ -642,7 +913,13 @@ def train_cnn_2d3d_myrorss(
             patience=PLATEAU_PATIENCE_EPOCHS, verbose=1, mode='min',
             min_delta=CROSS_ENTROPY_PATIENCE, cooldown=PLATEAU_COOLDOWN_EPOCHS)
 
-        list_of_callback_objects += [early_stopping_object, plateau_object]
+        validation_timing_dict = {}
+        list_of_callback_objects += [
+            early_stopping_object, plateau_object,
+            _get_timing_callback(
+                timing_dict=validation_timing_dict,
+                generator_name='validation')
+        ]
 
         validation_option_dict = copy.deepcopy(training_option_dict)
         validation_option_dict[
@@ -661,16 +938,30 @@ def train_cnn_2d3d_myrorss(
             validation_option_dict)
 
         model_object.fit_generator(
-            generator=trainval_io.myrorss_generator_2d3d(training_option_dict),
+            generator=_create_generator(
+                generator_function=trainval_io.myrorss_generator_2d3d,
+                generator_args=[training_option_dict],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=training_timing_dict),
             steps_per_epoch=num_training_batches_per_epoch, epochs=num_epochs,
             verbose=1, class_weight=class_to_weight_dict,
             callbacks=list_of_callback_objects,
-            validation_data=trainval_io.myrorss_generator_2d3d(
-                validation_option_dict),
+            validation_data=_create_generator(
+                generator_function=trainval_io.myrorss_generator_2d3d,
+                generator_args=[validation_option_dict],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=validation_timing_dict),
             validation_steps=num_validation_batches_per_epoch)
     else:
         model_object.fit_generator(
-            generator=trainval_io.myrorss_generator_2d3d(training_option_dict),
+            generator=_create_generator(
+                generator_function=trainval_io.myrorss_generator_2d3d,
+                generator_args=[training_option_dict],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=training_timing_dict),
             steps_per_epoch=num_training_batches_per_epoch, epochs=num_epochs,
             verbose=1, class_weight=class_to_weight_dict,
             callbacks=list_of_callback_objects)
@@ -682,7 +973,8 @@ def train_cnn_gridrad_2d_reduced(
         list_of_layer_operation_dicts, monitor_string=LOSS_FUNCTION_STRING,
         weight_loss_function=False, num_validation_batches_per_epoch=0,
         validation_file_names=None, first_validn_time_unix_sec=None,
-        last_validn_time_unix_sec=None, num_examples_per_validn_batch=None):
+        last_validn_time_unix_sec=None, num_examples_per_validn_batch=None,
+        num_prefetch_workers=0, use_prefetch_processes=False):
     """Trains CNN with 2-D GridRad images.
 
     These 2-D images are produced by applying layer operations to the native 3-D
@@ -705,6 +997,8 @@ def train_cnn_gridrad_2d_reduced(
     :param first_validn_time_unix_sec: Same.
     :param last_validn_time_unix_sec: Same.
     :param num_examples_per_validn_batch: Same.
+    :param num_prefetch_workers: Same.
+    :param use_prefetch_processes: Same.
     """
 
     class_to_weight_dict = _check_training_args(
@@ -722,7 +1016,12 @@ def train_cnn_gridrad_2d_reduced(
         output_model_file_name=model_file_name, monitor_string=monitor_string,
         use_validation=num_validation_batches_per_epoch > 0)
 
-    list_of_callback_objects = [history_object, checkpoint_object]
+    training_timing_dict = {}
+    list_of_callback_objects = [
+        history_object, checkpoint_object,
+        _get_timing_callback(
+            timing_dict=training_timing_dict, generator_name='training')
+    ]
 
     if num_validation_batches_per_epoch > 0:
         early_stopping_object = keras.callbacks.EarlyStopping(
@@ -734,7 +1033,13 @@ def train_cnn_gridrad_2d_reduced(
             patience=PLATEAU_PATIENCE_EPOCHS, verbose=1, mode='min',
             min_delta=CROSS_ENTROPY_PATIENCE, cooldown=PLATEAU_COOLDOWN_EPOCHS)
 
-        list_of_callback_objects += [early_stopping_object, plateau_object]
+        validation_timing_dict = {}
+        list_of_callback_objects += [
+            early_stopping_object, plateau_object,
+            _get_timing_callback(
+                timing_dict=validation_timing_dict,
+                generator_name='validation')
+        ]
 
         validation_option_dict = copy.deepcopy(training_option_dict)
         validation_option_dict[
@@ -753,21 +1058,36 @@ def train_cnn_gridrad_2d_reduced(
             validation_option_dict)
 
         model_object.fit_generator(
-            generator=trainval_io.gridrad_generator_2d_reduced(
-                option_dict=training_option_dict,
-                list_of_operation_dicts=list_of_layer_operation_dicts),
+            generator=_create_generator(
+                generator_function=trainval_io.gridrad_generator_2d_reduced,
+                generator_args=[
+                    training_option_dict, list_of_layer_operation_dicts
+                ],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=training_timing_dict),
             steps_per_epoch=num_training_batches_per_epoch, epochs=num_epochs,
             verbose=1, class_weight=class_to_weight_dict,
             callbacks=list_of_callback_objects,
-            validation_data=trainval_io.gridrad_generator_2d_reduced(
-                option_dict=validation_option_dict,
-                list_of_operation_dicts=list_of_layer_operation_dicts),
+            validation_data=_create_generator(
+                generator_function=trainval_io.gridrad_generator_2d_reduced,
+                generator_args=[
+                    validation_option_dict, list_of_layer_operation_dicts
+                ],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=validation_timing_dict),
             validation_steps=num_validation_batches_per_epoch)
     else:
         model_object.fit_generator(
-            generator=trainval_io.gridrad_generator_2d_reduced(
-                option_dict=training_option_dict,
-                list_of_operation_dicts=list_of_layer_operation_dicts),
+            generator=_create_generator(
+                generator_function=trainval_io.gridrad_generator_2d_reduced,
+                generator_args=[
+                    training_option_dict, list_of_layer_operation_dicts
+                ],
+                num_prefetch_workers=num_prefetch_workers,
+                use_prefetch_processes=use_prefetch_processes,
+                timing_dict=training_timing_dict),
             steps_per_epoch=num_training_batches_per_epoch, epochs=num_epochs,
             verbose=1, class_weight=class_to_weight_dict,
             callbacks=list_of_callback_objects)
@@ -0,0 +1,117 @@
+"""Unit tests for cnn.py."""
+
+import unittest
+import numpy
+import keras.layers
+import keras.models
+from gewittergefahr.deep_learning import cnn
+
+TOLERANCE = 1e-6
+
+# The following constants are used to test split_model_by_input.
+NUM_EXAMPLES = 5
+NUM_FIRST_INPUT_FEATURES = 4
+NUM_SECOND_INPUT_FEATURES = 3
+NUM_DENSE_NEURONS = 6
+NUM_CLASSES = 2
+
+FIRST_INPUT_MATRIX = numpy.reshape(
+    numpy.linspace(-1, 1, num=NUM_EXAMPLES * NUM_FIRST_INPUT_FEATURES),
+    (NUM_EXAMPLES, NUM_FIRST_INPUT_FEATURES)
+)
+SECOND_INPUT_MATRIX = numpy.reshape(
+    numpy.linspace(2, -3, num=NUM_EXAMPLES * NUM_SECOND_INPUT_FEATURES),
+    (NUM_EXAMPLES, NUM_SECOND_INPUT_FEATURES)
+)
+
+
+def create_two_input_model():
+    """Creates small model with two inputs, each feeding one dense branch.
+
+    :return: model_object: Instance of `keras.models.Model`.
+    """
+
+    first_input_layer_object = keras.layers.Input(
+        shape=(NUM_FIRST_INPUT_FEATURES,)
+    )
+    first_layer_object = keras.layers.Dense(
+        NUM_DENSE_NEURONS, activation='relu'
+    )(first_input_layer_object)
+
+    second_input_layer_object = keras.layers.Input(
+        shape=(NUM_SECOND_INPUT_FEATURES,)
+    )
+    second_layer_object = keras.layers.Dense(
+        NUM_DENSE_NEURONS, activation='relu'
+    )(second_input_layer_object)
+
+    layer_object = keras.layers.concatenate(
+        [first_layer_object, second_layer_object]
+    )
+    layer_object = keras.layers.Dense(
+        NUM_CLASSES, activation='softmax'
+    )(layer_object)
+
+    return keras.models.Model(
+        inputs=[first_input_layer_object, second_input_layer_object],
+        outputs=layer_object)
+
+
+class CnnTests(unittest.TestCase):
+    """Each method is a unit test for cnn.py."""
+
+    def test_split_model_by_input(self):
+        """Ensures correct output from split_model_by_input.
+
+        In this case, applying the head to the outputs of all branches should
+        give the same predictions as the whole model.
+        """
+
+        this_model_object = create_two_input_model()
+        these_input_matrices = [FIRST_INPUT_MATRIX, SECOND_INPUT_MATRIX]
+
+        these_branch_model_objects, this_head_model_object = (
+            cnn.split_model_by_input(this_model_object)
+        )
+
+        self.assertTrue(len(these_branch_model_objects) == 2)
+
+        these_feature_matrices = [
+            m.predict(x) for m, x in
+            zip(these_branch_model_objects, these_input_matrices)
+        ]
+        this_head_prob_matrix = this_head_model_object.predict(
+            these_feature_matrices)
+        this_whole_prob_matrix = this_model_object.predict(
+            these_input_matrices)
+
+        self.assertTrue(numpy.allclose(
+            this_head_prob_matrix, this_whole_prob_matrix, atol=TOLERANCE
+        ))
+
+    def test_split_model_by_input_one_input(self):
+        """Ensures correct output from split_model_by_input.
+
+        In this case, the model has only one input, so it cannot be split.
+        """
+
+        this_input_layer_object = keras.layers.Input(
+            shape=(NUM_FIRST_INPUT_FEATURES,)
+        )
+        this_model_object = keras.models.Model(
+            inputs=this_input_layer_object,
+            outputs=keras.layers.Dense(
+                NUM_CLASSES, activation='softmax'
+            )(this_input_layer_object)
+        )
+
+        these_branch_model_objects, this_head_model_object = (
+            cnn.split_model_by_input(this_model_object)
+        )
+
+        self.assertTrue(these_branch_model_objects is None)
+        self.assertTrue(this_head_model_object is None)
+
+
+if __name__ == '__main__':
+    unittest.main()
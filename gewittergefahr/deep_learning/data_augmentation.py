@@ -222,7 +222,8 @@ def rotate_radar_images(radar_image_matrix, ccw_rotation_angle_deg):
         reshape=False, order=1, mode='constant', cval=PADDING_VALUE)
 
 
-def noise_radar_images(radar_image_matrix, standard_deviation):
+def noise_radar_images(radar_image_matrix, standard_deviation,
+                       random_state=None):
     """Adds Gaussian noise to each radar image.
 
     This method assumes that images are normalized (as by
@@ -232,6 +233,8 @@ def noise_radar_images(radar_image_matrix, standard_deviation):
     :param radar_image_matrix: See doc for
         `deep_learning_utils.check_radar_images`.
     :param standard_deviation: Standard deviation of Gaussian noise.
+    :param random_state: Instance of `numpy.random.RandomState`.  If None, will
+        use numpy's global random state.
     :return: noised_image_matrix: Same as `radar_image_matrix`, but after
         noising.  The shapes of the two numpy arrays are the same.
     """
@@ -241,7 +244,10 @@ def noise_radar_images(radar_image_matrix, standard_deviation):
         max_num_dimensions=5)
     error_checking.assert_is_greater(standard_deviation, 0.)
 
-    noise_matrix = numpy.random.normal(
+    if random_state is None:
+        random_state = numpy.random
+
+    noise_matrix = random_state.normal(
         loc=0., scale=standard_deviation, size=radar_image_matrix.shape)
     return radar_image_matrix + noise_matrix
 
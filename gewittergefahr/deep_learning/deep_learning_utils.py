@@ -56,6 +56,142 @@ VALID_NORMALIZATION_TYPE_STRINGS = [
 DEFAULT_MIN_NORMALIZED_VALUE = -1.
 DEFAULT_MAX_NORMALIZED_VALUE = 1.
 
+RADAR_TABLE_INDEX = 0
+SOUNDING_TABLE_INDEX = 2
+
+NORMALIZER_CACHE_DICT = {}
+
+
+class Normalizer(object):
+    """Normalizes or denormalizes the last axis (channels) of a data matrix.
+
+    Parameters for each channel are looked up once, when the object is created,
+    and stored as a scale and offset.  Thus, for each channel j:
+
+    x_normalized(..., j) = x(..., j) * scale(j) + offset(j)
+
+    For z-score normalization, scale(j) = 1 / sigma(j) and
+    offset(j) = -mu(j) / sigma(j), where mu and sigma are the mean and standard
+    deviation of channel j.  For min-max normalization, scale and offset are
+    derived from the equations in `normalize_radar_images`.
+    """
+
+    def __init__(self, normalization_table, field_names,
+                 normalization_type_string, min_normalized_value=0.,
+                 max_normalized_value=1.):
+        """Creates new instance.
+
+        :param normalization_table: Single-indexed pandas DataFrame (see doc
+            for `write_normalization_params`).
+        :param field_names: 1-D list of field names, in the order that they
+            appear in the last axis of data matrices.
+        :param normalization_type_string: Normalization type (must be accepted
+            by `_check_normalization_type`).
+        :param min_normalized_value: See doc for `normalize_radar_images`.
+        :param max_normalized_value: Same.
+        """
+
+        error_checking.assert_is_string_list(field_names)
+        error_checking.assert_is_numpy_array(
+            numpy.array(field_names), num_dimensions=1)
+
+        _check_normalization_type(normalization_type_string)
+        if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
+            error_checking.assert_is_greater(
+                max_normalized_value, min_normalized_value)
+
+        self.field_names = copy.deepcopy(field_names)
+        self.normalization_type_string = normalization_type_string
+
+        if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
+            min_values = normalization_table[MIN_VALUE_COLUMN].loc[
+                field_names].values.astype(float)
+            max_values = normalization_table[MAX_VALUE_COLUMN].loc[
+                field_names].values.astype(float)
+
+            self.scale_values = (
+                (max_normalized_value - min_normalized_value) /
+                (max_values - min_values)
+            )
+            self.offset_values = (
+                min_normalized_value - min_values * self.scale_values
+            )
+        else:
+            mean_values = normalization_table[MEAN_VALUE_COLUMN].loc[
+                field_names].values.astype(float)
+            standard_deviations = normalization_table[
+                STANDARD_DEVIATION_COLUMN
+            ].loc[field_names].values.astype(float)
+
+            self.scale_values = 1. / standard_deviations
+            self.offset_values = -mean_values / standard_deviations
+
+    def _check_data_matrix(self, data_matrix):
+        """Error-checks data matrix.
+
+        :param data_matrix: numpy array, where the last axis has length F
+            (number of fields).
+        :return: data_matrix: Same as input, but converted to float if
+            necessary.
+        :return: scale_values: length-F numpy array of scale factors, with the
+            same type as `data_matrix`.
+        :return: offset_values: Same but for offsets.
+        """
+
+        error_checking.assert_is_numpy_array(data_matrix)
+        error_checking.assert_is_geq(len(data_matrix.shape), 1)
+
+        num_fields = len(self.field_names)
+        if data_matrix.shape[-1] != num_fields:
+            error_string = (
+                'Last axis of data matrix has length {0:d}, but there are {1:d}'
+                ' fields.'
+            ).format(data_matrix.shape[-1], num_fields)
+
+            raise ValueError(error_string)
+
+        if not numpy.issubdtype(data_matrix.dtype, numpy.floating):
+            data_matrix = data_matrix.astype(float)
+
+        return (
+            data_matrix,
+            self.scale_values.astype(data_matrix.dtype),
+            self.offset_values.astype(data_matrix.dtype)
+        )
+
+    def normalize(self, data_matrix):
+        """Normalizes data matrix in place.
+
+        :param data_matrix: numpy array, where the last axis has length F
+            (number of fields).
+        :return: data_matrix: Normalized version of input, with the same
+            dimensions.
+        """
+
+        data_matrix, scale_values, offset_values = self._check_data_matrix(
+            data_matrix)
+
+        numpy.multiply(data_matrix, scale_values, out=data_matrix)
+        numpy.add(data_matrix, offset_values, out=data_matrix)
+        return data_matrix
+
+    def denormalize(self, data_matrix):
+        """Denormalizes data matrix in place.
+
+        This method is the inverse of `normalize`.
+
+        :param data_matrix: See doc for `normalize`.
+        :return: data_matrix: Denormalized version of input, with the same
+            dimensions.
+        """
+
+        data_matrix, scale_values, offset_values = self._check_data_matrix(
+            data_matrix)
+
+        numpy.subtract(data_matrix, offset_values, out=data_matrix)
+        numpy.divide(data_matrix, scale_values, out=data_matrix)
+        return data_matrix
+
 
 def _check_normalization_type(normalization_type_string):
     """Ensures that normalization type is valid.
@@ -78,6 +214,40 @@ def _check_normalization_type(normalization_type_string):
         raise ValueError(error_string)
 
 
+def _get_normalizer_or_test_normalizer(
+        normalization_param_file_name, field_names, normalization_type_string,
+        for_soundings, min_normalized_value, max_normalized_value, test_mode,
+        normalization_table):
+    """Returns normalizer for radar or sounding fields.
+
+    :param normalization_param_file_name: See doc for `get_normalizer`.
+    :param field_names: Same.
+    :param normalization_type_string: Same.
+    :param for_soundings: Same.
+    :param min_normalized_value: Same.
+    :param max_normalized_value: Same.
+    :param test_mode: Boolean flag.  If True, will create normalizer from
+        `normalization_table` rather than reading the file.
+    :param normalization_table: [used only if `test_mode == True`]
+        See doc for `Normalizer.__init__`.
+    :return: normalizer: Instance of `Normalizer`.
+    """
+
+    if test_mode:
+        return Normalizer(
+            normalization_table=normalization_table, field_names=field_names,
+            normalization_type_string=normalization_type_string,
+            min_normalized_value=min_normalized_value,
+            max_normalized_value=max_normalized_value)
+
+    return get_normalizer(
+        normalization_param_file_name=normalization_param_file_name,
+        field_names=field_names,
+        normalization_type_string=normalization_type_string,
+        for_soundings=for_soundings, min_normalized_value=min_normalized_value,
+        max_normalized_value=max_normalized_value)
+
+
 def check_class_fractions(sampling_fraction_by_class_dict, target_name):
     """Error-checks sampling fractions (one for each class of target variable).
 
@@ -405,6 +575,55 @@ def stack_radar_heights(tuple_of_4d_matrices):
     return radar_image_matrix
 
 
+def get_normalizer(
+        normalization_param_file_name, field_names, normalization_type_string,
+        for_soundings=False, min_normalized_value=0., max_normalized_value=1.):
+    """Returns normalizer for radar or sounding fields.
+
+    Normalizers are cached in `NORMALIZER_CACHE_DICT`, so the normalization
+    file is read only once for each combination of input args (and each
+    modification time of the file).
+
+    :param normalization_param_file_name: Path to file with normalization
+        params.  Will be read by `read_normalization_params_from_file`.
+    :param field_names: See doc for `Normalizer.__init__`.
+    :param normalization_type_string: Same.
+    :param for_soundings: Boolean flag.  If True, will return normalizer for
+        sounding fields.  If False, for radar fields.
+    :param min_normalized_value: See doc for `Normalizer.__init__`.
+    :param max_normalized_value: Same.
+    :return: normalizer: Instance of `Normalizer`.
+    """
+
+    error_checking.assert_is_string(normalization_param_file_name)
+    error_checking.assert_is_boolean(for_soundings)
+
+    # Modification time is part of the key, so that a rewritten file is read
+    # again.
+    cache_key = (
+        os.path.abspath(normalization_param_file_name),
+        os.path.getmtime(normalization_param_file_name), tuple(field_names),
+        normalization_type_string, for_soundings, float(min_normalized_value),
+        float(max_normalized_value)
+    )
+
+    if cache_key not in NORMALIZER_CACHE_DICT:
+        table_index = (
+            SOUNDING_TABLE_INDEX if for_soundings else RADAR_TABLE_INDEX
+        )
+        normalization_table = read_normalization_params_from_file(
+            normalization_param_file_name
+        )[table_index]
+
+        NORMALIZER_CACHE_DICT[cache_key] = Normalizer(
+            normalization_table=normalization_table, field_names=field_names,
+            normalization_type_string=normalization_type_string,
+            min_normalized_value=min_normalized_value,
+            max_normalized_value=max_normalized_value)
+
+    return NORMALIZER_CACHE_DICT[cache_key]
+
+
 def normalize_radar_images(
         radar_image_matrix, field_names, normalization_type_string,
         normalization_param_file_name, test_mode=False, min_normalized_value=0.,
@@ -457,10 +676,6 @@ def normalize_radar_images(
     """
 
     error_checking.assert_is_boolean(test_mode)
-    if not test_mode:
-        normalization_table = read_normalization_params_from_file(
-            normalization_param_file_name)[0]
-
     check_radar_images(
         radar_image_matrix=radar_image_matrix, min_num_dimensions=4,
         max_num_dimensions=5)
@@ -476,31 +691,15 @@ def normalize_radar_images(
         error_checking.assert_is_greater(
             max_normalized_value, min_normalized_value)
 
-    for j in range(num_fields):
-        if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
-            this_min_value = normalization_table[
-                MIN_VALUE_COLUMN].loc[field_names[j]]
-            this_max_value = normalization_table[
-                MAX_VALUE_COLUMN].loc[field_names[j]]
-
-            radar_image_matrix[..., j] = (
-                (radar_image_matrix[..., j] - this_min_value) /
-                (this_max_value - this_min_value))
-
-            radar_image_matrix[..., j] = min_normalized_value + (
-                radar_image_matrix[..., j] *
-                (max_normalized_value - min_normalized_value))
-        else:
-            this_mean = normalization_table[
-                MEAN_VALUE_COLUMN].loc[field_names[j]]
-            this_standard_deviation = normalization_table[
-                STANDARD_DEVIATION_COLUMN].loc[field_names[j]]
-
-            radar_image_matrix[..., j] = (
-                (radar_image_matrix[..., j] - this_mean) /
-                this_standard_deviation)
+    normalizer = _get_normalizer_or_test_normalizer(
+        normalization_param_file_name=normalization_param_file_name,
+        field_names=field_names,
+        normalization_type_string=normalization_type_string,
+        for_soundings=False, min_normalized_value=min_normalized_value,
+        max_normalized_value=max_normalized_value, test_mode=test_mode,
+        normalization_table=normalization_table)
 
-    return radar_image_matrix
+    return normalizer.normalize(radar_image_matrix)
 
 
 def denormalize_radar_images(
@@ -525,10 +724,6 @@ def denormalize_radar_images(
     """
 
     error_checking.assert_is_boolean(test_mode)
-    if not test_mode:
-        normalization_table = read_normalization_params_from_file(
-            normalization_param_file_name)[0]
-
     check_radar_images(
         radar_image_matrix=radar_image_matrix, min_num_dimensions=4,
         max_num_dimensions=5)
@@ -548,29 +743,15 @@ def denormalize_radar_images(
         # error_checking.assert_is_leq_numpy_array(
         #     radar_image_matrix, max_normalized_value)
 
-    for j in range(num_fields):
-        if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
-            this_min_value = normalization_table[
-                MIN_VALUE_COLUMN].loc[field_names[j]]
-            this_max_value = normalization_table[
-                MAX_VALUE_COLUMN].loc[field_names[j]]
-
-            radar_image_matrix[..., j] = (
-                (radar_image_matrix[..., j] - min_normalized_value) /
-                (max_normalized_value - min_normalized_value))
-
-            radar_image_matrix[..., j] = this_min_value + (
-                radar_image_matrix[..., j] * (this_max_value - this_min_value))
-        else:
-            this_mean = normalization_table[
-                MEAN_VALUE_COLUMN].loc[field_names[j]]
-            this_standard_deviation = normalization_table[
-                STANDARD_DEVIATION_COLUMN].loc[field_names[j]]
-
-            radar_image_matrix[..., j] = this_mean + (
-                this_standard_deviation * radar_image_matrix[..., j])
+    normalizer = _get_normalizer_or_test_normalizer(
+        normalization_param_file_name=normalization_param_file_name,
+        field_names=field_names,
+        normalization_type_string=normalization_type_string,
+        for_soundings=False, min_normalized_value=min_normalized_value,
+        max_normalized_value=max_normalized_value, test_mode=test_mode,
+        normalization_table=normalization_table)
 
-    return radar_image_matrix
+    return normalizer.denormalize(radar_image_matrix)
 
 
 def mask_low_reflectivity_pixels(
@@ -656,10 +837,6 @@ def normalize_soundings(
     """
 
     error_checking.assert_is_boolean(test_mode)
-    if not test_mode:
-        normalization_table = read_normalization_params_from_file(
-            normalization_param_file_name)[2]
-
     error_checking.assert_is_string_list(field_names)
     error_checking.assert_is_numpy_array(
         numpy.array(field_names), num_dimensions=1)
@@ -672,33 +849,15 @@ def normalize_soundings(
         error_checking.assert_is_greater(
             max_normalized_value, min_normalized_value)
 
-    for j in range(num_fields):
-        if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
-            this_min_value = normalization_table[
-                MIN_VALUE_COLUMN].loc[field_names[j]]
-            this_max_value = normalization_table[
-                MAX_VALUE_COLUMN].loc[field_names[j]]
-
-            sounding_matrix[..., j] = (
-                (sounding_matrix[..., j] - this_min_value) /
-                (this_max_value - this_min_value)
-            )
-            sounding_matrix[..., j] = min_normalized_value + (
-                sounding_matrix[..., j] *
-                (max_normalized_value - min_normalized_value)
-            )
-        else:
-            this_mean = normalization_table[
-                MEAN_VALUE_COLUMN].loc[field_names[j]]
-            this_standard_deviation = normalization_table[
-                STANDARD_DEVIATION_COLUMN
-            ].loc[field_names[j]]
-
-            sounding_matrix[..., j] = (
-                (sounding_matrix[..., j] - this_mean) / this_standard_deviation
-            )
+    normalizer = _get_normalizer_or_test_normalizer(
+        normalization_param_file_name=normalization_param_file_name,
+        field_names=field_names,
+        normalization_type_string=normalization_type_string,
+        for_soundings=True, min_normalized_value=min_normalized_value,
+        max_normalized_value=max_normalized_value, test_mode=test_mode,
+        normalization_table=normalization_table)
 
-    return sounding_matrix
+    return normalizer.normalize(sounding_matrix)
 
 
 def denormalize_soundings(
@@ -723,10 +882,6 @@ def denormalize_soundings(
     """
 
     error_checking.assert_is_boolean(test_mode)
-    if not test_mode:
-        normalization_table = read_normalization_params_from_file(
-            normalization_param_file_name)[2]
-
     error_checking.assert_is_string_list(field_names)
     error_checking.assert_is_numpy_array(
         numpy.array(field_names), num_dimensions=1)
@@ -743,32 +898,15 @@ def denormalize_soundings(
         # error_checking.assert_is_leq_numpy_array(
         #     sounding_matrix, max_normalized_value)
 
-    for j in range(num_fields):
-        if normalization_type_string == MINMAX_NORMALIZATION_TYPE_STRING:
-            this_min_value = normalization_table[
-                MIN_VALUE_COLUMN].loc[field_names[j]]
-            this_max_value = normalization_table[
-                MAX_VALUE_COLUMN].loc[field_names[j]]
-
-            sounding_matrix[..., j] = (
-                (sounding_matrix[..., j] - min_normalized_value) /
-                (max_normalized_value - min_normalized_value)
-            )
-            sounding_matrix[..., j] = this_min_value + (
-                sounding_matrix[..., j] * (this_max_value - this_min_value)
-            )
-        else:
-            this_mean = normalization_table[
-                MEAN_VALUE_COLUMN].loc[field_names[j]]
-            this_standard_deviation = normalization_table[
-                STANDARD_DEVIATION_COLUMN
-            ].loc[field_names[j]]
+    normalizer = _get_normalizer_or_test_normalizer(
+        normalization_param_file_name=normalization_param_file_name,
+        field_names=field_names,
+        normalization_type_string=normalization_type_string,
+        for_soundings=True, min_normalized_value=min_normalized_value,
+        max_normalized_value=max_normalized_value, test_mode=test_mode,
+        normalization_table=normalization_table)
 
-            sounding_matrix[..., j] = this_mean + (
-                this_standard_deviation * sounding_matrix[..., j]
-            )
-
-    return sounding_matrix
+    return normalizer.denormalize(sounding_matrix)
 
 
 def soundings_to_metpy_dictionaries(
@@ -910,7 +1048,7 @@ def soundings_to_metpy_dictionaries(
 
 def sample_by_class(
         sampling_fraction_by_class_dict, target_name, target_values,
-        num_examples_total, test_mode=False):
+        num_examples_total, test_mode=False, random_state=None):
     """Randomly draws examples, respecting the fraction for each target class.
 
     In other words, this method allows "oversampling" and "undersampling" of
@@ -921,10 +1059,15 @@ def sample_by_class(
     :param target_values: See doc for `check_target_array` (format 1).
     :param num_examples_total: See doc for `class_fractions_to_num_examples`.
     :param test_mode: Leave this argument alone.
+    :param random_state: Instance of `numpy.random.RandomState`.  If None, will
+        use numpy's global random state.
     :return: indices_to_keep: 1-D numpy array with indices of examples to keep.
         These are array indices into `target_values`.
     """
 
+    if random_state is None:
+        random_state = numpy.random
+
     num_desired_examples_by_class_dict = class_fractions_to_num_examples(
         sampling_fraction_by_class_dict=sampling_fraction_by_class_dict,
         target_name=target_name, num_examples_total=num_examples_total)
@@ -978,7 +1121,7 @@ def sample_by_class(
 
     for this_key in class_keys:
         if not test_mode:
-            numpy.random.shuffle(indices_to_keep_by_class_dict[this_key])
+            random_state.shuffle(indices_to_keep_by_class_dict[this_key])
 
         this_num_examples = num_desired_examples_by_class_dict[this_key]
 
@@ -1079,6 +1079,60 @@ class DeepLearningUtilsTests(unittest.TestCase):
             this_radar_matrix, RADAR_MATRIX_5D_UNNORMALIZED,
             atol=TOLERANCE, equal_nan=True))
 
+    def test_normalizer_normalize_5d_minmax(self):
+        """Ensures correct output from Normalizer.normalize.
+
+        In this case, the input matrix is 5-D and normalization type is minmax.
+        """
+
+        this_normalizer = dl_utils.Normalizer(
+            normalization_table=RADAR_NORMALIZATION_TABLE,
+            field_names=RADAR_FIELD_NAMES,
+            normalization_type_string=dl_utils.MINMAX_NORMALIZATION_TYPE_STRING,
+            min_normalized_value=MIN_NORMALIZED_VALUE,
+            max_normalized_value=MAX_NORMALIZED_VALUE)
+
+        this_radar_matrix = this_normalizer.normalize(
+            copy.deepcopy(RADAR_MATRIX_5D_UNNORMALIZED)
+        )
+
+        self.assertTrue(numpy.allclose(
+            this_radar_matrix, RADAR_MATRIX_5D_MINMAX, atol=TOLERANCE,
+            equal_nan=True))
+
+    def test_normalizer_denormalize_5d_z(self):
+        """Ensures correct output from Normalizer.denormalize.
+
+        In this case, the input matrix is 5-D and normalization type is z-score.
+        """
+
+        this_normalizer = dl_utils.Normalizer(
+            normalization_table=RADAR_NORMALIZATION_TABLE,
+            field_names=RADAR_FIELD_NAMES,
+            normalization_type_string=dl_utils.Z_NORMALIZATION_TYPE_STRING)
+
+        this_radar_matrix = this_normalizer.denormalize(
+            copy.deepcopy(RADAR_MATRIX_5D_Z_SCORES)
+        )
+
+        self.assertTrue(numpy.allclose(
+            this_radar_matrix, RADAR_MATRIX_5D_UNNORMALIZED, atol=TOLERANCE,
+            equal_nan=True))
+
+    def test_normalizer_wrong_num_fields(self):
+        """Ensures that Normalizer.normalize fails with wrong number of fields.
+        """
+
+        this_normalizer = dl_utils.Normalizer(
+            normalization_table=RADAR_NORMALIZATION_TABLE,
+            field_names=RADAR_FIELD_NAMES[:1],
+            normalization_type_string=dl_utils.Z_NORMALIZATION_TYPE_STRING)
+
+        with self.assertRaises(ValueError):
+            this_normalizer.normalize(
+                copy.deepcopy(RADAR_MATRIX_5D_UNNORMALIZED)
+            )
+
     def test_mask_low_reflectivity_pixels(self):
         """Ensures correct output from mask_low_reflectivity_pixels."""
 
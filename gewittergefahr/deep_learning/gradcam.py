@@ -17,9 +17,7 @@ import keras
 from keras import backend as K
 import tensorflow
 from tensorflow.python.framework import ops as tensorflow_ops
-from scipy.interpolate import (
-    UnivariateSpline, RectBivariateSpline, RegularGridInterpolator
-)
+from scipy.interpolate import CubicSpline, interp1d
 from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 from gewittergefahr.deep_learning import cnn
@@ -30,6 +28,9 @@ SEPARATOR_STRING = '\n\n' + '*' * 50 + '\n\n'
 
 BACKPROP_FUNCTION_NAME = 'GuidedBackProp'
 
+GRADCAM_FUNCTION_DICT = {}
+GUIDED_SALIENCY_FUNCTION_DICT = {}
+
 PREDICTOR_MATRICES_KEY = model_interpretation.PREDICTOR_MATRICES_KEY
 CAM_MATRICES_KEY = 'cam_matrices'
 GUIDED_CAM_MATRICES_KEY = 'guided_cam_matrices'
@@ -85,84 +86,82 @@ def _compute_gradients(loss_tensor, list_of_input_tensors):
 def _normalize_tensor(input_tensor):
     """Normalizes tensor by its L2 norm.
 
+    Normalization is done separately for each example (along the first axis),
+    so that results for one example do not depend on the rest of the batch.
+
     :param input_tensor: Unnormalized tensor.
     :return: output_tensor: Normalized tensor.
     """
 
-    rms_tensor = K.sqrt(K.mean(K.square(input_tensor)))
+    num_dimensions = K.ndim(input_tensor)
+    rms_tensor = K.sqrt(K.mean(
+        K.square(input_tensor), axis=list(range(1, num_dimensions)),
+        keepdims=True
+    ))
+
     return input_tensor / (rms_tensor + K.epsilon())
 
 
-def _upsample_cam(class_activation_matrix, new_dimensions):
-    """Upsamples class-activation matrix (CAM).
+def _upsample_cams(class_activation_matrix, new_dimensions):
+    """Upsamples class-activation matrices (CAMs) for many examples at once.
 
-    CAM may be 1-D, 2-D, or 3-D.
+    Each CAM may be 1-D, 2-D, or 3-D.  1-D and 2-D CAMs are upsampled with cubic
+    splines, 3-D CAMs with linear interpolation.  Since both methods are
+    separable, interpolation is done along one spatial axis at a time, for all
+    examples together.
 
-    :param class_activation_matrix: numpy array containing 1-D, 2-D, or 3-D
-        class-activation matrix.
-    :param new_dimensions: numpy array of new dimensions.  If matrix is
-        {1D, 2D, 3D}, this must be a length-{1, 2, 3} array, respectively.
+    E = number of examples
+
+    :param class_activation_matrix: numpy array of CAMs, where the first axis
+        has length E and the other 1, 2, or 3 axes are spatial.
+    :param new_dimensions: numpy array of new spatial dimensions.  If each CAM
+        is {1D, 2D, 3D}, this must be a length-{1, 2, 3} array, respectively.
     :return: class_activation_matrix: Upsampled version of input.
     """
 
-    num_rows_new = new_dimensions[0]
-    row_indices_new = numpy.linspace(
-        1, num_rows_new, num=num_rows_new, dtype=float
-    )
-    row_indices_orig = numpy.linspace(
-        1, num_rows_new, num=class_activation_matrix.shape[0], dtype=float
-    )
-
-    if len(new_dimensions) == 1:
-        # interp_object = UnivariateSpline(
-        #     x=row_indices_orig, y=numpy.ravel(class_activation_matrix),
-        #     k=1, s=0
-        # )
+    num_spatial_dim = len(new_dimensions)
 
-        interp_object = UnivariateSpline(
-            x=row_indices_orig, y=numpy.ravel(class_activation_matrix),
-            k=3, s=0
+    for j in range(num_spatial_dim):
+        these_indices_new = numpy.linspace(
+            1, new_dimensions[j], num=new_dimensions[j], dtype=float
+        )
+        these_indices_orig = numpy.linspace(
+            1, new_dimensions[j], num=class_activation_matrix.shape[j + 1],
+            dtype=float
         )
 
-        return interp_object(row_indices_new)
+        if num_spatial_dim == 3:
+            interp_object = interp1d(
+                x=these_indices_orig, y=class_activation_matrix, kind='linear',
+                axis=j + 1, assume_sorted=True
+            )
+        else:
+            interp_object = CubicSpline(
+                x=these_indices_orig, y=class_activation_matrix, axis=j + 1
+            )
 
-    num_columns_new = new_dimensions[1]
-    column_indices_new = numpy.linspace(
-        1, num_columns_new, num=num_columns_new, dtype=float
-    )
-    column_indices_orig = numpy.linspace(
-        1, num_columns_new, num=class_activation_matrix.shape[1], dtype=float
-    )
+        class_activation_matrix = interp_object(these_indices_new)
 
-    if len(new_dimensions) == 2:
-        interp_object = RectBivariateSpline(
-            x=row_indices_orig, y=column_indices_orig,
-            z=class_activation_matrix, kx=3, ky=3, s=0
-        )
+    return class_activation_matrix
 
-        return interp_object(x=row_indices_new, y=column_indices_new, grid=True)
 
-    num_heights_new = new_dimensions[2]
-    height_indices_new = numpy.linspace(
-        1, num_heights_new, num=num_heights_new, dtype=float
-    )
-    height_indices_orig = numpy.linspace(
-        1, num_heights_new, num=class_activation_matrix.shape[2], dtype=float
-    )
+def _upsample_cam(class_activation_matrix, new_dimensions):
+    """Upsamples class-activation matrix (CAM).
 
-    interp_object = RegularGridInterpolator(
-        points=(row_indices_orig, column_indices_orig, height_indices_orig),
-        values=class_activation_matrix, method='linear'
-    )
+    CAM may be 1-D, 2-D, or 3-D.
 
-    column_index_matrix, row_index_matrix, height_index_matrix = (
-        numpy.meshgrid(column_indices_new, row_indices_new, height_indices_new)
-    )
-    query_point_matrix = numpy.stack(
-        (row_index_matrix, column_index_matrix, height_index_matrix), axis=-1
-    )
+    :param class_activation_matrix: numpy array containing 1-D, 2-D, or 3-D
+        class-activation matrix.
+    :param new_dimensions: numpy array of new dimensions.  If matrix is
+        {1D, 2D, 3D}, this must be a length-{1, 2, 3} array, respectively.
+    :return: class_activation_matrix: Upsampled version of input.
+    """
 
-    return interp_object(query_point_matrix)
+    return _upsample_cams(
+        class_activation_matrix=numpy.expand_dims(
+            class_activation_matrix, axis=0),
+        new_dimensions=new_dimensions
+    )[0, ...]
 
 
 def _register_guided_backprop():
@@ -268,6 +267,89 @@ def _make_saliency_function(model_object, target_layer_name,
     )
 
 
+def _get_gradcam_function(model_object, target_class, target_layer_name):
+    """Returns function for Grad-CAM, creating it only if necessary.
+
+    Functions are cached by model, target class, and target layer, so that the
+    Keras graph is created only once for each combination.
+
+    :param model_object: See doc for `run_gradcam`.
+    :param target_class: Same.
+    :param target_layer_name: Same.
+    :return: gradient_function: Instance of `keras.backend.function`.  Inputs
+        are the input tensors to the model; outputs are activations in the
+        target layer and their normalized gradients with respect to the loss.
+    """
+
+    cache_key = (model_object, target_class, target_layer_name)
+    if cache_key in GRADCAM_FUNCTION_DICT:
+        return GRADCAM_FUNCTION_DICT[cache_key]
+
+    # Create loss tensor.
+    output_layer_object = model_object.layers[-1].output
+    num_output_neurons = output_layer_object.get_shape().as_list()[-1]
+
+    if num_output_neurons == 1:
+        error_checking.assert_is_leq(target_class, 1)
+
+        if target_class == 1:
+            # loss_tensor = model_object.layers[-1].output[..., 0]
+            loss_tensor = model_object.layers[-1].input[..., 0]
+        else:
+            # loss_tensor = -1 * model_object.layers[-1].output[..., 0]
+            loss_tensor = -1 * model_object.layers[-1].input[..., 0]
+    else:
+        error_checking.assert_is_less_than(target_class, num_output_neurons)
+        # loss_tensor = model_object.layers[-1].output[..., target_class]
+        loss_tensor = model_object.layers[-1].input[..., target_class]
+
+    # Create gradient function.
+    target_layer_activation_tensor = model_object.get_layer(
+        name=target_layer_name
+    ).output
+
+    gradient_tensor = _compute_gradients(
+        loss_tensor, [target_layer_activation_tensor]
+    )[0]
+    gradient_tensor = _normalize_tensor(gradient_tensor)
+
+    if isinstance(model_object.input, list):
+        list_of_input_tensors = model_object.input
+    else:
+        list_of_input_tensors = [model_object.input]
+
+    GRADCAM_FUNCTION_DICT[cache_key] = K.function(
+        list_of_input_tensors, [target_layer_activation_tensor, gradient_tensor]
+    )
+
+    return GRADCAM_FUNCTION_DICT[cache_key]
+
+
+def _get_guided_saliency_function(new_model_object, target_layer_name,
+                                  input_layer_indices):
+    """Returns saliency function for guided Grad-CAM.
+
+    Functions are cached by model, target layer, and input layers, so that the
+    Keras graph is created only once for each combination.
+
+    :param new_model_object: See doc for `_make_saliency_function`.
+    :param target_layer_name: Same.
+    :param input_layer_indices: Same.
+    :return: saliency_function: Same.
+    """
+
+    cache_key = (
+        new_model_object, target_layer_name, tuple(input_layer_indices)
+    )
+
+    if cache_key not in GUIDED_SALIENCY_FUNCTION_DICT:
+        GUIDED_SALIENCY_FUNCTION_DICT[cache_key] = _make_saliency_function(
+            model_object=new_model_object, target_layer_name=target_layer_name,
+            input_layer_indices=input_layer_indices)
+
+    return GUIDED_SALIENCY_FUNCTION_DICT[cache_key]
+
+
 def _normalize_guided_gradcam_output(ggradcam_output_matrix):
     """Normalizes image produced by guided Grad-CAM.
 
@@ -438,7 +520,12 @@ def run_gradcam(model_object, list_of_input_matrices, target_class,
                 target_layer_name):
     """Runs Grad-CAM.
 
+    All examples in `list_of_input_matrices` are handled in one call to the
+    Keras graph, and the graph is created only the first time this method is
+    called for a given model, target class, and target layer.
+
     T = number of input tensors to the model
+    E = number of examples (storm objects)
 
     :param model_object: Trained model (instance of `keras.models.Model` or
         `keras.models.Sequential`).
@@ -449,6 +536,7 @@ def run_gradcam(model_object, list_of_input_matrices, target_class,
         will be based on activations in this layer.  Must be a convolution
         layer.
     :return: list_of_cam_matrices: See doc for `_check_in_and_out_matrices`.
+        The first axis of each matrix has length E.
     """
 
     error_checking.assert_is_integer(target_class)
@@ -460,63 +548,26 @@ def run_gradcam(model_object, list_of_input_matrices, target_class,
 
     num_input_matrices = len(list_of_input_matrices)
 
-    # Create loss tensor.
-    output_layer_object = model_object.layers[-1].output
-    num_output_neurons = output_layer_object.get_shape().as_list()[-1]
-
-    if num_output_neurons == 1:
-        error_checking.assert_is_leq(target_class, 1)
-
-        if target_class == 1:
-            # loss_tensor = model_object.layers[-1].output[..., 0]
-            loss_tensor = model_object.layers[-1].input[..., 0]
-        else:
-            # loss_tensor = -1 * model_object.layers[-1].output[..., 0]
-            loss_tensor = -1 * model_object.layers[-1].input[..., 0]
-    else:
-        error_checking.assert_is_less_than(target_class, num_output_neurons)
-        # loss_tensor = model_object.layers[-1].output[..., target_class]
-        loss_tensor = model_object.layers[-1].input[..., target_class]
-
-    # Create gradient function.
-    target_layer_activation_tensor = model_object.get_layer(
-        name=target_layer_name
-    ).output
-
-    gradient_tensor = _compute_gradients(
-        loss_tensor, [target_layer_activation_tensor]
-    )[0]
-    gradient_tensor = _normalize_tensor(gradient_tensor)
-
-    if isinstance(model_object.input, list):
-        list_of_input_tensors = model_object.input
-    else:
-        list_of_input_tensors = [model_object.input]
-
-    gradient_function = K.function(
-        list_of_input_tensors, [target_layer_activation_tensor, gradient_tensor]
-    )
+    gradient_function = _get_gradcam_function(
+        model_object=model_object, target_class=target_class,
+        target_layer_name=target_layer_name)
 
     # Evaluate gradient function.
     target_layer_activation_matrix, gradient_matrix = gradient_function(
         list_of_input_matrices)
-    target_layer_activation_matrix = target_layer_activation_matrix[0, ...]
-    gradient_matrix = gradient_matrix[0, ...]
 
-    # Compute class-activation matrix in the target layer's space.
-    num_spatial_dim = len(gradient_matrix.shape) - 1
+    # Compute class-activation matrices in the target layer's space.
+    num_spatial_dim = len(gradient_matrix.shape) - 2
     these_axes = numpy.linspace(
-        0, num_spatial_dim - 1, num=num_spatial_dim, dtype=int
+        1, num_spatial_dim, num=num_spatial_dim, dtype=int
     ).tolist()
 
-    mean_weight_by_filter = numpy.mean(gradient_matrix, axis=tuple(these_axes))
-    original_cam_matrix = numpy.ones(target_layer_activation_matrix.shape[:-1])
-
-    num_filters = len(mean_weight_by_filter)
-    for k in range(num_filters):
-        original_cam_matrix += (
-            mean_weight_by_filter[k] * target_layer_activation_matrix[..., k]
-        )
+    mean_weight_matrix = numpy.mean(
+        gradient_matrix, axis=tuple(these_axes), keepdims=True
+    )
+    original_cam_matrix = 1. + numpy.sum(
+        mean_weight_matrix * target_layer_activation_matrix, axis=-1
+    )
 
     input_layer_indices = _get_connected_input_layers(
         model_object=model_object,
@@ -531,11 +582,11 @@ def run_gradcam(model_object, list_of_input_matrices, target_class,
         )
 
         add_height_dim = (
-            len(original_cam_matrix.shape) == 2 and len(these_spatial_dim) == 3
+            len(original_cam_matrix.shape) == 3 and len(these_spatial_dim) == 3
         )
 
         if add_height_dim:
-            list_of_cam_matrices[i] = _upsample_cam(
+            list_of_cam_matrices[i] = _upsample_cams(
                 class_activation_matrix=original_cam_matrix,
                 new_dimensions=these_spatial_dim[:-1]
             )
@@ -549,14 +600,11 @@ def run_gradcam(model_object, list_of_input_matrices, target_class,
                 axis=-1
             )
         else:
-            list_of_cam_matrices[i] = _upsample_cam(
+            list_of_cam_matrices[i] = _upsample_cams(
                 class_activation_matrix=original_cam_matrix,
                 new_dimensions=these_spatial_dim)
 
         list_of_cam_matrices[i] = numpy.maximum(list_of_cam_matrices[i], 0.)
-        list_of_cam_matrices[i] = numpy.expand_dims(
-            list_of_cam_matrices[i], axis=0
-        )
 
     # denominator = numpy.maximum(numpy.max(class_activation_matrix), K.epsilon())
     # return class_activation_matrix / denominator
@@ -569,6 +617,9 @@ def run_guided_gradcam(
         list_of_cam_matrices, new_model_object=None):
     """Runs guided Grad-CAM.
 
+    As in `run_gradcam`, all examples are handled in one call to the Keras
+    graph.
+
     T = number of input tensors to the model
 
     :param orig_model_object: Original model (trained instance of
@@ -601,8 +652,8 @@ def run_guided_gradcam(
         list_of_input_matrices=list_of_input_matrices,
         target_layer_name=target_layer_name)
 
-    saliency_function = _make_saliency_function(
-        model_object=new_model_object, target_layer_name=target_layer_name,
+    saliency_function = _get_guided_saliency_function(
+        new_model_object=new_model_object, target_layer_name=target_layer_name,
         input_layer_indices=input_layer_indices)
 
     list_of_saliency_matrices = saliency_function(list_of_input_matrices + [0])
@@ -33,6 +33,22 @@ CLASS_ACTIV_MATRIX_3D = (
 )
 CLASS_ACTIV_MATRIX_COARSE_3D = CLASS_ACTIV_MATRIX_3D[::4, ::4, ::4]
 
+# The following constants are used to test _upsample_cams.
+CLASS_ACTIV_MATRIX_MANY_EXAMPLES_2D = numpy.stack(
+    (CLASS_ACTIV_MATRIX_2D, 2 * CLASS_ACTIV_MATRIX_2D, -CLASS_ACTIV_MATRIX_2D),
+    axis=0
+)
+CLASS_ACTIV_MATRIX_MANY_EXAMPLES_COARSE_2D = (
+    CLASS_ACTIV_MATRIX_MANY_EXAMPLES_2D[:, ::3, ::3]
+)
+
+CLASS_ACTIV_MATRIX_MANY_EXAMPLES_3D = numpy.stack(
+    (CLASS_ACTIV_MATRIX_3D, 2 * CLASS_ACTIV_MATRIX_3D), axis=0
+)
+CLASS_ACTIV_MATRIX_MANY_EXAMPLES_COARSE_3D = (
+    CLASS_ACTIV_MATRIX_MANY_EXAMPLES_3D[:, ::4, ::4, ::4]
+)
+
 # The following constants are used to test _normalize_guided_gradcam_output.
 GRADIENT_MATRIX_DENORM = numpy.array([
     [0, 2, 4, 2, 0],
@@ -100,6 +116,38 @@ class GradcamTests(unittest.TestCase):
             this_matrix, CLASS_ACTIV_MATRIX_3D, atol=TOLERANCE
         ))
 
+    def test_upsample_cams_2d(self):
+        """Ensures correct output from _upsample_cams.
+
+        In this case each CAM (class-activation map) is 2-D.
+        """
+
+        this_matrix = gradcam._upsample_cams(
+            class_activation_matrix=
+            CLASS_ACTIV_MATRIX_MANY_EXAMPLES_COARSE_2D + 0.,
+            new_dimensions=numpy.array(CLASS_ACTIV_MATRIX_2D.shape, dtype=int)
+        )
+
+        self.assertTrue(numpy.allclose(
+            this_matrix, CLASS_ACTIV_MATRIX_MANY_EXAMPLES_2D, atol=TOLERANCE
+        ))
+
+    def test_upsample_cams_3d(self):
+        """Ensures correct output from _upsample_cams.
+
+        In this case each CAM (class-activation map) is 3-D.
+        """
+
+        this_matrix = gradcam._upsample_cams(
+            class_activation_matrix=
+            CLASS_ACTIV_MATRIX_MANY_EXAMPLES_COARSE_3D + 0.,
+            new_dimensions=numpy.array(CLASS_ACTIV_MATRIX_3D.shape, dtype=int)
+        )
+
+        self.assertTrue(numpy.allclose(
+            this_matrix, CLASS_ACTIV_MATRIX_MANY_EXAMPLES_3D, atol=TOLERANCE
+        ))
+
     def test_normalize_guided_gradcam_output(self):
         """Ensures correct output from _normalize_guided_gradcam_output."""
 
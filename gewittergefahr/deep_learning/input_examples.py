@@ -18,6 +18,7 @@ C = number of radar field/height pairs
 
 import copy
 import glob
+import pickle
 import os.path
 import numpy
 import netCDF4
@@ -121,6 +122,58 @@ MIN_RADAR_HEIGHTS_KEY = 'min_radar_heights_m_agl'
 MAX_RADAR_HEIGHTS_KEY = 'max_radar_heights_m_agl'
 RADAR_LAYER_OPERATION_NAMES_KEY = 'radar_layer_operation_names'
 
+NETCDF_FILE_EXTENSION = '.nc'
+EXAMPLE_STORE_EXTENSION = '.store'
+STORE_METADATA_FILE_NAME = 'metadata.p'
+DEFAULT_NUM_EXAMPLES_PER_STORE_CHUNK = 256
+
+STORE_INDEX_KEYS = [STORM_TIMES_KEY, TARGET_MATRIX_KEY]
+STORE_PREDICTOR_KEYS = [
+    RADAR_IMAGE_MATRIX_KEY, REFL_IMAGE_MATRIX_KEY, AZ_SHEAR_IMAGE_MATRIX_KEY,
+    SOUNDING_MATRIX_KEY
+]
+
+
+class ExampleStore(object):
+    """Open example store (directory with memory-mapped arrays).
+
+    An example store holds the same data as a NetCDF example file (written by
+    `write_example_file`), but each array is kept in its own uncompressed .npy
+    file, with the example dimension first.  Thus, each example is one
+    contiguous chunk of bytes, and any subset of examples can be read without
+    decoding the rest of the file.
+
+    Metadata and the example index (full storm IDs, valid times, target
+    values) are kept separate from the predictor blocks, so reading the index
+    does not touch predictors.
+
+    This class mimics the part of the `netCDF4.Dataset` interface used by
+    `_subset_radar_data` and `_subset_sounding_data`: the attribute `variables`
+    (dictionary of arrays) and the method `close`.
+    """
+
+    def __init__(self, store_dir_name):
+        """Opens example store.
+
+        :param store_dir_name: Path to store (directory).
+        """
+
+        self.store_dir_name = store_dir_name
+        self.variables = {}
+
+        for this_key in STORE_INDEX_KEYS + STORE_PREDICTOR_KEYS:
+            this_file_name = _get_store_array_file_name(
+                store_dir_name=store_dir_name, array_key=this_key)
+
+            if os.path.isfile(this_file_name):
+                self.variables[this_key] = numpy.load(
+                    this_file_name, mmap_mode='r')
+
+    def close(self):
+        """Closes example store (releases memory maps)."""
+
+        self.variables = {}
+
 
 def _read_soundings(sounding_file_name, sounding_field_names, radar_image_dict):
     """Reads storm-centered soundings and matches w storm-centered radar imgs.
@@ -552,6 +605,63 @@ def _create_2d3d_examples_myrorss(
     return example_dict
 
 
+def _get_store_array_file_name(store_dir_name, array_key):
+    """Returns path to .npy file with one array in example store.
+
+    :param store_dir_name: Path to store (directory).
+    :param array_key: Key for array (in `STORE_INDEX_KEYS` or
+        `STORE_PREDICTOR_KEYS`).
+    :return: array_file_name: Path to .npy file.
+    """
+
+    return '{0:s}/{1:s}.npy'.format(store_dir_name, array_key)
+
+
+def _read_metadata_from_example_store(store_dir_name, include_soundings):
+    """Reads metadata from example store.
+
+    :param store_dir_name: Path to store (directory).
+    :param include_soundings: See doc for `_read_metadata_from_example_file`.
+    :return: example_dict: Same.
+    :return: example_store_object: Instance of `ExampleStore`, which can be
+        used to keep reading store.
+    """
+
+    pickle_file_handle = open(
+        '{0:s}/{1:s}'.format(store_dir_name, STORE_METADATA_FILE_NAME), 'rb'
+    )
+    metadata_dict = pickle.load(pickle_file_handle)
+    pickle_file_handle.close()
+
+    example_store_object = ExampleStore(store_dir_name)
+    include_soundings = (
+        include_soundings and
+        metadata_dict[SOUNDING_FIELDS_KEY] is not None
+    )
+
+    example_dict = {
+        ROTATED_GRIDS_KEY: metadata_dict[ROTATED_GRIDS_KEY],
+        ROTATED_GRID_SPACING_KEY: metadata_dict[ROTATED_GRID_SPACING_KEY],
+        TARGET_NAMES_KEY: metadata_dict[TARGET_NAMES_KEY],
+        FULL_IDS_KEY: metadata_dict[FULL_IDS_KEY],
+        STORM_TIMES_KEY: numpy.array(
+            example_store_object.variables[STORM_TIMES_KEY], dtype=int
+        ),
+        RADAR_FIELDS_KEY: metadata_dict[RADAR_FIELDS_KEY],
+        RADAR_HEIGHTS_KEY: metadata_dict[RADAR_HEIGHTS_KEY]
+    }
+
+    if not include_soundings:
+        return example_dict, example_store_object
+
+    example_dict.update({
+        SOUNDING_FIELDS_KEY: metadata_dict[SOUNDING_FIELDS_KEY],
+        SOUNDING_HEIGHTS_KEY: metadata_dict[SOUNDING_HEIGHTS_KEY]
+    })
+
+    return example_dict, example_store_object
+
+
 def _read_metadata_from_example_file(netcdf_file_name, include_soundings):
     """Reads metadata from file with input examples.
 
@@ -573,9 +683,15 @@ def _read_metadata_from_example_file(netcdf_file_name, include_soundings):
     example_dict['sounding_heights_m_agl']
 
     :return: netcdf_dataset: Instance of `netCDF4.Dataset`, which can be used to
-        keep reading file.
+        keep reading file.  If the input is an example store (see
+        `is_example_store`), this is an instance of `ExampleStore`.
     """
 
+    if is_example_store(netcdf_file_name):
+        return _read_metadata_from_example_store(
+            store_dir_name=netcdf_file_name,
+            include_soundings=include_soundings)
+
     netcdf_dataset = netCDF4.Dataset(netcdf_file_name)
     include_soundings = (
         include_soundings and
@@ -694,7 +810,7 @@ def _compare_metadata(netcdf_dataset, example_dict):
 
 
 def _filter_examples_by_class(target_values, downsampling_dict,
-                              test_mode=False):
+                              test_mode=False, random_state=None):
     """Filters examples by target value.
 
     E = number of examples
@@ -707,10 +823,15 @@ def _filter_examples_by_class(target_values, downsampling_dict,
         `downsampling_dict is None`, `example_dict` will be returned
         without modification.
     :param test_mode: Never mind.  Just leave this alone.
+    :param random_state: Instance of `numpy.random.RandomState`.  If None, will
+        use numpy's global random state.
     :return: indices_to_keep: 1-D numpy array with indices of examples to keep.
         These are all integers in [0, E - 1].
     """
 
+    if random_state is None:
+        random_state = numpy.random
+
     num_examples = len(target_values)
 
     if downsampling_dict is None:
@@ -732,7 +853,7 @@ def _filter_examples_by_class(target_values, downsampling_dict,
         if test_mode:
             these_indices = these_indices[:this_num_storm_objects]
         else:
-            these_indices = numpy.random.choice(
+            these_indices = random_state.choice(
                 these_indices, size=this_num_storm_objects, replace=False)
 
         indices_to_keep = numpy.concatenate((indices_to_keep, these_indices))
@@ -1555,7 +1676,8 @@ def subset_examples(example_dict, indices_to_keep, create_new_dict=False):
 
 def find_example_file(
         top_directory_name, shuffled=True, spc_date_string=None,
-        batch_number=None, raise_error_if_missing=True):
+        batch_number=None, raise_error_if_missing=True,
+        use_example_store=False):
     """Looks for file with input examples.
 
     If `shuffled = True`, this method looks for a file with shuffled examples
@@ -1571,6 +1693,8 @@ def find_example_file(
         Batch number (integer).
     :param raise_error_if_missing: Boolean flag.  If file is missing and
         `raise_error_if_missing = True`, this method will error out.
+    :param use_example_store: Boolean flag.  If True, will look for example
+        store (see `write_example_store`) rather than NetCDF file.
     :return: example_file_name: Path to file with input examples.  If file is
         missing and `raise_error_if_missing = False`, this is the *expected*
         path.
@@ -1580,6 +1704,12 @@ def find_example_file(
     error_checking.assert_is_string(top_directory_name)
     error_checking.assert_is_boolean(shuffled)
     error_checking.assert_is_boolean(raise_error_if_missing)
+    error_checking.assert_is_boolean(use_example_store)
+
+    if use_example_store:
+        file_extension = EXAMPLE_STORE_EXTENSION
+    else:
+        file_extension = NETCDF_FILE_EXTENSION
 
     if shuffled:
         error_checking.assert_is_integer(batch_number)
@@ -1590,17 +1720,18 @@ def find_example_file(
         last_batch_number = first_batch_number + NUM_BATCHES_PER_DIRECTORY - 1
 
         example_file_name = (
-            '{0:s}/batches{1:07d}-{2:07d}/input_examples_batch{3:07d}.nc'
+            '{0:s}/batches{1:07d}-{2:07d}/input_examples_batch{3:07d}{4:s}'
         ).format(top_directory_name, first_batch_number, last_batch_number,
-                 batch_number)
+                 batch_number, file_extension)
     else:
         time_conversion.spc_date_string_to_unix_sec(spc_date_string)
 
         example_file_name = (
-            '{0:s}/{1:s}/input_examples_{2:s}.nc'
-        ).format(top_directory_name, spc_date_string[:4], spc_date_string)
+            '{0:s}/{1:s}/input_examples_{2:s}{3:s}'
+        ).format(top_directory_name, spc_date_string[:4], spc_date_string,
+                 file_extension)
 
-    if raise_error_if_missing and not os.path.isfile(example_file_name):
+    if raise_error_if_missing and not os.path.exists(example_file_name):
         error_string = 'Cannot find file.  Expected at: "{0:s}"'.format(
             example_file_name)
         raise ValueError(error_string)
@@ -1611,7 +1742,8 @@ def find_example_file(
 def find_many_example_files(
         top_directory_name, shuffled=True, first_spc_date_string=None,
         last_spc_date_string=None, first_batch_number=None,
-        last_batch_number=None, raise_error_if_any_missing=True):
+        last_batch_number=None, raise_error_if_any_missing=True,
+        use_example_store=False):
     """Looks for many files with input examples.
 
     :param top_directory_name: See doc for `find_example_file`.
@@ -1627,11 +1759,13 @@ def find_many_example_files(
     :param raise_error_if_any_missing: Boolean flag.  If *any* desired file is
         not found and `raise_error_if_any_missing = True`, this method will
         error out.
+    :param use_example_store: See doc for `find_example_file`.
     :return: example_file_names: 1-D list of paths to example files.
     :raises: ValueError: if no files are found.
     """
 
     error_checking.assert_is_boolean(shuffled)
+    error_checking.assert_is_boolean(use_example_store)
 
     if shuffled:
         error_checking.assert_is_integer(first_batch_number)
@@ -1640,8 +1774,12 @@ def find_many_example_files(
         error_checking.assert_is_geq(last_batch_number, first_batch_number)
 
         example_file_pattern = (
-            '{0:s}/batches{1:s}-{1:s}/input_examples_batch{1:s}.nc'
-        ).format(top_directory_name, BATCH_NUMBER_REGEX)
+            '{0:s}/batches{1:s}-{1:s}/input_examples_batch{1:s}{2:s}'
+        ).format(
+            top_directory_name, BATCH_NUMBER_REGEX,
+            EXAMPLE_STORE_EXTENSION if use_example_store
+            else NETCDF_FILE_EXTENSION
+        )
 
         example_file_names = glob.glob(example_file_pattern)
 
@@ -1673,9 +1811,10 @@ def find_many_example_files(
         this_file_name = find_example_file(
             top_directory_name=top_directory_name, shuffled=False,
             spc_date_string=this_spc_date_string,
-            raise_error_if_missing=raise_error_if_any_missing)
+            raise_error_if_missing=raise_error_if_any_missing,
+            use_example_store=use_example_store)
 
-        if not os.path.isfile(this_file_name):
+        if not os.path.exists(this_file_name):
             continue
         example_file_names.append(this_file_name)
 
@@ -2050,13 +2189,15 @@ def read_example_file(
         sounding_field_names_to_keep=None, sounding_heights_to_keep_m_agl=None,
         first_time_to_keep_unix_sec=None, last_time_to_keep_unix_sec=None,
         num_rows_to_keep=None, num_columns_to_keep=None,
-        downsampling_dict=None):
+        downsampling_dict=None, random_state=None):
     """Reads examples from NetCDF file.
 
     If `metadata_only == True`, later input args are ignored.
     If `targets_only == True`, later input args are ignored.
 
-    :param netcdf_file_name: Path to input file.
+    :param netcdf_file_name: Path to input file.  This may also be an example
+        store (see `write_example_store`), in which case only the requested
+        examples are read from disk.
     :param read_all_target_vars: Boolean flag.  If True, will read all target
         variables.  If False, will read only `target_name`.  Either way, if
         downsampling is done, it will be based only on `target_name`.
@@ -2081,6 +2222,7 @@ def read_example_file(
     :param num_rows_to_keep: See doc for `_subset_radar_data`.
     :param num_columns_to_keep: Same.
     :param downsampling_dict: See doc for `_filter_examples_by_class`.
+    :param random_state: Same.
     :return: example_dict: If `read_all_target_vars == True`, dictionary will
         have all keys listed in doc for `write_example_file`.  If
         `read_all_target_vars == False`, key "target_names" will be replaced by
@@ -2154,7 +2296,7 @@ def read_example_file(
     if downsampling_dict is not None:
         subindices_to_keep = _filter_examples_by_class(
             target_values=main_target_values[example_indices_to_keep],
-            downsampling_dict=downsampling_dict
+            downsampling_dict=downsampling_dict, random_state=random_state
         )
     elif not read_all_target_vars:
         subindices_to_keep = numpy.where(
@@ -2221,7 +2363,7 @@ def read_specific_examples(
         num_rows_to_keep=None, num_columns_to_keep=None):
     """Reads specific examples (with specific ID-time pairs) from NetCDF file.
 
-    :param netcdf_file_name: Path to input file.
+    :param netcdf_file_name: Path to input file (NetCDF file or example store).
     :param read_all_target_vars: See doc for `read_example_file`.
     :param full_storm_id_strings: length-E list of storm IDs.
     :param storm_times_unix_sec: length-E numpy array of valid times.
@@ -2295,6 +2437,151 @@ def read_specific_examples(
     return example_dict
 
 
+def is_example_store(example_file_name):
+    """Determines whether or not file is example store.
+
+    :param example_file_name: Path to example file.
+    :return: is_store: Boolean flag.  If True, `example_file_name` is an example
+        store (see `write_example_store`).  If False, it should be a NetCDF file
+        (see `write_example_file`).
+    """
+
+    error_checking.assert_is_string(example_file_name)
+    return os.path.isdir(example_file_name)
+
+
+def write_example_store(store_dir_name, example_dict):
+    """Writes input examples to example store.
+
+    An example store is a directory with one .npy file per array (see
+    `ExampleStore`).  Predictor blocks are written as 32-bit floats, like in
+    the NetCDF format.
+
+    :param store_dir_name: Path to output directory.  If it already contains
+        an example store, the store will be overwritten.
+    :param example_dict: See doc for `write_example_file`.  The examples are
+        assumed to include soundings if and only if key "sounding_field_names"
+        is present and not None.
+    """
+
+    error_checking.assert_is_string(store_dir_name)
+    file_system_utils.mkdir_recursive_if_necessary(
+        directory_name=store_dir_name)
+
+    # Soundings are detected from metadata, rather than the sounding matrix,
+    # because `convert_example_file_to_store` writes predictors separately.
+    include_soundings = example_dict.get(SOUNDING_FIELDS_KEY) is not None
+    metadata_dict = {
+        FULL_IDS_KEY: list(example_dict[FULL_IDS_KEY]),
+        TARGET_NAMES_KEY: list(example_dict[TARGET_NAMES_KEY]),
+        ROTATED_GRIDS_KEY: bool(example_dict[ROTATED_GRIDS_KEY]),
+        ROTATED_GRID_SPACING_KEY: (
+            example_dict[ROTATED_GRID_SPACING_KEY]
+            if example_dict[ROTATED_GRIDS_KEY] else None
+        ),
+        RADAR_FIELDS_KEY: list(example_dict[RADAR_FIELDS_KEY]),
+        RADAR_HEIGHTS_KEY: numpy.array(
+            example_dict[RADAR_HEIGHTS_KEY], dtype=int
+        ),
+        SOUNDING_FIELDS_KEY: (
+            list(example_dict[SOUNDING_FIELDS_KEY]) if include_soundings
+            else None
+        ),
+        SOUNDING_HEIGHTS_KEY: (
+            numpy.array(example_dict[SOUNDING_HEIGHTS_KEY], dtype=int)
+            if include_soundings else None
+        )
+    }
+
+    pickle_file_handle = open(
+        '{0:s}/{1:s}'.format(store_dir_name, STORE_METADATA_FILE_NAME), 'wb'
+    )
+    pickle.dump(metadata_dict, pickle_file_handle)
+    pickle_file_handle.close()
+
+    numpy.save(
+        _get_store_array_file_name(
+            store_dir_name=store_dir_name, array_key=STORM_TIMES_KEY),
+        numpy.array(example_dict[STORM_TIMES_KEY], dtype=int)
+    )
+    numpy.save(
+        _get_store_array_file_name(
+            store_dir_name=store_dir_name, array_key=TARGET_MATRIX_KEY),
+        numpy.array(example_dict[TARGET_MATRIX_KEY], dtype=int)
+    )
+
+    for this_key in STORE_PREDICTOR_KEYS:
+        this_file_name = _get_store_array_file_name(
+            store_dir_name=store_dir_name, array_key=this_key)
+
+        if this_key not in example_dict:
+            if os.path.isfile(this_file_name):
+                os.remove(this_file_name)
+            continue
+
+        numpy.save(
+            this_file_name,
+            numpy.ascontiguousarray(example_dict[this_key], dtype=numpy.float32)
+        )
+
+
+def convert_example_file_to_store(
+        netcdf_file_name, store_dir_name,
+        num_examples_per_chunk=DEFAULT_NUM_EXAMPLES_PER_STORE_CHUNK):
+    """Converts NetCDF example file to example store.
+
+    Predictor blocks are copied one chunk of examples at a time, so the whole
+    file never needs to fit in memory.
+
+    :param netcdf_file_name: Path to input file (written by
+        `write_example_file`).
+    :param store_dir_name: Path to output directory (will be read by
+        `read_example_file` and `read_specific_examples`).
+    :param num_examples_per_chunk: Number of examples per chunk.
+    """
+
+    error_checking.assert_is_integer(num_examples_per_chunk)
+    error_checking.assert_is_greater(num_examples_per_chunk, 0)
+
+    example_dict, netcdf_dataset = _read_metadata_from_example_file(
+        netcdf_file_name=netcdf_file_name, include_soundings=True)
+    example_dict[TARGET_MATRIX_KEY] = numpy.array(
+        netcdf_dataset.variables[TARGET_MATRIX_KEY][:], dtype=int
+    )
+
+    # Write metadata and index only.  Predictor blocks are added below.
+    write_example_store(store_dir_name=store_dir_name,
+                        example_dict=example_dict)
+
+    include_soundings = SOUNDING_FIELDS_KEY in example_dict
+    num_examples = len(example_dict[FULL_IDS_KEY])
+
+    for this_key in STORE_PREDICTOR_KEYS:
+        if this_key not in netcdf_dataset.variables:
+            continue
+        if this_key == SOUNDING_MATRIX_KEY and not include_soundings:
+            continue
+
+        this_netcdf_variable = netcdf_dataset.variables[this_key]
+        this_store_matrix = numpy.lib.format.open_memmap(
+            _get_store_array_file_name(
+                store_dir_name=store_dir_name, array_key=this_key),
+            mode='w+', dtype=numpy.float32,
+            shape=tuple(this_netcdf_variable.shape)
+        )
+
+        for i in range(0, num_examples, num_examples_per_chunk):
+            j = min([i + num_examples_per_chunk, num_examples])
+            this_store_matrix[i:j, ...] = numpy.array(
+                this_netcdf_variable[i:j, ...], dtype=numpy.float32
+            )
+
+        this_store_matrix.flush()
+        del this_store_matrix
+
+    netcdf_dataset.close()
+
+
 def reduce_examples_3d_to_2d(example_dict, list_of_operation_dicts):
     """Reduces examples from 3-D to 2-D.
 
@@ -1,9 +1,12 @@
 """Unit tests for input_examples.py."""
 
 import copy
+import shutil
+import tempfile
 import unittest
 import numpy
 from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import soundings
 from gewittergefahr.gg_utils import linkage
 from gewittergefahr.gg_utils import target_val_utils
 from gewittergefahr.deep_learning import storm_images
@@ -302,6 +305,40 @@ EXAMPLE_FILE_NAME_SHUFFLED = (
     'foo/batches0001000-0001999/input_examples_batch0001967.nc'
 )
 EXAMPLE_FILE_NAME_UNSHUFFLED = 'foo/1967/input_examples_19670502.nc'
+EXAMPLE_STORE_NAME_SHUFFLED = (
+    'foo/batches0001000-0001999/input_examples_batch0001967.store'
+)
+
+# The following constants are used to test write_example_store.
+EXAMPLE_DICT_3D_FOR_STORE = copy.deepcopy(EXAMPLE_DICT_3D_ORIG)
+EXAMPLE_DICT_3D_FOR_STORE.pop(input_examples.TARGET_NAME_KEY)
+EXAMPLE_DICT_3D_FOR_STORE.pop(input_examples.TARGET_VALUES_KEY)
+EXAMPLE_DICT_3D_FOR_STORE[input_examples.TARGET_NAMES_KEY] = ['foo']
+EXAMPLE_DICT_3D_FOR_STORE[input_examples.TARGET_MATRIX_KEY] = (
+    numpy.expand_dims(TARGET_VALUES, axis=-1)
+)
+
+# The following constants are used to test convert_example_file_to_store.
+THESE_SOUNDING_FIELD_NAMES = [
+    soundings.RELATIVE_HUMIDITY_NAME, soundings.U_WIND_NAME,
+    soundings.V_WIND_NAME
+]
+THESE_SOUNDING_HEIGHTS_M_AGL = numpy.array([0, 500, 1000, 2000], dtype=int)
+THIS_SOUNDING_MATRIX = numpy.random.uniform(
+    low=0., high=1., size=(4, 4, 3)
+)
+
+EXAMPLE_DICT_WITH_SOUNDINGS = copy.deepcopy(EXAMPLE_DICT_3D_FOR_STORE)
+EXAMPLE_DICT_WITH_SOUNDINGS[input_examples.SOUNDING_FIELDS_KEY] = (
+    THESE_SOUNDING_FIELD_NAMES
+)
+EXAMPLE_DICT_WITH_SOUNDINGS[input_examples.SOUNDING_HEIGHTS_KEY] = (
+    THESE_SOUNDING_HEIGHTS_M_AGL
+)
+EXAMPLE_DICT_WITH_SOUNDINGS[input_examples.SOUNDING_MATRIX_KEY] = (
+    THIS_SOUNDING_MATRIX
+)
+NUM_EXAMPLES_PER_STORE_CHUNK = 3
 
 # The following constants are used to test _check_target_vars.
 TORNADO_MEAN_LEAD_TIME_SEC = 1800
@@ -606,6 +643,97 @@ class InputExamplesTests(unittest.TestCase):
 
         self.assertTrue(this_file_name == EXAMPLE_FILE_NAME_UNSHUFFLED)
 
+    def test_find_example_file_store(self):
+        """Ensures correct output from find_example_file.
+
+        In this case the hypothetical file is an example store.
+        """
+
+        this_file_name = input_examples.find_example_file(
+            top_directory_name=TOP_DIRECTORY_NAME, shuffled=True,
+            batch_number=BATCH_NUMBER, raise_error_if_missing=False,
+            use_example_store=True)
+
+        self.assertTrue(this_file_name == EXAMPLE_STORE_NAME_SHUFFLED)
+
+    def test_write_example_store(self):
+        """Ensures that write_example_store and read_specific_examples agree.
+
+        In this case a subset of examples is read back from the store.
+        """
+
+        this_directory_name = tempfile.mkdtemp()
+        this_store_name = '{0:s}/input_examples_batch0001967.store'.format(
+            this_directory_name)
+
+        input_examples.write_example_store(
+            store_dir_name=this_store_name,
+            example_dict=EXAMPLE_DICT_3D_FOR_STORE)
+
+        this_example_dict = input_examples.read_specific_examples(
+            netcdf_file_name=this_store_name, read_all_target_vars=False,
+            target_name='foo',
+            full_storm_id_strings=[FULL_ID_STRINGS[k] for k in INDICES_TO_KEEP],
+            storm_times_unix_sec=STORM_TIMES_UNIX_SEC[INDICES_TO_KEEP],
+            include_soundings=False)
+
+        shutil.rmtree(this_directory_name)
+
+        self.assertTrue(_compare_example_dicts(
+            this_example_dict, EXAMPLE_DICT_3D_SUBSET
+        ))
+
+    def test_convert_example_file_to_store(self):
+        """Ensures that convert_example_file_to_store keeps all predictors.
+
+        In this case the examples include soundings, which should be read back
+        from the store.
+        """
+
+        this_directory_name = tempfile.mkdtemp()
+        this_netcdf_file_name = (
+            '{0:s}/input_examples_batch0001967.nc'.format(this_directory_name)
+        )
+        this_store_name = '{0:s}/input_examples_batch0001967.store'.format(
+            this_directory_name)
+
+        try:
+            input_examples.write_example_file(
+                netcdf_file_name=this_netcdf_file_name,
+                example_dict=copy.deepcopy(EXAMPLE_DICT_WITH_SOUNDINGS))
+
+            input_examples.convert_example_file_to_store(
+                netcdf_file_name=this_netcdf_file_name,
+                store_dir_name=this_store_name,
+                num_examples_per_chunk=NUM_EXAMPLES_PER_STORE_CHUNK)
+
+            this_example_dict = input_examples.read_example_file(
+                netcdf_file_name=this_store_name, read_all_target_vars=True,
+                include_soundings=True)
+        finally:
+            shutil.rmtree(this_directory_name)
+
+        self.assertTrue(
+            this_example_dict[input_examples.SOUNDING_FIELDS_KEY] ==
+            THESE_SOUNDING_FIELD_NAMES
+        )
+        self.assertTrue(numpy.array_equal(
+            this_example_dict[input_examples.SOUNDING_HEIGHTS_KEY],
+            THESE_SOUNDING_HEIGHTS_M_AGL
+        ))
+        self.assertTrue(numpy.allclose(
+            this_example_dict[input_examples.SOUNDING_MATRIX_KEY],
+            THIS_SOUNDING_MATRIX, atol=TOLERANCE
+        ))
+        self.assertTrue(numpy.allclose(
+            this_example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY],
+            EXAMPLE_DICT_WITH_SOUNDINGS[input_examples.RADAR_IMAGE_MATRIX_KEY],
+            atol=TOLERANCE
+        ))
+        self.assertTrue(
+            this_example_dict[input_examples.FULL_IDS_KEY] == FULL_ID_STRINGS
+        )
+
     def test_file_name_to_batch_number_shuffled(self):
         """Ensures correct output from _file_name_to_batch_number.
 
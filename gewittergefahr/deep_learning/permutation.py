@@ -1,11 +1,14 @@
 """Methods to run permutation test for GewitterGefahr models."""
 
+import os
 import copy
+import hashlib
 import numpy
 from gewittergefahr.gg_utils import radar_utils
 from gewittergefahr.gg_utils import soundings
 from gewittergefahr.gg_utils import error_checking
 from gewittergefahr.deep_learning import cnn
+from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
 from gewittergefahr.deep_learning import permutation_utils
 from gewittergefahr.deep_learning import training_validation_io as trainval_io
 from gewittergefahr.plotting import radar_plotting
@@ -14,6 +17,8 @@ SEPARATOR_STRING = '\n\n' + '*' * 50 + '\n\n'
 MINOR_SEPARATOR_STRING = '\n\n' + '-' * 50 + '\n\n'
 
 DEFAULT_NUM_BOOTSTRAP_REPS = 1
+NUM_EXAMPLES_PER_BATCH = 100
+NUM_CACHED_VERSIONS_PER_INPUT = 2
 
 PREDICTOR_MATRICES_KEY = permutation_utils.PREDICTOR_MATRICES_KEY
 PERMUTED_FLAGS_KEY = permutation_utils.PERMUTED_FLAGS_KEY
@@ -24,6 +29,15 @@ UNPERMUTED_COST_MATRIX_KEY = permutation_utils.UNPERMUTED_COST_MATRIX_KEY
 BEST_PREDICTOR_KEY = permutation_utils.BEST_PREDICTOR_KEY
 BEST_COST_ARRAY_KEY = permutation_utils.BEST_COST_ARRAY_KEY
 
+MODEL_OBJECT_KEY = 'model_object'
+BRANCH_MODELS_KEY = 'branch_model_objects'
+HEAD_MODEL_KEY = 'head_model_object'
+CACHED_FEATURES_KEY = 'cached_features_by_input'
+
+# Cache used by `prediction_function_cached_branches`.  There is one cache per
+# process, so each worker process in the permutation test has its own.
+BRANCH_CACHE_DICT = {}
+
 
 def create_nice_predictor_names(
         predictor_matrices, cnn_metadata_dict, separate_radar_heights=False):
@@ -226,127 +240,286 @@ def prediction_function_2d3d_cnn(model_object, list_of_input_matrices):
         sounding_matrix=sounding_matrix, verbose=True)
 
 
-def run_forward_test(
-        model_object, predictor_matrices, target_values, cnn_metadata_dict,
-        cost_function, separate_radar_heights=False,
-        num_bootstrap_reps=DEFAULT_NUM_BOOTSTRAP_REPS):
-    """Runs forward permutation test.
+def _hash_predictor_matrix(predictor_matrix):
+    """Hashes contents of predictor matrix.
 
-    T = number of input tensors to the model
-    E = number of examples
-    K = number of classes
-    P = number of predictors to permute
-    B = number of bootstrap replicates
+    :param predictor_matrix: numpy array.
+    :return: hash_string: Hex digest.
+    """
 
-    :param model_object: Trained model (instance of `keras.models.Model` or
-        `keras.models.Sequential`).
-    :param cnn_metadata_dict: Dictionary returned by `cnn.read_model_metadata`.
-    :param predictor_matrices: length-T list of predictor matrices (numpy
-        arrays), in the order used for training.  The first axis of each array
-        should have length E.
-    :param target_values: length-E numpy array of target values (integers from
-        0...[K - 1]).
+    hash_object = hashlib.sha1(numpy.ascontiguousarray(predictor_matrix))
+    hash_object.update(str(predictor_matrix.shape).encode('utf-8'))
+    hash_object.update(str(predictor_matrix.dtype).encode('utf-8'))
 
-    :param cost_function: Function used to evaluate model predictions.  Must be
-        negatively oriented (lower is better), with the following inputs and
-        outputs.
-    Input: target_values: Same as input to this method.
-    Input: class_probability_matrix: E-by-K numpy array of class probabilities.
-    Output: cost: Scalar value.
+    return hash_object.hexdigest()
 
-    :param separate_radar_heights: Boolean flag.  If True, 3-D radar fields will
-        be separated by height, so each step will involve permuting one variable
-        at one height.  If False, each step will involve permuting one variable
-        at all heights.
-    :param num_bootstrap_reps: Number of bootstrap replicates.  If you do not
-        want to use bootstrapping, make this <= 1.
 
-    :return: result_dict: Dictionary with the following keys.
-    result_dict["best_predictor_names"]: length-P list of best predictors.
-        The [j]th element is the name of the [j]th predictor to be permanently
-        permuted.
-    result_dict["best_cost_matrix"]: P-by-B numpy array of costs after
-        permutation.
-    result_dict["original_cost_array"]: length-B numpy array of costs
-        before permutation.
-    result_dict["step1_predictor_names"]: length-P list of predictors in
-        the order that they were permuted in step 1.
-    result_dict["step1_cost_matrix"]: P-by-B numpy array of costs after
-        permutation in step 1.
-    result_dict["backwards_test"]: Boolean flag (always False).
+def prediction_function_cached_branches(model_object, list_of_input_matrices):
+    """Prediction function that caches features from each input branch.
+
+    This works for any CNN with more than one input tensor (e.g., hybrid 2D/3D
+    CNN or CNN with soundings).  The model is split by
+    `cnn.split_model_by_input` into one branch per input tensor and a head
+    (layers at and after the merge).  Features from each branch are cached for
+    the last few versions of each input tensor, so that when only one tensor
+    changes (e.g., when one sounding predictor is permuted), only that tensor's
+    branch and the head are re-run.
+
+    Versions of each input tensor are recognized by hashing their contents,
+    which costs one pass through memory per tensor per call.
+
+    If the model cannot be split, this method applies the whole model.
+
+    :param model_object: See doc for `prediction_function_2d_cnn`.
+    :param list_of_input_matrices: Same.
+    :return: class_probability_matrix: Same.
     """
 
-    error_checking.assert_is_integer_numpy_array(target_values)
-    error_checking.assert_is_geq_numpy_array(target_values, 0)
-    error_checking.assert_is_integer(num_bootstrap_reps)
-    num_bootstrap_reps = max([num_bootstrap_reps, 1])
+    if BRANCH_CACHE_DICT.get(MODEL_OBJECT_KEY) is not model_object:
+        branch_model_objects, head_model_object = cnn.split_model_by_input(
+            model_object)
 
-    if cnn_metadata_dict[cnn.CONV_2D3D_KEY]:
-        prediction_function = prediction_function_2d3d_cnn
+        BRANCH_CACHE_DICT.clear()
+        BRANCH_CACHE_DICT.update({
+            MODEL_OBJECT_KEY: model_object,
+            BRANCH_MODELS_KEY: branch_model_objects,
+            HEAD_MODEL_KEY: head_model_object,
+            CACHED_FEATURES_KEY: [[] for _ in list_of_input_matrices]
+        })
+
+    head_model_object = BRANCH_CACHE_DICT[HEAD_MODEL_KEY]
+
+    if head_model_object is None:
+        output_matrix = model_object.predict(
+            list_of_input_matrices, batch_size=NUM_EXAMPLES_PER_BATCH)
     else:
-        num_radar_dimensions = len(predictor_matrices[0].shape) - 2
+        feature_matrices = []
+
+        for i in range(len(list_of_input_matrices)):
+            this_hash_string = _hash_predictor_matrix(list_of_input_matrices[i])
+
+            # Each list item is (hash, feature matrices), most recent last.
+            these_cached_items = BRANCH_CACHE_DICT[CACHED_FEATURES_KEY][i]
+            these_matches = [
+                t for t in these_cached_items if t[0] == this_hash_string
+            ]
+
+            if len(these_matches) > 0:
+                this_item = these_matches[0]
+                these_cached_items.remove(this_item)
+            else:
+                print('Applying branch {0:d} of model...'.format(i + 1))
+
+                this_branch_model_object = BRANCH_CACHE_DICT[
+                    BRANCH_MODELS_KEY][i]
+                these_features = this_branch_model_object.predict(
+                    list_of_input_matrices[i],
+                    batch_size=NUM_EXAMPLES_PER_BATCH)
+
+                if not isinstance(these_features, list):
+                    these_features = [these_features]
+
+                this_item = (this_hash_string, these_features)
+
+            these_cached_items.append(this_item)
+            del these_cached_items[:-NUM_CACHED_VERSIONS_PER_INPUT]
+            feature_matrices += this_item[1]
+
+        output_matrix = head_model_object.predict(
+            feature_matrices, batch_size=NUM_EXAMPLES_PER_BATCH)
+
+    if len(output_matrix.shape) == 2 and output_matrix.shape[1] == 1:
+        output_matrix = output_matrix[:, 0]
+
+    if len(output_matrix.shape) == 1:
+        output_matrix = dl_utils.event_probs_to_multiclass(output_matrix)
+
+    return output_matrix
+
+
+def _get_prediction_function(cnn_metadata_dict, predictor_matrices,
+                             cache_branch_features):
+    """Returns prediction function for CNN.
 
-        if num_radar_dimensions == 2:
-            prediction_function = prediction_function_2d_cnn
+    :param cnn_metadata_dict: See doc for `run_forward_test`.
+    :param predictor_matrices: Same.
+    :param cache_branch_features: Same.
+    :return: prediction_function: Function (see doc for
+        `permutation_utils.run_forward_test_one_step`).
+    """
+
+    if cache_branch_features and len(predictor_matrices) > 1:
+        return prediction_function_cached_branches
+
+    if cnn_metadata_dict[cnn.CONV_2D3D_KEY]:
+        return prediction_function_2d3d_cnn
+
+    num_radar_dimensions = len(predictor_matrices[0].shape) - 2
+    if num_radar_dimensions == 2:
+        return prediction_function_2d_cnn
+
+    return prediction_function_3d_cnn
+
+
+def _read_checkpoint(checkpoint_file_name, test_settings_dict):
+    """Reads checkpoint from earlier, interrupted run of permutation test.
+
+    :param checkpoint_file_name: Path to checkpoint file.  If None or the file
+        does not exist, this method returns None.
+    :param test_settings_dict: Dictionary with settings for the current run,
+        created by `_get_test_settings`.
+    :return: checkpoint_dict: See doc for `permutation_utils.write_checkpoint`.
+    :raises: ValueError: if the checkpoint was created by a test with different
+        settings.
+    """
+
+    if checkpoint_file_name is None or not os.path.isfile(checkpoint_file_name):
+        return None
+
+    print('Reading checkpoint from: "{0:s}"...'.format(checkpoint_file_name))
+    checkpoint_dict = permutation_utils.read_checkpoint(checkpoint_file_name)
+
+    mismatched_keys = []
+
+    for this_key in test_settings_dict:
+        this_current_value = test_settings_dict[this_key]
+        this_checkpoint_value = checkpoint_dict[this_key]
+
+        if (isinstance(this_current_value, numpy.ndarray) or
+                isinstance(this_checkpoint_value, numpy.ndarray)):
+            this_match_flag = numpy.array_equal(
+                this_checkpoint_value, this_current_value)
         else:
-            prediction_function = prediction_function_3d_cnn
+            this_match_flag = this_checkpoint_value == this_current_value
 
-    predictor_names_by_matrix = create_nice_predictor_names(
-        predictor_matrices=predictor_matrices,
-        cnn_metadata_dict=cnn_metadata_dict,
-        separate_radar_heights=separate_radar_heights)
+        if not this_match_flag:
+            mismatched_keys.append(this_key)
 
-    num_matrices = len(predictor_names_by_matrix)
-    for i in range(num_matrices):
-        print('Predictors in {0:d}th matrix:\n{1:s}\n'.format(
-            i + 1, str(predictor_names_by_matrix[i])
-        ))
+    if len(mismatched_keys) == 0:
+        return checkpoint_dict
 
-    print(SEPARATOR_STRING)
+    error_string = (
+        'Checkpoint file "{0:s}" was created by a different permutation test.  '
+        'The following settings do not match the current run:\n{1:s}'
+    ).format(checkpoint_file_name, str(mismatched_keys))
 
-    # Find original cost (before permutation).
-    print('Finding original cost (before permutation)...')
-    class_probability_matrix = prediction_function(
-        model_object, predictor_matrices)
-    print(MINOR_SEPARATOR_STRING)
-
-    original_cost_array = permutation_utils.bootstrap_cost(
-        target_values=target_values,
-        class_probability_matrix=class_probability_matrix,
-        cost_function=cost_function, num_replicates=num_bootstrap_reps)
-
-    # Do the permutation part.
-    permuted_flags_by_matrix = [
-        numpy.full(len(n), 0, dtype=bool)
-        for n in predictor_names_by_matrix
-    ]
+    raise ValueError(error_string)
+
+
+def _get_test_settings(
+        predictor_names_by_matrix, target_values, backwards_flag,
+        model_file_name, num_bootstrap_reps, cost_function,
+        full_storm_id_strings, storm_times_unix_sec):
+    """Returns settings that must match between a checkpoint and the run.
+
+    :param predictor_names_by_matrix: See doc for
+        `permutation_utils.run_forward_test_one_step`.
+    :param target_values: See doc for `run_forward_test`.
+    :param backwards_flag: Boolean flag, indicating whether the current run is
+        a backwards test.
+    :param model_file_name: See doc for `run_forward_test`.
+    :param num_bootstrap_reps: Same.
+    :param cost_function: Same.
+    :param full_storm_id_strings: Same.
+    :param storm_times_unix_sec: Same.
+    :return: test_settings_dict: Dictionary, where each key is in
+        `permutation_utils.CHECKPOINT_KEYS`.
+    """
+
+    if model_file_name is None:
+        model_mtime_unix_sec = None
+    else:
+        model_mtime_unix_sec = os.path.getmtime(model_file_name)
+
+    return {
+        permutation_utils.BACKWARDS_FLAG: backwards_flag,
+        permutation_utils.PREDICTOR_NAMES_KEY: predictor_names_by_matrix,
+        permutation_utils.TARGET_VALUES_KEY: target_values,
+        permutation_utils.MODEL_FILE_KEY: model_file_name,
+        permutation_utils.MODEL_MTIME_KEY: model_mtime_unix_sec,
+        permutation_utils.NUM_BOOTSTRAP_REPS_KEY: num_bootstrap_reps,
+        permutation_utils.COST_FUNCTION_NAME_KEY:
+            getattr(cost_function, '__name__', str(cost_function)),
+        permutation_utils.FULL_IDS_KEY: full_storm_id_strings,
+        permutation_utils.STORM_TIMES_KEY: storm_times_unix_sec
+    }
+
+
+def _run_steps(
+        model_object, predictor_matrices, clean_predictor_matrices,
+        target_values, predictor_names_by_matrix, prediction_function,
+        cost_function, separate_radar_heights, num_bootstrap_reps,
+        checkpoint_dict, worker_pool, checkpoint_file_name):
+    """Runs all steps of forward or backwards permutation test.
+
+    :param model_object: See doc for `run_forward_test`.
+    :param predictor_matrices: Same.
+    :param clean_predictor_matrices: Clean version of `predictor_matrices` (used
+        only for backwards test).
+    :param target_values: See doc for `run_forward_test`.
+    :param predictor_names_by_matrix: See doc for
+        `permutation_utils.run_forward_test_one_step`.
+    :param prediction_function: Same.
+    :param cost_function: See doc for `run_forward_test`.
+    :param separate_radar_heights: Same.
+    :param num_bootstrap_reps: Same.
+    :param checkpoint_dict: Dictionary with state after the last completed step
+        (see doc for `permutation_utils.write_checkpoint`).
+    :param worker_pool: See doc for
+        `permutation_utils.run_forward_test_one_step`.
+    :param checkpoint_file_name: See doc for `run_forward_test`.
+    :return: result_dict: Same.
+    """
 
-    step_num = 0
+    backwards_flag = checkpoint_dict[permutation_utils.BACKWARDS_FLAG]
+    best_predictor_names = checkpoint_dict[
+        permutation_utils.BEST_PREDICTORS_KEY]
+    best_cost_matrix = checkpoint_dict[permutation_utils.BEST_COST_MATRIX_KEY]
+    permuted_flags_by_matrix = checkpoint_dict[PERMUTED_FLAGS_KEY]
+    permutation_seeds_by_matrix = checkpoint_dict[
+        permutation_utils.PERMUTATION_SEEDS_KEY]
 
-    step1_predictor_names = None
-    step1_cost_matrix = None
-    best_predictor_names = []
-    best_cost_matrix = numpy.full((0, num_bootstrap_reps), numpy.nan)
+    step_num = len(best_predictor_names)
 
     while True:
         print(MINOR_SEPARATOR_STRING)
         step_num += 1
 
-        this_dict = permutation_utils.run_forward_test_one_step(
-            model_object=model_object, predictor_matrices=predictor_matrices,
-            predictor_names_by_matrix=predictor_names_by_matrix,
-            target_values=target_values,
-            prediction_function=prediction_function,
-            cost_function=cost_function,
-            separate_heights=separate_radar_heights,
-            num_bootstrap_reps=num_bootstrap_reps, step_num=step_num,
-            permuted_flags_by_matrix=permuted_flags_by_matrix)
+        if backwards_flag:
+            this_dict = permutation_utils.run_backwards_test_one_step(
+                model_object=model_object,
+                predictor_matrices=predictor_matrices,
+                clean_predictor_matrices=clean_predictor_matrices,
+                predictor_names_by_matrix=predictor_names_by_matrix,
+                target_values=target_values,
+                prediction_function=prediction_function,
+                cost_function=cost_function,
+                separate_heights=separate_radar_heights,
+                num_bootstrap_reps=num_bootstrap_reps, step_num=step_num,
+                permuted_flags_by_matrix=permuted_flags_by_matrix,
+                permutation_seeds_by_matrix=permutation_seeds_by_matrix,
+                worker_pool=worker_pool)
+        else:
+            this_dict = permutation_utils.run_forward_test_one_step(
+                model_object=model_object,
+                predictor_matrices=predictor_matrices,
+                predictor_names_by_matrix=predictor_names_by_matrix,
+                target_values=target_values,
+                prediction_function=prediction_function,
+                cost_function=cost_function,
+                separate_heights=separate_radar_heights,
+                num_bootstrap_reps=num_bootstrap_reps, step_num=step_num,
+                permuted_flags_by_matrix=permuted_flags_by_matrix,
+                permutation_seeds_by_matrix=permutation_seeds_by_matrix,
+                worker_pool=worker_pool)
 
         if this_dict is None:
             break
 
         predictor_matrices = this_dict[PREDICTOR_MATRICES_KEY]
         permuted_flags_by_matrix = this_dict[PERMUTED_FLAGS_KEY]
+        permutation_seeds_by_matrix = this_dict[
+            permutation_utils.PERMUTATION_SEEDS_KEY]
         best_predictor_names.append(this_dict[BEST_PREDICTOR_KEY])
 
         this_best_cost_array = this_dict[BEST_COST_ARRAY_KEY]
@@ -358,27 +531,50 @@ def run_forward_test(
         )
 
         if step_num == 1:
-            step1_predictor_names = this_dict[PERMUTED_PREDICTORS_KEY]
-            step1_cost_matrix = this_dict[PERMUTED_COST_MATRIX_KEY]
+            if backwards_flag:
+                checkpoint_dict[permutation_utils.STEP1_PREDICTORS_KEY] = (
+                    this_dict[UNPERMUTED_PREDICTORS_KEY]
+                )
+                checkpoint_dict[permutation_utils.STEP1_COST_MATRIX_KEY] = (
+                    this_dict[UNPERMUTED_COST_MATRIX_KEY]
+                )
+            else:
+                checkpoint_dict[permutation_utils.STEP1_PREDICTORS_KEY] = (
+                    this_dict[PERMUTED_PREDICTORS_KEY]
+                )
+                checkpoint_dict[permutation_utils.STEP1_COST_MATRIX_KEY] = (
+                    this_dict[PERMUTED_COST_MATRIX_KEY]
+                )
+
+        checkpoint_dict.update({
+            permutation_utils.BEST_PREDICTORS_KEY: best_predictor_names,
+            permutation_utils.BEST_COST_MATRIX_KEY: best_cost_matrix,
+            PERMUTED_FLAGS_KEY: permuted_flags_by_matrix,
+            permutation_utils.PERMUTATION_SEEDS_KEY:
+                permutation_seeds_by_matrix,
+            permutation_utils.RANDOM_STATE_KEY: numpy.random.get_state()
+        })
+
+        if checkpoint_file_name is not None:
+            print('Writing checkpoint after step {0:d} to: "{1:s}"...'.format(
+                step_num, checkpoint_file_name
+            ))
+            permutation_utils.write_checkpoint(
+                checkpoint_dict=checkpoint_dict,
+                pickle_file_name=checkpoint_file_name)
 
     return {
-        permutation_utils.BEST_PREDICTORS_KEY: best_predictor_names,
-        permutation_utils.BEST_COST_MATRIX_KEY: best_cost_matrix,
-        permutation_utils.ORIGINAL_COST_ARRAY_KEY: original_cost_array,
-        permutation_utils.STEP1_PREDICTORS_KEY: step1_predictor_names,
-        permutation_utils.STEP1_COST_MATRIX_KEY: step1_cost_matrix,
-        permutation_utils.BACKWARDS_FLAG: False
+        k: checkpoint_dict[k] for k in permutation_utils.REQUIRED_KEYS
     }
 
 
-def run_backwards_test(
+def _run_test(
         model_object, predictor_matrices, target_values, cnn_metadata_dict,
-        cost_function, separate_radar_heights=False,
-        num_bootstrap_reps=DEFAULT_NUM_BOOTSTRAP_REPS):
-    """Runs backwards permutation test.
-
-    P = number of predictors to unpermute
-    B = number of bootstrap replicates
+        cost_function, separate_radar_heights, num_bootstrap_reps,
+        num_processes, model_file_name, checkpoint_file_name,
+        cache_branch_features, full_storm_id_strings, storm_times_unix_sec,
+        backwards_flag):
+    """Runs forward or backwards permutation test.
 
     :param model_object: See doc for `run_forward_test`.
     :param predictor_matrices: Same.
@@ -387,36 +583,53 @@ def run_backwards_test(
     :param cost_function: Same.
     :param separate_radar_heights: Same.
     :param num_bootstrap_reps: Same.
-    :return: result_dict: Dictionary with the following keys.
-    result_dict["best_predictor_names"]: length-P list of best
-        predictors.  The [j]th element is the name of the [j]th predictor to be
-        permanently unpermuted.
-    result_dict["best_cost_matrix"]: P-by-B numpy array of costs after
-        unpermutation.
-    result_dict["original_cost_array"]: length-B numpy array of costs
-        before unpermutation.
-    result_dict["step1_predictor_names"]: length-P list of predictors in
-        the order that they were unpermuted in step 1.
-    result_dict["step1_cost_matrix"]: P-by-B numpy array of costs after
-        unpermutation in step 1.
-    result_dict["backwards_test"]: Boolean flag (always True).
+    :param num_processes: Same.
+    :param model_file_name: Same.
+    :param checkpoint_file_name: Same.
+    :param cache_branch_features: Same.
+    :param full_storm_id_strings: Same.
+    :param storm_times_unix_sec: Same.
+    :param backwards_flag: Boolean flag.  If True, will run backwards test.
+    :return: result_dict: See doc for `run_forward_test` or
+        `run_backwards_test`.
+    :raises: ValueError: if `num_processes > 1` and `model_file_name is None`.
     """
 
-    # Deal with input args.
     error_checking.assert_is_integer_numpy_array(target_values)
     error_checking.assert_is_geq_numpy_array(target_values, 0)
     error_checking.assert_is_integer(num_bootstrap_reps)
     num_bootstrap_reps = max([num_bootstrap_reps, 1])
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_geq(num_processes, 1)
+    error_checking.assert_is_boolean(cache_branch_features)
 
-    if cnn_metadata_dict[cnn.CONV_2D3D_KEY]:
-        prediction_function = prediction_function_2d3d_cnn
-    else:
-        num_radar_dimensions = len(predictor_matrices[0].shape) - 2
+    num_examples = len(target_values)
 
-        if num_radar_dimensions == 2:
-            prediction_function = prediction_function_2d_cnn
-        else:
-            prediction_function = prediction_function_3d_cnn
+    if full_storm_id_strings is not None:
+        error_checking.assert_is_string_list(full_storm_id_strings)
+        error_checking.assert_is_numpy_array(
+            numpy.array(full_storm_id_strings),
+            exact_dimensions=numpy.array([num_examples], dtype=int)
+        )
+
+        error_checking.assert_is_integer_numpy_array(storm_times_unix_sec)
+        error_checking.assert_is_numpy_array(
+            storm_times_unix_sec,
+            exact_dimensions=numpy.array([num_examples], dtype=int)
+        )
+
+    if num_processes > 1 and model_file_name is None:
+        error_string = (
+            'Worker processes must read their own copy of the model, so '
+            '`model_file_name` must be specified when num_processes > 1.'
+        )
+
+        raise ValueError(error_string)
+
+    prediction_function = _get_prediction_function(
+        cnn_metadata_dict=cnn_metadata_dict,
+        predictor_matrices=predictor_matrices,
+        cache_branch_features=cache_branch_features)
 
     predictor_names_by_matrix = create_nice_predictor_names(
         predictor_matrices=predictor_matrices,
@@ -431,83 +644,275 @@ def run_backwards_test(
 
     print(SEPARATOR_STRING)
 
-    # Permute all predictors.
-    num_matrices = len(predictor_matrices)
-    clean_predictor_matrices = copy.deepcopy(predictor_matrices)
+    if backwards_flag or num_processes > 1:
+        clean_predictor_matrices = copy.deepcopy(predictor_matrices)
+    else:
+        clean_predictor_matrices = None
+
+    test_settings_dict = _get_test_settings(
+        predictor_names_by_matrix=predictor_names_by_matrix,
+        target_values=target_values, backwards_flag=backwards_flag,
+        model_file_name=model_file_name,
+        num_bootstrap_reps=num_bootstrap_reps, cost_function=cost_function,
+        full_storm_id_strings=full_storm_id_strings,
+        storm_times_unix_sec=storm_times_unix_sec)
+
+    checkpoint_dict = _read_checkpoint(
+        checkpoint_file_name=checkpoint_file_name,
+        test_settings_dict=test_settings_dict)
+
+    if checkpoint_dict is None:
+        if backwards_flag:
+            permutation_seeds_by_matrix = [
+                numpy.random.randint(
+                    low=0, high=permutation_utils.MAX_PERMUTATION_SEED,
+                    size=len(n)
+                )
+                for n in predictor_names_by_matrix
+            ]
+        else:
+            permutation_seeds_by_matrix = [
+                numpy.full(
+                    len(n), permutation_utils.NO_PERMUTATION_SEED, dtype=int
+                )
+                for n in predictor_names_by_matrix
+            ]
 
-    for i in range(num_matrices):
-        this_num_predictors = len(predictor_names_by_matrix[i])
+        predictor_matrices = permutation_utils.apply_permutation_seeds(
+            predictor_matrices=predictor_matrices,
+            clean_predictor_matrices=predictor_matrices,
+            separate_heights=separate_radar_heights,
+            new_seeds_by_matrix=permutation_seeds_by_matrix,
+            old_seeds_by_matrix=[
+                numpy.full(len(n), permutation_utils.NO_PERMUTATION_SEED)
+                for n in predictor_names_by_matrix
+            ]
+        )
 
-        for j in range(this_num_predictors):
-            predictor_matrices = permutation_utils.permute_one_predictor(
-                predictor_matrices=predictor_matrices,
-                separate_heights=separate_radar_heights,
-                matrix_index=i, predictor_index=j
-            )[0]
-
-    # Find original cost (before unpermutation).
-    print('Finding original cost (before unpermutation)...')
-    class_probability_matrix = prediction_function(
-        model_object, predictor_matrices)
-    print(MINOR_SEPARATOR_STRING)
-
-    original_cost_array = permutation_utils.bootstrap_cost(
-        target_values=target_values,
-        class_probability_matrix=class_probability_matrix,
-        cost_function=cost_function, num_replicates=num_bootstrap_reps)
-
-    # Do the dirty work.
-    permuted_flags_by_matrix = [
-        numpy.full(len(n), 1, dtype=bool)
-        for n in predictor_names_by_matrix
-    ]
+        print('Finding original cost (before {0:s}permutation)...'.format(
+            'un' if backwards_flag else ''
+        ))
+        class_probability_matrix = prediction_function(
+            model_object, predictor_matrices)
+        print(MINOR_SEPARATOR_STRING)
 
-    step_num = 0
+        original_cost_array = permutation_utils.bootstrap_cost(
+            target_values=target_values,
+            class_probability_matrix=class_probability_matrix,
+            cost_function=cost_function, num_replicates=num_bootstrap_reps)
+
+        checkpoint_dict = {
+            permutation_utils.BEST_PREDICTORS_KEY: [],
+            permutation_utils.BEST_COST_MATRIX_KEY:
+                numpy.full((0, num_bootstrap_reps), numpy.nan),
+            permutation_utils.ORIGINAL_COST_ARRAY_KEY: original_cost_array,
+            permutation_utils.STEP1_PREDICTORS_KEY: None,
+            permutation_utils.STEP1_COST_MATRIX_KEY: None,
+            PERMUTED_FLAGS_KEY: [s >= 0 for s in permutation_seeds_by_matrix],
+            permutation_utils.PERMUTATION_SEEDS_KEY:
+                permutation_seeds_by_matrix,
+            permutation_utils.RANDOM_STATE_KEY: numpy.random.get_state()
+        }
+        checkpoint_dict.update(test_settings_dict)
+
+        if checkpoint_file_name is not None:
+            print('Writing checkpoint to: "{0:s}"...'.format(
+                checkpoint_file_name
+            ))
+            permutation_utils.write_checkpoint(
+                checkpoint_dict=checkpoint_dict,
+                pickle_file_name=checkpoint_file_name)
+    else:
+        print('Resuming after step {0:d}...'.format(
+            len(checkpoint_dict[permutation_utils.BEST_PREDICTORS_KEY])
+        ))
+
+        predictor_matrices = permutation_utils.apply_permutation_seeds(
+            predictor_matrices=predictor_matrices,
+            clean_predictor_matrices=predictor_matrices,
+            separate_heights=separate_radar_heights,
+            new_seeds_by_matrix=checkpoint_dict[
+                permutation_utils.PERMUTATION_SEEDS_KEY],
+            old_seeds_by_matrix=[
+                numpy.full(len(n), permutation_utils.NO_PERMUTATION_SEED)
+                for n in predictor_names_by_matrix
+            ]
+        )
 
-    step1_predictor_names = None
-    step1_cost_matrix = None
-    best_predictor_names = []
-    best_cost_matrix = numpy.full((0, num_bootstrap_reps), numpy.nan)
+        numpy.random.set_state(
+            checkpoint_dict[permutation_utils.RANDOM_STATE_KEY]
+        )
 
-    while True:
-        print(MINOR_SEPARATOR_STRING)
-        step_num += 1
+    if num_processes > 1:
+        worker_pool = permutation_utils.create_worker_pool(
+            num_processes=num_processes, model_file_name=model_file_name,
+            model_reading_function=cnn.read_model,
+            prediction_function=prediction_function,
+            cost_function=cost_function,
+            clean_predictor_matrices=clean_predictor_matrices,
+            target_values=target_values,
+            separate_heights=separate_radar_heights,
+            num_bootstrap_reps=num_bootstrap_reps)
+    else:
+        worker_pool = None
 
-        this_dict = permutation_utils.run_backwards_test_one_step(
+    try:
+        result_dict = _run_steps(
             model_object=model_object, predictor_matrices=predictor_matrices,
             clean_predictor_matrices=clean_predictor_matrices,
-            predictor_names_by_matrix=predictor_names_by_matrix,
             target_values=target_values,
+            predictor_names_by_matrix=predictor_names_by_matrix,
             prediction_function=prediction_function,
             cost_function=cost_function,
-            separate_heights=separate_radar_heights,
-            num_bootstrap_reps=num_bootstrap_reps, step_num=step_num,
-            permuted_flags_by_matrix=permuted_flags_by_matrix)
+            separate_radar_heights=separate_radar_heights,
+            num_bootstrap_reps=num_bootstrap_reps,
+            checkpoint_dict=checkpoint_dict, worker_pool=worker_pool,
+            checkpoint_file_name=checkpoint_file_name)
+    finally:
+        if worker_pool is not None:
+            worker_pool.close()
+            worker_pool.join()
 
-        if this_dict is None:
-            break
+    return result_dict
 
-        predictor_matrices = this_dict[PREDICTOR_MATRICES_KEY]
-        permuted_flags_by_matrix = this_dict[PERMUTED_FLAGS_KEY]
-        best_predictor_names.append(this_dict[BEST_PREDICTOR_KEY])
 
-        this_best_cost_array = this_dict[BEST_COST_ARRAY_KEY]
-        this_best_cost_matrix = numpy.reshape(
-            this_best_cost_array, (1, len(this_best_cost_array))
-        )
-        best_cost_matrix = numpy.concatenate(
-            (best_cost_matrix, this_best_cost_matrix), axis=0
-        )
+def run_forward_test(
+        model_object, predictor_matrices, target_values, cnn_metadata_dict,
+        cost_function, separate_radar_heights=False,
+        num_bootstrap_reps=DEFAULT_NUM_BOOTSTRAP_REPS, num_processes=1,
+        model_file_name=None, checkpoint_file_name=None,
+        cache_branch_features=False, full_storm_id_strings=None,
+        storm_times_unix_sec=None):
+    """Runs forward permutation test.
 
-        if step_num == 1:
-            step1_predictor_names = this_dict[UNPERMUTED_PREDICTORS_KEY]
-            step1_cost_matrix = this_dict[UNPERMUTED_COST_MATRIX_KEY]
+    T = number of input tensors to the model
+    E = number of examples
+    K = number of classes
+    P = number of predictors to permute
+    B = number of bootstrap replicates
 
-    return {
-        permutation_utils.BEST_PREDICTORS_KEY: best_predictor_names,
-        permutation_utils.BEST_COST_MATRIX_KEY: best_cost_matrix,
-        permutation_utils.ORIGINAL_COST_ARRAY_KEY: original_cost_array,
-        permutation_utils.STEP1_PREDICTORS_KEY: step1_predictor_names,
-        permutation_utils.STEP1_COST_MATRIX_KEY: step1_cost_matrix,
-        permutation_utils.BACKWARDS_FLAG: True
-    }
+    :param model_object: Trained model (instance of `keras.models.Model` or
+        `keras.models.Sequential`).
+    :param cnn_metadata_dict: Dictionary returned by `cnn.read_model_metadata`.
+    :param predictor_matrices: length-T list of predictor matrices (numpy
+        arrays), in the order used for training.  The first axis of each array
+        should have length E.  These will be permuted in place.
+    :param target_values: length-E numpy array of target values (integers from
+        0...[K - 1]).
+
+    :param cost_function: Function used to evaluate model predictions.  Must be
+        negatively oriented (lower is better), with the following inputs and
+        outputs.
+    Input: target_values: Same as input to this method.
+    Input: class_probability_matrix: E-by-K numpy array of class probabilities.
+    Output: cost: Scalar value.
+
+    :param separate_radar_heights: Boolean flag.  If True, 3-D radar fields will
+        be separated by height, so each step will involve permuting one variable
+        at one height.  If False, each step will involve permuting one variable
+        at all heights.
+    :param num_bootstrap_reps: Number of bootstrap replicates.  If you do not
+        want to use bootstrapping, make this <= 1.
+    :param num_processes: Number of worker processes used to evaluate candidate
+        predictors at each step.  Each worker reads its own copy of the model
+        and keeps its own copy of the predictor matrices.  If 1, everything is
+        done in this process.
+    :param model_file_name: Path to file with `model_object` (readable by
+        `cnn.read_model`).  Used only if `num_processes > 1`.
+    :param checkpoint_file_name: Path to checkpoint file, written after every
+        step by `permutation_utils.write_checkpoint`.  If the file already
+        exists, the test will resume after the last completed step.  If the
+        checkpoint was created with a different direction, predictors,
+        examples (target values and, if given, storm IDs and times), model
+        file (name or modification time), number of bootstrap
+        replicates, or cost function, this method will error out.  If None,
+        there will be no checkpointing.
+    :param cache_branch_features: Boolean flag.  If True, will use
+        `prediction_function_cached_branches`, so that branches of the model fed
+        by unchanged input tensors are not re-run.  This matters only for
+        models with more than one input tensor.
+    :param full_storm_id_strings: length-E list of storm IDs.  If specified,
+        these are saved in the checkpoint and must match when resuming, so that
+        the test cannot resume on a different set of examples.
+    :param storm_times_unix_sec: length-E numpy array of storm times (required
+        if `full_storm_id_strings` is specified).
+
+    :return: result_dict: Dictionary with the following keys.
+    result_dict["best_predictor_names"]: length-P list of best predictors.
+        The [j]th element is the name of the [j]th predictor to be permanently
+        permuted.
+    result_dict["best_cost_matrix"]: P-by-B numpy array of costs after
+        permutation.
+    result_dict["original_cost_array"]: length-B numpy array of costs
+        before permutation.
+    result_dict["step1_predictor_names"]: length-P list of predictors in
+        the order that they were permuted in step 1.
+    result_dict["step1_cost_matrix"]: P-by-B numpy array of costs after
+        permutation in step 1.
+    result_dict["backwards_test"]: Boolean flag (always False).
+    """
+
+    return _run_test(
+        model_object=model_object, predictor_matrices=predictor_matrices,
+        target_values=target_values, cnn_metadata_dict=cnn_metadata_dict,
+        cost_function=cost_function,
+        separate_radar_heights=separate_radar_heights,
+        num_bootstrap_reps=num_bootstrap_reps, num_processes=num_processes,
+        model_file_name=model_file_name,
+        checkpoint_file_name=checkpoint_file_name,
+        cache_branch_features=cache_branch_features,
+        full_storm_id_strings=full_storm_id_strings,
+        storm_times_unix_sec=storm_times_unix_sec, backwards_flag=False)
+
+
+def run_backwards_test(
+        model_object, predictor_matrices, target_values, cnn_metadata_dict,
+        cost_function, separate_radar_heights=False,
+        num_bootstrap_reps=DEFAULT_NUM_BOOTSTRAP_REPS, num_processes=1,
+        model_file_name=None, checkpoint_file_name=None,
+        cache_branch_features=False, full_storm_id_strings=None,
+        storm_times_unix_sec=None):
+    """Runs backwards permutation test.
+
+    P = number of predictors to unpermute
+    B = number of bootstrap replicates
+
+    :param model_object: See doc for `run_forward_test`.
+    :param predictor_matrices: Same.
+    :param target_values: Same.
+    :param cnn_metadata_dict: Same.
+    :param cost_function: Same.
+    :param separate_radar_heights: Same.
+    :param num_bootstrap_reps: Same.
+    :param num_processes: Same.
+    :param model_file_name: Same.
+    :param checkpoint_file_name: Same.
+    :param cache_branch_features: Same.
+    :param full_storm_id_strings: Same.
+    :param storm_times_unix_sec: Same.
+    :return: result_dict: Dictionary with the following keys.
+    result_dict["best_predictor_names"]: length-P list of best
+        predictors.  The [j]th element is the name of the [j]th predictor to be
+        permanently unpermuted.
+    result_dict["best_cost_matrix"]: P-by-B numpy array of costs after
+        unpermutation.
+    result_dict["original_cost_array"]: length-B numpy array of costs
+        before unpermutation.
+    result_dict["step1_predictor_names"]: length-P list of predictors in
+        the order that they were unpermuted in step 1.
+    result_dict["step1_cost_matrix"]: P-by-B numpy array of costs after
+        unpermutation in step 1.
+    result_dict["backwards_test"]: Boolean flag (always True).
+    """
+
+    return _run_test(
+        model_object=model_object, predictor_matrices=predictor_matrices,
+        target_values=target_values, cnn_metadata_dict=cnn_metadata_dict,
+        cost_function=cost_function,
+        separate_radar_heights=separate_radar_heights,
+        num_bootstrap_reps=num_bootstrap_reps, num_processes=num_processes,
+        model_file_name=model_file_name,
+        checkpoint_file_name=checkpoint_file_name,
+        cache_branch_features=cache_branch_features,
+        full_storm_id_strings=full_storm_id_strings,
+        storm_times_unix_sec=storm_times_unix_sec, backwards_flag=True)
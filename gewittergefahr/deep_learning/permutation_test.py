@@ -1,14 +1,18 @@
 """Unit tests for permutation.py."""
 
 import unittest
+from unittest import mock
 import numpy
 from gewittergefahr.gg_utils import radar_utils
 from gewittergefahr.gg_utils import soundings
 from gewittergefahr.deep_learning import cnn
+from gewittergefahr.deep_learning import cnn_test
 from gewittergefahr.deep_learning import permutation
 from gewittergefahr.deep_learning import input_examples
 from gewittergefahr.deep_learning import training_validation_io as trainval_io
 
+TOLERANCE = 1e-6
+
 # The following constants are used to test different methods.
 RADAR_HEIGHTS_M_AGL = numpy.array([2000, 6000, 10000], dtype=int)
 
@@ -234,6 +238,10 @@ NINTH_NICE_PREDICTOR_NAMES = [
 ]
 
 
+# The following constants are used to test prediction_function_cached_branches.
+PERMUTATION_FOR_CACHE = numpy.array([3, 0, 4, 1, 2], dtype=int)
+
+
 class PermutationTests(unittest.TestCase):
     """Each method is a unit test for permutation.py."""
 
@@ -362,6 +370,85 @@ class PermutationTests(unittest.TestCase):
         these_predictor_names = sum(these_names_by_matrix, [])
         self.assertTrue(these_predictor_names == NINTH_NICE_PREDICTOR_NAMES)
 
+    def test_prediction_function_cached_branches_first(self):
+        """Ensures correct output from prediction_function_cached_branches.
+
+        In this case, predictions should match the whole model, both before
+        and after permuting the second input.  After the permutation, only the
+        branch fed by the second input should be re-run.
+        """
+
+        permutation.BRANCH_CACHE_DICT.clear()
+        this_model_object = cnn_test.create_two_input_model()
+        these_input_matrices = [
+            cnn_test.FIRST_INPUT_MATRIX + 0.,
+            cnn_test.SECOND_INPUT_MATRIX + 0.
+        ]
+
+        this_prob_matrix = permutation.prediction_function_cached_branches(
+            model_object=this_model_object,
+            list_of_input_matrices=these_input_matrices)
+
+        self.assertTrue(numpy.allclose(
+            this_prob_matrix, this_model_object.predict(these_input_matrices),
+            atol=TOLERANCE
+        ))
+
+        these_input_matrices[1] = (
+            these_input_matrices[1][PERMUTATION_FOR_CACHE, ...]
+        )
+
+        # Wrap branch models, so that calls to each branch can be counted.
+        these_branch_model_objects = [
+            mock.Mock(wraps=m) for m in
+            permutation.BRANCH_CACHE_DICT[permutation.BRANCH_MODELS_KEY]
+        ]
+        permutation.BRANCH_CACHE_DICT[permutation.BRANCH_MODELS_KEY] = (
+            these_branch_model_objects
+        )
+
+        this_prob_matrix = permutation.prediction_function_cached_branches(
+            model_object=this_model_object,
+            list_of_input_matrices=these_input_matrices)
+
+        self.assertTrue(these_branch_model_objects[0].predict.call_count == 0)
+        self.assertTrue(these_branch_model_objects[1].predict.call_count == 1)
+        self.assertTrue(numpy.allclose(
+            this_prob_matrix, this_model_object.predict(these_input_matrices),
+            atol=TOLERANCE
+        ))
+
+    def test_prediction_function_cached_branches_second(self):
+        """Ensures correct output from prediction_function_cached_branches.
+
+        In this case, the first input array is changed in place between calls.
+        Branch features for the old contents must not be reused.
+        """
+
+        permutation.BRANCH_CACHE_DICT.clear()
+        this_model_object = cnn_test.create_two_input_model()
+        these_input_matrices = [
+            cnn_test.FIRST_INPUT_MATRIX + 0.,
+            cnn_test.SECOND_INPUT_MATRIX + 0.
+        ]
+
+        permutation.prediction_function_cached_branches(
+            model_object=this_model_object,
+            list_of_input_matrices=these_input_matrices)
+
+        these_input_matrices[0][:] = (
+            these_input_matrices[0][PERMUTATION_FOR_CACHE, ...]
+        )
+
+        this_prob_matrix = permutation.prediction_function_cached_branches(
+            model_object=this_model_object,
+            list_of_input_matrices=these_input_matrices)
+
+        self.assertTrue(numpy.allclose(
+            this_prob_matrix, this_model_object.predict(these_input_matrices),
+            atol=TOLERANCE
+        ))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -14,8 +14,10 @@ Lakshmanan, V., C. Karstens, J. Krause, K. Elmore, A. Ryzhkov, and S. Berkseth,
     1209-1223.
 """
 
+import os
 import time
 import pickle
+import multiprocessing
 import numpy
 import keras.utils
 from sklearn.metrics import roc_auc_score as sklearn_auc
@@ -30,6 +32,8 @@ MINOR_SEPARATOR_STRING = '\n\n' + '-' * 50 + '\n\n'
 DEFAULT_NUM_BOOTSTRAP_REPS = 1
 MIN_PROBABILITY = 1e-15
 MAX_PROBABILITY = 1. - MIN_PROBABILITY
+MAX_PERMUTATION_SEED = 2 ** 31 - 1
+NO_PERMUTATION_SEED = -1
 
 PREDICTOR_MATRICES_KEY = 'predictor_matrices'
 PERMUTED_FLAGS_KEY = 'permuted_flags_by_matrix'
@@ -39,6 +43,7 @@ UNPERMUTED_PREDICTORS_KEY = 'unpermuted_predictor_names'
 UNPERMUTED_COST_MATRIX_KEY = 'unpermuted_cost_matrix'
 BEST_PREDICTOR_KEY = 'best_predictor_name'
 BEST_COST_ARRAY_KEY = 'best_cost_array'
+PERMUTATION_SEEDS_KEY = 'permutation_seeds_by_matrix'
 
 BEST_PREDICTORS_KEY = 'best_predictor_names'
 BEST_COST_MATRIX_KEY = 'best_cost_matrix'
@@ -58,6 +63,291 @@ STORM_TIMES_KEY = tracking_io.STORM_TIMES_KEY
 MODEL_FILE_KEY = 'model_file_name'
 TARGET_VALUES_KEY = 'target_values'
 
+# Keys in checkpoint file.
+PREDICTOR_NAMES_KEY = 'predictor_names_by_matrix'
+RANDOM_STATE_KEY = 'random_state'
+MODEL_MTIME_KEY = 'model_file_mtime_unix_sec'
+NUM_BOOTSTRAP_REPS_KEY = 'num_bootstrap_reps'
+COST_FUNCTION_NAME_KEY = 'cost_function_name'
+
+CHECKPOINT_KEYS = [
+    BEST_PREDICTORS_KEY, BEST_COST_MATRIX_KEY, ORIGINAL_COST_ARRAY_KEY,
+    STEP1_PREDICTORS_KEY, STEP1_COST_MATRIX_KEY, BACKWARDS_FLAG,
+    PREDICTOR_NAMES_KEY, TARGET_VALUES_KEY, PERMUTED_FLAGS_KEY,
+    PERMUTATION_SEEDS_KEY, RANDOM_STATE_KEY, MODEL_FILE_KEY, MODEL_MTIME_KEY,
+    NUM_BOOTSTRAP_REPS_KEY, COST_FUNCTION_NAME_KEY, FULL_IDS_KEY,
+    STORM_TIMES_KEY
+]
+
+# Keys used to pass state to worker processes.
+MODEL_OBJECT_KEY = 'model_object'
+CLEAN_MATRICES_KEY = 'clean_predictor_matrices'
+PREDICTION_FUNCTION_KEY = 'prediction_function'
+COST_FUNCTION_KEY = 'cost_function'
+SEPARATE_HEIGHTS_KEY = 'separate_heights'
+MATRIX_INDEX_KEY = 'matrix_index'
+PREDICTOR_INDEX_KEY = 'predictor_index'
+PERMUTATION_SEED_KEY = 'permutation_seed'
+BOOTSTRAP_SEED_KEY = 'bootstrap_seed'
+
+# State of worker process, set by `init_permutation_worker`.  Each worker holds
+# its own copy of the model and predictor matrices.
+WORKER_STATE_DICT = {}
+
+
+def _get_predictor_values(predictor_matrix, separate_heights,
+                          predictor_index):
+    """Returns values of one predictor.
+
+    The output is a view into `predictor_matrix`, so that the predictor can be
+    permuted and restored in place, without copying the whole matrix.
+
+    :param predictor_matrix: numpy array, where the first axis is the example
+        axis and the last axis is the channel axis.
+    :param separate_heights: See doc for `permute_one_predictor`.
+    :param predictor_index: Index of predictor.  If `separate_heights` is True
+        and `predictor_matrix` has 3 spatial dimensions, this is an index into
+        the predictor/height pairs, in the order created by
+        `flatten_last_two_dim`.
+    :return: predictor_values: numpy array (view into `predictor_matrix`), where
+        the first axis is the example axis.
+    """
+
+    num_spatial_dim = len(predictor_matrix.shape) - 2
+
+    if num_spatial_dim == 3 and separate_heights:
+        num_heights = predictor_matrix.shape[-2]
+
+        return predictor_matrix[
+            ..., numpy.mod(predictor_index, num_heights),
+            predictor_index // num_heights
+        ]
+
+    return predictor_matrix[..., predictor_index]
+
+
+def _permute_values(predictor_values, permutation_seed):
+    """Permutes values of one predictor over the example axis.
+
+    :param predictor_values: numpy array, where the first axis is the example
+        axis.
+    :param permutation_seed: Seed for random permutation (non-negative
+        integer).  The same seed always yields the same permutation.
+    :return: permuted_values: Permuted version of `predictor_values` (a new
+        array).
+    """
+
+    random_indices = numpy.random.RandomState(permutation_seed).permutation(
+        predictor_values.shape[0]
+    )
+
+    return predictor_values[random_indices, ...]
+
+
+def _draw_permutation_seed():
+    """Draws random seed for permutation of one predictor.
+
+    :return: permutation_seed: Seed (non-negative integer).
+    """
+
+    return numpy.random.randint(low=0, high=MAX_PERMUTATION_SEED)
+
+
+def _evaluate_one_predictor(
+        model_object, predictor_matrices, clean_predictor_matrices,
+        target_values, prediction_function, cost_function, separate_heights,
+        num_bootstrap_reps, matrix_index, predictor_index, permutation_seed,
+        bootstrap_seed):
+    """Computes cost with one predictor temporarily permuted or unpermuted.
+
+    The [j]th predictor in the [i]th matrix, where i = `matrix_index` and
+    j = `predictor_index`, is changed in place and restored before returning.
+
+    B = number of bootstrap replicates
+
+    :param model_object: See doc for `run_forward_test_one_step`.
+    :param predictor_matrices: Same.
+    :param clean_predictor_matrices: See doc for `run_backwards_test_one_step`.
+        Used only if `permutation_seed is None`.
+    :param target_values: See doc for `run_forward_test_one_step`.
+    :param prediction_function: Same.
+    :param cost_function: Same.
+    :param separate_heights: Same.
+    :param num_bootstrap_reps: Same.
+    :param matrix_index: See discussion above.
+    :param predictor_index: See discussion above.
+    :param permutation_seed: Seed used to permute the predictor.  If None, the
+        predictor will be unpermuted (replaced with clean values) instead.
+    :param bootstrap_seed: Seed for bootstrap replicates.
+    :return: cost_array: length-B numpy array of costs.
+    """
+
+    these_values = _get_predictor_values(
+        predictor_matrix=predictor_matrices[matrix_index],
+        separate_heights=separate_heights, predictor_index=predictor_index)
+    these_orig_values = these_values.copy()
+
+    if permutation_seed is None:
+        these_values[:] = _get_predictor_values(
+            predictor_matrix=clean_predictor_matrices[matrix_index],
+            separate_heights=separate_heights, predictor_index=predictor_index)
+    else:
+        these_values[:] = _permute_values(
+            predictor_values=these_orig_values,
+            permutation_seed=permutation_seed)
+
+    try:
+        this_probability_matrix = prediction_function(
+            model_object, predictor_matrices)
+    finally:
+        these_values[:] = these_orig_values
+
+    print(MINOR_SEPARATOR_STRING)
+    numpy.random.seed(bootstrap_seed)
+
+    return bootstrap_cost(
+        target_values=target_values,
+        class_probability_matrix=this_probability_matrix,
+        cost_function=cost_function, num_replicates=num_bootstrap_reps)
+
+
+def _evaluate_one_predictor_in_worker(task_dict):
+    """Same as `_evaluate_one_predictor` but in worker process.
+
+    The worker must have been initialized by `init_permutation_worker`.
+
+    :param task_dict: Dictionary with the following keys.
+    task_dict["permutation_seeds_by_matrix"]: Permutation state in which to
+        evaluate the predictor (see doc for `apply_permutation_seeds`).
+    task_dict["matrix_index"]: See doc for `_evaluate_one_predictor`.
+    task_dict["predictor_index"]: Same.
+    task_dict["permutation_seed"]: Same.
+    task_dict["bootstrap_seed"]: Same.
+    :return: cost_array: See doc for `_evaluate_one_predictor`.
+    """
+
+    worker_dict = WORKER_STATE_DICT
+
+    worker_dict[PREDICTOR_MATRICES_KEY] = apply_permutation_seeds(
+        predictor_matrices=worker_dict[PREDICTOR_MATRICES_KEY],
+        clean_predictor_matrices=worker_dict[CLEAN_MATRICES_KEY],
+        separate_heights=worker_dict[SEPARATE_HEIGHTS_KEY],
+        new_seeds_by_matrix=task_dict[PERMUTATION_SEEDS_KEY],
+        old_seeds_by_matrix=worker_dict[PERMUTATION_SEEDS_KEY]
+    )
+    worker_dict[PERMUTATION_SEEDS_KEY] = [
+        numpy.array(s, dtype=int) for s in task_dict[PERMUTATION_SEEDS_KEY]
+    ]
+
+    return _evaluate_one_predictor(
+        model_object=worker_dict[MODEL_OBJECT_KEY],
+        predictor_matrices=worker_dict[PREDICTOR_MATRICES_KEY],
+        clean_predictor_matrices=worker_dict[CLEAN_MATRICES_KEY],
+        target_values=worker_dict[TARGET_VALUES_KEY],
+        prediction_function=worker_dict[PREDICTION_FUNCTION_KEY],
+        cost_function=worker_dict[COST_FUNCTION_KEY],
+        separate_heights=worker_dict[SEPARATE_HEIGHTS_KEY],
+        num_bootstrap_reps=worker_dict[NUM_BOOTSTRAP_REPS_KEY],
+        matrix_index=task_dict[MATRIX_INDEX_KEY],
+        predictor_index=task_dict[PREDICTOR_INDEX_KEY],
+        permutation_seed=task_dict[PERMUTATION_SEED_KEY],
+        bootstrap_seed=task_dict[BOOTSTRAP_SEED_KEY]
+    )
+
+
+def _evaluate_many_predictors(
+        model_object, predictor_matrices, clean_predictor_matrices,
+        target_values, prediction_function, cost_function, separate_heights,
+        num_bootstrap_reps, step_num, predictor_names_by_matrix,
+        index_pairs, permutation_seeds, permutation_seeds_by_matrix,
+        worker_pool):
+    """Evaluates many candidate predictors in one step.
+
+    C = number of candidate predictors
+    B = number of bootstrap replicates
+
+    :param model_object: See doc for `_evaluate_one_predictor`.
+    :param predictor_matrices: Same.
+    :param clean_predictor_matrices: Same.
+    :param target_values: Same.
+    :param prediction_function: Same.
+    :param cost_function: Same.
+    :param separate_heights: Same.
+    :param num_bootstrap_reps: Same.
+    :param step_num: See doc for `run_forward_test_one_step`.
+    :param predictor_names_by_matrix: Same.
+    :param index_pairs: length-C list of (matrix_index, predictor_index)
+        tuples.
+    :param permutation_seeds: length-C list of seeds (see doc for
+        `_evaluate_one_predictor`).
+    :param permutation_seeds_by_matrix: Current permutation state (see doc for
+        `apply_permutation_seeds`).
+    :param worker_pool: See doc for `run_forward_test_one_step`.
+    :return: cost_matrix: C-by-B numpy array of costs.
+    """
+
+    num_candidates = len(index_pairs)
+    if num_candidates == 0:
+        return numpy.full((0, num_bootstrap_reps), numpy.nan)
+
+    # Bootstrap seeds are drawn up front, the same way with or without worker
+    # processes, so that results do not depend on `num_processes`.
+    bootstrap_seeds = [_draw_permutation_seed() for _ in range(num_candidates)]
+
+    if worker_pool is None:
+        cost_arrays = []
+
+        for k in range(num_candidates):
+            i, j = index_pairs[k]
+
+            print('{0:s} predictor "{1:s}" at step {2:d}...'.format(
+                'Unpermuting' if permutation_seeds[k] is None
+                else 'Permuting',
+                predictor_names_by_matrix[i][j], step_num
+            ))
+
+            cost_arrays.append(_evaluate_one_predictor(
+                model_object=model_object,
+                predictor_matrices=predictor_matrices,
+                clean_predictor_matrices=clean_predictor_matrices,
+                target_values=target_values,
+                prediction_function=prediction_function,
+                cost_function=cost_function, separate_heights=separate_heights,
+                num_bootstrap_reps=num_bootstrap_reps, matrix_index=i,
+                predictor_index=j, permutation_seed=permutation_seeds[k],
+                bootstrap_seed=bootstrap_seeds[k]
+            ))
+
+        return numpy.stack(cost_arrays, axis=0)
+
+    print((
+        'Evaluating {0:d} candidate predictors at step {1:d} in worker '
+        'processes...'
+    ).format(
+        num_candidates, step_num
+    ))
+
+    exec_start_time_unix_sec = time.time()
+    task_dicts = []
+
+    for k in range(num_candidates):
+        task_dicts.append({
+            PERMUTATION_SEEDS_KEY: permutation_seeds_by_matrix,
+            MATRIX_INDEX_KEY: index_pairs[k][0],
+            PREDICTOR_INDEX_KEY: index_pairs[k][1],
+            PERMUTATION_SEED_KEY: permutation_seeds[k],
+            BOOTSTRAP_SEED_KEY: bootstrap_seeds[k]
+        })
+
+    cost_arrays = worker_pool.map(
+        _evaluate_one_predictor_in_worker, task_dicts, chunksize=1)
+
+    print('Time elapsed = {0:.2f} seconds'.format(
+        time.time() - exec_start_time_unix_sec
+    ))
+
+    return numpy.stack(cost_arrays, axis=0)
+
 
 def _unpermute_one_predictor(
         predictor_matrices, clean_predictor_matrices, separate_heights,
@@ -65,7 +355,8 @@ def _unpermute_one_predictor(
     """Unpermutes values of one predictor (replaces permuted with clean values).
 
     Specifically, will unpermute values of the [j]th predictor in the [i]th
-    matrix, where i = `matrix_index` and j = `predictor_index`.
+    matrix, where i = `matrix_index` and j = `predictor_index`.  This is done in
+    place.
 
     :param predictor_matrices: See doc for `permute_one_predictor`.
     :param clean_predictor_matrices: Clean version of `predictor_matrices` (with
@@ -76,31 +367,13 @@ def _unpermute_one_predictor(
     :return: predictor_matrices: Same as input but after unpermuting.
     """
 
-    i = matrix_index
-    j = predictor_index
-    num_spatial_dim = len(predictor_matrices[i].shape) - 2
-
-    if num_spatial_dim == 3 and separate_heights:
-        predictor_matrices[i], original_shape = flatten_last_two_dim(
-            predictor_matrices[i]
-        )
-
-        clean_predictor_matrices[i] = flatten_last_two_dim(
-            clean_predictor_matrices[i]
-        )[0]
-    else:
-        original_shape = None
-
-    predictor_matrices[i][..., j] = clean_predictor_matrices[i][..., j]
-
-    if original_shape is not None:
-        predictor_matrices[i] = numpy.reshape(
-            predictor_matrices[i], original_shape, order='F'
-        )
+    these_values = _get_predictor_values(
+        predictor_matrix=predictor_matrices[matrix_index],
+        separate_heights=separate_heights, predictor_index=predictor_index)
 
-        clean_predictor_matrices[i] = numpy.reshape(
-            clean_predictor_matrices[i], original_shape, order='F'
-        )
+    these_values[:] = _get_predictor_values(
+        predictor_matrix=clean_predictor_matrices[matrix_index],
+        separate_heights=separate_heights, predictor_index=predictor_index)
 
     return predictor_matrices
 
@@ -190,7 +463,8 @@ def permute_one_predictor(
     :param permuted_values: numpy array of permuted values with which to replace
         clean values.  If None, permuted values will be created randomly on the
         fly.
-    :return: predictor_matrices: Same as input but after permutation.
+    :return: predictor_matrices: Same as input but after permutation (which is
+        done in place).
     :return: permuted_values: numpy array of permuted values with which clean
         values were replaced.
     """
@@ -210,49 +484,157 @@ def permute_one_predictor(
         error_checking.assert_is_numpy_array_without_nan(permuted_values)
 
     # Do dirty work.
-    i = matrix_index
-    j = predictor_index
-    num_spatial_dim = len(predictor_matrices[i].shape) - 2
+    these_values = _get_predictor_values(
+        predictor_matrix=predictor_matrices[matrix_index],
+        separate_heights=separate_heights, predictor_index=predictor_index)
 
-    if num_spatial_dim == 3 and separate_heights:
-        predictor_matrices[i], original_shape = flatten_last_two_dim(
-            predictor_matrices[i]
-        )
+    if permuted_values is None:
+        random_indices = numpy.random.permutation(these_values.shape[0])
+        these_values[:] = these_values[random_indices, ...]
     else:
-        original_shape = None
+        these_values[:] = permuted_values
 
-    if permuted_values is None:
-        random_indices = numpy.random.permutation(
-            predictor_matrices[i].shape[0]
-        )
-        predictor_matrices[i][..., j] = (
-            predictor_matrices[i][random_indices, ..., j]
-        )
+    return predictor_matrices, these_values.copy()
 
-        # predictor_matrices[i][..., j] = numpy.take(
-        #     predictor_matrices[i][..., j],
-        #     indices=numpy.random.permutation(predictor_matrices[i].shape[0]),
-        #     axis=0
-        # )
-    else:
-        predictor_matrices[i][..., j] = permuted_values
 
-    permuted_values = predictor_matrices[i][..., j]
+def apply_permutation_seeds(
+        predictor_matrices, clean_predictor_matrices, separate_heights,
+        new_seeds_by_matrix, old_seeds_by_matrix=None):
+    """Puts predictor matrices in the permutation state given by seeds.
 
-    if original_shape is not None:
-        predictor_matrices[i] = numpy.reshape(
-            predictor_matrices[i], original_shape, order='F'
-        )
+    The permutation state of all predictors is described by one list of seeds,
+    where the seed for the [j]th predictor in the [i]th matrix is
+    `seeds_by_matrix[i][j]`.  A seed of `NO_PERMUTATION_SEED` means that the
+    predictor is clean (unpermuted); any other seed means that the predictor is
+    permuted as in `_permute_values`.
+
+    T = number of input tensors to the model
+    P_i = number of predictors in [i]th input tensor
+
+    :param predictor_matrices: See doc for `permute_one_predictor`.
+    :param clean_predictor_matrices: Clean version of `predictor_matrices` (with
+        no values permuted).
+    :param separate_heights: See doc for `permute_one_predictor`.
+    :param new_seeds_by_matrix: length-T list of numpy arrays, where the [i]th
+        array contains seeds (integers) for the P_i predictors in the [i]th
+        tensor.  This is the desired state.
+    :param old_seeds_by_matrix: Same but for current state of
+        `predictor_matrices`.  Only predictors whose seed has changed will be
+        rewritten.  If None, all predictors will be rewritten.
+    :return: predictor_matrices: Same as input but in the new state (changed in
+        place).
+    """
 
-    return predictor_matrices, permuted_values
+    num_matrices = len(predictor_matrices)
+
+    for i in range(num_matrices):
+        for j in range(len(new_seeds_by_matrix[i])):
+            this_seed = new_seeds_by_matrix[i][j]
+
+            if (old_seeds_by_matrix is not None and
+                    old_seeds_by_matrix[i][j] == this_seed):
+                continue
+
+            these_values = _get_predictor_values(
+                predictor_matrix=predictor_matrices[i],
+                separate_heights=separate_heights, predictor_index=j)
+            these_clean_values = _get_predictor_values(
+                predictor_matrix=clean_predictor_matrices[i],
+                separate_heights=separate_heights, predictor_index=j)
+
+            if this_seed == NO_PERMUTATION_SEED:
+                these_values[:] = these_clean_values
+            else:
+                these_values[:] = _permute_values(
+                    predictor_values=these_clean_values,
+                    permutation_seed=this_seed)
+
+    return predictor_matrices
+
+
+def init_permutation_worker(
+        model_file_name, model_reading_function, prediction_function,
+        cost_function, clean_predictor_matrices, target_values,
+        separate_heights, num_bootstrap_reps):
+    """Initializes worker process for permutation test.
+
+    Each worker reads its own copy of the model and keeps its own copy of the
+    predictor matrices, which are brought up to date with the main process
+    (via permutation seeds) before each candidate predictor is evaluated.
+
+    :param model_file_name: Path to model file.
+    :param model_reading_function: Function used to read model (e.g.,
+        `cnn.read_model`), with the following inputs and outputs.
+    Input: model_file_name: Same as input to this method.
+    Output: model_object: See doc for `run_forward_test_one_step`.
+
+    :param prediction_function: See doc for `run_forward_test_one_step`.
+    :param cost_function: Same.
+    :param clean_predictor_matrices: See doc for `apply_permutation_seeds`.
+    :param target_values: See doc for `run_forward_test_one_step`.
+    :param separate_heights: Same.
+    :param num_bootstrap_reps: Same.
+    """
+
+    WORKER_STATE_DICT.update({
+        MODEL_OBJECT_KEY: model_reading_function(model_file_name),
+        PREDICTOR_MATRICES_KEY: [a + 0. for a in clean_predictor_matrices],
+        CLEAN_MATRICES_KEY: clean_predictor_matrices,
+        PERMUTATION_SEEDS_KEY: None,
+        TARGET_VALUES_KEY: target_values,
+        PREDICTION_FUNCTION_KEY: prediction_function,
+        COST_FUNCTION_KEY: cost_function,
+        SEPARATE_HEIGHTS_KEY: separate_heights,
+        NUM_BOOTSTRAP_REPS_KEY: num_bootstrap_reps
+    })
+
+
+def create_worker_pool(
+        num_processes, model_file_name, model_reading_function,
+        prediction_function, cost_function, clean_predictor_matrices,
+        target_values, separate_heights, num_bootstrap_reps):
+    """Creates pool of worker processes for permutation test.
+
+    Workers are started with the "spawn" method, so that each one builds its
+    own deep-learning session rather than inheriting the parent's.
+
+    :param num_processes: Number of worker processes.
+    :param model_file_name: See doc for `init_permutation_worker`.
+    :param model_reading_function: Same.
+    :param prediction_function: Same.
+    :param cost_function: Same.
+    :param clean_predictor_matrices: Same.
+    :param target_values: Same.
+    :param separate_heights: Same.
+    :param num_bootstrap_reps: Same.
+    :return: worker_pool: Instance of `multiprocessing.pool.Pool`.  When done,
+        the caller should close and join the pool.
+    """
+
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_geq(num_processes, 1)
+    error_checking.assert_is_string(model_file_name)
+
+    return multiprocessing.get_context('spawn').Pool(
+        processes=num_processes, initializer=init_permutation_worker,
+        initargs=(
+            model_file_name, model_reading_function, prediction_function,
+            cost_function, clean_predictor_matrices, target_values,
+            separate_heights, num_bootstrap_reps
+        )
+    )
 
 
 def run_forward_test_one_step(
         model_object, predictor_matrices, predictor_names_by_matrix,
         target_values, prediction_function, cost_function, separate_heights,
-        num_bootstrap_reps, step_num, permuted_flags_by_matrix):
+        num_bootstrap_reps, step_num, permuted_flags_by_matrix,
+        permutation_seeds_by_matrix=None, worker_pool=None):
     """Runs one step of the forward permutation test.
 
+    Each candidate predictor is permuted in place, evaluated, and restored, so
+    the predictor matrices are never copied as a whole.
+
     T = number of input tensors to the model
     E = number of examples
     K = number of classes
@@ -294,11 +676,18 @@ def run_forward_test_one_step(
         [i]th array contains Boolean flags, indicating which predictors in the
         [i]th tensor have yet been permuted.  The [i]th array should have length
         P_i.
+    :param permutation_seeds_by_matrix: Current permutation state (see doc for
+        `apply_permutation_seeds`).  If None, will assume that all predictors
+        are clean, unless some are flagged as permuted.
+    :param worker_pool: Pool created by `create_worker_pool`.  If None, all
+        candidate predictors will be evaluated in this process.
     :return: forward_step_dict: Dictionary with the following keys.
     forward_step_dict["predictor_matrices"]: Same as input but maybe with
         different values.
     forward_step_dict["permuted_flags_by_matrix"]: Same as input but maybe with
         different values.
+    forward_step_dict["permutation_seeds_by_matrix"]: Permutation state after
+        this step.
     forward_step_dict["permuted_predictor_names"]: length-P list with names of
         predictors permuted in this step.
     forward_step_dict["permuted_cost_matrix"]: P-by-B numpy array of costs after
@@ -307,81 +696,71 @@ def run_forward_test_one_step(
         step.
     forward_step_dict["best_cost_array"]: length-B numpy array of costs after
         permutation of best predictor.
+    :raises: ValueError: if `worker_pool` is specified, some predictors are
+        already permuted, and `permutation_seeds_by_matrix` is None.
     """
 
-    best_matrix_index = -1
-    best_predictor_index = -1
-    best_permuted_values = None
-
-    permuted_predictor_names = []
-    permuted_cost_matrix = numpy.full((0, num_bootstrap_reps), numpy.nan)
-    best_cost_array = numpy.full(num_bootstrap_reps, -numpy.inf)
-
-    num_matrices = len(predictor_matrices)
-
-    for i in range(num_matrices):
-        this_num_predictors = len(predictor_names_by_matrix[i])
-
-        for j in range(this_num_predictors):
-            if permuted_flags_by_matrix[i][j]:
-                continue
-
-            print('Permuting predictor "{0:s}" at step {1:d}...'.format(
-                predictor_names_by_matrix[i][j], step_num
-            ))
-            exec_start_time_unix_sec = time.time()
-
-            these_predictor_matrices, these_permuted_values = (
-                permute_one_predictor(
-                    predictor_matrices=[a + 0. for a in predictor_matrices],
-                    separate_heights=separate_heights,
-                    matrix_index=i, predictor_index=j)
+    if permutation_seeds_by_matrix is None:
+        if worker_pool is not None and numpy.any(
+                numpy.concatenate(permuted_flags_by_matrix)
+        ):
+            error_string = (
+                'Worker processes cannot reproduce the permuted predictors '
+                'without their permutation seeds.'
             )
 
-            elapsed_time_sec = time.time() - exec_start_time_unix_sec
-            print('Time elapsed = {0:.2f} seconds'.format(elapsed_time_sec))
-
-            this_probability_matrix = prediction_function(
-                model_object, these_predictor_matrices)
-            print(MINOR_SEPARATOR_STRING)
+            raise ValueError(error_string)
 
-            this_cost_array = bootstrap_cost(
-                target_values=target_values,
-                class_probability_matrix=this_probability_matrix,
-                cost_function=cost_function, num_replicates=num_bootstrap_reps)
+        permutation_seeds_by_matrix = [
+            numpy.full(len(f), NO_PERMUTATION_SEED, dtype=int)
+            for f in permuted_flags_by_matrix
+        ]
 
-            this_cost_matrix = numpy.reshape(
-                this_cost_array, (1, len(this_cost_array))
-            )
-
-            permuted_predictor_names.append(predictor_names_by_matrix[i][j])
-            permuted_cost_matrix = numpy.concatenate(
-                (permuted_cost_matrix, this_cost_matrix), axis=0
-            )
-
-            if numpy.mean(this_cost_array) < numpy.mean(best_cost_array):
-                continue
-
-            best_matrix_index = i + 0
-            best_predictor_index = j + 0
-            best_permuted_values = these_permuted_values + 0.
+    index_pairs = []
+    num_matrices = len(predictor_matrices)
 
-            best_cost_array = this_cost_array + 0.
+    for i in range(num_matrices):
+        for j in range(len(predictor_names_by_matrix[i])):
+            if not permuted_flags_by_matrix[i][j]:
+                index_pairs.append((i, j))
 
-    if len(permuted_predictor_names) == 0:
+    if len(index_pairs) == 0:
         return None
 
-    i = best_matrix_index + 0
-    j = best_predictor_index + 0
+    permutation_seeds = [_draw_permutation_seed() for _ in index_pairs]
+
+    permuted_cost_matrix = _evaluate_many_predictors(
+        model_object=model_object, predictor_matrices=predictor_matrices,
+        clean_predictor_matrices=None, target_values=target_values,
+        prediction_function=prediction_function, cost_function=cost_function,
+        separate_heights=separate_heights,
+        num_bootstrap_reps=num_bootstrap_reps, step_num=step_num,
+        predictor_names_by_matrix=predictor_names_by_matrix,
+        index_pairs=index_pairs, permutation_seeds=permutation_seeds,
+        permutation_seeds_by_matrix=permutation_seeds_by_matrix,
+        worker_pool=worker_pool)
+
+    permuted_predictor_names = [
+        predictor_names_by_matrix[i][j] for i, j in index_pairs
+    ]
+
+    # In case of tie, the last candidate wins.
+    mean_costs = numpy.mean(permuted_cost_matrix, axis=1)
+    best_index = len(mean_costs) - 1 - numpy.argmax(mean_costs[::-1])
+    best_cost_array = permuted_cost_matrix[best_index, :] + 0.
+
+    i, j = index_pairs[best_index]
     best_predictor_name = predictor_names_by_matrix[i][j]
     permuted_flags_by_matrix[i][j] = True
+    permutation_seeds_by_matrix[i][j] = permutation_seeds[best_index]
 
     exec_start_time_unix_sec = time.time()
-    predictor_matrices = permute_one_predictor(
-        predictor_matrices=predictor_matrices,
-        separate_heights=separate_heights,
-        matrix_index=i, predictor_index=j, permuted_values=best_permuted_values
-    )[0]
+    these_values = _get_predictor_values(
+        predictor_matrix=predictor_matrices[i],
+        separate_heights=separate_heights, predictor_index=j)
+    these_values[:] = _permute_values(
+        predictor_values=these_values,
+        permutation_seed=permutation_seeds[best_index])
     elapsed_time_sec = time.time() - exec_start_time_unix_sec
 
     print('Best predictor = "{0:s}" ... cost = {1:.4f}'.format(
@@ -397,6 +776,7 @@ def run_forward_test_one_step(
     return {
         PREDICTOR_MATRICES_KEY: predictor_matrices,
         PERMUTED_FLAGS_KEY: permuted_flags_by_matrix,
+        PERMUTATION_SEEDS_KEY: permutation_seeds_by_matrix,
         PERMUTED_PREDICTORS_KEY: permuted_predictor_names,
         PERMUTED_COST_MATRIX_KEY: permuted_cost_matrix,
         BEST_PREDICTOR_KEY: best_predictor_name,
@@ -408,7 +788,8 @@ def run_backwards_test_one_step(
         model_object, predictor_matrices, clean_predictor_matrices,
         predictor_names_by_matrix, target_values, prediction_function,
         cost_function, separate_heights, num_bootstrap_reps, step_num,
-        permuted_flags_by_matrix):
+        permuted_flags_by_matrix, permutation_seeds_by_matrix=None,
+        worker_pool=None):
     """Runs one step of the backwards permutation test.
 
     B = number of bootstrap replicates
@@ -426,12 +807,18 @@ def run_backwards_test_one_step(
     :param num_bootstrap_reps: Same.
     :param step_num: Same.
     :param permuted_flags_by_matrix: Same.
+    :param permutation_seeds_by_matrix: Current permutation state (see doc for
+        `apply_permutation_seeds`).  Must be specified if `worker_pool` is
+        specified.
+    :param worker_pool: See doc for `run_forward_test_one_step`.
 
     :return: backwards_step_dict: Dictionary with the following keys.
     backwards_step_dict["predictor_matrices"]: Same as input but maybe with
         different values.
     backwards_step_dict["permuted_flags_by_matrix"]: Same as input but maybe
         with different values.
+    backwards_step_dict["permutation_seeds_by_matrix"]: Permutation state after
+        this step (None if input was None).
     backwards_step_dict["unpermuted_predictor_names"]: length-P list with names
         of predictors unpermuted in this step.
     backwards_step_dict["unpermuted_cost_matrix"]: P-by-B numpy array of costs
@@ -440,72 +827,56 @@ def run_backwards_test_one_step(
         step.
     backwards_step_dict["best_cost_array"]: length-B numpy array of costs after
         unpermutation of best predictor.
+    :raises: ValueError: if `worker_pool` is specified but
+        `permutation_seeds_by_matrix` is not.
     """
 
-    best_matrix_index = -1
-    best_predictor_index = -1
+    if worker_pool is not None and permutation_seeds_by_matrix is None:
+        error_string = (
+            'Worker processes cannot reproduce the permuted predictors without '
+            'their permutation seeds.'
+        )
 
-    unpermuted_predictor_names = []
-    unpermuted_cost_matrix = numpy.full((0, num_bootstrap_reps), numpy.nan)
-    best_cost_array = numpy.full(num_bootstrap_reps, numpy.inf)
+        raise ValueError(error_string)
 
+    index_pairs = []
     num_matrices = len(predictor_matrices)
 
     for i in range(num_matrices):
-        this_num_predictors = len(predictor_names_by_matrix[i])
-
-        for j in range(this_num_predictors):
-            if not permuted_flags_by_matrix[i][j]:
-                continue
-
-            print('Unpermuting predictor "{0:s}" at step {1:d}...'.format(
-                predictor_names_by_matrix[i][j], step_num
-            ))
-            exec_start_time_unix_sec = time.time()
-
-            these_predictor_matrices = _unpermute_one_predictor(
-                predictor_matrices=[a + 0. for a in predictor_matrices],
-                clean_predictor_matrices=clean_predictor_matrices,
-                separate_heights=separate_heights,
-                matrix_index=i, predictor_index=j
-            )
-
-            elapsed_time_sec = time.time() - exec_start_time_unix_sec
-            print('Time elapsed = {0:.2f} seconds'.format(elapsed_time_sec))
-
-            this_probability_matrix = prediction_function(
-                model_object, these_predictor_matrices)
-            print(MINOR_SEPARATOR_STRING)
-
-            this_cost_array = bootstrap_cost(
-                target_values=target_values,
-                class_probability_matrix=this_probability_matrix,
-                cost_function=cost_function, num_replicates=num_bootstrap_reps)
-
-            this_cost_matrix = numpy.reshape(
-                this_cost_array, (1, len(this_cost_array))
-            )
-
-            unpermuted_predictor_names.append(predictor_names_by_matrix[i][j])
-            unpermuted_cost_matrix = numpy.concatenate(
-                (unpermuted_cost_matrix, this_cost_matrix), axis=0
-            )
-
-            if numpy.mean(this_cost_array) > numpy.mean(best_cost_array):
-                continue
-
-            best_matrix_index = i + 0
-            best_predictor_index = j + 0
-            best_cost_array = this_cost_array + 0.
+        for j in range(len(predictor_names_by_matrix[i])):
+            if permuted_flags_by_matrix[i][j]:
+                index_pairs.append((i, j))
 
-    if len(unpermuted_predictor_names) == 0:
+    if len(index_pairs) == 0:
         return None
 
-    i = best_matrix_index + 0
-    j = best_predictor_index + 0
+    unpermuted_cost_matrix = _evaluate_many_predictors(
+        model_object=model_object, predictor_matrices=predictor_matrices,
+        clean_predictor_matrices=clean_predictor_matrices,
+        target_values=target_values, prediction_function=prediction_function,
+        cost_function=cost_function, separate_heights=separate_heights,
+        num_bootstrap_reps=num_bootstrap_reps, step_num=step_num,
+        predictor_names_by_matrix=predictor_names_by_matrix,
+        index_pairs=index_pairs, permutation_seeds=[None] * len(index_pairs),
+        permutation_seeds_by_matrix=permutation_seeds_by_matrix,
+        worker_pool=worker_pool)
+
+    unpermuted_predictor_names = [
+        predictor_names_by_matrix[i][j] for i, j in index_pairs
+    ]
+
+    # In case of tie, the last candidate wins.
+    mean_costs = numpy.mean(unpermuted_cost_matrix, axis=1)
+    best_index = len(mean_costs) - 1 - numpy.argmin(mean_costs[::-1])
+    best_cost_array = unpermuted_cost_matrix[best_index, :] + 0.
+
+    i, j = index_pairs[best_index]
     best_predictor_name = predictor_names_by_matrix[i][j]
     permuted_flags_by_matrix[i][j] = False
 
+    if permutation_seeds_by_matrix is not None:
+        permutation_seeds_by_matrix[i][j] = NO_PERMUTATION_SEED
+
     exec_start_time_unix_sec = time.time()
     predictor_matrices = _unpermute_one_predictor(
         predictor_matrices=predictor_matrices,
@@ -529,6 +900,7 @@ def run_backwards_test_one_step(
     return {
         PREDICTOR_MATRICES_KEY: predictor_matrices,
         PERMUTED_FLAGS_KEY: permuted_flags_by_matrix,
+        PERMUTATION_SEEDS_KEY: permutation_seeds_by_matrix,
         UNPERMUTED_PREDICTORS_KEY: unpermuted_predictor_names,
         UNPERMUTED_COST_MATRIX_KEY: unpermuted_cost_matrix,
         BEST_PREDICTOR_KEY: best_predictor_name,
@@ -663,3 +1035,58 @@ def read_results(pickle_file_name):
     ).format(str(missing_keys), pickle_file_name)
 
     raise ValueError(error_string)
+
+
+def write_checkpoint(checkpoint_dict, pickle_file_name):
+    """Writes checkpoint (results of all steps so far) to Pickle file.
+
+    The file is first written under a temporary name and then renamed, so that
+    an interruption during writing cannot corrupt the previous checkpoint.
+
+    :param checkpoint_dict: Dictionary with keys listed in `CHECKPOINT_KEYS`.
+    :param pickle_file_name: Path to output file.
+    :raises: ValueError: if any required keys are not found in the dictionary.
+    """
+
+    missing_keys = list(set(CHECKPOINT_KEYS) - set(checkpoint_dict.keys()))
+
+    if len(missing_keys) > 0:
+        error_string = (
+            '\n{0:s}\nKeys listed above were expected, but not found, in '
+            'dictionary.'
+        ).format(str(missing_keys))
+
+        raise ValueError(error_string)
+
+    file_system_utils.mkdir_recursive_if_necessary(file_name=pickle_file_name)
+    temp_file_name = '{0:s}.tmp'.format(pickle_file_name)
+
+    pickle_file_handle = open(temp_file_name, 'wb')
+    pickle.dump(checkpoint_dict, pickle_file_handle)
+    pickle_file_handle.close()
+
+    os.replace(temp_file_name, pickle_file_name)
+
+
+def read_checkpoint(pickle_file_name):
+    """Reads checkpoint from Pickle file.
+
+    :param pickle_file_name: Path to input file.
+    :return: checkpoint_dict: See doc for `write_checkpoint`.
+    :raises: ValueError: if any required keys are not found in the dictionary.
+    """
+
+    pickle_file_handle = open(pickle_file_name, 'rb')
+    checkpoint_dict = pickle.load(pickle_file_handle)
+    pickle_file_handle.close()
+
+    missing_keys = list(set(CHECKPOINT_KEYS) - set(checkpoint_dict.keys()))
+    if len(missing_keys) == 0:
+        return checkpoint_dict
+
+    error_string = (
+        '\n{0:s}\nKeys listed above were expected, but not found, in file '
+        '"{1:s}".'
+    ).format(str(missing_keys), pickle_file_name)
+
+    raise ValueError(error_string)
@@ -74,6 +74,12 @@ THIRD_SEPARATE_FLAG_FOR_PERMUTN = False
 THIRD_MATRIX_INDEX_FOR_PERMUTN = 0
 THIRD_PRED_INDEX_FOR_PERMUTN = 1
 
+# The following constants are used to test apply_permutation_seeds.
+SEEDS_BY_MATRIX_FOR_PERMUTN = [
+    numpy.array([-1, 6695, -1, -1, 1234, -1], dtype=int),
+    numpy.array([-1, 42], dtype=int)
+]
+
 # The following constants are used to test cross_entropy_function,
 # negative_auc_function, and bootstrap_cost.
 BINARY_TARGET_VALUES = numpy.array([0, 0, 1, 0, 0, 0, 1, 0, 1, 1, 0], dtype=int)
@@ -399,6 +405,67 @@ class PermutationUtilsTests(unittest.TestCase):
                 atol=TOLERANCE
             ))
 
+    def test_get_predictor_values(self):
+        """Ensures correct output from _get_predictor_values.
+
+        In this case, predictor/height pairs are separate, so the values should
+        match those from `flatten_last_two_dim`.
+        """
+
+        this_flattened_matrix = permutation_utils.flatten_last_two_dim(
+            RADAR_MATRIX_3D
+        )[0]
+
+        for j in range(this_flattened_matrix.shape[-1]):
+            these_values = permutation_utils._get_predictor_values(
+                predictor_matrix=RADAR_MATRIX_3D, separate_heights=True,
+                predictor_index=j)
+
+            self.assertTrue(numpy.allclose(
+                these_values, this_flattened_matrix[..., j], atol=TOLERANCE
+            ))
+
+    def test_apply_permutation_seeds(self):
+        """Ensures correct output from apply_permutation_seeds.
+
+        Permuting with seeds and then returning to the clean state (all seeds
+        = `NO_PERMUTATION_SEED`) should recover the original matrices.
+        """
+
+        these_new_matrices = permutation_utils.apply_permutation_seeds(
+            predictor_matrices=copy.deepcopy(PREDICTOR_MATRICES_FOR_PERMUTN),
+            clean_predictor_matrices=PREDICTOR_MATRICES_FOR_PERMUTN,
+            separate_heights=True,
+            new_seeds_by_matrix=SEEDS_BY_MATRIX_FOR_PERMUTN)
+
+        these_newnew_matrices = permutation_utils.apply_permutation_seeds(
+            predictor_matrices=copy.deepcopy(PREDICTOR_MATRICES_FOR_PERMUTN),
+            clean_predictor_matrices=PREDICTOR_MATRICES_FOR_PERMUTN,
+            separate_heights=True,
+            new_seeds_by_matrix=SEEDS_BY_MATRIX_FOR_PERMUTN)
+
+        for i in range(len(these_new_matrices)):
+            self.assertTrue(numpy.allclose(
+                these_new_matrices[i], these_newnew_matrices[i],
+                atol=TOLERANCE
+            ))
+
+        these_orig_matrices = permutation_utils.apply_permutation_seeds(
+            predictor_matrices=these_new_matrices,
+            clean_predictor_matrices=PREDICTOR_MATRICES_FOR_PERMUTN,
+            separate_heights=True,
+            new_seeds_by_matrix=[
+                numpy.full(len(s), permutation_utils.NO_PERMUTATION_SEED)
+                for s in SEEDS_BY_MATRIX_FOR_PERMUTN
+            ],
+            old_seeds_by_matrix=SEEDS_BY_MATRIX_FOR_PERMUTN)
+
+        for i in range(len(these_orig_matrices)):
+            self.assertTrue(numpy.allclose(
+                these_orig_matrices[i], PREDICTOR_MATRICES_FOR_PERMUTN[i],
+                atol=TOLERANCE
+            ))
+
     def test_flatten_last_two_dim(self):
         """Ensures correct output from flatten_last_two_dim."""
 
@@ -10,6 +10,8 @@ from gewittergefahr.deep_learning import model_interpretation
 TOLERANCE = 1e-6
 DEFAULT_IDEAL_ACTIVATION = 2.
 
+SALIENCY_FUNCTION_DICT = {}
+
 PREDICTOR_MATRICES_KEY = model_interpretation.PREDICTOR_MATRICES_KEY
 SALIENCY_MATRICES_KEY = 'saliency_matrices'
 MODEL_FILE_KEY = model_interpretation.MODEL_FILE_KEY
@@ -162,23 +164,14 @@ def check_metadata(
     }
 
 
-def do_saliency_calculations(
-        model_object, loss_tensor, list_of_input_matrices):
-    """Does saliency calculations.
-
-    T = number of input tensors to the model
-    E = number of examples (storm objects)
+def _make_saliency_function(model_object, loss_tensor):
+    """Creates saliency function.
 
     :param model_object: Instance of `keras.models.Model`.
     :param loss_tensor: Keras tensor defining the loss function.
-    :param list_of_input_matrices: length-T list of numpy arrays, comprising one
-        or more examples (storm objects).  list_of_input_matrices[i] must have
-        the same dimensions as the [i]th input tensor to the model.
-    :return: list_of_saliency_matrices: length-T list of numpy arrays,
-        comprising the saliency map for each example.
-        list_of_saliency_matrices[i] has the same dimensions as
-        list_of_input_matrices[i] and defines the "saliency" of each value x,
-        which is the gradient of the loss function with respect to x.
+    :return: saliency_function: Instance of `keras.backend.function`.  Inputs
+        are the input tensors to the model and the learning phase; outputs are
+        normalized gradients of the loss with respect to each input tensor.
     """
 
     if isinstance(model_object.input, list):
@@ -194,36 +187,81 @@ def do_saliency_calculations(
             K.std(list_of_gradient_tensors[i]), K.epsilon()
         )
 
-    inputs_to_gradients_function = K.function(
+    return K.function(
         list_of_input_tensors + [K.learning_phase()], list_of_gradient_tensors
     )
 
-    # list_of_saliency_matrices = None
-    # num_examples = list_of_input_matrices[0].shape[0]
-    #
-    # for i in range(num_examples):
-    #     these_input_matrices = [a[[i], ...] for a in list_of_input_matrices]
-    #     these_saliency_matrices = inputs_to_gradients_function(
-    #         these_input_matrices + [0])
-    #
-    #     if list_of_saliency_matrices is None:
-    #         list_of_saliency_matrices = these_saliency_matrices + []
-    #     else:
-    #         for i in range(num_input_tensors):
-    #             list_of_saliency_matrices[i] = numpy.concatenate(
-    #                 (list_of_saliency_matrices[i], these_saliency_matrices[i]),
-    #                 axis=0)
-
-    list_of_saliency_matrices = inputs_to_gradients_function(
-        list_of_input_matrices + [0]
-    )
 
-    for i in range(num_input_tensors):
+def _run_saliency_function(saliency_function, list_of_input_matrices):
+    """Runs saliency function.
+
+    :param saliency_function: Function created by `_make_saliency_function`.
+    :param list_of_input_matrices: See doc for `do_saliency_calculations`.
+    :return: list_of_saliency_matrices: Same.
+    """
+
+    list_of_saliency_matrices = saliency_function(list_of_input_matrices + [0])
+
+    for i in range(len(list_of_saliency_matrices)):
         list_of_saliency_matrices[i] *= -1
 
     return list_of_saliency_matrices
 
 
+def _get_saliency_maps_cached(model_object, cache_key, loss_function,
+                              list_of_input_matrices):
+    """Creates saliency maps, reusing the saliency function if possible.
+
+    Saliency functions are cached by model and `cache_key`, so that the Keras
+    graph is created only once for each model component.
+
+    :param model_object: Instance of `keras.models.Model`.
+    :param cache_key: Tuple (must be hashable) identifying the model component.
+    :param loss_function: Function that takes no arguments and returns the loss
+        tensor.  Called only if the saliency function is not yet cached.
+    :param list_of_input_matrices: See doc for `do_saliency_calculations`.
+    :return: list_of_saliency_matrices: Same.
+    """
+
+    full_cache_key = (model_object,) + cache_key
+
+    if full_cache_key not in SALIENCY_FUNCTION_DICT:
+        SALIENCY_FUNCTION_DICT[full_cache_key] = _make_saliency_function(
+            model_object=model_object, loss_tensor=loss_function()
+        )
+
+    return _run_saliency_function(
+        saliency_function=SALIENCY_FUNCTION_DICT[full_cache_key],
+        list_of_input_matrices=list_of_input_matrices)
+
+
+def do_saliency_calculations(
+        model_object, loss_tensor, list_of_input_matrices):
+    """Does saliency calculations.
+
+    T = number of input tensors to the model
+    E = number of examples (storm objects)
+
+    :param model_object: Instance of `keras.models.Model`.
+    :param loss_tensor: Keras tensor defining the loss function.
+    :param list_of_input_matrices: length-T list of numpy arrays, comprising one
+        or more examples (storm objects).  list_of_input_matrices[i] must have
+        the same dimensions as the [i]th input tensor to the model.
+    :return: list_of_saliency_matrices: length-T list of numpy arrays,
+        comprising the saliency map for each example.
+        list_of_saliency_matrices[i] has the same dimensions as
+        list_of_input_matrices[i] and defines the "saliency" of each value x,
+        which is the gradient of the loss function with respect to x.
+    """
+
+    saliency_function = _make_saliency_function(
+        model_object=model_object, loss_tensor=loss_tensor)
+
+    return _run_saliency_function(
+        saliency_function=saliency_function,
+        list_of_input_matrices=list_of_input_matrices)
+
+
 def get_saliency_maps_for_class_activation(
         model_object, target_class, list_of_input_matrices):
     """For each input example, creates saliency map for prob of target class.
@@ -244,20 +282,31 @@ def get_saliency_maps_for_class_activation(
 
     if num_output_neurons == 1:
         error_checking.assert_is_leq(target_class, 1)
-        if target_class == 1:
-            loss_tensor = K.mean(
-                (model_object.layers[-1].output[..., 0] - 1) ** 2
-            )
-        else:
-            loss_tensor = K.mean(model_object.layers[-1].output[..., 0] ** 2)
     else:
         error_checking.assert_is_less_than(target_class, num_output_neurons)
-        loss_tensor = K.mean(
-            (model_object.layers[-1].output[..., target_class] - 1) ** 2
-        )
 
-    return do_saliency_calculations(
-        model_object=model_object, loss_tensor=loss_tensor,
+    def loss_function():
+        """Returns loss tensor.
+
+        :return: loss_tensor: Keras tensor defining the loss function.
+        """
+
+        if num_output_neurons > 1:
+            return K.mean(
+                (model_object.layers[-1].output[..., target_class] - 1) ** 2
+            )
+
+        if target_class == 1:
+            return K.mean((model_object.layers[-1].output[..., 0] - 1) ** 2)
+
+        return K.mean(model_object.layers[-1].output[..., 0] ** 2)
+
+    return _get_saliency_maps_cached(
+        model_object=model_object,
+        cache_key=(
+            model_interpretation.CLASS_COMPONENT_TYPE_STRING, target_class
+        ),
+        loss_function=loss_function,
         list_of_input_matrices=list_of_input_matrices)
 
 
@@ -287,27 +336,28 @@ def get_saliency_maps_for_neuron_activation(
         layer_name=layer_name, ideal_activation=ideal_activation,
         neuron_indices=neuron_indices)
 
-    if ideal_activation is None:
-        loss_tensor = (
-            -K.sign(
-                model_object.get_layer(name=layer_name).output[
-                    0, ..., neuron_indices
-                ]
-            )
-            * model_object.get_layer(name=layer_name).output[
-                0, ..., neuron_indices
-            ] ** 2
-        )
-    else:
-        loss_tensor = (
-            model_object.get_layer(name=layer_name).output[
-                0, ..., neuron_indices
-            ]
-            - ideal_activation
-        ) ** 2
+    def loss_function():
+        """Returns loss tensor.
+
+        :return: loss_tensor: Keras tensor defining the loss function.
+        """
+
+        activation_tensor = model_object.get_layer(name=layer_name).output[
+            0, ..., neuron_indices
+        ]
+
+        if ideal_activation is None:
+            return -K.sign(activation_tensor) * activation_tensor ** 2
 
-    return do_saliency_calculations(
-        model_object=model_object, loss_tensor=loss_tensor,
+        return (activation_tensor - ideal_activation) ** 2
+
+    return _get_saliency_maps_cached(
+        model_object=model_object,
+        cache_key=(
+            model_interpretation.NEURON_COMPONENT_TYPE_STRING, layer_name,
+            tuple(neuron_indices), ideal_activation
+        ),
+        loss_function=loss_function,
         list_of_input_matrices=list_of_input_matrices)
 
 
@@ -342,24 +392,33 @@ def get_saliency_maps_for_channel_activation(
         channel_index=channel_index
     )
 
-    if ideal_activation is None:
-        loss_tensor = -K.abs(stat_function_for_neuron_activations(
-            model_object.get_layer(name=layer_name).output[
-                0, ..., channel_index
-            ]
-        ))
-    else:
+    if ideal_activation is not None:
         error_checking.assert_is_greater(ideal_activation, 0.)
-        loss_tensor = K.abs(
-            stat_function_for_neuron_activations(
-                model_object.get_layer(name=layer_name).output[
-                    0, ..., channel_index]
-            )
-            - ideal_activation
+
+    def loss_function():
+        """Returns loss tensor.
+
+        :return: loss_tensor: Keras tensor defining the loss function.
+        """
+
+        activation_tensor = stat_function_for_neuron_activations(
+            model_object.get_layer(name=layer_name).output[
+                0, ..., channel_index]
         )
 
-    return do_saliency_calculations(
-        model_object=model_object, loss_tensor=loss_tensor,
+        if ideal_activation is None:
+            return -K.abs(activation_tensor)
+
+        return K.abs(activation_tensor - ideal_activation)
+
+    return _get_saliency_maps_cached(
+        model_object=model_object,
+        cache_key=(
+            model_interpretation.CHANNEL_COMPONENT_TYPE_STRING, layer_name,
+            channel_index, stat_function_for_neuron_activations,
+            ideal_activation
+        ),
+        loss_function=loss_function,
         list_of_input_matrices=list_of_input_matrices)
 
 
@@ -47,10 +47,7 @@ NUM_BOTTOM_PADDING_ROWS_KEY = 'num_padding_rows_at_bottom'
 NUM_LEFT_PADDING_COLS_KEY = 'num_padding_columns_at_left'
 NUM_RIGHT_PADDING_COLS_KEY = 'num_padding_columns_at_right'
 
-ROTATED_NON_SHEAR_LATITUDES_COLUMN = 'rotated_lat_matrix_non_shear_deg'
-ROTATED_NON_SHEAR_LONGITUDES_COLUMN = 'rotated_lng_matrix_non_shear_deg'
-ROTATED_SHEAR_LATITUDES_COLUMN = 'rotated_lat_matrix_for_shear_deg'
-ROTATED_SHEAR_LONGITUDES_COLUMN = 'rotated_lng_matrix_for_shear_deg'
+NUM_STORMS_PER_ROTATION_CHUNK = 1000
 
 STORM_IMAGE_MATRIX_KEY = 'storm_image_matrix'
 FULL_IDS_KEY = 'full_storm_id_strings'
@@ -474,9 +471,14 @@ def _rotate_grid_one_storm_object(
 
 def _rotate_grids_many_storm_objects(
         storm_object_table, num_storm_image_rows, num_storm_image_columns,
-        storm_grid_spacing_metres, for_azimuthal_shear):
+        storm_grid_spacing_metres):
     """Creates rotated, storm-centered grid for each storm object.
 
+    This method is a vectorized version of `_rotate_grid_one_storm_object`.
+    Storm objects are handled in chunks of `NUM_STORMS_PER_ROTATION_CHUNK`, to
+    bound memory usage.
+
+    L = number of storm objects
     m = number of rows in each storm-centered grid
     n = number of columns in each storm-centered grid
 
@@ -491,51 +493,107 @@ def _rotate_grids_many_storm_objects(
     :param num_storm_image_columns: n in the above discussion.
     :param storm_grid_spacing_metres: Spacing between grid points in adjacent
         rows or columns.
-    :param for_azimuthal_shear: Boolean flag.  If True (False), the grids will
-        be created will be used for azimuthal shear (other fields).  This option
-        affects only the names of the output columns.
-    :return: storm_object_table: Same as input, but with two new columns.
-    storm_object_table.rotated_lat_matrix_non_shear_deg: m-by-n numpy array with
+    :return: grid_point_lat_matrix_deg: L-by-m-by-n numpy array (float32) with
         latitudes (deg N) of grid points.
-    storm_object_table.rotated_lng_matrix_non_shear_deg: m-by-n numpy array with
+    :return: grid_point_lng_matrix_deg: L-by-m-by-n numpy array (float32) with
         longitudes (deg E) of grid points.
-    If `for_azimuthal_shear = True`, these columns will be named
-    "rotated_lat_matrix_for_shear_deg" and "rotated_lng_matrix_for_shear_deg",
-    instead.
     """
 
     num_storm_objects = len(storm_object_table.index)
-    list_of_latitude_matrices = [None] * num_storm_objects
-    list_of_longitude_matrices = [None] * num_storm_objects
+    grid_point_lat_matrix_deg = numpy.full(
+        (num_storm_objects, num_storm_image_rows, num_storm_image_columns),
+        numpy.nan, dtype=numpy.float32
+    )
+    grid_point_lng_matrix_deg = grid_point_lat_matrix_deg + 0.
 
-    for i in range(num_storm_objects):
-        list_of_latitude_matrices[i], list_of_longitude_matrices[i] = (
-            _rotate_grid_one_storm_object(
-                centroid_latitude_deg=storm_object_table[
-                    tracking_utils.CENTROID_LATITUDE_COLUMN].values[i],
-                centroid_longitude_deg=storm_object_table[
-                    tracking_utils.CENTROID_LONGITUDE_COLUMN].values[i],
-                eastward_motion_m_s01=storm_object_table[
-                    tracking_utils.EAST_VELOCITY_COLUMN].values[i],
-                northward_motion_m_s01=storm_object_table[
-                    tracking_utils.NORTH_VELOCITY_COLUMN].values[i],
-                num_storm_image_rows=num_storm_image_rows,
-                num_storm_image_columns=num_storm_image_columns,
-                storm_grid_spacing_metres=storm_grid_spacing_metres)
+    if num_storm_objects == 0:
+        return grid_point_lat_matrix_deg, grid_point_lng_matrix_deg
+
+    storm_bearings_deg = geodetic_utils.xy_to_scalar_displacements_and_bearings(
+        x_displacements_metres=storm_object_table[
+            tracking_utils.EAST_VELOCITY_COLUMN].values.astype(float),
+        y_displacements_metres=storm_object_table[
+            tracking_utils.NORTH_VELOCITY_COLUMN].values.astype(float)
+    )[-1]
+
+    ccw_rotation_angles_rad = (
+        -(storm_bearings_deg - 90) * geodetic_utils.DEGREES_TO_RADIANS
+    )
+
+    this_max_displacement_metres = storm_grid_spacing_metres * (
+        num_storm_image_columns / 2 - 0.5)
+    this_min_displacement_metres = -1 * this_max_displacement_metres
+    x_prime_displacements_metres = numpy.linspace(
+        this_min_displacement_metres, this_max_displacement_metres,
+        num=num_storm_image_columns)
+
+    this_max_displacement_metres = storm_grid_spacing_metres * (
+        num_storm_image_rows / 2 - 0.5)
+    this_min_displacement_metres = -1 * this_max_displacement_metres
+    y_prime_displacements_metres = numpy.linspace(
+        this_min_displacement_metres, this_max_displacement_metres,
+        num=num_storm_image_rows)
+
+    (x_prime_displ_matrix_metres, y_prime_displ_matrix_metres
+    ) = grids.xy_vectors_to_matrices(
+        x_unique_metres=x_prime_displacements_metres,
+        y_unique_metres=y_prime_displacements_metres)
+
+    x_prime_displ_matrix_metres = numpy.expand_dims(
+        x_prime_displ_matrix_metres, axis=0)
+    y_prime_displ_matrix_metres = numpy.expand_dims(
+        y_prime_displ_matrix_metres, axis=0)
+
+    centroid_latitudes_deg = storm_object_table[
+        tracking_utils.CENTROID_LATITUDE_COLUMN].values.astype(float)
+    centroid_longitudes_deg = storm_object_table[
+        tracking_utils.CENTROID_LONGITUDE_COLUMN].values.astype(float)
+
+    for i in range(0, num_storm_objects, NUM_STORMS_PER_ROTATION_CHUNK):
+        this_last_index = min([
+            i + NUM_STORMS_PER_ROTATION_CHUNK, num_storm_objects
+        ])
+        these_indices = slice(i, this_last_index)
+
+        these_cosines = numpy.cos(ccw_rotation_angles_rad[these_indices])
+        these_cosines = these_cosines[:, numpy.newaxis, numpy.newaxis]
+        these_sines = numpy.sin(ccw_rotation_angles_rad[these_indices])
+        these_sines = these_sines[:, numpy.newaxis, numpy.newaxis]
+
+        this_x_displ_matrix_metres = (
+            these_cosines * x_prime_displ_matrix_metres -
+            these_sines * y_prime_displ_matrix_metres
+        )
+        this_y_displ_matrix_metres = (
+            these_sines * x_prime_displ_matrix_metres +
+            these_cosines * y_prime_displ_matrix_metres
         )
 
-    if for_azimuthal_shear:
-        argument_dict = {
-            ROTATED_SHEAR_LATITUDES_COLUMN: list_of_latitude_matrices,
-            ROTATED_SHEAR_LONGITUDES_COLUMN: list_of_longitude_matrices,
-        }
-    else:
-        argument_dict = {
-            ROTATED_NON_SHEAR_LATITUDES_COLUMN: list_of_latitude_matrices,
-            ROTATED_NON_SHEAR_LONGITUDES_COLUMN: list_of_longitude_matrices,
-        }
+        (this_scalar_displ_matrix_metres, this_bearing_matrix_deg
+        ) = geodetic_utils.xy_to_scalar_displacements_and_bearings(
+            x_displacements_metres=this_x_displ_matrix_metres,
+            y_displacements_metres=this_y_displ_matrix_metres)
 
-    return storm_object_table.assign(**argument_dict)
+        this_start_lat_matrix_deg = numpy.broadcast_to(
+            centroid_latitudes_deg[these_indices][
+                :, numpy.newaxis, numpy.newaxis],
+            this_bearing_matrix_deg.shape
+        )
+        this_start_lng_matrix_deg = numpy.broadcast_to(
+            centroid_longitudes_deg[these_indices][
+                :, numpy.newaxis, numpy.newaxis],
+            this_bearing_matrix_deg.shape
+        )
+
+        (grid_point_lat_matrix_deg[these_indices, ...],
+         grid_point_lng_matrix_deg[these_indices, ...]
+        ) = geodetic_utils.start_points_and_displacements_to_endpoints(
+            start_latitudes_deg=this_start_lat_matrix_deg,
+            start_longitudes_deg=this_start_lng_matrix_deg,
+            scalar_displacements_metres=this_scalar_displ_matrix_metres,
+            geodetic_bearings_deg=this_bearing_matrix_deg)
+
+    return grid_point_lat_matrix_deg, grid_point_lng_matrix_deg
 
 
 def _centroids_latlng_to_rowcol(
@@ -1237,12 +1295,12 @@ def extract_storm_images_myrorss_or_mrms(
                     rotated_grid_spacing_metres / 2, valid_time_strings[i]
                 ))
 
-                this_storm_object_table = _rotate_grids_many_storm_objects(
+                (this_shear_lat_matrix_deg, this_shear_lng_matrix_deg
+                ) = _rotate_grids_many_storm_objects(
                     storm_object_table=this_storm_object_table,
                     num_storm_image_rows=num_storm_image_rows * 2,
                     num_storm_image_columns=num_storm_image_columns * 2,
-                    storm_grid_spacing_metres=rotated_grid_spacing_metres / 2,
-                    for_azimuthal_shear=True)
+                    storm_grid_spacing_metres=rotated_grid_spacing_metres / 2)
 
             if any_non_azimuthal_shear:
                 print((
@@ -1252,12 +1310,12 @@ def extract_storm_images_myrorss_or_mrms(
                     rotated_grid_spacing_metres, valid_time_strings[i]
                 ))
 
-                this_storm_object_table = _rotate_grids_many_storm_objects(
+                (this_non_shear_lat_matrix_deg, this_non_shear_lng_matrix_deg
+                ) = _rotate_grids_many_storm_objects(
                     storm_object_table=this_storm_object_table,
                     num_storm_image_rows=num_storm_image_rows,
                     num_storm_image_columns=num_storm_image_columns,
-                    storm_grid_spacing_metres=rotated_grid_spacing_metres,
-                    for_azimuthal_shear=False)
+                    storm_grid_spacing_metres=rotated_grid_spacing_metres)
 
         this_num_storms = len(this_storm_object_table.index)
         this_refl_matrix_sea_relative_dbz = numpy.full(
@@ -1331,15 +1389,17 @@ def extract_storm_images_myrorss_or_mrms(
             if rotate_grids:
                 for k in range(this_num_storms):
                     if field_name_by_pair[j] in AZIMUTHAL_SHEAR_FIELD_NAMES:
-                        this_rotated_lat_matrix_deg = this_storm_object_table[
-                            ROTATED_SHEAR_LATITUDES_COLUMN].values[k]
-                        this_rotated_lng_matrix_deg = this_storm_object_table[
-                            ROTATED_SHEAR_LONGITUDES_COLUMN].values[k]
+                        this_rotated_lat_matrix_deg = this_shear_lat_matrix_deg[
+                            k, ...]
+                        this_rotated_lng_matrix_deg = this_shear_lng_matrix_deg[
+                            k, ...]
                     else:
-                        this_rotated_lat_matrix_deg = this_storm_object_table[
-                            ROTATED_NON_SHEAR_LATITUDES_COLUMN].values[k]
-                        this_rotated_lng_matrix_deg = this_storm_object_table[
-                            ROTATED_NON_SHEAR_LONGITUDES_COLUMN].values[k]
+                        this_rotated_lat_matrix_deg = (
+                            this_non_shear_lat_matrix_deg[k, ...]
+                        )
+                        this_rotated_lng_matrix_deg = (
+                            this_non_shear_lng_matrix_deg[k, ...]
+                        )
 
                     this_storm_image_matrix[
                         k, :, :
@@ -1585,12 +1645,12 @@ def extract_storm_images_gridrad(
                 rotated_grid_spacing_metres, valid_time_strings[i]
             ))
 
-            this_storm_object_table = _rotate_grids_many_storm_objects(
+            (this_rotated_lat_matrix_deg, this_rotated_lng_matrix_deg
+            ) = _rotate_grids_many_storm_objects(
                 storm_object_table=this_storm_object_table,
                 num_storm_image_rows=num_storm_image_rows,
                 num_storm_image_columns=num_storm_image_columns,
-                storm_grid_spacing_metres=rotated_grid_spacing_metres,
-                for_azimuthal_shear=False)
+                storm_grid_spacing_metres=rotated_grid_spacing_metres)
 
         this_num_storms = len(this_storm_object_table.index)
 
@@ -1648,10 +1708,10 @@ def extract_storm_images_gridrad(
                             these_full_latitudes_deg,
                             full_grid_point_longitudes_deg=
                             these_full_longitudes_deg,
-                            rotated_gp_lat_matrix_deg=this_storm_object_table[
-                                ROTATED_NON_SHEAR_LATITUDES_COLUMN].values[m],
-                            rotated_gp_lng_matrix_deg=this_storm_object_table[
-                                ROTATED_NON_SHEAR_LONGITUDES_COLUMN].values[m]
+                            rotated_gp_lat_matrix_deg=
+                            this_rotated_lat_matrix_deg[m, ...],
+                            rotated_gp_lng_matrix_deg=
+                            this_rotated_lng_matrix_deg[m, ...]
                         )
                 else:
                     these_center_rows, these_center_columns = (
@@ -2,7 +2,9 @@
 
 import unittest
 import numpy
+import pandas
 from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
 from gewittergefahr.deep_learning import storm_images
 
 TOLERANCE = 1e-6
@@ -107,6 +109,42 @@ ROTATED_LNG_MATRIX_ARBITRARY_MOTION_DEG = numpy.array([
     [246.444, 246.455, 246.465, 246.475, 246.485, 246.495]
 ])
 
+# The following constants are used to test _rotate_grids_many_storm_objects.
+THESE_EAST_VELOCITIES_M_S01 = numpy.array([
+    0, EASTWARD_MOTION_M_S01, -EASTWARD_MOTION_M_S01, 0, 0,
+    EASTWARD_MOTION_M_S01
+])
+THESE_NORTH_VELOCITIES_M_S01 = numpy.array([
+    0, 0, 0, NORTHWARD_MOTION_M_S01, -NORTHWARD_MOTION_M_S01,
+    NORTHWARD_MOTION_M_S01
+])
+
+THIS_DICT = {
+    tracking_utils.CENTROID_LATITUDE_COLUMN:
+        numpy.full(6, ONE_CENTROID_LATITUDE_DEG),
+    tracking_utils.CENTROID_LONGITUDE_COLUMN:
+        numpy.full(6, ONE_CENTROID_LONGITUDE_DEG),
+    tracking_utils.EAST_VELOCITY_COLUMN: THESE_EAST_VELOCITIES_M_S01,
+    tracking_utils.NORTH_VELOCITY_COLUMN: THESE_NORTH_VELOCITIES_M_S01
+}
+STORM_OBJECT_TABLE_ROTATED = pandas.DataFrame.from_dict(THIS_DICT)
+
+ROTATED_LAT_MATRIX_MANY_STORMS_DEG = numpy.stack((
+    ROTATED_LAT_MATRIX_ZERO_MOTION_DEG, ROTATED_LAT_MATRIX_EASTWARD_MOTION_DEG,
+    ROTATED_LAT_MATRIX_WESTWARD_MOTION_DEG,
+    ROTATED_LAT_MATRIX_NORTHWARD_MOTION_DEG,
+    ROTATED_LAT_MATRIX_SOUTHWARD_MOTION_DEG,
+    ROTATED_LAT_MATRIX_ARBITRARY_MOTION_DEG
+), axis=0)
+
+ROTATED_LNG_MATRIX_MANY_STORMS_DEG = numpy.stack((
+    ROTATED_LNG_MATRIX_ZERO_MOTION_DEG, ROTATED_LNG_MATRIX_EASTWARD_MOTION_DEG,
+    ROTATED_LNG_MATRIX_WESTWARD_MOTION_DEG,
+    ROTATED_LNG_MATRIX_NORTHWARD_MOTION_DEG,
+    ROTATED_LNG_MATRIX_SOUTHWARD_MOTION_DEG,
+    ROTATED_LNG_MATRIX_ARBITRARY_MOTION_DEG
+), axis=0)
+
 # The following constants are used to test _centroids_latlng_to_rowcol.
 NW_GRID_POINT_LAT_DEG = 55.
 NW_GRID_POINT_LNG_DEG = 230.
@@ -546,6 +584,60 @@ class StormImagesTests(unittest.TestCase):
             atol=TOLERANCE
         ))
 
+    def test_rotate_grids_many_storm_objects(self):
+        """Ensures correct output from _rotate_grids_many_storm_objects."""
+
+        this_latitude_matrix_deg, this_longitude_matrix_deg = (
+            storm_images._rotate_grids_many_storm_objects(
+                storm_object_table=STORM_OBJECT_TABLE_ROTATED,
+                num_storm_image_rows=NUM_FULL_GRID_ROWS_ROTATED,
+                num_storm_image_columns=NUM_FULL_GRID_COLUMNS_ROTATED,
+                storm_grid_spacing_metres=ROTATED_GRID_SPACING_METRES)
+        )
+
+        self.assertTrue(numpy.allclose(
+            this_latitude_matrix_deg, ROTATED_LAT_MATRIX_MANY_STORMS_DEG,
+            atol=TOLERANCE
+        ))
+        self.assertTrue(numpy.allclose(
+            this_longitude_matrix_deg, ROTATED_LNG_MATRIX_MANY_STORMS_DEG,
+            atol=TOLERANCE
+        ))
+
+    def test_rotate_grids_many_storm_objects_match_one(self):
+        """Ensures that _rotate_grids_many_storm_objects matches single-object
+        method.
+        """
+
+        this_latitude_matrix_deg, this_longitude_matrix_deg = (
+            storm_images._rotate_grids_many_storm_objects(
+                storm_object_table=STORM_OBJECT_TABLE_ROTATED,
+                num_storm_image_rows=NUM_FULL_GRID_ROWS_ROTATED,
+                num_storm_image_columns=NUM_FULL_GRID_COLUMNS_ROTATED,
+                storm_grid_spacing_metres=ROTATED_GRID_SPACING_METRES)
+        )
+
+        for i in range(len(STORM_OBJECT_TABLE_ROTATED.index)):
+            these_latitudes_deg, these_longitudes_deg = (
+                storm_images._rotate_grid_one_storm_object(
+                    centroid_latitude_deg=ONE_CENTROID_LATITUDE_DEG,
+                    centroid_longitude_deg=ONE_CENTROID_LONGITUDE_DEG,
+                    eastward_motion_m_s01=THESE_EAST_VELOCITIES_M_S01[i],
+                    northward_motion_m_s01=THESE_NORTH_VELOCITIES_M_S01[i],
+                    num_storm_image_rows=NUM_FULL_GRID_ROWS_ROTATED,
+                    num_storm_image_columns=NUM_FULL_GRID_COLUMNS_ROTATED,
+                    storm_grid_spacing_metres=ROTATED_GRID_SPACING_METRES)
+            )
+
+            self.assertTrue(numpy.allclose(
+                this_latitude_matrix_deg[i, ...], these_latitudes_deg,
+                atol=TOLERANCE
+            ))
+            self.assertTrue(numpy.allclose(
+                this_longitude_matrix_deg[i, ...], these_longitudes_deg,
+                atol=TOLERANCE
+            ))
+
     def test_centroids_latlng_to_rowcol(self):
         """Ensures correct output from _centroids_latlng_to_rowcol."""
 
@@ -14,6 +14,11 @@ F_s = number of sounding fields (or "variables" or "channels")
 C = number of radar field/height pairs
 """
 
+import copy
+import time
+import queue
+import threading
+import multiprocessing
 import numpy
 import keras
 from scipy.interpolate import RectBivariateSpline
@@ -60,6 +65,18 @@ FLIP_X_KEY = 'flip_in_x'
 FLIP_Y_KEY = 'flip_in_y'
 UPSAMPLE_REFLECTIVITY_KEY = 'upsample_reflectivity'
 
+READING_TIME_KEY = 'reading_time_sec'
+NORMALIZATION_TIME_KEY = 'normalization_time_sec'
+AUGMENTATION_TIME_KEY = 'augmentation_time_sec'
+WAITING_TIME_KEY = 'waiting_time_sec'
+NUM_BATCHES_KEY = 'num_batches'
+WORKER_TIMING_KEYS = [
+    READING_TIME_KEY, NORMALIZATION_TIME_KEY, AUGMENTATION_TIME_KEY
+]
+
+DEFAULT_NUM_BATCHES_TO_PREFETCH = 4
+QUEUE_TIMEOUT_SEC = 1.
+
 DEFAULT_OPTION_DICT = {
     NORMALIZATION_TYPE_KEY: dl_utils.Z_NORMALIZATION_TYPE_STRING,
     MIN_NORMALIZED_VALUE_KEY: dl_utils.DEFAULT_MIN_NORMALIZED_VALUE,
@@ -80,6 +97,23 @@ DEFAULT_OPTION_DICT = {
 }
 
 
+def _add_elapsed_time(timing_dict, timing_key, start_time_unix_sec):
+    """Adds elapsed time to counter.
+
+    :param timing_dict: Dictionary of counters (see doc for
+        `prefetch_generator`).  If None, this method does nothing.
+    :param timing_key: Key for counter.
+    :param start_time_unix_sec: Start time of operation (from `time.time`).
+    """
+
+    if timing_dict is None:
+        return
+
+    timing_dict[timing_key] = (
+        timing_dict.get(timing_key, 0.) + time.time() - start_time_unix_sec
+    )
+
+
 def _get_batch_size_by_class(
         num_examples_per_batch, target_name, class_to_sampling_fraction_dict):
     """Returns number of examples needed per batch for each class.
@@ -198,7 +232,7 @@ def _check_stopping_criterion(
 
 def _select_batch(
         list_of_predictor_matrices, target_values, num_examples_per_batch,
-        binarize_target, num_classes):
+        binarize_target, num_classes, random_state=None):
     """Randomly selects batch from examples in memory.
 
     E = number of examples in memory
@@ -214,17 +248,22 @@ def _select_batch(
         become 0.  If False, the original classes will be kept, in which case
         the prediction task may be binary or multiclass.
     :param num_classes: Number of classes for target variable.
+    :param random_state: Instance of `numpy.random.RandomState`.  If None, will
+        use numpy's global random state.
     :return: list_of_predictor_matrices: Same as input, except the first axis of
         each array has length e.
     :return: target_array: See output doc for `generator_2d_or_3d`.
     """
 
+    if random_state is None:
+        random_state = numpy.random
+
     num_examples_in_memory = len(target_values)
     example_indices = numpy.linspace(
         0, num_examples_in_memory - 1, num=num_examples_in_memory, dtype=int)
 
     if num_examples_in_memory > num_examples_per_batch:
-        batch_indices = numpy.random.choice(
+        batch_indices = random_state.choice(
             example_indices, size=num_examples_per_batch, replace=False)
     else:
         batch_indices = example_indices + 0
@@ -264,7 +303,8 @@ def _select_batch(
 def _augment_radar_images(
         list_of_predictor_matrices, target_array, x_translations_pixels,
         y_translations_pixels, ccw_rotation_angles_deg,
-        noise_standard_deviation, num_noisings, flip_in_x, flip_in_y):
+        noise_standard_deviation, num_noisings, flip_in_x, flip_in_y,
+        random_state=None):
     """Applies one or more data augmentations to each radar image.
 
     P = number of predictor matrices
@@ -294,6 +334,7 @@ def _augment_radar_images(
         in the x-direction.
     :param flip_in_y: Boolean flag.  If True, each radar image will be flipped
         in the y-direction.
+    :param random_state: Used for noising.  See doc for `_select_batch`.
     :return: list_of_predictor_matrices: Same as input, except the first axis of
         each array now has length E.
     :return: target_array: Same as input, except dimensions are now either
@@ -397,7 +438,8 @@ def _augment_radar_images(
             this_image_matrix = data_augmentation.noise_radar_images(
                 radar_image_matrix=
                 list_of_predictor_matrices[j][:orig_num_examples, ...],
-                standard_deviation=noise_standard_deviation)
+                standard_deviation=noise_standard_deviation,
+                random_state=random_state)
 
             list_of_predictor_matrices[j] = numpy.concatenate(
                 (list_of_predictor_matrices[j], this_image_matrix), axis=0)
@@ -643,7 +685,7 @@ def separate_shear_and_reflectivity(list_of_input_matrices,
     return list_of_input_matrices
 
 
-def generator_2d_or_3d(option_dict):
+def generator_2d_or_3d(option_dict, timing_dict=None, random_state=None):
     """Generates examples with either 2-D or 3-D radar images.
 
     Each example (storm object) consists of the following:
@@ -655,7 +697,8 @@ def generator_2d_or_3d(option_dict):
 
     :param option_dict: Dictionary with the following keys.
     option_dict['example_file_names']: 1-D list of paths to input files (will be
-        read by `input_examples.read_example_file`).
+        read by `input_examples.read_example_file`).  These may be NetCDF files
+        or example stores (see `input_examples.write_example_store`).
     option_dict['num_examples_per_batch']: Number of examples in each batch.
     option_dict['binarize_target']: Boolean flag.  If True, target variable will
         be binarized, where the highest class becomes 1 and all other classes
@@ -707,6 +750,13 @@ def generator_2d_or_3d(option_dict):
     option_dict['num_noisings']: Same.
     option_dict['flip_in_x']: Same.
     option_dict['flip_in_y']: Same.
+    :param timing_dict: Dictionary of counters.  If specified, this generator
+        will add time spent reading, normalizing and augmenting data to keys
+        "reading_time_sec", "normalization_time_sec" and
+        "augmentation_time_sec".  If None, no timing.
+    :param random_state: Instance of `numpy.random.RandomState`, used for all
+        random operations (downsampling, target-shuffling, batch selection and
+        noising).  If None, will use numpy's global random state.
 
     If `sounding_field_names is None`...
 
@@ -730,6 +780,8 @@ def generator_2d_or_3d(option_dict):
     """
 
     option_dict = check_generator_args(option_dict)
+    if random_state is None:
+        random_state = numpy.random
 
     example_file_names = option_dict[EXAMPLE_FILES_KEY]
     num_examples_per_batch = option_dict[NUM_EXAMPLES_PER_BATCH_KEY]
@@ -800,6 +852,7 @@ def generator_2d_or_3d(option_dict):
                 example_file_names[file_index]
             ))
 
+            exec_start_time_unix_sec = time.time()
             this_example_dict = input_examples.read_example_file(
                 netcdf_file_name=example_file_names[file_index],
                 read_all_target_vars=False, target_name=target_name,
@@ -812,9 +865,14 @@ def generator_2d_or_3d(option_dict):
                 last_time_to_keep_unix_sec=last_storm_time_unix_sec,
                 num_rows_to_keep=num_grid_rows,
                 num_columns_to_keep=num_grid_columns,
-                downsampling_dict=class_to_rem_batch_size_dict)
+                downsampling_dict=class_to_rem_batch_size_dict,
+                random_state=random_state)
 
             file_index += 1
+            _add_elapsed_time(
+                timing_dict=timing_dict, timing_key=READING_TIME_KEY,
+                start_time_unix_sec=exec_start_time_unix_sec)
+
             if this_example_dict is None:
                 continue
 
@@ -825,8 +883,8 @@ def generator_2d_or_3d(option_dict):
             )
             if shuffle_target:
                 print('Shuffling target values...')
-                numpy.random.seed(RANDOM_SEED)
-                numpy.random.shuffle(these_target_values)
+                random_state.seed(RANDOM_SEED)
+                random_state.shuffle(these_target_values)
 
             this_radar_matrix = this_example_dict[
                 input_examples.RADAR_IMAGE_MATRIX_KEY]
@@ -869,7 +927,8 @@ def generator_2d_or_3d(option_dict):
             indices_to_keep = dl_utils.sample_by_class(
                 sampling_fraction_by_class_dict=class_to_sampling_fraction_dict,
                 target_name=target_name, target_values=target_values,
-                num_examples_total=num_examples_per_batch)
+                num_examples_total=num_examples_per_batch,
+                random_state=random_state)
 
             radar_image_matrix = radar_image_matrix[indices_to_keep, ...]
             target_values = target_values[indices_to_keep]
@@ -882,6 +941,8 @@ def generator_2d_or_3d(option_dict):
                 field_names=radar_field_names,
                 reflectivity_threshold_dbz=refl_masking_threshold_dbz)
 
+        exec_start_time_unix_sec = time.time()
+
         if normalization_type_string is not None:
             radar_image_matrix = dl_utils.normalize_radar_images(
                 radar_image_matrix=radar_image_matrix,
@@ -900,6 +961,10 @@ def generator_2d_or_3d(option_dict):
                     min_normalized_value=min_normalized_value,
                     max_normalized_value=max_normalized_value).astype(numpy.float32)
 
+        _add_elapsed_time(
+            timing_dict=timing_dict, timing_key=NORMALIZATION_TIME_KEY,
+            start_time_unix_sec=exec_start_time_unix_sec)
+
         list_of_predictor_matrices = [radar_image_matrix]
         if include_soundings:
             list_of_predictor_matrices.append(sounding_matrix)
@@ -908,8 +973,10 @@ def generator_2d_or_3d(option_dict):
             list_of_predictor_matrices=list_of_predictor_matrices,
             target_values=target_values,
             num_examples_per_batch=num_examples_per_batch,
-            binarize_target=binarize_target, num_classes=num_classes)
+            binarize_target=binarize_target, num_classes=num_classes,
+            random_state=random_state)
 
+        exec_start_time_unix_sec = time.time()
         list_of_predictor_matrices, target_array = _augment_radar_images(
             list_of_predictor_matrices=list_of_predictor_matrices,
             target_array=target_array,
@@ -917,7 +984,11 @@ def generator_2d_or_3d(option_dict):
             y_translations_pixels=y_translations_pixels,
             ccw_rotation_angles_deg=ccw_rotation_angles_deg,
             noise_standard_deviation=noise_standard_deviation,
-            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y)
+            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y,
+            random_state=random_state)
+        _add_elapsed_time(
+            timing_dict=timing_dict, timing_key=AUGMENTATION_TIME_KEY,
+            start_time_unix_sec=exec_start_time_unix_sec)
 
         radar_image_matrix = None
         sounding_matrix = None
@@ -926,7 +997,7 @@ def generator_2d_or_3d(option_dict):
         yield (list_of_predictor_matrices, target_array)
 
 
-def myrorss_generator_2d3d(option_dict):
+def myrorss_generator_2d3d(option_dict, timing_dict=None, random_state=None):
     """Generates examples with both 2-D and 3-D radar images.
 
     Each example (storm object) consists of the following:
@@ -974,6 +1045,11 @@ def myrorss_generator_2d3d(option_dict):
         reflectivity to the same resolution as azimuthal shear and do 2-D
         convolution over both at the same time.  If False, will do 3-D
         convolution over reflectivity and 2-D convolution over azimuthal shear.
+    :param timing_dict: Dictionary of counters.  If specified, this generator
+        will add time spent reading, normalizing and augmenting data to keys
+        "reading_time_sec", "normalization_time_sec" and
+        "augmentation_time_sec".  If None, no timing.
+    :param random_state: See doc for `generator_2d_or_3d`.
 
     If `upsample_reflectivity == False`...
 
@@ -999,6 +1075,8 @@ def myrorss_generator_2d3d(option_dict):
     """
 
     option_dict = check_generator_args(option_dict)
+    if random_state is None:
+        random_state = numpy.random
 
     example_file_names = option_dict[EXAMPLE_FILES_KEY]
     num_examples_per_batch = option_dict[NUM_EXAMPLES_PER_BATCH_KEY]
@@ -1077,6 +1155,7 @@ def myrorss_generator_2d3d(option_dict):
                 example_file_names[file_index]
             ))
 
+            exec_start_time_unix_sec = time.time()
             this_example_dict = input_examples.read_example_file(
                 netcdf_file_name=example_file_names[file_index],
                 read_all_target_vars=False, target_name=target_name,
@@ -1089,9 +1168,14 @@ def myrorss_generator_2d3d(option_dict):
                 last_time_to_keep_unix_sec=last_storm_time_unix_sec,
                 num_rows_to_keep=num_grid_rows,
                 num_columns_to_keep=num_grid_columns,
-                downsampling_dict=class_to_rem_batch_size_dict)
+                downsampling_dict=class_to_rem_batch_size_dict,
+                random_state=random_state)
 
             file_index += 1
+            _add_elapsed_time(
+                timing_dict=timing_dict, timing_key=READING_TIME_KEY,
+                start_time_unix_sec=exec_start_time_unix_sec)
+
             if this_example_dict is None:
                 continue
 
@@ -1100,8 +1184,8 @@ def myrorss_generator_2d3d(option_dict):
             )
             if shuffle_target:
                 print('Shuffling target values...')
-                numpy.random.seed(RANDOM_SEED)
-                numpy.random.shuffle(these_target_values)
+                random_state.seed(RANDOM_SEED)
+                random_state.shuffle(these_target_values)
 
             include_soundings = (
                 input_examples.SOUNDING_MATRIX_KEY in this_example_dict
@@ -1172,7 +1256,8 @@ def myrorss_generator_2d3d(option_dict):
             indices_to_keep = dl_utils.sample_by_class(
                 sampling_fraction_by_class_dict=class_to_sampling_fraction_dict,
                 target_name=target_name, target_values=target_values,
-                num_examples_total=num_examples_per_batch)
+                num_examples_total=num_examples_per_batch,
+                random_state=random_state)
 
             if upsample_refl:
                 radar_image_matrix = radar_image_matrix[indices_to_keep, ...]
@@ -1186,6 +1271,8 @@ def myrorss_generator_2d3d(option_dict):
             if include_soundings:
                 sounding_matrix = sounding_matrix[indices_to_keep, ...]
 
+        exec_start_time_unix_sec = time.time()
+
         if normalization_type_string is not None:
             if upsample_refl:
                 radar_image_matrix = dl_utils.normalize_radar_images(
@@ -1225,6 +1312,10 @@ def myrorss_generator_2d3d(option_dict):
                     max_normalized_value=max_normalized_value
                 ).astype(numpy.float32)
 
+        _add_elapsed_time(
+            timing_dict=timing_dict, timing_key=NORMALIZATION_TIME_KEY,
+            start_time_unix_sec=exec_start_time_unix_sec)
+
         if upsample_refl:
             list_of_predictor_matrices = [radar_image_matrix]
         else:
@@ -1239,8 +1330,10 @@ def myrorss_generator_2d3d(option_dict):
             list_of_predictor_matrices=list_of_predictor_matrices,
             target_values=target_values,
             num_examples_per_batch=num_examples_per_batch,
-            binarize_target=binarize_target, num_classes=num_classes)
+            binarize_target=binarize_target, num_classes=num_classes,
+            random_state=random_state)
 
+        exec_start_time_unix_sec = time.time()
         list_of_predictor_matrices, target_array = _augment_radar_images(
             list_of_predictor_matrices=list_of_predictor_matrices,
             target_array=target_array,
@@ -1248,7 +1341,11 @@ def myrorss_generator_2d3d(option_dict):
             y_translations_pixels=y_translations_pixels,
             ccw_rotation_angles_deg=ccw_rotation_angles_deg,
             noise_standard_deviation=noise_standard_deviation,
-            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y)
+            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y,
+            random_state=random_state)
+        _add_elapsed_time(
+            timing_dict=timing_dict, timing_key=AUGMENTATION_TIME_KEY,
+            start_time_unix_sec=exec_start_time_unix_sec)
 
         radar_image_matrix = None
         reflectivity_image_matrix_dbz = None
@@ -1259,7 +1356,7 @@ def myrorss_generator_2d3d(option_dict):
         yield (list_of_predictor_matrices, target_array)
 
 
-def sounding_generator(option_dict):
+def sounding_generator(option_dict, timing_dict=None, random_state=None):
     """Generates examples with soundings only.
 
     In this case each example (storm objects) consists of the following:
@@ -1283,12 +1380,18 @@ def sounding_generator(option_dict):
     option_dict['loop_thru_files_once']: Same.
     option_dict['class_to_sampling_fraction_dict']: Same.
 
+    :param timing_dict: Dictionary of counters.  If specified, this generator
+        will add time spent reading and normalizing data to keys
+        "reading_time_sec" and "normalization_time_sec".  If None, no timing.
+    :param random_state: See doc for `generator_2d_or_3d`.
     :return: sounding_matrix: numpy array (E x H_s x F_s) of near-storm
         soundings.
     :return: target_array: See doc for `generator_2d_or_3d`.
     """
 
     option_dict = check_generator_args(option_dict)
+    if random_state is None:
+        random_state = numpy.random
 
     example_file_names = option_dict[EXAMPLE_FILES_KEY]
     num_examples_per_batch = option_dict[NUM_EXAMPLES_PER_BATCH_KEY]
@@ -1352,6 +1455,7 @@ def sounding_generator(option_dict):
                 example_file_names[file_index]
             ))
 
+            exec_start_time_unix_sec = time.time()
             this_example_dict = input_examples.read_example_file(
                 netcdf_file_name=example_file_names[file_index],
                 read_all_target_vars=False, target_name=target_name,
@@ -1362,9 +1466,14 @@ def sounding_generator(option_dict):
                 sounding_heights_to_keep_m_agl=sounding_heights_m_agl,
                 first_time_to_keep_unix_sec=first_storm_time_unix_sec,
                 last_time_to_keep_unix_sec=last_storm_time_unix_sec,
-                downsampling_dict=class_to_rem_batch_size_dict)
+                downsampling_dict=class_to_rem_batch_size_dict,
+                random_state=random_state)
 
             file_index += 1
+            _add_elapsed_time(
+                timing_dict=timing_dict, timing_key=READING_TIME_KEY,
+                start_time_unix_sec=exec_start_time_unix_sec)
+
             if this_example_dict is None:
                 continue
 
@@ -1396,11 +1505,14 @@ def sounding_generator(option_dict):
             indices_to_keep = dl_utils.sample_by_class(
                 sampling_fraction_by_class_dict=class_to_sampling_fraction_dict,
                 target_name=target_name, target_values=target_values,
-                num_examples_total=num_examples_per_batch)
+                num_examples_total=num_examples_per_batch,
+                random_state=random_state)
 
             sounding_matrix = sounding_matrix[indices_to_keep, ...]
             target_values = target_values[indices_to_keep]
 
+        exec_start_time_unix_sec = time.time()
+
         if normalization_type_string is not None:
             sounding_matrix = dl_utils.normalize_soundings(
                 sounding_matrix=sounding_matrix,
@@ -1411,11 +1523,16 @@ def sounding_generator(option_dict):
                 max_normalized_value=max_normalized_value
             ).astype(numpy.float32)
 
+        _add_elapsed_time(
+            timing_dict=timing_dict, timing_key=NORMALIZATION_TIME_KEY,
+            start_time_unix_sec=exec_start_time_unix_sec)
+
         list_of_predictor_matrices, target_array = _select_batch(
             list_of_predictor_matrices=[sounding_matrix],
             target_values=target_values,
             num_examples_per_batch=num_examples_per_batch,
-            binarize_target=binarize_target, num_classes=num_classes)
+            binarize_target=binarize_target, num_classes=num_classes,
+            random_state=random_state)
 
         sounding_matrix = None
         target_values = None
@@ -1461,7 +1578,8 @@ def layer_ops_to_field_height_pairs(list_of_operation_dicts):
     return unique_radar_field_names, unique_radar_heights_m_agl
 
 
-def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
+def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts,
+                                 timing_dict=None, random_state=None):
     """Generates examples with 2-D GridRad images.
 
     These 2-D images are produced by applying layer operations to the native 3-D
@@ -1500,6 +1618,11 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
 
     :param list_of_operation_dicts: See doc for
         `input_examples.reduce_examples_3d_to_2d`.
+    :param timing_dict: Dictionary of counters.  If specified, this generator
+        will add time spent reading, normalizing and augmenting data to keys
+        "reading_time_sec", "normalization_time_sec" and
+        "augmentation_time_sec".  If None, no timing.
+    :param random_state: See doc for `generator_2d_or_3d`.
 
     If `sounding_field_names is None`...
 
@@ -1513,6 +1636,8 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
     """
 
     option_dict = check_generator_args(option_dict)
+    if random_state is None:
+        random_state = numpy.random
 
     example_file_names = option_dict[EXAMPLE_FILES_KEY]
     num_examples_per_batch = option_dict[NUM_EXAMPLES_PER_BATCH_KEY]
@@ -1584,6 +1709,7 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
                 example_file_names[file_index]
             ))
 
+            exec_start_time_unix_sec = time.time()
             this_example_dict = input_examples.read_example_file(
                 netcdf_file_name=example_file_names[file_index],
                 read_all_target_vars=False, target_name=target_name,
@@ -1596,9 +1722,14 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
                 last_time_to_keep_unix_sec=last_storm_time_unix_sec,
                 num_rows_to_keep=num_grid_rows,
                 num_columns_to_keep=num_grid_columns,
-                downsampling_dict=class_to_rem_batch_size_dict)
+                downsampling_dict=class_to_rem_batch_size_dict,
+                random_state=random_state)
 
             file_index += 1
+            _add_elapsed_time(
+                timing_dict=timing_dict, timing_key=READING_TIME_KEY,
+                start_time_unix_sec=exec_start_time_unix_sec)
+
             if this_example_dict is None:
                 continue
 
@@ -1607,8 +1738,8 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
             )
             if shuffle_target:
                 print('Shuffling target values...')
-                numpy.random.seed(RANDOM_SEED)
-                numpy.random.shuffle(these_target_values)
+                random_state.seed(RANDOM_SEED)
+                random_state.shuffle(these_target_values)
 
             this_example_dict = input_examples.reduce_examples_3d_to_2d(
                 example_dict=this_example_dict,
@@ -1658,13 +1789,16 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
             indices_to_keep = dl_utils.sample_by_class(
                 sampling_fraction_by_class_dict=class_to_sampling_fraction_dict,
                 target_name=target_name, target_values=target_values,
-                num_examples_total=num_examples_per_batch)
+                num_examples_total=num_examples_per_batch,
+                random_state=random_state)
 
             radar_image_matrix = radar_image_matrix[indices_to_keep, ...]
             target_values = target_values[indices_to_keep]
             if include_soundings:
                 sounding_matrix = sounding_matrix[indices_to_keep, ...]
 
+        exec_start_time_unix_sec = time.time()
+
         if normalization_type_string is not None:
             radar_image_matrix = dl_utils.normalize_radar_images(
                 radar_image_matrix=radar_image_matrix,
@@ -1683,6 +1817,10 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
                     min_normalized_value=min_normalized_value,
                     max_normalized_value=max_normalized_value).astype(numpy.float32)
 
+        _add_elapsed_time(
+            timing_dict=timing_dict, timing_key=NORMALIZATION_TIME_KEY,
+            start_time_unix_sec=exec_start_time_unix_sec)
+
         list_of_predictor_matrices = [radar_image_matrix]
         if include_soundings:
             list_of_predictor_matrices.append(sounding_matrix)
@@ -1691,8 +1829,10 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
             list_of_predictor_matrices=list_of_predictor_matrices,
             target_values=target_values,
             num_examples_per_batch=num_examples_per_batch,
-            binarize_target=binarize_target, num_classes=num_classes)
+            binarize_target=binarize_target, num_classes=num_classes,
+            random_state=random_state)
 
+        exec_start_time_unix_sec = time.time()
         list_of_predictor_matrices, target_array = _augment_radar_images(
             list_of_predictor_matrices=list_of_predictor_matrices,
             target_array=target_array,
@@ -1700,10 +1840,242 @@ def gridrad_generator_2d_reduced(option_dict, list_of_operation_dicts):
             y_translations_pixels=y_translations_pixels,
             ccw_rotation_angles_deg=ccw_rotation_angles_deg,
             noise_standard_deviation=noise_standard_deviation,
-            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y)
+            num_noisings=num_noisings, flip_in_x=flip_in_x, flip_in_y=flip_in_y,
+            random_state=random_state)
+        _add_elapsed_time(
+            timing_dict=timing_dict, timing_key=AUGMENTATION_TIME_KEY,
+            start_time_unix_sec=exec_start_time_unix_sec)
 
         radar_image_matrix = None
         sounding_matrix = None
         target_values = None
 
         yield (list_of_predictor_matrices, target_array)
+
+
+def _prefetch_worker(generator_function, generator_args, random_seed,
+                     batch_queue, stop_event):
+    """Runs one generator in the background and puts its batches in a queue.
+
+    Each item put in the queue is a tuple (batch, timing_dict, exception).  The
+    last item has `batch = None`.  If the generator failed, `exception` is the
+    error raised; otherwise it is None.
+
+    :param generator_function: See doc for `prefetch_generator`.
+    :param generator_args: List of positional arguments for
+        `generator_function`.
+    :param random_seed: Random seed for this worker.  The generator is given
+        its own `numpy.random.RandomState`, so numpy's global random state
+        (shared with the main thread, if the worker is a thread) is untouched.
+    :param batch_queue: Instance of `queue.Queue` or `multiprocessing.Queue`.
+    :param stop_event: Instance of `threading.Event` or
+        `multiprocessing.Event`.  When this is set, the worker will stop.
+    """
+
+    random_state = numpy.random.RandomState(random_seed)
+    timing_dict = dict([(k, 0.) for k in WORKER_TIMING_KEYS])
+    final_item = (None, timing_dict, None)
+
+    try:
+        for this_batch in generator_function(
+                *generator_args, timing_dict=timing_dict,
+                random_state=random_state):
+            this_item = (this_batch, copy.deepcopy(timing_dict), None)
+
+            while True:
+                if stop_event.is_set():
+                    return
+
+                try:
+                    batch_queue.put(this_item, timeout=QUEUE_TIMEOUT_SEC)
+                    break
+                except queue.Full:
+                    continue
+
+    except RuntimeError as this_error:
+
+        # Since PEP 479, `raise StopIteration` inside a generator is converted
+        # to RuntimeError.  The generators in this module use it to signal that
+        # `loop_thru_files_once = True` and all files have been read.
+        if not isinstance(this_error.__cause__, StopIteration):
+            final_item = (None, timing_dict, this_error)
+
+    except Exception as this_error:
+        final_item = (None, timing_dict, this_error)
+
+    while not stop_event.is_set():
+        try:
+            batch_queue.put(final_item, timeout=QUEUE_TIMEOUT_SEC)
+            break
+        except queue.Full:
+            continue
+
+
+def _get_from_worker(batch_queue, worker_object):
+    """Gets next item from the queue filled by one prefetch worker.
+
+    :param batch_queue: See doc for `_prefetch_worker`.
+    :param worker_object: Worker (instance of `threading.Thread` or
+        `multiprocessing.Process`) that fills the queue.
+    :return: item: Tuple (batch, timing_dict, exception), as described in doc
+        for `_prefetch_worker`.
+    :raises: ValueError: if the worker died without putting its last item in
+        the queue.
+    """
+
+    while True:
+
+        # Liveness is checked before waiting, so that an item put just before
+        # the worker exited is not missed.
+        worker_alive = worker_object.is_alive()
+
+        try:
+            return batch_queue.get(timeout=QUEUE_TIMEOUT_SEC)
+        except queue.Empty:
+            if not worker_alive:
+                break
+
+    error_string = (
+        'Prefetch worker "{0:s}" died before finishing.'
+    ).format(worker_object.name)
+
+    raise ValueError(error_string)
+
+
+def prefetch_generator(
+        generator_function, generator_args, num_workers=1,
+        num_batches_to_prefetch=DEFAULT_NUM_BATCHES_TO_PREFETCH,
+        use_processes=False, random_seed=RANDOM_SEED, timing_dict=None):
+    """Prefetches batches from any generator in this module.
+
+    Batches are created in the background by `num_workers` workers (threads or
+    processes), each of which runs its own copy of the generator.  Each worker
+    has a bounded queue of ready batches, so that reading, normalization and
+    augmentation overlap with training.
+
+    If `num_workers > 1`, example files are dealt out to workers (file k goes
+    to worker k mod `num_workers`) and batches are returned round-robin (one
+    from worker 0, then worker 1, ...), so the order of batches does not depend
+    on which worker finishes first.  Worker k runs the generator with its own
+    `numpy.random.RandomState(random_seed + k)`, so the output is deterministic
+    for threads and processes alike, and numpy's global random state is never
+    touched.  If a worker dies without finishing, this generator raises an
+    error instead of waiting forever.
+
+    :param generator_function: Generator function (e.g., `generator_2d_or_3d`).
+    :param generator_args: List of positional arguments for
+        `generator_function`.  The first must be `option_dict`.
+    :param num_workers: Number of workers.  This will be reduced if there are
+        fewer example files than workers.
+    :param num_batches_to_prefetch: Max number of ready batches to keep in
+        memory for each worker.
+    :param use_processes: Boolean flag.  If True, workers will be processes.
+        If False, workers will be threads.
+    :param random_seed: Random seed (integer).
+    :param timing_dict: Dictionary of counters.  If specified, this generator
+        will keep the following keys up to date, each summed over all workers.
+    timing_dict['reading_time_sec']: Time spent reading example files.
+    timing_dict['normalization_time_sec']: Time spent normalizing predictors.
+    timing_dict['augmentation_time_sec']: Time spent augmenting data.
+    timing_dict['waiting_time_sec']: Time spent by the consumer waiting for a
+        batch (i.e., time for which the background workers were too slow).
+    timing_dict['num_batches']: Number of batches returned so far.
+
+    :return: batch: Same as output of `generator_function`.
+    """
+
+    error_checking.assert_is_integer(num_workers)
+    error_checking.assert_is_greater(num_workers, 0)
+    error_checking.assert_is_integer(num_batches_to_prefetch)
+    error_checking.assert_is_greater(num_batches_to_prefetch, 0)
+    error_checking.assert_is_boolean(use_processes)
+    error_checking.assert_is_integer(random_seed)
+
+    option_dict = generator_args[0]
+    example_file_names = option_dict[EXAMPLE_FILES_KEY]
+    num_workers = min([num_workers, len(example_file_names)])
+
+    if use_processes:
+        stop_event = multiprocessing.Event()
+    else:
+        stop_event = threading.Event()
+
+    batch_queues = []
+    worker_objects = []
+
+    for k in range(num_workers):
+        this_option_dict = copy.deepcopy(option_dict)
+        this_option_dict[EXAMPLE_FILES_KEY] = example_file_names[k::num_workers]
+        these_args = [this_option_dict] + list(generator_args[1:])
+
+        if use_processes:
+            this_queue = multiprocessing.Queue(maxsize=num_batches_to_prefetch)
+            this_worker_object = multiprocessing.Process(
+                target=_prefetch_worker,
+                args=(generator_function, these_args, random_seed + k,
+                      this_queue, stop_event)
+            )
+        else:
+            this_queue = queue.Queue(maxsize=num_batches_to_prefetch)
+            this_worker_object = threading.Thread(
+                target=_prefetch_worker,
+                args=(generator_function, these_args, random_seed + k,
+                      this_queue, stop_event)
+            )
+
+        this_worker_object.daemon = True
+        this_worker_object.start()
+
+        batch_queues.append(this_queue)
+        worker_objects.append(this_worker_object)
+
+    if timing_dict is not None:
+        for this_key in WORKER_TIMING_KEYS + [WAITING_TIME_KEY]:
+            timing_dict[this_key] = 0.
+        timing_dict[NUM_BATCHES_KEY] = 0
+
+    worker_timing_dicts = [
+        dict([(k, 0.) for k in WORKER_TIMING_KEYS])
+        for _ in range(num_workers)
+    ]
+    active_worker_indices = list(range(num_workers))
+
+    try:
+        while len(active_worker_indices) > 0:
+            for k in copy.deepcopy(active_worker_indices):
+                exec_start_time_unix_sec = time.time()
+                this_batch, worker_timing_dicts[k], this_error = (
+                    _get_from_worker(
+                        batch_queue=batch_queues[k],
+                        worker_object=worker_objects[k])
+                )
+
+                if timing_dict is not None:
+                    _add_elapsed_time(
+                        timing_dict=timing_dict, timing_key=WAITING_TIME_KEY,
+                        start_time_unix_sec=exec_start_time_unix_sec)
+
+                    for this_key in WORKER_TIMING_KEYS:
+                        timing_dict[this_key] = sum(
+                            [d[this_key] for d in worker_timing_dicts]
+                        )
+
+                if this_error is not None:
+                    raise this_error
+
+                if this_batch is None:
+                    active_worker_indices.remove(k)
+                    continue
+
+                if timing_dict is not None:
+                    timing_dict[NUM_BATCHES_KEY] += 1
+
+                yield this_batch
+    finally:
+        stop_event.set()
+
+        for this_worker_object in worker_objects:
+            this_worker_object.join(timeout=2 * QUEUE_TIMEOUT_SEC)
+
+            if use_processes and this_worker_object.is_alive():
+                this_worker_object.terminate()
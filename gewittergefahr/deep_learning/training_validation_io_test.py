@@ -1,5 +1,7 @@
 """Unit tests for training_validation_io.py."""
 
+import queue
+import threading
 import unittest
 import numpy
 from gewittergefahr.gg_utils import radar_utils
@@ -154,6 +156,47 @@ UNIQUE_RADAR_FIELD_NAMES = [
 UNIQUE_HEIGHTS_M_AGL = numpy.array(
     [1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000], dtype=int)
 
+# The following constants are used to test prefetch_generator.
+DUMMY_FILE_NAMES = ['foo', 'bar', 'moo', 'hal', 'tiger', 'lion', 'wolf']
+NUM_DUMMY_BATCHES_PER_FILE = 2
+PREFETCH_OPTION_DICT = {
+    trainval_io.EXAMPLE_FILES_KEY: DUMMY_FILE_NAMES,
+    trainval_io.LOOP_ONCE_KEY: True
+}
+
+
+def _dummy_generator(option_dict, timing_dict=None, random_state=None):
+    """Generates random "batches" for testing prefetch_generator.
+
+    :param option_dict: Dictionary with keys "example_file_names" and
+        "loop_thru_files_once".
+    :param timing_dict: See doc for `trainval_io.generator_2d_or_3d`.
+    :param random_state: Same.
+    :return: file_name: Name of "file" for batch.
+    :return: random_values: numpy array of random values.
+    """
+
+    if random_state is None:
+        random_state = numpy.random
+
+    file_index = 0
+
+    while True:
+        if file_index == len(option_dict[trainval_io.EXAMPLE_FILES_KEY]):
+            if option_dict[trainval_io.LOOP_ONCE_KEY]:
+                raise StopIteration
+
+            file_index = 0
+
+        this_file_name = option_dict[trainval_io.EXAMPLE_FILES_KEY][file_index]
+        file_index += 1
+
+        for _ in range(NUM_DUMMY_BATCHES_PER_FILE):
+            if timing_dict is not None:
+                timing_dict[trainval_io.READING_TIME_KEY] += 1.
+
+            yield this_file_name, random_state.uniform(size=10)
+
 
 class TrainingValidationIoTests(unittest.TestCase):
     """Each method is a unit test for training_validation_io.py."""
@@ -404,6 +447,121 @@ class TrainingValidationIoTests(unittest.TestCase):
             these_heights_m_agl, UNIQUE_HEIGHTS_M_AGL
         ))
 
+    def test_prefetch_generator_one_thread(self):
+        """Ensures correct output from prefetch_generator.
+
+        In this case there is one worker thread, which uses its own random state
+        seeded with `random_seed`, so batches should be the same as without
+        prefetching and numpy's global random state should be untouched.
+        """
+
+        this_generator = _dummy_generator(
+            PREFETCH_OPTION_DICT,
+            random_state=numpy.random.RandomState(trainval_io.RANDOM_SEED)
+        )
+        expected_batches = [
+            next(this_generator) for _ in
+            range(len(DUMMY_FILE_NAMES) * NUM_DUMMY_BATCHES_PER_FILE)
+        ]
+
+        numpy.random.seed(trainval_io.RANDOM_SEED)
+        this_expected_value = numpy.random.uniform()
+
+        numpy.random.seed(trainval_io.RANDOM_SEED)
+        this_timing_dict = {}
+        these_batches = list(trainval_io.prefetch_generator(
+            generator_function=_dummy_generator,
+            generator_args=[PREFETCH_OPTION_DICT], num_workers=1,
+            num_batches_to_prefetch=3, timing_dict=this_timing_dict
+        ))
+
+        self.assertTrue(len(these_batches) == len(expected_batches))
+        for this_batch, this_expected_batch in zip(
+                these_batches, expected_batches):
+            self.assertTrue(this_batch[0] == this_expected_batch[0])
+            self.assertTrue(numpy.array_equal(
+                this_batch[1], this_expected_batch[1]
+            ))
+
+        self.assertTrue(
+            this_timing_dict[trainval_io.NUM_BATCHES_KEY] ==
+            len(expected_batches)
+        )
+        self.assertTrue(numpy.isclose(
+            this_timing_dict[trainval_io.READING_TIME_KEY],
+            len(expected_batches)
+        ))
+        self.assertTrue(numpy.isclose(
+            numpy.random.uniform(), this_expected_value
+        ))
+
+    def test_prefetch_generator_many_threads(self):
+        """Ensures correct output from prefetch_generator.
+
+        In this case there are 3 worker threads, each with its own random
+        state, so the output should be reproducible.
+        """
+
+        these_batches = list(trainval_io.prefetch_generator(
+            generator_function=_dummy_generator,
+            generator_args=[PREFETCH_OPTION_DICT], num_workers=3
+        ))
+        these_new_batches = list(trainval_io.prefetch_generator(
+            generator_function=_dummy_generator,
+            generator_args=[PREFETCH_OPTION_DICT], num_workers=3
+        ))
+
+        self.assertTrue(len(these_batches) == len(these_new_batches))
+        for this_batch, this_new_batch in zip(these_batches, these_new_batches):
+            self.assertTrue(this_batch[0] == this_new_batch[0])
+            self.assertTrue(numpy.array_equal(this_batch[1], this_new_batch[1]))
+
+    def test_prefetch_generator_many_processes(self):
+        """Ensures correct output from prefetch_generator.
+
+        In this case there are 3 worker processes, so files should be dealt out
+        to workers, batches should be returned round-robin, and the output
+        should be reproducible.
+        """
+
+        these_batches = list(trainval_io.prefetch_generator(
+            generator_function=_dummy_generator,
+            generator_args=[PREFETCH_OPTION_DICT], num_workers=3,
+            use_processes=True
+        ))
+
+        these_file_names = [b[0] for b in these_batches]
+        expected_file_names = [
+            'foo', 'bar', 'moo', 'foo', 'bar', 'moo',
+            'hal', 'tiger', 'lion', 'hal', 'tiger', 'lion',
+            'wolf', 'wolf'
+        ]
+        self.assertTrue(these_file_names == expected_file_names)
+
+        these_new_batches = list(trainval_io.prefetch_generator(
+            generator_function=_dummy_generator,
+            generator_args=[PREFETCH_OPTION_DICT], num_workers=3,
+            use_processes=True
+        ))
+
+        for this_batch, this_new_batch in zip(these_batches, these_new_batches):
+            self.assertTrue(numpy.array_equal(this_batch[1], this_new_batch[1]))
+
+    def test_get_from_worker_dead(self):
+        """Ensures that _get_from_worker errors out if worker is dead.
+
+        In this case the worker has finished without putting anything in the
+        queue, so the consumer should not wait forever.
+        """
+
+        this_worker_object = threading.Thread(target=lambda: None)
+        this_worker_object.start()
+        this_worker_object.join()
+
+        with self.assertRaises(ValueError):
+            trainval_io._get_from_worker(
+                batch_queue=queue.Queue(), worker_object=this_worker_object)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -6,6 +6,8 @@ instructions.
 """
 
 import os
+import re
+import hashlib
 import subprocess
 import tempfile
 import warnings
@@ -27,6 +29,11 @@ VALID_FILE_TYPES = [GRIB1_FILE_TYPE, GRIB2_FILE_TYPE]
 U_WIND_PREFIX = 'UGRD'
 V_WIND_PREFIX = 'VGRD'
 
+CACHE_FILE_EXTENSION = '.npy'
+DEFAULT_MAX_CACHE_SIZE_BYTES = int(2e10)
+
+CACHE_SIZE_DICT = {}
+
 
 def _field_name_grib1_to_grib2(field_name_grib1):
     """Converts field name from grib1 to grib2.
@@ -58,6 +65,148 @@ def _sentinel_value_to_nan(data_matrix, sentinel_value=None):
     return numpy.reshape(data_vector, data_matrix.shape)
 
 
+def _get_cache_file_name(cache_dir_name, grib_file_name, field_name_grib1,
+                         num_grid_rows, num_grid_columns, sentinel_value,
+                         binary_extraction):
+    """Returns name of cache file for one decoded field.
+
+    The key includes the modification time and size of the grib file, so a
+    cache file becomes stale (and is never read again) if the grib file
+    changes.
+
+    :param cache_dir_name: Name of cache directory.
+    :param grib_file_name: See doc for `read_field_from_grib_file`.
+    :param field_name_grib1: Same.
+    :param num_grid_rows: Same.
+    :param num_grid_columns: Same.
+    :param sentinel_value: Same.
+    :param binary_extraction: Same.
+    :return: cache_file_name: Path to cache file (may not exist yet).
+    """
+
+    key_string = '{0:s}|{1:d}|{2:d}|{3:s}|{4:d}|{5:d}|{6:s}|{7:d}'.format(
+        os.path.abspath(grib_file_name),
+        int(os.path.getmtime(grib_file_name)),
+        os.path.getsize(grib_file_name), field_name_grib1, num_grid_rows,
+        num_grid_columns, str(sentinel_value), int(binary_extraction)
+    )
+
+    return '{0:s}/{1:s}{2:s}'.format(
+        cache_dir_name, hashlib.md5(key_string.encode('utf-8')).hexdigest(),
+        CACHE_FILE_EXTENSION
+    )
+
+
+def _read_field_from_cache(cache_file_name):
+    """Reads decoded field from cache.
+
+    :param cache_file_name: Path to cache file.
+    :return: field_matrix: numpy array with decoded field.  This is a
+        writable float64 array, whatever the data type of the cache file, so
+        that a cache hit returns the same kind of array as a cache miss.  If
+        the cache file does not exist or cannot be read, this is None.
+    """
+
+    if not os.path.isfile(cache_file_name):
+        return None
+
+    try:
+        field_matrix = numpy.array(numpy.load(cache_file_name), dtype=float)
+    except (IOError, OSError, ValueError):
+        return None
+
+    # Cache files are evicted in order of modification time, so touching the
+    # file on each read makes eviction least-recently used.
+    try:
+        os.utime(cache_file_name, None)
+    except OSError:
+        pass
+
+    return field_matrix
+
+
+def _write_field_to_cache(field_matrix, cache_file_name):
+    """Writes decoded field to cache.
+
+    The field is written to a temporary file, then renamed, so that other
+    processes sharing the cache never see a partial file.  The field is written
+    with its own data type, so the caller decides the precision.
+
+    :param field_matrix: numpy array with decoded field.
+    :param cache_file_name: Path to cache file.
+    :return: num_bytes_written: Size of cache file.
+    """
+
+    file_handle, temporary_file_name = tempfile.mkstemp(
+        dir=os.path.dirname(cache_file_name), suffix=CACHE_FILE_EXTENSION)
+    os.close(file_handle)
+
+    numpy.save(temporary_file_name, field_matrix)
+    num_bytes_written = os.path.getsize(temporary_file_name)
+    os.rename(temporary_file_name, cache_file_name)
+
+    return num_bytes_written
+
+
+def _evict_from_cache(cache_dir_name, max_cache_size_bytes, num_new_bytes=0):
+    """Deletes least-recently used files until cache is small enough.
+
+    The total size of the cache is kept in `CACHE_SIZE_DICT` and updated with
+    each write, so the cache directory is listed only when this running total
+    exceeds the max (or the first time that the directory is used).  Writes by
+    other processes sharing the cache are not added to the running total, so
+    they are noticed only at the next listing.
+
+    :param cache_dir_name: Name of cache directory.
+    :param max_cache_size_bytes: Max total size of cache files.
+    :param num_new_bytes: Number of bytes written to cache since last call.
+    """
+
+    cache_key = os.path.abspath(cache_dir_name)
+
+    if cache_key in CACHE_SIZE_DICT:
+        CACHE_SIZE_DICT[cache_key] += num_new_bytes
+        if CACHE_SIZE_DICT[cache_key] <= max_cache_size_bytes:
+            return
+
+    cache_file_names = [
+        '{0:s}/{1:s}'.format(cache_dir_name, f)
+        for f in os.listdir(cache_dir_name) if f.endswith(CACHE_FILE_EXTENSION)
+    ]
+
+    modification_times_unix_sec = []
+    file_sizes_bytes = []
+
+    for this_file_name in cache_file_names:
+        try:
+            modification_times_unix_sec.append(
+                os.path.getmtime(this_file_name))
+            file_sizes_bytes.append(os.path.getsize(this_file_name))
+        except OSError:
+            modification_times_unix_sec.append(-numpy.inf)
+            file_sizes_bytes.append(0)
+
+    total_size_bytes = numpy.sum(numpy.array(file_sizes_bytes, dtype=int))
+    CACHE_SIZE_DICT[cache_key] = total_size_bytes
+    if total_size_bytes <= max_cache_size_bytes:
+        return
+
+    sort_indices = numpy.argsort(numpy.array(modification_times_unix_sec))
+
+    for i in sort_indices:
+        if total_size_bytes <= max_cache_size_bytes:
+            break
+
+        try:
+            os.remove(cache_file_names[i])
+        except OSError:
+            pass
+
+        total_size_bytes -= file_sizes_bytes[i]
+
+    CACHE_SIZE_DICT[cache_key] = total_size_bytes
+
+
 def check_file_type(grib_file_type):
     """Ensures that grib file type is valid.
 
@@ -99,7 +248,9 @@ def read_field_from_grib_file(
         grib_file_name, field_name_grib1, num_grid_rows, num_grid_columns,
         sentinel_value=None, temporary_dir_name=None,
         wgrib_exe_name=WGRIB_EXE_NAME_DEFAULT,
-        wgrib2_exe_name=WGRIB2_EXE_NAME_DEFAULT, raise_error_if_fails=True):
+        wgrib2_exe_name=WGRIB2_EXE_NAME_DEFAULT, raise_error_if_fails=True,
+        binary_extraction=True, cache_dir_name=None,
+        max_cache_size_bytes=DEFAULT_MAX_CACHE_SIZE_BYTES):
     """Reads field from grib file.
 
     One field = one variable at one time step.
@@ -115,13 +266,25 @@ def read_field_from_grib_file(
     :param sentinel_value: Sentinel value (all instances will be replaced with
         NaN).
     :param temporary_dir_name: Name of temporary directory.  An intermediate
-        text file will be stored here.
+        file will be stored here.
     :param wgrib_exe_name: Path to wgrib executable.
     :param wgrib2_exe_name: Path to wgrib2 executable.
     :param raise_error_if_fails: Boolean flag.  If the extraction fails and
         raise_error_if_fails = True, this method will error out.  If the
         extraction fails and raise_error_if_fails = False, this method will
         return None.
+    :param binary_extraction: Boolean flag.  If True, wgrib/wgrib2 will write
+        the field as raw float32 values, which are read directly into numpy.
+        If False, wgrib/wgrib2 will write a text dump, which is parsed with
+        `numpy.loadtxt`.
+    :param cache_dir_name: Name of cache directory.  If specified, decoded
+        fields (after replacing sentinel values) will be stored here, keyed by
+        grib file, field name, grid dimensions and extraction type, and each
+        field will be decoded only once.  The cache may be shared by several
+        processes.  If None, there is no caching.
+    :param max_cache_size_bytes: [used only if `cache_dir_name` is specified]
+        Max total size of cache.  When a new field makes the cache larger than
+        this, least-recently used fields will be deleted.
     :return: field_matrix: M-by-N numpy array with values of the given field.
         If the grid is regular in x-y coordinates, x increases towards the right
         (in the positive direction of the second axis), while y increases
@@ -140,34 +303,56 @@ def read_field_from_grib_file(
     error_checking.assert_file_exists(wgrib_exe_name)
     error_checking.assert_file_exists(wgrib2_exe_name)
     error_checking.assert_is_boolean(raise_error_if_fails)
+    error_checking.assert_is_boolean(binary_extraction)
     if sentinel_value is not None:
         error_checking.assert_is_not_nan(sentinel_value)
 
     # Housekeeping.
     grib_file_type = file_name_to_type(grib_file_name)
 
+    cache_file_name = None
+    if cache_dir_name is not None:
+        error_checking.assert_is_integer(max_cache_size_bytes)
+        error_checking.assert_is_greater(max_cache_size_bytes, 0)
+        file_system_utils.mkdir_recursive_if_necessary(
+            directory_name=cache_dir_name)
+
+        if os.path.isfile(grib_file_name):
+            cache_file_name = _get_cache_file_name(
+                cache_dir_name=cache_dir_name, grib_file_name=grib_file_name,
+                field_name_grib1=field_name_grib1,
+                num_grid_rows=num_grid_rows, num_grid_columns=num_grid_columns,
+                sentinel_value=sentinel_value,
+                binary_extraction=binary_extraction)
+
+            field_matrix = _read_field_from_cache(cache_file_name)
+            if field_matrix is not None:
+                return field_matrix
+
     if temporary_dir_name is not None:
         file_system_utils.mkdir_recursive_if_necessary(
             directory_name=temporary_dir_name)
-    temporary_file_name = tempfile.NamedTemporaryFile(
-        dir=temporary_dir_name, delete=False).name
+    file_handle, temporary_file_name = tempfile.mkstemp(
+        dir=temporary_dir_name)
+    os.close(file_handle)
 
     # Extract field to temporary file.
     if grib_file_type == GRIB1_FILE_TYPE:
         command_string = (
             '"{0:s}" "{1:s}" -s | grep -w "{2:s}" | "{0:s}" -i "{1:s}" '
-            '-text -nh -o "{3:s}"'
+            '{3:s} -nh -o "{4:s}"'
         ).format(
             wgrib_exe_name, grib_file_name, field_name_grib1,
-            temporary_file_name
+            '-bin' if binary_extraction else '-text', temporary_file_name
         )
     else:
         command_string = (
             '"{0:s}" "{1:s}" -s | grep -w "{2:s}" | "{0:s}" -i "{1:s}" '
-            '-no_header -text "{3:s}"'
+            '-no_header {3:s} "{4:s}"'
         ).format(
             wgrib2_exe_name, grib_file_name,
-            _field_name_grib1_to_grib2(field_name_grib1), temporary_file_name
+            _field_name_grib1_to_grib2(field_name_grib1),
+            '-bin' if binary_extraction else '-text', temporary_file_name
         )
 
     try:
@@ -186,7 +371,13 @@ def read_field_from_grib_file(
         return None
 
     # Read field from temporary file.
-    field_vector = numpy.loadtxt(temporary_file_name)
+    if binary_extraction:
+        field_vector = numpy.fromfile(
+            temporary_file_name, dtype=numpy.float32
+        ).astype(float)
+    else:
+        field_vector = numpy.loadtxt(temporary_file_name)
+
     os.remove(temporary_file_name)
 
     try:
@@ -203,9 +394,266 @@ def read_field_from_grib_file(
         warnings.warn(warning_string)
         return None
 
-    return _sentinel_value_to_nan(
+    field_matrix = _sentinel_value_to_nan(
         data_matrix=field_matrix, sentinel_value=sentinel_value)
 
+    # Fields from binary extraction are exactly representable as float32, so
+    # they are cached at half the size.  Fields from text extraction keep full
+    # precision.
+    if cache_file_name is not None:
+        if binary_extraction:
+            num_bytes_written = _write_field_to_cache(
+                field_matrix=field_matrix.astype(numpy.float32),
+                cache_file_name=cache_file_name)
+        else:
+            num_bytes_written = _write_field_to_cache(
+                field_matrix=field_matrix, cache_file_name=cache_file_name)
+
+        _evict_from_cache(
+            cache_dir_name=cache_dir_name,
+            max_cache_size_bytes=max_cache_size_bytes,
+            num_new_bytes=num_bytes_written)
+
+    return field_matrix
+
+
+def _find_records_in_inventory(inventory_lines, field_name):
+    """Finds records in grib inventory that match the given field.
+
+    This method mimics `grep -w`, which is used to find records in
+    `read_field_from_grib_file`.
+
+    :param inventory_lines: 1-D list of lines in inventory (output of
+        `wgrib -s` or `wgrib2 -s`).
+    :param field_name: Field name (in grib1 format for grib1 files, grib2
+        format for grib2 files).
+    :return: matching_lines: 1-D list of matching lines.
+    """
+
+    pattern_object = re.compile(
+        r'(?<!\w){0:s}(?!\w)'.format(re.escape(field_name))
+    )
+
+    return [l for l in inventory_lines if pattern_object.search(l) is not None]
+
+
+def read_fields_from_grib_file(
+        grib_file_name, field_names_grib1, num_grid_rows, num_grid_columns,
+        sentinel_value=None, temporary_dir_name=None,
+        wgrib_exe_name=WGRIB_EXE_NAME_DEFAULT,
+        wgrib2_exe_name=WGRIB2_EXE_NAME_DEFAULT, raise_error_if_fails=True,
+        cache_dir_name=None, max_cache_size_bytes=DEFAULT_MAX_CACHE_SIZE_BYTES):
+    """Reads many fields from grib file.
+
+    This method is equivalent to calling `read_field_from_grib_file` for each
+    field, except that the grib file is inventoried once and all fields not
+    already in the cache are extracted with one call to wgrib/wgrib2.
+
+    F = number of fields
+
+    :param grib_file_name: See doc for `read_field_from_grib_file`.
+    :param field_names_grib1: length-F list of field names in grib1 format.
+    :param num_grid_rows: See doc for `read_field_from_grib_file`.
+    :param num_grid_columns: Same.
+    :param sentinel_value: Same.
+    :param temporary_dir_name: Same.
+    :param wgrib_exe_name: Same.
+    :param wgrib2_exe_name: Same.
+    :param raise_error_if_fails: Same.
+    :param cache_dir_name: Same.
+    :param max_cache_size_bytes: Same.
+    :return: field_matrices: length-F list, where each element is an M-by-N
+        numpy array (see doc for `read_field_from_grib_file`).  If extraction
+        of the [j]th field fails and `raise_error_if_fails = False`, the [j]th
+        element is None.
+    :raises: ValueError: if extraction fails and raise_error_if_fails = True.
+    """
+
+    # Error-checking.
+    error_checking.assert_is_string_list(field_names_grib1)
+    error_checking.assert_is_integer(num_grid_rows)
+    error_checking.assert_is_greater(num_grid_rows, 0)
+    error_checking.assert_is_integer(num_grid_columns)
+    error_checking.assert_is_greater(num_grid_columns, 0)
+    error_checking.assert_file_exists(wgrib_exe_name)
+    error_checking.assert_file_exists(wgrib2_exe_name)
+    error_checking.assert_is_boolean(raise_error_if_fails)
+    if sentinel_value is not None:
+        error_checking.assert_is_not_nan(sentinel_value)
+
+    # Housekeeping.
+    grib_file_type = file_name_to_type(grib_file_name)
+    num_fields = len(field_names_grib1)
+    field_matrices = [None] * num_fields
+    cache_file_names = [None] * num_fields
+
+    if cache_dir_name is not None:
+        error_checking.assert_is_integer(max_cache_size_bytes)
+        error_checking.assert_is_greater(max_cache_size_bytes, 0)
+        file_system_utils.mkdir_recursive_if_necessary(
+            directory_name=cache_dir_name)
+
+        if os.path.isfile(grib_file_name):
+            for j in range(num_fields):
+                cache_file_names[j] = _get_cache_file_name(
+                    cache_dir_name=cache_dir_name,
+                    grib_file_name=grib_file_name,
+                    field_name_grib1=field_names_grib1[j],
+                    num_grid_rows=num_grid_rows,
+                    num_grid_columns=num_grid_columns,
+                    sentinel_value=sentinel_value, binary_extraction=True)
+
+                field_matrices[j] = _read_field_from_cache(cache_file_names[j])
+
+    fields_to_read_indices = numpy.where(
+        numpy.array([m is None for m in field_matrices], dtype=bool)
+    )[0]
+
+    if len(fields_to_read_indices) == 0:
+        return field_matrices
+
+    if grib_file_type == GRIB1_FILE_TYPE:
+        exe_name = wgrib_exe_name
+        these_field_names = [
+            field_names_grib1[j] for j in fields_to_read_indices
+        ]
+    else:
+        exe_name = wgrib2_exe_name
+        these_field_names = [
+            _field_name_grib1_to_grib2(field_names_grib1[j])
+            for j in fields_to_read_indices
+        ]
+
+    # Inventory grib file and find one record for each field.
+    inventory_command_string = '"{0:s}" "{1:s}" -s'.format(
+        exe_name, grib_file_name)
+
+    try:
+        inventory_lines = subprocess.check_output(
+            inventory_command_string, shell=True
+        ).decode('utf-8').splitlines()
+    except (OSError, subprocess.CalledProcessError) as this_exception:
+        if raise_error_if_fails:
+            raise
+
+        warning_string = (
+            '\n\n{0:s}\n\nCommand (shown above) failed (details shown below).'
+            '\n\n{1:s}'
+        ).format(inventory_command_string, str(this_exception))
+
+        warnings.warn(warning_string)
+        return field_matrices
+
+    line_by_field = [None] * len(fields_to_read_indices)
+
+    for k in range(len(fields_to_read_indices)):
+        these_lines = _find_records_in_inventory(
+            inventory_lines=inventory_lines, field_name=these_field_names[k])
+
+        if len(these_lines) == 1:
+            line_by_field[k] = these_lines[0]
+            continue
+
+        error_string = (
+            'Expected one record for field "{0:s}" in file "{1:s}".  Instead, '
+            'found {2:d}.'
+        ).format(these_field_names[k], grib_file_name, len(these_lines))
+
+        if raise_error_if_fails:
+            raise ValueError(error_string)
+
+        warnings.warn(error_string)
+
+    # wgrib writes records in the order that they appear in the inventory.
+    lines_to_extract = set([l for l in line_by_field if l is not None])
+    record_lines = [l for l in inventory_lines if l in lines_to_extract]
+    if len(record_lines) == 0:
+        return field_matrices
+
+    # Extract all records to one temporary file.
+    if temporary_dir_name is not None:
+        file_system_utils.mkdir_recursive_if_necessary(
+            directory_name=temporary_dir_name)
+    file_handle, temporary_file_name = tempfile.mkstemp(
+        dir=temporary_dir_name)
+    os.close(file_handle)
+
+    if grib_file_type == GRIB1_FILE_TYPE:
+        command_string = '"{0:s}" -i "{1:s}" -bin -nh -o "{2:s}"'.format(
+            exe_name, grib_file_name, temporary_file_name)
+    else:
+        command_string = '"{0:s}" -i "{1:s}" -no_header -bin "{2:s}"'.format(
+            exe_name, grib_file_name, temporary_file_name)
+
+    try:
+        process_object = subprocess.Popen(
+            command_string, shell=True, stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE)
+        process_object.communicate(
+            input='\n'.join(record_lines + ['']).encode('utf-8')
+        )
+
+        if process_object.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process_object.returncode, command_string)
+    except (OSError, subprocess.CalledProcessError) as this_exception:
+        os.remove(temporary_file_name)
+        if raise_error_if_fails:
+            raise
+
+        warning_string = (
+            '\n\n{0:s}\n\nCommand (shown above) failed (details shown below).'
+            '\n\n{1:s}'
+        ).format(command_string, str(this_exception))
+
+        warnings.warn(warning_string)
+        return field_matrices
+
+    data_vector = numpy.fromfile(
+        temporary_file_name, dtype=numpy.float32
+    ).astype(float)
+    os.remove(temporary_file_name)
+
+    try:
+        data_matrix = numpy.reshape(
+            data_vector, (len(record_lines), num_grid_rows, num_grid_columns)
+        )
+    except ValueError as this_exception:
+        if raise_error_if_fails:
+            raise
+
+        warning_string = (
+            '\n\nnumpy.reshape failed (details shown below).\n\n{0:s}'
+        ).format(str(this_exception))
+
+        warnings.warn(warning_string)
+        return field_matrices
+
+    num_bytes_written = 0
+
+    for k in range(len(fields_to_read_indices)):
+        if line_by_field[k] is None:
+            continue
+
+        j = fields_to_read_indices[k]
+        this_record_index = record_lines.index(line_by_field[k])
+        field_matrices[j] = _sentinel_value_to_nan(
+            data_matrix=data_matrix[this_record_index, ...] + 0.,
+            sentinel_value=sentinel_value)
+
+        if cache_file_names[j] is not None:
+            num_bytes_written += _write_field_to_cache(
+                field_matrix=field_matrices[j].astype(numpy.float32),
+                cache_file_name=cache_file_names[j])
+
+    if cache_dir_name is not None:
+        _evict_from_cache(
+            cache_dir_name=cache_dir_name,
+            max_cache_size_bytes=max_cache_size_bytes,
+            num_new_bytes=num_bytes_written)
+
+    return field_matrices
+
 
 def is_u_wind_field(field_name_grib1):
     """Determines whether or not field is a u-wind field.
@@ -1,6 +1,9 @@
 """Unit tests for grib_io.py."""
 
+import os
 import copy
+import shutil
+import tempfile
 import unittest
 import numpy
 from gewittergefahr.gg_io import grib_io
@@ -35,6 +38,14 @@ DATA_MATRIX_NO_SENTINELS = numpy.array([
     [numpy.nan, numpy.nan, 1002., 1002., 1003.3]
 ])
 
+INVENTORY_LINES = [
+    '1:0:d=12050100:HGT:500 mb:anl',
+    '2:1:d=12050100:HGT:5000 mb:anl',
+    '3:2:d=12050100:TMP:500 mb:anl',
+    '4:3:d=12050100:TMP:2 m above gnd:anl',
+    '5:4:d=12050100:DPT:2 m above gnd:anl'
+]
+
 U_WIND_NAME_GRIB1 = 'UGRD:500 mb'
 V_WIND_NAME_GRIB1 = 'VGRD:500 mb'
 NON_WIND_NAME_GRIB1 = 'TMP:500 mb'
@@ -102,6 +113,178 @@ class GribIoTests(unittest.TestCase):
         self.assertTrue(numpy.allclose(
             this_data_matrix, DATA_MATRIX_WITH_SENTINELS, atol=TOLERANCE))
 
+    def test_write_and_read_cache(self):
+        """Ensures that _read_field_from_cache inverts _write_field_to_cache.
+        """
+
+        this_dir_name = tempfile.mkdtemp()
+        this_file_name = '{0:s}/field{1:s}'.format(
+            this_dir_name, grib_io.CACHE_FILE_EXTENSION)
+
+        try:
+            self.assertTrue(
+                grib_io._read_field_from_cache(this_file_name) is None
+            )
+
+            grib_io._write_field_to_cache(
+                field_matrix=DATA_MATRIX_NO_SENTINELS,
+                cache_file_name=this_file_name)
+            this_data_matrix = grib_io._read_field_from_cache(this_file_name)
+
+            self.assertTrue(numpy.array_equal(
+                this_data_matrix, DATA_MATRIX_NO_SENTINELS, equal_nan=True))
+            self.assertTrue(this_data_matrix.dtype == numpy.float64)
+            self.assertTrue(this_data_matrix.flags.writeable)
+        finally:
+            shutil.rmtree(this_dir_name)
+
+    def test_write_and_read_cache_float32(self):
+        """Ensures that _read_field_from_cache inverts _write_field_to_cache.
+
+        In this case the field is cached as float32 (as for binary extraction),
+        but should be read as a writable float64 array, like a cache miss.
+        """
+
+        this_dir_name = tempfile.mkdtemp()
+        this_file_name = '{0:s}/field{1:s}'.format(
+            this_dir_name, grib_io.CACHE_FILE_EXTENSION)
+
+        try:
+            grib_io._write_field_to_cache(
+                field_matrix=DATA_MATRIX_NO_SENTINELS.astype(numpy.float32),
+                cache_file_name=this_file_name)
+            this_data_matrix = grib_io._read_field_from_cache(this_file_name)
+
+            self.assertTrue(numpy.array_equal(
+                this_data_matrix,
+                DATA_MATRIX_NO_SENTINELS.astype(numpy.float32).astype(float),
+                equal_nan=True
+            ))
+            self.assertTrue(this_data_matrix.dtype == numpy.float64)
+            self.assertTrue(this_data_matrix.flags.writeable)
+        finally:
+            shutil.rmtree(this_dir_name)
+
+    def test_evict_from_cache(self):
+        """Ensures correct output from _evict_from_cache."""
+
+        this_dir_name = tempfile.mkdtemp()
+        these_file_names = [
+            '{0:s}/field{1:d}{2:s}'.format(
+                this_dir_name, k, grib_io.CACHE_FILE_EXTENSION)
+            for k in range(3)
+        ]
+
+        try:
+            for k in range(3):
+                grib_io._write_field_to_cache(
+                    field_matrix=DATA_MATRIX_NO_SENTINELS,
+                    cache_file_name=these_file_names[k])
+                os.utime(these_file_names[k], (k, k))
+
+            this_file_size_bytes = os.path.getsize(these_file_names[0])
+            grib_io._evict_from_cache(
+                cache_dir_name=this_dir_name,
+                max_cache_size_bytes=2 * this_file_size_bytes)
+
+            these_flags = [os.path.isfile(f) for f in these_file_names]
+        finally:
+            shutil.rmtree(this_dir_name)
+
+        self.assertTrue(these_flags == [False, True, True])
+
+    def test_evict_from_cache_running_total(self):
+        """Ensures that _evict_from_cache uses running total of cache size.
+
+        After the first call, the cache directory should be listed only when
+        the running total exceeds the max.
+        """
+
+        this_dir_name = tempfile.mkdtemp()
+        these_file_names = [
+            '{0:s}/field{1:d}{2:s}'.format(
+                this_dir_name, k, grib_io.CACHE_FILE_EXTENSION)
+            for k in range(3)
+        ]
+
+        try:
+            this_file_size_bytes = grib_io._write_field_to_cache(
+                field_matrix=DATA_MATRIX_NO_SENTINELS,
+                cache_file_name=these_file_names[0])
+            os.utime(these_file_names[0], (0, 0))
+
+            grib_io._evict_from_cache(
+                cache_dir_name=this_dir_name,
+                max_cache_size_bytes=this_file_size_bytes,
+                num_new_bytes=this_file_size_bytes)
+
+            # The new file is not added to the running total, so nothing is
+            # evicted.
+            grib_io._write_field_to_cache(
+                field_matrix=DATA_MATRIX_NO_SENTINELS,
+                cache_file_name=these_file_names[1])
+            os.utime(these_file_names[1], (1, 1))
+
+            grib_io._evict_from_cache(
+                cache_dir_name=this_dir_name,
+                max_cache_size_bytes=this_file_size_bytes, num_new_bytes=0)
+            first_flags = [os.path.isfile(f) for f in these_file_names]
+
+            # Now the running total exceeds the max, so the oldest files are
+            # evicted.
+            grib_io._write_field_to_cache(
+                field_matrix=DATA_MATRIX_NO_SENTINELS,
+                cache_file_name=these_file_names[2])
+            os.utime(these_file_names[2], (2, 2))
+
+            grib_io._evict_from_cache(
+                cache_dir_name=this_dir_name,
+                max_cache_size_bytes=this_file_size_bytes,
+                num_new_bytes=this_file_size_bytes)
+            second_flags = [os.path.isfile(f) for f in these_file_names]
+        finally:
+            shutil.rmtree(this_dir_name)
+
+        self.assertTrue(first_flags == [True, True, False])
+        self.assertTrue(second_flags == [False, False, True])
+
+    def test_find_records_in_inventory_one(self):
+        """Ensures correct output from _find_records_in_inventory.
+
+        In this case there is one matching record.
+        """
+
+        self.assertTrue(
+            grib_io._find_records_in_inventory(
+                inventory_lines=INVENTORY_LINES, field_name='HGT:500 mb')
+            == [INVENTORY_LINES[0]]
+        )
+
+    def test_find_records_in_inventory_none(self):
+        """Ensures correct output from _find_records_in_inventory.
+
+        In this case there are no matching records.
+        """
+
+        self.assertTrue(
+            grib_io._find_records_in_inventory(
+                inventory_lines=INVENTORY_LINES, field_name='HGT:50 mb')
+            == []
+        )
+
+    def test_find_records_in_inventory_many(self):
+        """Ensures correct output from _find_records_in_inventory.
+
+        In this case there are many matching records.
+        """
+
+        self.assertTrue(
+            grib_io._find_records_in_inventory(
+                inventory_lines=INVENTORY_LINES,
+                field_name='2 m above gnd')
+            == INVENTORY_LINES[3:]
+        )
+
     def test_check_file_type_grib1(self):
         """Ensures correct output from check_file_type.
 
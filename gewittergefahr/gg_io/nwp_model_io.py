@@ -341,7 +341,7 @@ def read_field_from_grib_file(
         grib_file_name, field_name_grib1, model_name, grid_id=None,
         temporary_dir_name=None, wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
         wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
-        raise_error_if_fails=True):
+        raise_error_if_fails=True, cache_dir_name=None):
     """Reads field from grib file.
 
     One field = one variable at one time step.
@@ -354,6 +354,7 @@ def read_field_from_grib_file(
     :param wgrib_exe_name: Same.
     :param wgrib2_exe_name: Same.
     :param raise_error_if_fails: Same.
+    :param cache_dir_name: Same.
     :return: field_matrix: Same.
     """
 
@@ -366,4 +367,37 @@ def read_field_from_grib_file(
         sentinel_value=nwp_model_utils.SENTINEL_VALUE,
         temporary_dir_name=temporary_dir_name, wgrib_exe_name=wgrib_exe_name,
         wgrib2_exe_name=wgrib2_exe_name,
-        raise_error_if_fails=raise_error_if_fails)
+        raise_error_if_fails=raise_error_if_fails,
+        cache_dir_name=cache_dir_name)
+
+
+def read_fields_from_grib_file(
+        grib_file_name, field_names_grib1, model_name, grid_id=None,
+        temporary_dir_name=None, wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
+        wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
+        raise_error_if_fails=True, cache_dir_name=None):
+    """Reads many fields from grib file.
+
+    :param grib_file_name: Path to input file.
+    :param field_names_grib1: See doc for `grib_io.read_fields_from_grib_file`.
+    :param model_name: See doc for `nwp_model_utils.check_grid_name`.
+    :param grid_id: Same.
+    :param temporary_dir_name: See doc for `grib_io.read_fields_from_grib_file`.
+    :param wgrib_exe_name: Same.
+    :param wgrib2_exe_name: Same.
+    :param raise_error_if_fails: Same.
+    :param cache_dir_name: Same.
+    :return: field_matrices: Same.
+    """
+
+    num_grid_rows, num_grid_columns = nwp_model_utils.get_grid_dimensions(
+        model_name=model_name, grid_name=grid_id)
+
+    return grib_io.read_fields_from_grib_file(
+        grib_file_name=grib_file_name, field_names_grib1=field_names_grib1,
+        num_grid_rows=num_grid_rows, num_grid_columns=num_grid_columns,
+        sentinel_value=nwp_model_utils.SENTINEL_VALUE,
+        temporary_dir_name=temporary_dir_name, wgrib_exe_name=wgrib_exe_name,
+        wgrib2_exe_name=wgrib2_exe_name,
+        raise_error_if_fails=raise_error_if_fails,
+        cache_dir_name=cache_dir_name)
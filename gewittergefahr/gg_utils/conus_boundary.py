@@ -349,22 +349,18 @@ def find_points_in_conus(
         exterior_x_coords=conus_longitudes_deg,
         exterior_y_coords=conus_latitudes_deg)
 
-    for i in range(num_query_points):
-        if numpy.mod(i, 1000) == 0 and verbose:
-            print((
-                'Have done point-in-CONUS test for {0:d} of {1:d} points...'
-            ).format(
-                i, num_query_points
-            ))
-
-        if in_conus_flags[i] != -1:
-            continue
+    trial_indices = numpy.where(in_conus_flags == -1)[0]
 
-        in_conus_flags[i] = polygons.point_in_or_on_polygon(
-            polygon_object=conus_polygon_object,
-            query_x_coordinate=query_longitudes_deg[i],
-            query_y_coordinate=query_latitudes_deg[i]
-        )
+    if verbose:
+        print('Doing point-in-CONUS test for {0:d} of {1:d} points...'.format(
+            len(trial_indices), num_query_points
+        ))
+
+    in_conus_flags[trial_indices] = polygons.points_in_or_on_polygon(
+        polygon_object=conus_polygon_object,
+        query_x_coords=query_longitudes_deg[trial_indices],
+        query_y_coords=query_latitudes_deg[trial_indices]
+    ).astype(int)
 
     if verbose:
         print('Have done point-in-CONUS test for all {0:d} points!'.format(
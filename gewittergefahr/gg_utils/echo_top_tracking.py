@@ -26,11 +26,12 @@ Lakshmanan, V., and T. Smith, 2010: "Evaluating a storm tracking algorithm".
 import copy
 import os.path
 import warnings
+import functools
+import multiprocessing
 from itertools import chain
 import numpy
 import pandas
 from scipy.ndimage.filters import gaussian_filter
-from scipy.stats import mode as scipy_mode
 from skimage.measure import label as label_image
 from gewittergefahr.gg_io import myrorss_and_mrms_io
 from gewittergefahr.gg_io import storm_tracking_io as tracking_io
@@ -540,83 +541,69 @@ def _find_input_tracking_files(
             valid_times_by_date_unix_sec)
 
 
-def _make_regions_contiguous(
-        region_to_grid_rows, region_to_grid_columns, grid_cell_to_region,
-        num_grid_rows, num_grid_columns):
+def _make_regions_contiguous(radar_to_region_matrix):
     """Makes regions (local maxima) contiguous.
 
+    A grid cell is "isolated" if none of its 8 neighbours is in the same
+    region.  Each isolated grid cell (unless it is the only cell in its region)
+    is moved to the region most common among its neighbours.  If there is a tie,
+    the region with the lowest index wins.
+
     M = number of rows in radar grid
     N = number of columns in radar grid
 
-    :param region_to_grid_rows: 1-D list, where the [k]th element is a numpy
-        array with row indices of grid cells in the [k]th region.
-    :param region_to_grid_columns: Same but for columns.
-    :param grid_cell_to_region: Double-indexed dictionary.  If key [i, j] has
-        value k, grid cell [i, j] belongs to region k.
-    :param num_grid_rows: M in the above discussion.
-    :param num_grid_columns: N in the above discussion.
-    :return: radar_to_region_matrix: M-by-N numpy array of region indices, where
+    :param radar_to_region_matrix: M-by-N numpy array of region indices, where
         -1 means "not part of a region".
+    :return: radar_to_region_matrix: Same as input but with contiguous regions.
     """
 
-    num_maxima = len(region_to_grid_rows)
-    radar_to_region_matrix = numpy.full(
-        (num_grid_rows, num_grid_columns), -1, dtype=int
+    rows_in_any_region, columns_in_any_region = numpy.where(
+        radar_to_region_matrix >= 0
     )
+    if len(rows_in_any_region) == 0:
+        return radar_to_region_matrix
 
-    for k in range(num_maxima):
-        radar_to_region_matrix[
-            region_to_grid_rows[k], region_to_grid_columns[k]
-        ] = k
-
-        if len(region_to_grid_rows[k]) == 1:
-            continue
-
-        isolated_rows = []
-        isolated_columns = []
-
-        for i, j in zip(region_to_grid_rows[k], region_to_grid_columns[k]):
-            neigh_row_flags = numpy.logical_and(
-                region_to_grid_rows[k] >= i - 1, region_to_grid_rows[k] <= i + 1
-            )
-            neigh_column_flags = numpy.logical_and(
-                region_to_grid_columns[k] >= j - 1,
-                region_to_grid_columns[k] <= j + 1
-            )
+    region_indices = radar_to_region_matrix[
+        rows_in_any_region, columns_in_any_region
+    ]
 
-            num_neighbours = -1 + numpy.sum(numpy.logical_and(
-                neigh_row_flags, neigh_column_flags
-            ))
+    padded_region_matrix = numpy.pad(
+        radar_to_region_matrix, pad_width=1, mode='constant',
+        constant_values=-1
+    )
 
-            if num_neighbours > 0:
-                continue
+    neigh_region_matrix = numpy.stack([
+        padded_region_matrix[
+            rows_in_any_region + 1 + i, columns_in_any_region + 1 + j
+        ]
+        for i in range(-1, 2) for j in range(-1, 2) if not i == j == 0
+    ], axis=-1)
 
-            isolated_rows.append(i)
-            isolated_columns.append(j)
+    num_neighbours_in_region = numpy.sum(
+        neigh_region_matrix == region_indices[:, numpy.newaxis], axis=1
+    )
 
-        isolated_rows = numpy.array(isolated_rows, dtype=int)
-        isolated_columns = numpy.array(isolated_columns, dtype=int)
+    num_cells_by_region = numpy.bincount(region_indices)
+    isolated_indices = numpy.where(numpy.logical_and(
+        num_neighbours_in_region == 0,
+        num_cells_by_region[region_indices] > 1
+    ))[0]
 
-        for i, j in zip(isolated_rows, isolated_columns):
-            these_region_indices = []
+    radar_to_region_matrix = radar_to_region_matrix + 0
 
-            for i_new in range(i - 1, i + 2):
-                for j_new in range(j - 1, j + 2):
-                    if (i_new, j_new) in grid_cell_to_region:
-                        these_region_indices.append(
-                            grid_cell_to_region[i_new, j_new]
-                        )
-                    else:
-                        these_region_indices.append(numpy.nan)
+    for m in isolated_indices:
+        these_neigh_region_indices = neigh_region_matrix[m, :]
+        these_neigh_region_indices = these_neigh_region_indices[
+            these_neigh_region_indices >= 0
+        ]
 
-            these_region_indices = numpy.array(these_region_indices)
-            these_region_indices[these_region_indices == k] = numpy.nan
-            this_mode_object = scipy_mode(
-                these_region_indices, axis=None, nan_policy='omit')
+        these_unique_indices, these_counts = numpy.unique(
+            these_neigh_region_indices, return_counts=True
+        )
 
-            radar_to_region_matrix[i, j] = int(numpy.round(
-                this_mode_object.mode
-            ))
+        radar_to_region_matrix[
+            rows_in_any_region[m], columns_in_any_region[m]
+        ] = these_unique_indices[numpy.argmax(these_counts)]
 
     return radar_to_region_matrix
 
@@ -626,6 +613,12 @@ def _local_maxima_to_regions(
         radar_latitudes_deg, radar_longitudes_deg):
     """Converts local maxima at one time from points to regions.
 
+    Each local max claims the connected echo region (echo top >=
+    `min_echo_top_km`) containing its grid cell, or only its grid cell if the
+    latter is not in an echo region.  Grid cells claimed by more than one local
+    max are assigned to the nearest one.  All grid cells are handled in one
+    pass per echo region, rather than one pass per grid cell.
+
     :param local_max_dict: See doc for `_local_maxima_to_polygons`.
     :param echo_top_matrix_km: Same.
     :param min_echo_top_km: Same.
@@ -641,117 +634,135 @@ def _local_maxima_to_regions(
 
     orig_region_id_matrix = label_image(
         echo_top_matrix_km >= min_echo_top_km, connectivity=2)
-    rows_in_any_region, columns_in_any_region = numpy.where(
-        orig_region_id_matrix > 0)
+    num_grid_columns = orig_region_id_matrix.shape[1]
 
-    num_maxima = len(local_max_dict[temporal_tracking.LATITUDES_KEY])
+    max_latitudes_deg = local_max_dict[temporal_tracking.LATITUDES_KEY]
+    max_longitudes_deg = local_max_dict[temporal_tracking.LONGITUDES_KEY]
 
-    region_to_grid_rows = [None] * num_maxima
-    region_to_grid_columns = [None] * num_maxima
-    grid_cell_to_regions = {}
+    max_rows = numpy.array([
+        numpy.argmin(numpy.absolute(l - radar_latitudes_deg))
+        for l in max_latitudes_deg
+    ], dtype=int)
 
-    for k in range(num_maxima):
-        this_row = numpy.argmin(numpy.absolute(
-            local_max_dict[temporal_tracking.LATITUDES_KEY][k] -
-            radar_latitudes_deg
-        ))
+    max_columns = numpy.array([
+        numpy.argmin(numpy.absolute(l - radar_longitudes_deg))
+        for l in max_longitudes_deg
+    ], dtype=int)
 
-        this_column = numpy.argmin(numpy.absolute(
-            local_max_dict[temporal_tracking.LONGITUDES_KEY][k] -
-            radar_longitudes_deg
-        ))
+    max_region_ids = orig_region_id_matrix[max_rows, max_columns]
 
-        this_region_id = orig_region_id_matrix[this_row, this_column]
+    # Find grid cells (as flat indices) in each echo region.
+    flat_region_ids = numpy.ravel(orig_region_id_matrix)
+    flat_indices_by_region_id = numpy.argsort(flat_region_ids, kind='stable')
+    num_cells_by_region_id = numpy.bincount(flat_region_ids)
+    first_index_by_region_id = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_cells_by_region_id)
+    ))
 
-        if this_region_id == 0:
-            region_to_grid_rows[k] = numpy.array([this_row], dtype=int)
-            region_to_grid_columns[k] = numpy.array([this_column], dtype=int)
-        else:
-            these_subindices = numpy.where(
-                orig_region_id_matrix[rows_in_any_region, columns_in_any_region]
-                == this_region_id
-            )
+    # Each group is a set of grid cells claimed by the same local maxima.  A
+    # local max outside all echo regions claims only its own grid cell.
+    group_to_flat_indices = []
+    group_to_max_indices = []
 
-            region_to_grid_rows[k] = rows_in_any_region[these_subindices]
-            region_to_grid_columns[k] = columns_in_any_region[these_subindices]
+    for this_region_id in numpy.unique(max_region_ids[max_region_ids > 0]):
+        this_first_index = first_index_by_region_id[this_region_id]
+        this_last_index = first_index_by_region_id[this_region_id + 1]
 
-        for i, j in zip(region_to_grid_rows[k], region_to_grid_columns[k]):
-            if (i, j) in grid_cell_to_regions:
-                grid_cell_to_regions[i, j].append(k)
-            else:
-                grid_cell_to_regions[i, j] = [k]
+        group_to_flat_indices.append(
+            flat_indices_by_region_id[this_first_index:this_last_index]
+        )
+        group_to_max_indices.append(
+            numpy.where(max_region_ids == this_region_id)[0]
+        )
+
+    outside_max_indices = numpy.where(max_region_ids == 0)[0]
+    outside_flat_indices = (
+        max_rows[outside_max_indices] * num_grid_columns +
+        max_columns[outside_max_indices]
+    )
 
-    for this_key in grid_cell_to_regions:
-        grid_cell_to_regions[this_key] = numpy.array(
-            grid_cell_to_regions[this_key], dtype=int
+    for this_flat_index in numpy.unique(outside_flat_indices):
+        group_to_flat_indices.append(
+            numpy.array([this_flat_index], dtype=int)
+        )
+        group_to_max_indices.append(
+            outside_max_indices[outside_flat_indices == this_flat_index]
         )
 
-    these_keys = list(grid_cell_to_regions.keys())
-    rows_in_any_region = numpy.array([a[0] for a in these_keys], dtype=int)
-    columns_in_any_region = numpy.array([a[1] for a in these_keys], dtype=int)
+    radar_to_region_matrix = numpy.full(
+        orig_region_id_matrix.shape, -1, dtype=int
+    )
+    shared_group_indices = []
+
+    for m in range(len(group_to_max_indices)):
+        if len(group_to_max_indices[m]) == 1:
+            radar_to_region_matrix.flat[group_to_flat_indices[m]] = (
+                group_to_max_indices[m][0]
+            )
+        else:
+            shared_group_indices.append(m)
+
+    if len(shared_group_indices) == 0:
+        return _make_regions_contiguous(radar_to_region_matrix)
+
+    # Assign each shared grid cell to the nearest local max.  Distances are
+    # computed in x-y space, with all shared grid cells projected at once.
+    shared_flat_indices = numpy.concatenate([
+        group_to_flat_indices[m] for m in shared_group_indices
+    ])
+    shared_rows, shared_columns = numpy.unravel_index(
+        shared_flat_indices, orig_region_id_matrix.shape
+    )
 
     projection_object = projections.init_azimuthal_equidistant_projection(
         central_latitude_deg=numpy.mean(radar_latitudes_deg),
         central_longitude_deg=numpy.mean(radar_longitudes_deg)
     )
 
-    x_in_any_region_metres, y_in_any_region_metres = (
+    shared_x_coords_metres, shared_y_coords_metres = (
         projections.project_latlng_to_xy(
-            latitudes_deg=radar_latitudes_deg[rows_in_any_region],
-            longitudes_deg=radar_longitudes_deg[columns_in_any_region],
+            latitudes_deg=radar_latitudes_deg[shared_rows],
+            longitudes_deg=radar_longitudes_deg[shared_columns],
             projection_object=projection_object)
     )
 
     point_x_coords_metres, point_y_coords_metres = (
         projections.project_latlng_to_xy(
-            latitudes_deg=local_max_dict[temporal_tracking.LATITUDES_KEY],
-            longitudes_deg=local_max_dict[temporal_tracking.LONGITUDES_KEY],
+            latitudes_deg=max_latitudes_deg, longitudes_deg=max_longitudes_deg,
             projection_object=projection_object)
     )
 
-    region_to_grid_rows = [numpy.array([], dtype=int)] * num_maxima
-    region_to_grid_columns = [numpy.array([], dtype=int)] * num_maxima
-    grid_cell_to_region = {}
+    this_first_index = 0
 
-    for m in range(len(rows_in_any_region)):
-        i = rows_in_any_region[m]
-        j = columns_in_any_region[m]
-        these_region_indices = grid_cell_to_regions[i, j]
+    for m in shared_group_indices:
+        this_last_index = this_first_index + len(group_to_flat_indices[m])
+        these_max_indices = group_to_max_indices[m]
 
-        if len(these_region_indices) == 1:
-            k = these_region_indices[0]
-        else:
-            these_x_diffs_metres = (
-                x_in_any_region_metres[m] -
-                point_x_coords_metres[these_region_indices]
-            )
+        these_x_diffs_metres = (
+            shared_x_coords_metres[
+                this_first_index:this_last_index, numpy.newaxis] -
+            point_x_coords_metres[these_max_indices][numpy.newaxis, :]
+        )
 
-            these_y_diffs_metres = (
-                y_in_any_region_metres[m] -
-                point_y_coords_metres[these_region_indices]
-            )
+        these_y_diffs_metres = (
+            shared_y_coords_metres[
+                this_first_index:this_last_index, numpy.newaxis] -
+            point_y_coords_metres[these_max_indices][numpy.newaxis, :]
+        )
 
-            these_distances_metres2 = (
-                these_x_diffs_metres ** 2 + these_y_diffs_metres ** 2
-            )
+        these_distances_metres2 = (
+            these_x_diffs_metres ** 2 + these_y_diffs_metres ** 2
+        )
 
-            k = these_region_indices[numpy.nanargmin(these_distances_metres2)]
+        radar_to_region_matrix.flat[group_to_flat_indices[m]] = (
+            these_max_indices[
+                numpy.nanargmin(these_distances_metres2, axis=1)
+            ]
+        )
 
-        region_to_grid_rows[k] = numpy.concatenate((
-            region_to_grid_rows[k], numpy.array([i], dtype=int)
-        ))
-        region_to_grid_columns[k] = numpy.concatenate((
-            region_to_grid_columns[k], numpy.array([j], dtype=int)
-        ))
-        grid_cell_to_region[i, j] = k
-
-    return _make_regions_contiguous(
-        region_to_grid_rows=region_to_grid_rows,
-        region_to_grid_columns=region_to_grid_columns,
-        grid_cell_to_region=grid_cell_to_region,
-        num_grid_rows=echo_top_matrix_km.shape[0],
-        num_grid_columns=echo_top_matrix_km.shape[1]
-    )
+        this_first_index = this_last_index + 0
+
+    return _make_regions_contiguous(radar_to_region_matrix)
 
 
 def _local_maxima_to_polygons(
@@ -823,34 +834,59 @@ def _local_maxima_to_polygons(
 
     num_maxima = len(local_max_dict[temporal_tracking.LATITUDES_KEY])
 
-    local_max_dict[temporal_tracking.GRID_POINT_ROWS_KEY] = [[]] * num_maxima
-    local_max_dict[temporal_tracking.GRID_POINT_COLUMNS_KEY] = [[]] * num_maxima
-    local_max_dict[temporal_tracking.GRID_POINT_LATITUDES_KEY] = (
-        [[]] * num_maxima
-    )
-    local_max_dict[temporal_tracking.GRID_POINT_LONGITUDES_KEY] = (
-        [[]] * num_maxima
+    # Find grid points in each region, all in one pass.  Within each region,
+    # grid points are in row-major order (as returned by `numpy.where`).
+    rows_in_any_region, columns_in_any_region = numpy.where(
+        radar_to_region_matrix >= 0
     )
-    local_max_dict[temporal_tracking.POLYGON_OBJECTS_ROWCOL_KEY] = numpy.full(
-        num_maxima, numpy.nan, dtype=object
+    sort_indices = numpy.argsort(
+        radar_to_region_matrix[rows_in_any_region, columns_in_any_region],
+        kind='stable'
     )
-    local_max_dict[temporal_tracking.POLYGON_OBJECTS_LATLNG_KEY] = numpy.full(
-        num_maxima, numpy.nan, dtype=object
+    rows_in_any_region = rows_in_any_region[sort_indices]
+    columns_in_any_region = columns_in_any_region[sort_indices]
+
+    num_points_by_region = numpy.bincount(
+        radar_to_region_matrix[rows_in_any_region, columns_in_any_region],
+        minlength=num_maxima
     )
+    split_indices = numpy.cumsum(num_points_by_region)[:-1]
 
-    good_indices = []
+    latitudes_in_any_region_deg, longitudes_in_any_region_deg = (
+        radar_utils.rowcol_to_latlng(
+            grid_rows=rows_in_any_region, grid_columns=columns_in_any_region,
+            nw_grid_point_lat_deg=radar_metadata_dict[
+                radar_utils.NW_GRID_POINT_LAT_COLUMN],
+            nw_grid_point_lng_deg=radar_metadata_dict[
+                radar_utils.NW_GRID_POINT_LNG_COLUMN],
+            lat_spacing_deg=radar_metadata_dict[
+                radar_utils.LAT_SPACING_COLUMN],
+            lng_spacing_deg=radar_metadata_dict[radar_utils.LNG_SPACING_COLUMN]
+        )
+    )
 
-    for k in range(num_maxima):
-        (local_max_dict[temporal_tracking.GRID_POINT_ROWS_KEY][k],
-         local_max_dict[temporal_tracking.GRID_POINT_COLUMNS_KEY][k]
-        ) = numpy.where(radar_to_region_matrix == k)
+    local_max_dict[temporal_tracking.GRID_POINT_ROWS_KEY] = numpy.split(
+        rows_in_any_region, split_indices
+    )
+    local_max_dict[temporal_tracking.GRID_POINT_COLUMNS_KEY] = numpy.split(
+        columns_in_any_region, split_indices
+    )
+    local_max_dict[temporal_tracking.GRID_POINT_LATITUDES_KEY] = numpy.split(
+        latitudes_in_any_region_deg, split_indices
+    )
+    local_max_dict[temporal_tracking.GRID_POINT_LONGITUDES_KEY] = numpy.split(
+        longitudes_in_any_region_deg, split_indices
+    )
 
-        if len(local_max_dict[temporal_tracking.GRID_POINT_ROWS_KEY][k]) == 0:
-            continue
+    good_indices = numpy.where(num_points_by_region > 0)[0]
 
-        good_indices.append(k)
+    # Find polygon vertices for each region, then convert all vertices to
+    # lat-long at once.
+    vertex_rows_by_region = [None] * num_maxima
+    vertex_columns_by_region = [None] * num_maxima
 
-        these_vertex_rows, these_vertex_columns = (
+    for k in good_indices:
+        vertex_rows_by_region[k], vertex_columns_by_region[k] = (
             polygons.grid_points_in_poly_to_vertices(
                 grid_point_row_indices=local_max_dict[
                     temporal_tracking.GRID_POINT_ROWS_KEY][k],
@@ -859,24 +895,26 @@ def _local_maxima_to_polygons(
             )
         )
 
-        (local_max_dict[temporal_tracking.GRID_POINT_LATITUDES_KEY][k],
-         local_max_dict[temporal_tracking.GRID_POINT_LONGITUDES_KEY][k]
-        ) = radar_utils.rowcol_to_latlng(
-            grid_rows=local_max_dict[temporal_tracking.GRID_POINT_ROWS_KEY][k],
-            grid_columns=local_max_dict[
-                temporal_tracking.GRID_POINT_COLUMNS_KEY][k],
-            nw_grid_point_lat_deg=radar_metadata_dict[
-                radar_utils.NW_GRID_POINT_LAT_COLUMN],
-            nw_grid_point_lng_deg=radar_metadata_dict[
-                radar_utils.NW_GRID_POINT_LNG_COLUMN],
-            lat_spacing_deg=radar_metadata_dict[
-                radar_utils.LAT_SPACING_COLUMN],
-            lng_spacing_deg=radar_metadata_dict[radar_utils.LNG_SPACING_COLUMN]
+    local_max_dict[temporal_tracking.POLYGON_OBJECTS_ROWCOL_KEY] = numpy.full(
+        num_maxima, numpy.nan, dtype=object
+    )
+    local_max_dict[temporal_tracking.POLYGON_OBJECTS_LATLNG_KEY] = numpy.full(
+        num_maxima, numpy.nan, dtype=object
+    )
+
+    if len(good_indices) > 0:
+        num_vertices_by_region = numpy.array(
+            [len(vertex_rows_by_region[k]) for k in good_indices], dtype=int
         )
 
-        these_vertex_latitudes_deg, these_vertex_longitudes_deg = (
+        vertex_latitudes_deg, vertex_longitudes_deg = (
             radar_utils.rowcol_to_latlng(
-                grid_rows=these_vertex_rows, grid_columns=these_vertex_columns,
+                grid_rows=numpy.concatenate(
+                    [vertex_rows_by_region[k] for k in good_indices]
+                ),
+                grid_columns=numpy.concatenate(
+                    [vertex_columns_by_region[k] for k in good_indices]
+                ),
                 nw_grid_point_lat_deg=radar_metadata_dict[
                     radar_utils.NW_GRID_POINT_LAT_COLUMN],
                 nw_grid_point_lng_deg=radar_metadata_dict[
@@ -888,16 +926,25 @@ def _local_maxima_to_polygons(
             )
         )
 
+        vertex_split_indices = numpy.cumsum(num_vertices_by_region)[:-1]
+        vertex_lats_by_good_region_deg = numpy.split(
+            vertex_latitudes_deg, vertex_split_indices
+        )
+        vertex_lngs_by_good_region_deg = numpy.split(
+            vertex_longitudes_deg, vertex_split_indices
+        )
+
+    for m, k in enumerate(good_indices):
         local_max_dict[temporal_tracking.POLYGON_OBJECTS_ROWCOL_KEY][k] = (
             polygons.vertex_arrays_to_polygon_object(
-                exterior_x_coords=these_vertex_columns,
-                exterior_y_coords=these_vertex_rows)
+                exterior_x_coords=vertex_columns_by_region[k],
+                exterior_y_coords=vertex_rows_by_region[k])
         )
 
         local_max_dict[temporal_tracking.POLYGON_OBJECTS_LATLNG_KEY][k] = (
             polygons.vertex_arrays_to_polygon_object(
-                exterior_x_coords=these_vertex_longitudes_deg,
-                exterior_y_coords=these_vertex_latitudes_deg)
+                exterior_x_coords=vertex_lngs_by_good_region_deg[m],
+                exterior_y_coords=vertex_lats_by_good_region_deg[m])
         )
 
         if not recompute_centroids:
@@ -924,8 +971,6 @@ def _local_maxima_to_polygons(
         num_maxima - len(good_indices), num_maxima
     ))
 
-    good_indices = numpy.array(good_indices, dtype=int)
-
     for this_key in local_max_dict:
         if isinstance(local_max_dict[this_key], list):
             local_max_dict[this_key] = [
@@ -1371,6 +1416,168 @@ def _old_to_new_tracking_periods(
     return tracking_start_times_unix_sec, tracking_end_times_unix_sec
 
 
+def _find_maxima_one_time(
+        radar_file_name_and_time, radar_source_name, echo_top_field_name,
+        top_echo_classifn_dir_name, min_echo_top_km, smoothing_radius_deg_lat,
+        half_width_for_max_filter_deg_lat, min_intermax_distance_metres,
+        min_polygon_size_pixels, recompute_centroids):
+    """Finds local maxima (and storm polygons) at one radar time.
+
+    This method does not depend on other radar times, so it may be run in a
+    worker process.
+
+    :param radar_file_name_and_time: Tuple with path to radar file and valid
+        time (Unix seconds).
+    :param radar_source_name: See doc for `run_tracking`.
+    :param echo_top_field_name: Same.
+    :param top_echo_classifn_dir_name: Same.
+    :param min_echo_top_km: Same.
+    :param smoothing_radius_deg_lat: Same.
+    :param half_width_for_max_filter_deg_lat: Same.
+    :param min_intermax_distance_metres: Same.
+    :param min_polygon_size_pixels: Same.
+    :param recompute_centroids: Same.
+    :return: local_max_dict: Dictionary created by
+        `_remove_redundant_local_maxima`.  If the echo-classification file is
+        missing, this is None.
+    """
+
+    radar_file_name, radar_time_unix_sec = radar_file_name_and_time
+
+    if top_echo_classifn_dir_name is None:
+        echo_classifn_file_name = None
+    else:
+        echo_classifn_file_name = echo_classifn.find_classification_file(
+            top_directory_name=top_echo_classifn_dir_name,
+            valid_time_unix_sec=radar_time_unix_sec,
+            desire_zipped=True, allow_zipped_or_unzipped=True,
+            raise_error_if_missing=False)
+
+        if not os.path.isfile(echo_classifn_file_name):
+            warning_string = (
+                'POTENTIAL PROBLEM.  Cannot find echo-classification file.  '
+                'Expected at: "{0:s}"'
+            ).format(echo_classifn_file_name)
+
+            warnings.warn(warning_string)
+            return None
+
+    print('Reading data from: "{0:s}"...'.format(radar_file_name))
+    metadata_dict = myrorss_and_mrms_io.read_metadata_from_raw_file(
+        netcdf_file_name=radar_file_name, data_source=radar_source_name)
+
+    sparse_grid_table = myrorss_and_mrms_io.read_data_from_sparse_grid_file(
+        netcdf_file_name=radar_file_name,
+        field_name_orig=metadata_dict[
+            myrorss_and_mrms_io.FIELD_NAME_COLUMN_ORIG],
+        data_source=radar_source_name,
+        sentinel_values=metadata_dict[radar_utils.SENTINEL_VALUE_COLUMN]
+    )
+
+    echo_top_matrix_km = radar_s2f.sparse_to_full_grid(
+        sparse_grid_table=sparse_grid_table, metadata_dict=metadata_dict,
+        ignore_if_below=min_echo_top_km
+    )[0]
+
+    if echo_classifn_file_name is not None:
+        print('Reading data from: "{0:s}"...'.format(echo_classifn_file_name))
+
+        convective_flag_matrix = echo_classifn.read_classifications(
+            echo_classifn_file_name
+        )[0]
+
+        convective_flag_matrix = numpy.flip(convective_flag_matrix, axis=0)
+        echo_top_matrix_km[convective_flag_matrix == False] = 0.
+
+    print('Finding local maxima in "{0:s}" at {1:s}...'.format(
+        echo_top_field_name,
+        time_conversion.unix_sec_to_string(radar_time_unix_sec, TIME_FORMAT)
+    ))
+
+    latitude_spacing_deg = metadata_dict[radar_utils.LAT_SPACING_COLUMN]
+
+    smoothed_et_matrix_km = _gaussian_smooth_radar_field(
+        radar_matrix=copy.deepcopy(echo_top_matrix_km),
+        e_folding_radius_pixels=smoothing_radius_deg_lat / latitude_spacing_deg
+    )
+
+    half_width_pixels = int(numpy.round(
+        half_width_for_max_filter_deg_lat / latitude_spacing_deg
+    ))
+
+    local_max_dict = _find_local_maxima(
+        radar_matrix=smoothed_et_matrix_km, radar_metadata_dict=metadata_dict,
+        neigh_half_width_pixels=half_width_pixels)
+
+    local_max_dict.update(
+        {temporal_tracking.VALID_TIME_KEY: radar_time_unix_sec}
+    )
+
+    local_max_dict = _local_maxima_to_polygons(
+        local_max_dict=local_max_dict, echo_top_matrix_km=echo_top_matrix_km,
+        min_echo_top_km=min_echo_top_km, radar_metadata_dict=metadata_dict,
+        recompute_centroids=recompute_centroids)
+
+    local_max_dict = _remove_small_polygons(
+        local_max_dict=local_max_dict, min_size_pixels=min_polygon_size_pixels)
+
+    projection_object = projections.init_azimuthal_equidistant_projection(
+        central_latitude_deg=CENTRAL_PROJ_LATITUDE_DEG,
+        central_longitude_deg=CENTRAL_PROJ_LONGITUDE_DEG)
+
+    return _remove_redundant_local_maxima(
+        local_max_dict=local_max_dict, projection_object=projection_object,
+        min_intermax_distance_metres=min_intermax_distance_metres)
+
+
+def _link_local_maxima_one_time(
+        local_max_dict_by_time, time_index, radar_time_strings,
+        max_link_time_seconds, max_velocity_diff_m_s01,
+        max_link_distance_m_s01):
+    """Links local maxima at one time with those at the previous time.
+
+    T = number of radar times
+
+    :param local_max_dict_by_time: length-T list of dictionaries created by
+        `_find_maxima_one_time`.  The [i]th dictionary, where i =
+        `time_index`, will be updated in place.
+    :param time_index: Index of current time.
+    :param radar_time_strings: length-T list of radar times (format
+        "yyyy-mm-dd-HHMMSS").
+    :param max_link_time_seconds: See doc for `run_tracking`.
+    :param max_velocity_diff_m_s01: Same.
+    :param max_link_distance_m_s01: Same.
+    """
+
+    i = time_index
+
+    if i == 0:
+        previous_local_max_dict = None
+    else:
+        print((
+            'Linking local maxima at {0:s} with those at {1:s}...\n'
+        ).format(
+            radar_time_strings[i], radar_time_strings[i - 1]
+        ))
+
+        previous_local_max_dict = local_max_dict_by_time[i - 1]
+
+    current_to_prev_matrix = temporal_tracking.link_local_maxima_in_time(
+        current_local_max_dict=local_max_dict_by_time[i],
+        previous_local_max_dict=previous_local_max_dict,
+        max_link_time_seconds=max_link_time_seconds,
+        max_velocity_diff_m_s01=max_velocity_diff_m_s01,
+        max_link_distance_m_s01=max_link_distance_m_s01)
+
+    local_max_dict_by_time[i].update({
+        temporal_tracking.CURRENT_TO_PREV_MATRIX_KEY: current_to_prev_matrix
+    })
+
+    local_max_dict_by_time[i] = temporal_tracking.get_intermediate_velocities(
+        current_local_max_dict=local_max_dict_by_time[i],
+        previous_local_max_dict=previous_local_max_dict)
+
+
 def run_tracking(
         top_radar_dir_name, top_output_dir_name, first_spc_date_string,
         last_spc_date_string, first_time_unix_sec=None, last_time_unix_sec=None,
@@ -1387,7 +1594,8 @@ def run_tracking(
         max_link_time_seconds=DEFAULT_MAX_LINK_TIME_SECONDS,
         max_velocity_diff_m_s01=DEFAULT_MAX_VELOCITY_DIFF_M_S01,
         max_link_distance_m_s01=DEFAULT_MAX_LINK_DISTANCE_M_S01,
-        min_track_duration_seconds=0, recompute_centroids=True):
+        min_track_duration_seconds=0, recompute_centroids=True,
+        num_processes=1):
     """Runs echo-top-tracking.  This is effectively the main method.
 
     :param top_radar_dir_name: See doc for `_find_input_radar_files`.
@@ -1421,6 +1629,9 @@ def run_tracking(
         `temporal_tracking.remove_short_lived_storms`.
     :param recompute_centroids: Boolean flag.  If True, storm centroids will be
         polygon centroids rather than original point maxima.
+    :param num_processes: Number of processes used to find local maxima (and
+        storm polygons) at different radar times.  Linking maxima over time is
+        always done in the main process, in chronological order.
     """
 
     if min_polygon_size_pixels is None:
@@ -1429,6 +1640,8 @@ def run_tracking(
     error_checking.assert_is_integer(min_polygon_size_pixels)
     error_checking.assert_is_geq(min_polygon_size_pixels, 0)
     error_checking.assert_is_greater(min_echo_top_km, 0.)
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
 
     radar_file_names, radar_times_unix_sec = _find_input_radar_files(
         top_radar_dir_name=top_radar_dir_name,
@@ -1450,156 +1663,54 @@ def run_tracking(
 
     error_checking.assert_is_integer(first_numeric_id)
 
-    projection_object = projections.init_azimuthal_equidistant_projection(
-        central_latitude_deg=CENTRAL_PROJ_LATITUDE_DEG,
-        central_longitude_deg=CENTRAL_PROJ_LONGITUDE_DEG)
+    find_maxima_function = functools.partial(
+        _find_maxima_one_time, radar_source_name=radar_source_name,
+        echo_top_field_name=echo_top_field_name,
+        top_echo_classifn_dir_name=top_echo_classifn_dir_name,
+        min_echo_top_km=min_echo_top_km,
+        smoothing_radius_deg_lat=smoothing_radius_deg_lat,
+        half_width_for_max_filter_deg_lat=half_width_for_max_filter_deg_lat,
+        min_intermax_distance_metres=min_intermax_distance_metres,
+        min_polygon_size_pixels=min_polygon_size_pixels,
+        recompute_centroids=recompute_centroids)
 
     num_times = len(radar_times_unix_sec)
+    radar_file_time_pairs = [
+        (radar_file_names[i], radar_times_unix_sec[i]) for i in range(num_times)
+    ]
+
     local_max_dict_by_time = [{}] * num_times
     keep_time_indices = []
 
-    for i in range(num_times):
-        if top_echo_classifn_dir_name is None:
-            this_echo_classifn_file_name = None
-            keep_time_indices.append(i)
-        else:
-            this_echo_classifn_file_name = (
-                echo_classifn.find_classification_file(
-                    top_directory_name=top_echo_classifn_dir_name,
-                    valid_time_unix_sec=radar_times_unix_sec[i],
-                    desire_zipped=True, allow_zipped_or_unzipped=True,
-                    raise_error_if_missing=False)
-            )
-
-            if not os.path.isfile(this_echo_classifn_file_name):
-                warning_string = (
-                    'POTENTIAL PROBLEM.  Cannot find echo-classification file.'
-                    '  Expected at: "{0:s}"'
-                ).format(this_echo_classifn_file_name)
-
-                warnings.warn(warning_string)
-                local_max_dict_by_time[i] = None
+    # Local maxima are found in parallel, but results come back in order (as
+    # soon as each is ready), so linking can proceed while later times are
+    # still being processed.
+    if num_processes == 1:
+        worker_pool = None
+        local_max_dict_iterator = map(
+            find_maxima_function, radar_file_time_pairs)
+    else:
+        worker_pool = multiprocessing.Pool(num_processes)
+        local_max_dict_iterator = worker_pool.imap(
+            find_maxima_function, radar_file_time_pairs, chunksize=1)
+
+    try:
+        for i, this_local_max_dict in enumerate(local_max_dict_iterator):
+            local_max_dict_by_time[i] = this_local_max_dict
+            if this_local_max_dict is None:
                 continue
 
             keep_time_indices.append(i)
-
-        print('Reading data from: "{0:s}"...'.format(radar_file_names[i]))
-        this_metadata_dict = myrorss_and_mrms_io.read_metadata_from_raw_file(
-            netcdf_file_name=radar_file_names[i], data_source=radar_source_name)
-
-        this_sparse_grid_table = (
-            myrorss_and_mrms_io.read_data_from_sparse_grid_file(
-                netcdf_file_name=radar_file_names[i],
-                field_name_orig=this_metadata_dict[
-                    myrorss_and_mrms_io.FIELD_NAME_COLUMN_ORIG],
-                data_source=radar_source_name,
-                sentinel_values=this_metadata_dict[
-                    radar_utils.SENTINEL_VALUE_COLUMN]
-            )
-        )
-
-        this_echo_top_matrix_km = radar_s2f.sparse_to_full_grid(
-            sparse_grid_table=this_sparse_grid_table,
-            metadata_dict=this_metadata_dict,
-            ignore_if_below=min_echo_top_km
-        )[0]
-
-        if this_echo_classifn_file_name is not None:
-            print('Reading data from: "{0:s}"...'.format(
-                this_echo_classifn_file_name))
-
-            this_convective_flag_matrix = echo_classifn.read_classifications(
-                this_echo_classifn_file_name
-            )[0]
-
-            this_convective_flag_matrix = numpy.flip(
-                this_convective_flag_matrix, axis=0)
-            this_echo_top_matrix_km[this_convective_flag_matrix == False] = 0.
-
-        print('Finding local maxima in "{0:s}" at {1:s}...'.format(
-            echo_top_field_name, radar_time_strings[i]
-        ))
-
-        this_latitude_spacing_deg = this_metadata_dict[
-            radar_utils.LAT_SPACING_COLUMN]
-
-        this_smoothed_et_matrix_km = _gaussian_smooth_radar_field(
-            radar_matrix=copy.deepcopy(this_echo_top_matrix_km),
-            e_folding_radius_pixels=
-            smoothing_radius_deg_lat / this_latitude_spacing_deg
-        )
-
-        this_half_width_pixels = int(numpy.round(
-            half_width_for_max_filter_deg_lat / this_latitude_spacing_deg
-        ))
-
-        local_max_dict_by_time[i] = _find_local_maxima(
-            radar_matrix=this_smoothed_et_matrix_km,
-            radar_metadata_dict=this_metadata_dict,
-            neigh_half_width_pixels=this_half_width_pixels)
-
-        local_max_dict_by_time[i].update(
-            {temporal_tracking.VALID_TIME_KEY: radar_times_unix_sec[i]}
-        )
-
-        local_max_dict_by_time[i] = _local_maxima_to_polygons(
-            local_max_dict=local_max_dict_by_time[i],
-            echo_top_matrix_km=this_echo_top_matrix_km,
-            min_echo_top_km=min_echo_top_km,
-            radar_metadata_dict=this_metadata_dict,
-            recompute_centroids=recompute_centroids)
-
-        local_max_dict_by_time[i] = _remove_small_polygons(
-            local_max_dict=local_max_dict_by_time[i],
-            min_size_pixels=min_polygon_size_pixels)
-
-        local_max_dict_by_time[i] = _remove_redundant_local_maxima(
-            local_max_dict=local_max_dict_by_time[i],
-            projection_object=projection_object,
-            min_intermax_distance_metres=min_intermax_distance_metres)
-
-        if i == 0:
-            this_current_to_prev_matrix = (
-                temporal_tracking.link_local_maxima_in_time(
-                    current_local_max_dict=local_max_dict_by_time[i],
-                    previous_local_max_dict=None,
-                    max_link_time_seconds=max_link_time_seconds,
-                    max_velocity_diff_m_s01=max_velocity_diff_m_s01,
-                    max_link_distance_m_s01=max_link_distance_m_s01)
-            )
-        else:
-            print((
-                'Linking local maxima at {0:s} with those at {1:s}...\n'
-            ).format(
-                radar_time_strings[i], radar_time_strings[i - 1]
-            ))
-
-            this_current_to_prev_matrix = (
-                temporal_tracking.link_local_maxima_in_time(
-                    current_local_max_dict=local_max_dict_by_time[i],
-                    previous_local_max_dict=local_max_dict_by_time[i - 1],
-                    max_link_time_seconds=max_link_time_seconds,
-                    max_velocity_diff_m_s01=max_velocity_diff_m_s01,
-                    max_link_distance_m_s01=max_link_distance_m_s01)
-            )
-
-        local_max_dict_by_time[i].update({
-            temporal_tracking.CURRENT_TO_PREV_MATRIX_KEY:
-                this_current_to_prev_matrix
-        })
-
-        if i == 0:
-            local_max_dict_by_time[i] = (
-                temporal_tracking.get_intermediate_velocities(
-                    current_local_max_dict=local_max_dict_by_time[i],
-                    previous_local_max_dict=None)
-            )
-        else:
-            local_max_dict_by_time[i] = (
-                temporal_tracking.get_intermediate_velocities(
-                    current_local_max_dict=local_max_dict_by_time[i],
-                    previous_local_max_dict=local_max_dict_by_time[i - 1])
-            )
+            _link_local_maxima_one_time(
+                local_max_dict_by_time=local_max_dict_by_time, time_index=i,
+                radar_time_strings=radar_time_strings,
+                max_link_time_seconds=max_link_time_seconds,
+                max_velocity_diff_m_s01=max_velocity_diff_m_s01,
+                max_link_distance_m_s01=max_link_distance_m_s01)
+    finally:
+        if worker_pool is not None:
+            worker_pool.terminate()
+            worker_pool.join()
 
     print(SEPARATOR_STRING)
 
@@ -113,6 +113,21 @@ TOY_RADAR_TO_REGION_MATRIX = numpy.array([
 
 TOY_RADAR_TO_REGION_MATRIX -= 1
 
+# The following constants are used to test _make_regions_contiguous.
+NON_CONTIGUOUS_REGION_MATRIX = numpy.array([
+    [0, 0, 1, 1, -1],
+    [-1, 1, 1, -1, -1],
+    [-1, -1, 0, -1, 2],
+    [-1, -1, -1, -1, -1]
+], dtype=int)
+
+CONTIGUOUS_REGION_MATRIX = numpy.array([
+    [0, 0, 1, 1, -1],
+    [-1, 1, 1, -1, -1],
+    [-1, -1, 1, -1, 2],
+    [-1, -1, -1, -1, -1]
+], dtype=int)
+
 # The following constants are used to test _remove_small_polygons.
 THIS_LIST_OF_ROW_ARRAYS = [
     numpy.array([0, 0, 0, 0, 1, 1, 2, 2, 2], dtype=int),
@@ -295,6 +310,16 @@ class EchoTopTrackingTests(unittest.TestCase):
             this_region_matrix, TOY_RADAR_TO_REGION_MATRIX
         ))
 
+    def test_make_regions_contiguous(self):
+        """Ensures correct output from _make_regions_contiguous."""
+
+        this_region_matrix = echo_top_tracking._make_regions_contiguous(
+            NON_CONTIGUOUS_REGION_MATRIX + 0)
+
+        self.assertTrue(numpy.array_equal(
+            this_region_matrix, CONTIGUOUS_REGION_MATRIX
+        ))
+
     def test_remove_small_polygons_min0(self):
         """Ensures correct output from _remove_small_polygons.
 
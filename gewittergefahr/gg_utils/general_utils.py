@@ -88,3 +88,86 @@ def apply_gaussian_filter(input_matrix, e_folding_radius_grid_cells):
     return gaussian_filter(
         input_matrix, sigma=e_folding_radius_grid_cells, order=0, mode='nearest'
     )
+
+
+def get_segment_percentiles(
+        sorted_values, sorted_segment_indices, num_segments,
+        percentile_levels):
+    """Computes percentiles for many segments of a sorted array at once.
+
+    Values must be sorted by segment and then by magnitude, so that each
+    segment is one contiguous, sorted block.  Percentiles are interpolated
+    linearly between closest ranks, the same way as in `numpy.percentile`, so
+    that results match exactly.
+
+    V = number of values
+    S = number of segments
+    P = number of percentile levels
+
+    :param sorted_values: length-V numpy array of values, sorted by segment and
+        then by value.
+    :param sorted_segment_indices: length-V numpy array of segment indices
+        (integers from 0...[S - 1]), sorted in ascending order.
+    :param num_segments: Number of segments (S in the above discussion).
+    :param percentile_levels: length-P numpy array of percentile levels (from
+        0...100).
+    :return: percentile_matrix: S-by-P numpy array of percentiles.  For
+        segments with no values, this is NaN.
+    """
+
+    error_checking.assert_is_real_numpy_array(sorted_values)
+    error_checking.assert_is_numpy_array(sorted_values, num_dimensions=1)
+    num_values = len(sorted_values)
+
+    error_checking.assert_is_integer(num_segments)
+    error_checking.assert_is_geq(num_segments, 0)
+    error_checking.assert_is_integer_numpy_array(sorted_segment_indices)
+    error_checking.assert_is_numpy_array(
+        sorted_segment_indices, exact_dimensions=numpy.array([num_values]))
+    error_checking.assert_is_geq_numpy_array(sorted_segment_indices, 0)
+    error_checking.assert_is_less_than_numpy_array(
+        sorted_segment_indices, num_segments)
+
+    error_checking.assert_is_numpy_array(percentile_levels, num_dimensions=1)
+    error_checking.assert_is_geq_numpy_array(percentile_levels, 0.)
+    error_checking.assert_is_leq_numpy_array(percentile_levels, 100.)
+
+    percentile_matrix = numpy.full(
+        (num_segments, len(percentile_levels)), numpy.nan)
+
+    num_values_by_segment = numpy.bincount(
+        sorted_segment_indices, minlength=num_segments)
+    first_index_by_segment = (
+        numpy.cumsum(num_values_by_segment) - num_values_by_segment
+    )
+
+    good_segment_indices = numpy.where(num_values_by_segment > 0)[0]
+    if len(good_segment_indices) == 0:
+        return percentile_matrix
+
+    last_index_matrix = numpy.expand_dims(
+        num_values_by_segment[good_segment_indices] - 1, axis=-1)
+    first_index_matrix = numpy.expand_dims(
+        first_index_by_segment[good_segment_indices], axis=-1)
+
+    virtual_index_matrix = last_index_matrix * numpy.expand_dims(
+        percentile_levels / 100, axis=0)
+    previous_index_matrix = numpy.floor(virtual_index_matrix)
+    gamma_matrix = virtual_index_matrix - previous_index_matrix
+
+    previous_index_matrix = previous_index_matrix.astype(int)
+    next_index_matrix = numpy.minimum(
+        previous_index_matrix + 1, last_index_matrix)
+
+    previous_value_matrix = sorted_values[
+        first_index_matrix + previous_index_matrix]
+    next_value_matrix = sorted_values[first_index_matrix + next_index_matrix]
+    diff_matrix = next_value_matrix - previous_value_matrix
+
+    percentile_matrix[good_segment_indices, :] = numpy.where(
+        gamma_matrix >= 0.5,
+        next_value_matrix - diff_matrix * (1 - gamma_matrix),
+        previous_value_matrix + diff_matrix * gamma_matrix
+    )
+
+    return percentile_matrix
@@ -70,6 +70,19 @@ SMOOTHED_MATRIX_2D_RADIUS2 = numpy.array([
     [-4, -4, 2, 2, 2, 2]
 ], dtype=float)
 
+# The following constants are used to test get_segment_percentiles.
+SORTED_SEGMENT_VALUES = numpy.array([1, 2, 3, 4, 5, 10, 20], dtype=float)
+SORTED_SEGMENT_INDICES = numpy.array([0, 0, 0, 0, 2, 3, 3], dtype=int)
+NUM_SEGMENTS = 4
+SEGMENT_PERCENTILE_LEVELS = numpy.array([0, 25, 50, 100], dtype=float)
+
+SEGMENT_PERCENTILE_MATRIX = numpy.array([
+    [1, 1.75, 2.5, 4],
+    [numpy.nan, numpy.nan, numpy.nan, numpy.nan],
+    [5, 5, 5, 5],
+    [10, 12.5, 15, 20]
+])
+
 
 class GeneralUtilsTests(unittest.TestCase):
     """Each method is a unit test for general_utils.py."""
@@ -169,5 +182,20 @@ class GeneralUtilsTests(unittest.TestCase):
 
         self.assertTrue(this_matrix.shape == UNSMOOTHED_MATRIX_3D.shape)
 
+    def test_get_segment_percentiles(self):
+        """Ensures correct output from get_segment_percentiles."""
+
+        this_matrix = general_utils.get_segment_percentiles(
+            sorted_values=SORTED_SEGMENT_VALUES,
+            sorted_segment_indices=SORTED_SEGMENT_INDICES,
+            num_segments=NUM_SEGMENTS,
+            percentile_levels=SEGMENT_PERCENTILE_LEVELS)
+
+        self.assertTrue(numpy.allclose(
+            this_matrix, SEGMENT_PERCENTILE_MATRIX, atol=TOLERANCE,
+            equal_nan=True
+        ))
+
+
 if __name__ == '__main__':
     unittest.main()
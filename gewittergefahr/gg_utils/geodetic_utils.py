@@ -3,12 +3,14 @@
 import os
 import numpy
 import srtm
-import geopy
-from geopy.distance import GeodesicDistance
+from pyproj import Geod
 from gewittergefahr.gg_utils import longitude_conversion as lng_conversion
 from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 
+# Same ellipsoid as the default in `geopy.distance.geodesic`.
+GEOD_OBJECT = Geod(ellps='WGS84')
+
 RADIANS_TO_DEGREES = 180. / numpy.pi
 DEGREES_TO_RADIANS = numpy.pi / 180
 
@@ -301,19 +303,20 @@ def start_points_and_displacements_to_endpoints(
         geodetic_bearings_deg,
         exact_dimensions=numpy.array(start_latitudes_deg.shape))
 
-    end_latitudes_deg = numpy.full(start_latitudes_deg.shape, numpy.nan)
-    end_longitudes_deg = numpy.full(start_latitudes_deg.shape, numpy.nan)
-    num_points = start_latitudes_deg.size
-
-    for i in range(num_points):
-        this_start_point_object = geopy.Point(
-            start_latitudes_deg.flat[i], start_longitudes_deg.flat[i])
-        this_end_point_object = GeodesicDistance(
-            meters=scalar_displacements_metres.flat[i]).destination(
-                this_start_point_object, geodetic_bearings_deg.flat[i])
-
-        end_latitudes_deg.flat[i] = this_end_point_object.latitude
-        end_longitudes_deg.flat[i] = this_end_point_object.longitude
+    # All points are handled in one vectorized call.  Both pyproj and geopy
+    # solve the direct geodesic problem with Karney's algorithm, so results are
+    # the same to within rounding error.
+    end_longitudes_deg, end_latitudes_deg = GEOD_OBJECT.fwd(
+        numpy.ravel(start_longitudes_deg).astype(float),
+        numpy.ravel(start_latitudes_deg).astype(float),
+        numpy.ravel(geodetic_bearings_deg).astype(float),
+        numpy.ravel(scalar_displacements_metres).astype(float)
+    )[:2]
+
+    end_latitudes_deg = numpy.reshape(
+        numpy.array(end_latitudes_deg, dtype=float), start_latitudes_deg.shape)
+    end_longitudes_deg = numpy.reshape(
+        numpy.array(end_longitudes_deg, dtype=float), start_latitudes_deg.shape)
 
     end_longitudes_deg = lng_conversion.convert_lng_positive_in_west(
         end_longitudes_deg, allow_nan=False)
@@ -405,18 +408,14 @@ def rotate_displacement_vectors(
         [numpy.sin(ccw_rotation_angle_rad), numpy.cos(ccw_rotation_angle_rad)]
     ])
 
-    x_prime_displacements_metres = numpy.full(
-        x_displacements_metres.shape, numpy.nan)
-    y_prime_displacements_metres = numpy.full(
-        x_displacements_metres.shape, numpy.nan)
-    num_points = x_prime_displacements_metres.size
-
-    for i in range(num_points):
-        this_vector = numpy.transpose(numpy.array(
-            [x_displacements_metres.flat[i], y_displacements_metres.flat[i]]))
-        this_vector = numpy.matmul(rotation_matrix, this_vector)
-        x_prime_displacements_metres.flat[i] = this_vector[0]
-        y_prime_displacements_metres.flat[i] = this_vector[1]
+    x_prime_displacements_metres = (
+        rotation_matrix[0, 0] * x_displacements_metres +
+        rotation_matrix[0, 1] * y_displacements_metres
+    )
+    y_prime_displacements_metres = (
+        rotation_matrix[1, 0] * x_displacements_metres +
+        rotation_matrix[1, 1] * y_displacements_metres
+    )
 
     return x_prime_displacements_metres, y_prime_displacements_metres
 
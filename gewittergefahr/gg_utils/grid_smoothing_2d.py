@@ -1,7 +1,8 @@
 """Methods for smoothing data over a grid."""
 
 import numpy
-from scipy.ndimage.filters import generic_filter
+from scipy.ndimage import correlate, correlate1d, maximum_filter
+from scipy.signal import oaconvolve
 from gewittergefahr.gg_utils import grids
 from gewittergefahr.gg_utils import error_checking
 
@@ -74,6 +75,49 @@ def _get_weights_for_gaussian(
     return weight_matrix / numpy.sum(weight_matrix)
 
 
+def _get_separable_weights_for_gaussian(
+        grid_spacing_x, grid_spacing_y, e_folding_radius, cutoff_radius):
+    """Computes weights for Gaussian smoother as two 1-D vectors.
+
+    The Gaussian weight matrix is separable: the outer product of the two
+    vectors returned by this method equals the matrix returned by
+    `_get_weights_for_gaussian`.
+
+    m = number of grid rows used for smoothing at each point
+    n = number of grid columns used for smoothing at each point
+
+    :param grid_spacing_x: See doc for `_get_weights_for_gaussian`.
+    :param grid_spacing_y: Same.
+    :param e_folding_radius: Same.
+    :param cutoff_radius: Same.
+    :return: row_weights: length-m numpy array of weights (to be applied along
+        each column, i.e., in the y-direction).
+    :return: column_weights: length-n numpy array of weights (to be applied
+        along each row, i.e., in the x-direction).
+    """
+
+    distance_from_center_matrix = _get_distances_from_center_point(
+        grid_spacing_x, grid_spacing_y, cutoff_radius)
+
+    half_width_y_pixels = (distance_from_center_matrix.shape[0] - 1) // 2
+    half_width_x_pixels = (distance_from_center_matrix.shape[1] - 1) // 2
+
+    relative_y_coords = numpy.linspace(
+        -half_width_y_pixels * grid_spacing_y,
+        half_width_y_pixels * grid_spacing_y, num=2 * half_width_y_pixels + 1)
+    relative_x_coords = numpy.linspace(
+        -half_width_x_pixels * grid_spacing_x,
+        half_width_x_pixels * grid_spacing_x, num=2 * half_width_x_pixels + 1)
+
+    row_weights = numpy.exp(-(relative_y_coords / e_folding_radius) ** 2)
+    column_weights = numpy.exp(-(relative_x_coords / e_folding_radius) ** 2)
+
+    return (
+        row_weights / numpy.sum(row_weights),
+        column_weights / numpy.sum(column_weights)
+    )
+
+
 def _get_weights_for_cressman(grid_spacing_x, grid_spacing_y, cutoff_radius):
     """Computes weights for Gaussian smoother.
 
@@ -110,7 +154,38 @@ def _apply_smoother_at_one_point(values, weight_vector):
     return numpy.sum(values * weight_vector)
 
 
-def _apply_smoother_at_all_points(input_matrix, weight_matrix):
+def _nan_to_zero(input_matrix, use_float32):
+    """Prepares input matrix for smoothing.
+
+    :param input_matrix: numpy array of input data.
+    :param use_float32: Boolean flag.  If True, will convert input matrix to
+        float32.
+    :return: input_matrix: Same as input, but with NaN's replaced by zero (and
+        maybe converted to float32).  If `use_float32 = False`, this is the same
+        object, which is modified in place.
+    """
+
+    error_checking.assert_is_boolean(use_float32)
+    if use_float32:
+        input_matrix = input_matrix.astype(numpy.float32)
+
+    input_matrix[numpy.isnan(input_matrix)] = 0.
+    return input_matrix
+
+
+def _small_values_to_nan(output_matrix):
+    """Replaces values with absolute value < TOLERANCE by NaN.
+
+    :param output_matrix: numpy array of smoothed values.
+    :return: output_matrix: Same but with small values replaced by NaN.
+    """
+
+    output_matrix[numpy.absolute(output_matrix) < TOLERANCE] = numpy.nan
+    return output_matrix
+
+
+def _apply_smoother_at_all_points(input_matrix, weight_matrix, use_fft=False,
+                                  use_float32=False):
     """Applies any kind of smoother at all grid points.
 
     M = number of grid rows
@@ -118,27 +193,90 @@ def _apply_smoother_at_all_points(input_matrix, weight_matrix):
     m = number of grid rows used for smoothing at each point
     n = number of grid columns used for smoothing at each point
 
-    This method treats all NaN's as zero.
+    This method treats all NaN's as zero.  Values outside the grid are also
+    treated as zero.  In the output, values with absolute value < `TOLERANCE`
+    are replaced by NaN.
 
     :param input_matrix: M-by-N numpy array of input data.
     :param weight_matrix: m-by-n numpy array of weights.
+    :param use_fft: Boolean flag.  If True, will apply smoother via fast Fourier
+        transform (overlap-add method), which is faster for large windows.  If
+        False, will apply smoother via direct correlation.
+    :param use_float32: Boolean flag.  If True, will do computations (and return
+        output) in single precision.
     :return: output_matrix: M-by-N numpy array of smoothed input values.
     """
 
-    weight_vector = numpy.reshape(weight_matrix, weight_matrix.size)
-    input_matrix[numpy.isnan(input_matrix)] = 0.
+    error_checking.assert_is_boolean(use_fft)
+    input_matrix = _nan_to_zero(
+        input_matrix=input_matrix, use_float32=use_float32)
 
-    output_matrix = generic_filter(
-        input_matrix, function=_apply_smoother_at_one_point,
-        size=(weight_matrix.shape[0], weight_matrix.shape[1]), mode='constant',
-        cval=0., extra_arguments=(weight_vector,))
+    if use_float32:
+        weight_matrix = weight_matrix.astype(numpy.float32)
 
-    output_matrix[numpy.absolute(output_matrix) < TOLERANCE] = numpy.nan
-    return output_matrix
+    if not use_fft:
+        output_matrix = correlate(
+            input_matrix, weights=weight_matrix, mode='constant', cval=0.)
+        return _small_values_to_nan(output_matrix)
+
+    # Correlation is convolution with the flipped kernel.  Since weight matrices
+    # have odd dimensions, the "same" output is centered like `correlate`.
+    output_matrix = oaconvolve(
+        input_matrix, weight_matrix[::-1, ::-1], mode='same'
+    ).astype(input_matrix.dtype)
+
+    # Points whose window contains only zeros would be exactly zero with direct
+    # correlation, but contain round-off noise with FFT.  Make them exactly
+    # zero, so that they become NaN.
+    nonzero_in_window_matrix = maximum_filter(
+        (input_matrix != 0).astype(numpy.uint8), size=weight_matrix.shape,
+        mode='constant', cval=0
+    )
+    output_matrix[nonzero_in_window_matrix == 0] = 0.
+
+    return _small_values_to_nan(output_matrix)
+
+
+def _apply_separable_smoother(input_matrix, row_weights, column_weights,
+                              use_float32=False):
+    """Applies separable smoother at all grid points.
+
+    This is equivalent to `_apply_smoother_at_all_points` with
+    weight_matrix = numpy.outer(row_weights, column_weights), but much faster,
+    because the smoother is applied as two 1-D passes.
+
+    M = number of grid rows
+    N = number of grid columns
+    m = number of grid rows used for smoothing at each point
+    n = number of grid columns used for smoothing at each point
+
+    :param input_matrix: M-by-N numpy array of input data.
+    :param row_weights: length-m numpy array of weights (applied along each
+        column).
+    :param column_weights: length-n numpy array of weights (applied along each
+        row).
+    :param use_float32: See doc for `_apply_smoother_at_all_points`.
+    :return: output_matrix: Same.
+    """
+
+    input_matrix = _nan_to_zero(
+        input_matrix=input_matrix, use_float32=use_float32)
+
+    if use_float32:
+        row_weights = row_weights.astype(numpy.float32)
+        column_weights = column_weights.astype(numpy.float32)
+
+    output_matrix = correlate1d(
+        input_matrix, weights=row_weights, axis=0, mode='constant', cval=0.)
+    output_matrix = correlate1d(
+        output_matrix, weights=column_weights, axis=1, mode='constant',
+        cval=0.)
+
+    return _small_values_to_nan(output_matrix)
 
 
 def apply_gaussian(input_matrix, grid_spacing_x, grid_spacing_y,
-                   e_folding_radius, cutoff_radius=None):
+                   e_folding_radius, cutoff_radius=None, use_float32=False):
     """Applies Gaussian smoother.
 
     M = number of rows (unique grid-point y-coordinates)
@@ -152,24 +290,26 @@ def apply_gaussian(input_matrix, grid_spacing_x, grid_spacing_y,
     :param e_folding_radius: e-folding radius for Gaussian smoother.
     :param cutoff_radius: Cutoff radius for Gaussian smoother.  Default is
         3 * e-folding radius.
+    :param use_float32: Boolean flag.  If True, will do computations (and return
+        output) in single precision.
     :return: output_matrix: M-by-N numpy array of smoothed input values.
     """
 
-    # TODO(thunderhoser): For some reason, using
-    # `scipy.ndimage.filters.gaussian_filter` is way faster.  I should change
-    # this module to use said method.
-
     error_checking.assert_is_greater(e_folding_radius, 0.)
     if cutoff_radius is None:
         cutoff_radius = EFOLDING_TO_CUTOFF_RADIUS_DEFAULT * e_folding_radius
     error_checking.assert_is_geq(cutoff_radius, e_folding_radius)
 
-    weight_matrix = _get_weights_for_gaussian(
+    row_weights, column_weights = _get_separable_weights_for_gaussian(
         grid_spacing_x, grid_spacing_y, e_folding_radius, cutoff_radius)
-    return _apply_smoother_at_all_points(input_matrix, weight_matrix)
+
+    return _apply_separable_smoother(
+        input_matrix=input_matrix, row_weights=row_weights,
+        column_weights=column_weights, use_float32=use_float32)
 
 
-def apply_cressman(input_matrix, grid_spacing_x, grid_spacing_y, cutoff_radius):
+def apply_cressman(input_matrix, grid_spacing_x, grid_spacing_y, cutoff_radius,
+                   use_float32=False):
     """Applies Cressman smoother.
 
     M = number of rows (unique grid-point y-coordinates)
@@ -181,9 +321,14 @@ def apply_cressman(input_matrix, grid_spacing_x, grid_spacing_y, cutoff_radius):
     :param grid_spacing_y: Spacing between adjacent grid points in y-direction
         (i.e., between adjacent rows).
     :param cutoff_radius: Cutoff radius for Cressman smoother.
+    :param use_float32: Boolean flag.  If True, will do computations (and return
+        output) in single precision.
     :return: output_matrix: M-by-N numpy array of smoothed input values.
     """
 
     weight_matrix = _get_weights_for_cressman(
         grid_spacing_x, grid_spacing_y, cutoff_radius)
-    return _apply_smoother_at_all_points(input_matrix, weight_matrix)
+
+    return _apply_smoother_at_all_points(
+        input_matrix=input_matrix, weight_matrix=weight_matrix, use_fft=True,
+        use_float32=use_float32)
@@ -53,6 +53,14 @@ SMOOTHED_MATRIX = numpy.array(
      [-11., -7., numpy.nan, 11., 16.],
      [-17., -16., -9., 1., 8.]])
 
+# The following constants are used to test apply_gaussian and apply_cressman.
+E_FOLDING_RADIUS_METRES = 10.
+
+LARGE_INPUT_MATRIX = numpy.random.RandomState(6695).uniform(
+    low=0., high=70., size=(30, 40))
+LARGE_INPUT_MATRIX[::3, ::4] = numpy.nan
+LARGE_INPUT_MATRIX[:10, :10] = numpy.nan
+
 
 class GridSmoothing2dTests(unittest.TestCase):
     """Each method is a unit test for grid_smoothing_2d.py."""
@@ -86,6 +94,91 @@ class GridSmoothing2dTests(unittest.TestCase):
             this_smoothed_matrix, SMOOTHED_MATRIX, atol=TOLERANCE,
             equal_nan=True))
 
+    def test_apply_smoother_at_all_points_fft(self):
+        """Ensures correct output from _apply_smoother_at_all_points.
+
+        In this case, smoother is applied via FFT.
+        """
+
+        this_smoothed_matrix = grid_smoothing_2d._apply_smoother_at_all_points(
+            INPUT_MATRIX + 0., WEIGHT_MATRIX, use_fft=True)
+        self.assertTrue(numpy.allclose(
+            this_smoothed_matrix, SMOOTHED_MATRIX, atol=TOLERANCE,
+            equal_nan=True))
+
+    def test_apply_gaussian(self):
+        """Ensures correct output from apply_gaussian.
+
+        In this case, the separable smoother should match the 2-D smoother.
+        """
+
+        this_weight_matrix = grid_smoothing_2d._get_weights_for_gaussian(
+            grid_spacing_x=GRID_SPACING_X_METRES,
+            grid_spacing_y=GRID_SPACING_Y_METRES,
+            e_folding_radius=E_FOLDING_RADIUS_METRES,
+            cutoff_radius=CUTOFF_RADIUS_METRES)
+
+        this_expected_matrix = grid_smoothing_2d._apply_smoother_at_all_points(
+            LARGE_INPUT_MATRIX + 0., this_weight_matrix)
+
+        this_smoothed_matrix = grid_smoothing_2d.apply_gaussian(
+            input_matrix=LARGE_INPUT_MATRIX + 0.,
+            grid_spacing_x=GRID_SPACING_X_METRES,
+            grid_spacing_y=GRID_SPACING_Y_METRES,
+            e_folding_radius=E_FOLDING_RADIUS_METRES,
+            cutoff_radius=CUTOFF_RADIUS_METRES)
+
+        self.assertTrue(numpy.allclose(
+            this_smoothed_matrix, this_expected_matrix, atol=TOLERANCE,
+            equal_nan=True))
+
+    def test_apply_cressman(self):
+        """Ensures correct output from apply_cressman.
+
+        In this case, the FFT smoother should match the direct smoother.
+        """
+
+        this_weight_matrix = grid_smoothing_2d._get_weights_for_cressman(
+            grid_spacing_x=GRID_SPACING_X_METRES,
+            grid_spacing_y=GRID_SPACING_Y_METRES,
+            cutoff_radius=CUTOFF_RADIUS_METRES)
+
+        this_expected_matrix = grid_smoothing_2d._apply_smoother_at_all_points(
+            LARGE_INPUT_MATRIX + 0., this_weight_matrix)
+
+        this_smoothed_matrix = grid_smoothing_2d.apply_cressman(
+            input_matrix=LARGE_INPUT_MATRIX + 0.,
+            grid_spacing_x=GRID_SPACING_X_METRES,
+            grid_spacing_y=GRID_SPACING_Y_METRES,
+            cutoff_radius=CUTOFF_RADIUS_METRES)
+
+        self.assertTrue(numpy.allclose(
+            this_smoothed_matrix, this_expected_matrix, atol=TOLERANCE,
+            equal_nan=True))
+
+    def test_apply_gaussian_float32(self):
+        """Ensures correct output from apply_gaussian.
+
+        In this case, computations are done in single precision.
+        """
+
+        this_expected_matrix = grid_smoothing_2d.apply_gaussian(
+            input_matrix=LARGE_INPUT_MATRIX + 0.,
+            grid_spacing_x=GRID_SPACING_X_METRES,
+            grid_spacing_y=GRID_SPACING_Y_METRES,
+            e_folding_radius=E_FOLDING_RADIUS_METRES)
+
+        this_smoothed_matrix = grid_smoothing_2d.apply_gaussian(
+            input_matrix=LARGE_INPUT_MATRIX + 0.,
+            grid_spacing_x=GRID_SPACING_X_METRES,
+            grid_spacing_y=GRID_SPACING_Y_METRES,
+            e_folding_radius=E_FOLDING_RADIUS_METRES, use_float32=True)
+
+        self.assertTrue(this_smoothed_matrix.dtype == numpy.float32)
+        self.assertTrue(numpy.allclose(
+            this_smoothed_matrix, this_expected_matrix, atol=1e-4,
+            equal_nan=True))
+
 
 if __name__ == '__main__':
     unittest.main()
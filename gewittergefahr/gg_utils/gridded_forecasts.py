@@ -877,26 +877,23 @@ def _find_grid_points_in_polygon(
     _, max_column_to_test = _find_max_value_less_than_or_equal(
         grid_points_x_metres, max_x_in_polygon_metres)
 
-    rows_in_polygon = []
-    columns_in_polygon = []
-
-    for this_row in range(min_row_to_test, max_row_to_test + 1):
-        for this_column in range(min_column_to_test, max_column_to_test + 1):
-            this_flag = polygons.point_in_or_on_polygon(
-                polygon_object=polygon_object_xy,
-                query_x_coordinate=grid_points_x_metres[this_column],
-                query_y_coordinate=grid_points_y_metres[this_row]
-            )
-
-            if not this_flag:
-                continue
-
-            rows_in_polygon.append(this_row)
-            columns_in_polygon.append(this_column)
+    rows_to_test = numpy.arange(
+        min_row_to_test, max_row_to_test + 1, dtype=int)
+    columns_to_test = numpy.arange(
+        min_column_to_test, max_column_to_test + 1, dtype=int)
+
+    column_matrix, row_matrix = numpy.meshgrid(columns_to_test, rows_to_test)
+    row_vector = numpy.ravel(row_matrix)
+    column_vector = numpy.ravel(column_matrix)
+
+    in_polygon_flags = polygons.points_in_or_on_polygon(
+        polygon_object=polygon_object_xy,
+        query_x_coords=grid_points_x_metres[column_vector],
+        query_y_coords=grid_points_y_metres[row_vector]
+    )
 
-    rows_in_polygon = numpy.array(rows_in_polygon, dtype=int)
-    columns_in_polygon = numpy.array(columns_in_polygon, dtype=int)
-    return rows_in_polygon, columns_in_polygon
+    in_polygon_indices = numpy.where(in_polygon_flags)[0]
+    return row_vector[in_polygon_indices], column_vector[in_polygon_indices]
 
 
 def _polygons_to_grid_points(
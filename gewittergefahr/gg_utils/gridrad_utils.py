@@ -25,6 +25,8 @@ from gewittergefahr.gg_utils import radar_utils
 from gewittergefahr.gg_utils import longitude_conversion as lng_conversion
 from gewittergefahr.gg_utils import error_checking
 
+NUM_ROWS_PER_ECHO_TOP_CHUNK = 100
+
 
 def fields_and_refl_heights_to_pairs(field_names, heights_m_asl):
     """Converts unique arrays (field names and heights) to non-unique ones.
@@ -243,8 +245,6 @@ def get_echo_tops(
     error_checking.assert_is_greater(critical_reflectivity_dbz, 0.)
 
     num_grid_heights = reflectivity_matrix_dbz.shape[0]
-    num_grid_rows = reflectivity_matrix_dbz.shape[1]
-    num_grid_columns = reflectivity_matrix_dbz.shape[2]
 
     error_checking.assert_is_numpy_array(
         grid_point_heights_m_asl,
@@ -258,15 +258,8 @@ def get_echo_tops(
         raise ValueError('grid_point_heights_m_asl are not sorted in '
                          'ascending order.')
 
-    echo_top_matrix_m_asl = numpy.full(
-        (num_grid_rows, num_grid_columns), numpy.nan)
-    for i in range(num_grid_rows):
-        for j in range(num_grid_columns):
-            echo_top_matrix_m_asl[i, j] = (
-                radar_utils.get_echo_top_single_column(
-                    reflectivities_dbz=reflectivity_matrix_dbz[:, i, j],
-                    heights_m_asl=grid_point_heights_m_asl,
-                    critical_reflectivity_dbz=critical_reflectivity_dbz,
-                    check_args=False))
-
-    return echo_top_matrix_m_asl
+    return radar_utils.get_echo_tops_3d(
+        reflectivity_matrix_dbz=reflectivity_matrix_dbz,
+        heights_m_asl=grid_point_heights_m_asl,
+        critical_reflectivity_dbz=critical_reflectivity_dbz,
+        num_rows_per_chunk=NUM_ROWS_PER_ECHO_TOP_CHUNK)
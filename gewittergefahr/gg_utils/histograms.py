@@ -34,8 +34,7 @@ def create_histogram(input_values, num_bins, min_value, max_value):
     input_to_bin_indices[input_to_bin_indices < 0] = 0
     input_to_bin_indices[input_to_bin_indices > num_bins - 1] = num_bins - 1
 
-    num_examples_by_bin = numpy.full(num_bins, -1, dtype=int)
-    for j in range(num_bins):
-        num_examples_by_bin[j] = numpy.sum(input_to_bin_indices == j)
+    num_examples_by_bin = numpy.bincount(
+        input_to_bin_indices, minlength=num_bins)
 
     return input_to_bin_indices, num_examples_by_bin
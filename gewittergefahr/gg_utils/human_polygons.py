@@ -226,7 +226,13 @@ def _polygons_to_mask_one_panel(polygon_objects_grid_coords, num_grid_rows,
     if num_polygons == 0:
         return mask_matrix
 
-    # TODO(thunderhoser): This triple for-loop is probably inefficient.
+    column_matrix, row_matrix = numpy.meshgrid(
+        numpy.linspace(0, num_grid_columns - 1, num=num_grid_columns),
+        numpy.linspace(0, num_grid_rows - 1, num=num_grid_rows)
+    )
+    row_vector = numpy.ravel(row_matrix)
+    column_vector = numpy.ravel(column_matrix)
+
     for k in range(num_polygons):
         these_grid_columns = numpy.array(
             polygon_objects_grid_coords[k].exterior.xy[0]
@@ -244,14 +250,14 @@ def _polygons_to_mask_one_panel(polygon_objects_grid_coords, num_grid_rows,
         error_checking.assert_is_leq_numpy_array(
             these_grid_rows, num_grid_rows - 0.5)
 
-        for i in range(num_grid_rows):
-            for j in range(num_grid_columns):
-                if mask_matrix[i, j]:
-                    continue
+        these_flags = polygons.points_in_or_on_polygon(
+            polygon_object=polygon_objects_grid_coords[k],
+            query_x_coords=column_vector, query_y_coords=row_vector)
 
-                mask_matrix[i, j] = polygons.point_in_or_on_polygon(
-                    polygon_object=polygon_objects_grid_coords[k],
-                    query_x_coordinate=j, query_y_coordinate=i)
+        mask_matrix = numpy.logical_or(
+            mask_matrix,
+            numpy.reshape(these_flags, (num_grid_rows, num_grid_columns))
+        )
 
     return mask_matrix
 
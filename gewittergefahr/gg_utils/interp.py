@@ -7,7 +7,6 @@ import pandas
 import scipy.interpolate
 from gewittergefahr.gg_io import grib_io
 from gewittergefahr.gg_io import nwp_model_io
-from gewittergefahr.gg_utils import general_utils
 from gewittergefahr.gg_utils import nwp_model_utils
 from gewittergefahr.gg_utils import error_checking
 
@@ -119,6 +118,41 @@ def _interp_to_next_time(
     return numpy.stack(list_of_interp_matrices, axis=-1)
 
 
+def _find_nearest_indices(sorted_input_values, test_values):
+    """Finds nearest value in array to each test value.
+
+    This method is a vectorized version of `general_utils.find_nearest_value`
+    (with the same tie-breaking).
+
+    :param sorted_input_values: 1-D numpy array.  Must be sorted in ascending
+        order.
+    :param test_values: 1-D numpy array of test values.
+    :return: nearest_indices: 1-D numpy array (same length as `test_values`)
+        with array index of nearest value in `sorted_input_values`.
+    """
+
+    num_input_values = len(sorted_input_values)
+    nearest_indices = numpy.searchsorted(
+        sorted_input_values, test_values, side='left')
+
+    previous_values = sorted_input_values[numpy.maximum(nearest_indices - 1, 0)]
+    next_values = sorted_input_values[
+        numpy.minimum(nearest_indices, num_input_values - 1)
+    ]
+
+    subtract_one_flags = numpy.logical_and(
+        nearest_indices > 0,
+        numpy.logical_or(
+            nearest_indices == num_input_values,
+            numpy.absolute(test_values - previous_values) <
+            numpy.absolute(test_values - next_values)
+        )
+    )
+
+    nearest_indices[subtract_one_flags] -= 1
+    return nearest_indices
+
+
 def _nn_interp_from_xy_grid_to_points(
         input_matrix, sorted_grid_point_x_metres, sorted_grid_point_y_metres,
         query_x_coords_metres, query_y_coords_metres):
@@ -132,17 +166,14 @@ def _nn_interp_from_xy_grid_to_points(
     :return: interp_values: Same.
     """
 
-    num_query_points = len(query_x_coords_metres)
-    interp_values = numpy.full(num_query_points, numpy.nan)
-
-    for i in range(num_query_points):
-        _, this_row = general_utils.find_nearest_value(
-            sorted_grid_point_y_metres, query_y_coords_metres[i])
-        _, this_column = general_utils.find_nearest_value(
-            sorted_grid_point_x_metres, query_x_coords_metres[i])
-        interp_values[i] = input_matrix[this_row, this_column]
+    row_indices = _find_nearest_indices(
+        sorted_input_values=sorted_grid_point_y_metres,
+        test_values=query_y_coords_metres)
+    column_indices = _find_nearest_indices(
+        sorted_input_values=sorted_grid_point_x_metres,
+        test_values=query_x_coords_metres)
 
-    return interp_values
+    return input_matrix[..., row_indices, column_indices].astype(float)
 
 
 def _get_wind_rotation_metadata(field_names_grib1, model_name):
@@ -213,7 +244,7 @@ def _read_nwp_for_interp(
         top_grib_directory_name, grid_id=None,
         wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
         wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
-        raise_error_if_missing=False):
+        raise_error_if_missing=False, grib_cache_dir_name=None):
     """Reads NWP data needed for interpolation to a range of query times.
 
     T = number of model-initialization times
@@ -246,6 +277,9 @@ def _read_nwp_for_interp(
         raise_error_if_missing = False, this method will return None for the
         relevant entries in `list_of_model_grids` and
         `list_of_model_grids_other_wind_component`.
+    :param grib_cache_dir_name: Name of cache directory for decoded grib
+        fields (see doc for `grib_io.read_field_from_grib_file`).  If None,
+        there is no caching.
     :return: list_of_model_grids: Same as input, except that different elements
         are filled and different elements are None.
     :return: list_of_model_grids_other_wind_component: See above.
@@ -295,7 +329,8 @@ def _read_nwp_for_interp(
             field_name_grib1=field_name_grib1, model_name=model_name,
             grid_id=grid_id, wgrib_exe_name=wgrib_exe_name,
             wgrib2_exe_name=wgrib2_exe_name,
-            raise_error_if_fails=raise_error_if_missing)
+            raise_error_if_fails=raise_error_if_missing,
+            cache_dir_name=grib_cache_dir_name)
 
         if list_of_model_grids[i] is None:
             missing_data = True
@@ -310,7 +345,8 @@ def _read_nwp_for_interp(
                     model_name=model_name, grid_id=grid_id,
                     wgrib_exe_name=wgrib_exe_name,
                     wgrib2_exe_name=wgrib2_exe_name,
-                    raise_error_if_fails=raise_error_if_missing))
+                    raise_error_if_fails=raise_error_if_missing,
+                    cache_dir_name=grib_cache_dir_name))
 
             if list_of_model_grids_other_wind_component[i] is None:
                 missing_data = True
@@ -341,7 +377,7 @@ def _read_nwp_for_interp_any_grid(
         list_of_model_grids_other_wind_component, top_grib_directory_name,
         model_name, wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
         wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
-        raise_error_if_missing=False):
+        raise_error_if_missing=False, grib_cache_dir_name=None):
     """Reads NWP data needed for interpolation to a range of query times.
 
     This method reads data from the highest-resolution grid available at each
@@ -358,6 +394,7 @@ def _read_nwp_for_interp_any_grid(
     :param wgrib_exe_name: Same.
     :param wgrib2_exe_name: Same.
     :param raise_error_if_missing: Same.
+    :param grib_cache_dir_name: Same.
     :return: list_of_model_grids: Same.
     :return: list_of_model_grids_other_wind_component: Same.
     :return: missing_data: Same.
@@ -381,7 +418,8 @@ def _read_nwp_for_interp_any_grid(
             grid_id=grid_ids[i], wgrib_exe_name=wgrib_exe_name,
             wgrib2_exe_name=wgrib2_exe_name,
             raise_error_if_missing=(
-                raise_error_if_missing and i == len(grid_ids) - 1))
+                raise_error_if_missing and i == len(grid_ids) - 1),
+            grib_cache_dir_name=grib_cache_dir_name)
 
         if missing_data:
             continue
@@ -390,6 +428,164 @@ def _read_nwp_for_interp_any_grid(
             missing_data)
 
 
+def _read_nwp_fields_for_one_init_time(
+        init_time_unix_sec, field_names_grib1, wind_field_pairs_grib1,
+        model_name, grid_ids, top_grib_directory_name, wgrib_exe_name,
+        wgrib2_exe_name, raise_error_if_missing, grib_cache_dir_name):
+    """Reads all NWP fields needed from one model-initialization time.
+
+    Each field is read from the first grid (in `grid_ids`) where it is
+    available, so one missing field does not prevent the others from being
+    read.  The two components of each wind field are always read from the same
+    grid.  Each grib file is read only once, for all fields still missing.
+
+    F = number of fields
+
+    :param init_time_unix_sec: Initialization time.
+    :param field_names_grib1: length-F list of field names in grib1 format.
+    :param wind_field_pairs_grib1: 1-D list of tuples, each containing the
+        grib1 names of the u- and v-components for one wind field that must be
+        rotated.
+    :param model_name: See doc for `_read_nwp_for_interp`.
+    :param grid_ids: 1-D list of grid IDs, in order of preference.
+    :param top_grib_directory_name: See doc for `_read_nwp_for_interp`.
+    :param wgrib_exe_name: Same.
+    :param wgrib2_exe_name: Same.
+    :param raise_error_if_missing: Same.
+    :param grib_cache_dir_name: Same.
+    :return: grid_index_by_field: length-F numpy array with index of grid used
+        for each field (in `grid_ids`).  If data for the [j]th field are missing
+        from all grids, grid_index_by_field[j] = -1.
+    :return: field_matrix_dict: Dictionary, where each key is a field name
+        (from `field_names_grib1`) and each value is the corresponding grid.
+        Fields missing from all grids are not in the dictionary.
+    """
+
+    num_grids = len(grid_ids)
+    num_fields = len(field_names_grib1)
+    grid_index_by_field = numpy.full(num_fields, -1, dtype=int)
+    field_matrix_dict = {}
+
+    for g in range(num_grids):
+        these_field_indices = numpy.where(grid_index_by_field < 0)[0]
+        if len(these_field_indices) == 0:
+            break
+
+        raise_error_for_this_grid = (
+            raise_error_if_missing and g == num_grids - 1
+        )
+
+        this_grib_file_name = nwp_model_io.find_grib_file(
+            top_directory_name=top_grib_directory_name,
+            init_time_unix_sec=init_time_unix_sec, model_name=model_name,
+            grid_id=grid_ids[g], lead_time_hours=FORECAST_LEAD_TIME_HOURS,
+            raise_error_if_missing=raise_error_for_this_grid)
+
+        if not os.path.isfile(this_grib_file_name):
+            continue
+
+        these_field_matrices = nwp_model_io.read_fields_from_grib_file(
+            grib_file_name=this_grib_file_name,
+            field_names_grib1=[
+                field_names_grib1[j] for j in these_field_indices
+            ],
+            model_name=model_name, grid_id=grid_ids[g],
+            wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
+            raise_error_if_fails=raise_error_for_this_grid,
+            cache_dir_name=grib_cache_dir_name)
+
+        for j, this_field_matrix in zip(these_field_indices,
+                                        these_field_matrices):
+            if this_field_matrix is None:
+                continue
+
+            grid_index_by_field[j] = g
+            field_matrix_dict[field_names_grib1[j]] = this_field_matrix
+
+        for this_u_name, this_v_name in wind_field_pairs_grib1:
+            these_pair_indices = numpy.array([
+                field_names_grib1.index(this_u_name),
+                field_names_grib1.index(this_v_name)
+            ], dtype=int)
+
+            these_found_flags = grid_index_by_field[these_pair_indices] == g
+            if numpy.all(these_found_flags) or not numpy.any(these_found_flags):
+                continue
+
+            for j in these_pair_indices[these_found_flags]:
+                grid_index_by_field[j] = -1
+                field_matrix_dict.pop(field_names_grib1[j])
+
+    return grid_index_by_field, field_matrix_dict
+
+
+def _find_fields_available_for_interp(grid_index_matrix,
+                                      init_time_needed_indices):
+    """Finds fields available at all init times needed for interpolation.
+
+    T = number of model-initialization times
+    F = number of fields
+
+    :param grid_index_matrix: T-by-F numpy array with index of grid used for
+        each init time and field (output `grid_index_by_field` from
+        `_read_nwp_fields_for_one_init_time`).  -1 means that the field is
+        missing at the given init time.
+    :param init_time_needed_indices: 1-D numpy array with indices of init times
+        needed.
+    :return: field_indices: 1-D numpy array with indices of fields available at
+        all init times needed.
+    """
+
+    return numpy.where(numpy.all(
+        grid_index_matrix[init_time_needed_indices, :] >= 0, axis=0
+    ))[0]
+
+
+def _interp_fields_from_xy_grid_to_points(
+        list_of_input_matrices, sorted_grid_point_x_metres,
+        sorted_grid_point_y_metres, query_x_coords_metres,
+        query_y_coords_metres, method_string, spline_degree):
+    """Interpolates many fields from the same x-y grid to scattered points.
+
+    For nearest-neighbour interpolation, the nearest grid point to each query
+    point is found only once, for all fields.
+
+    F = number of fields
+    Q = number of query points
+
+    :param list_of_input_matrices: length-F list of input matrices (see doc for
+        `interp_from_xy_grid_to_points`).
+    :param sorted_grid_point_x_metres: See doc for
+        `interp_from_xy_grid_to_points`.
+    :param sorted_grid_point_y_metres: Same.
+    :param query_x_coords_metres: Same.
+    :param query_y_coords_metres: Same.
+    :param method_string: Same.
+    :param spline_degree: Same.
+    :return: interp_matrix: F-by-Q numpy array of interpolated values.
+    """
+
+    if method_string == NEAREST_NEIGHBOUR_METHOD_STRING:
+        return _nn_interp_from_xy_grid_to_points(
+            input_matrix=numpy.stack(list_of_input_matrices, axis=0),
+            sorted_grid_point_x_metres=sorted_grid_point_x_metres,
+            sorted_grid_point_y_metres=sorted_grid_point_y_metres,
+            query_x_coords_metres=query_x_coords_metres,
+            query_y_coords_metres=query_y_coords_metres)
+
+    return numpy.stack([
+        interp_from_xy_grid_to_points(
+            input_matrix=this_matrix,
+            sorted_grid_point_x_metres=sorted_grid_point_x_metres,
+            sorted_grid_point_y_metres=sorted_grid_point_y_metres,
+            query_x_coords_metres=query_x_coords_metres,
+            query_y_coords_metres=query_y_coords_metres,
+            method_string=method_string, spline_degree=spline_degree,
+            extrapolate=True)
+        for this_matrix in list_of_input_matrices
+    ], axis=0)
+
+
 def _stack_1d_arrays_horizontally(list_of_1d_arrays):
     """Stacks 1-D numpy arrays horizontally.
 
@@ -747,7 +943,7 @@ def interp_nwp_from_xy_grid(
         spline_degree=DEFAULT_SPLINE_DEGREE,
         wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
         wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
-        raise_error_if_missing=False):
+        raise_error_if_missing=False, grib_cache_dir_name=None):
     """Interpolates NWP data from x-y grid in both space and time.
 
     Each query point consists of (latitude, longitude, time).  Before
@@ -781,6 +977,7 @@ def interp_nwp_from_xy_grid(
     :param wgrib_exe_name: Path to wgrib executable.
     :param wgrib2_exe_name: Path to wgrib2 executable.
     :param raise_error_if_missing: See doc for `_read_nwp_for_interp`.
+    :param grib_cache_dir_name: Same.
     :return: interp_table: pandas DataFrame, where each column is one field and
         each row is one query point.  Column names are taken directly from the
         input list `field_names`.
@@ -812,11 +1009,39 @@ def interp_nwp_from_xy_grid(
     rotate_wind_flags = metadata_dict[ROTATE_WIND_FLAGS_KEY]
     field_names_other_wind_component_grib1 = metadata_dict[
         FIELD_NAMES_OTHER_COMPONENT_KEY]
-    other_wind_component_indices = metadata_dict[
-        OTHER_WIND_COMPONENT_INDICES_KEY]
     rotation_sine_by_query_point = metadata_dict[ROTATION_SINES_KEY]
     rotation_cosine_by_query_point = metadata_dict[ROTATION_COSINES_KEY]
 
+    # Each grib file will be read once, for all fields needed.  These include
+    # the other component of each wind field that must be rotated.
+    field_names_to_read_grib1 = []
+    wind_field_pairs_grib1 = []
+    num_fields = len(field_names)
+
+    for j in range(num_fields):
+        if field_names_grib1[j] not in field_names_to_read_grib1:
+            field_names_to_read_grib1.append(field_names_grib1[j])
+
+        if not rotate_wind_flags[j]:
+            continue
+
+        this_other_name = field_names_other_wind_component_grib1[j]
+        if this_other_name not in field_names_to_read_grib1:
+            field_names_to_read_grib1.append(this_other_name)
+
+        if grib_io.is_u_wind_field(field_names_grib1[j]):
+            this_pair = (field_names_grib1[j], this_other_name)
+        else:
+            this_pair = (this_other_name, field_names_grib1[j])
+
+        if this_pair not in wind_field_pairs_grib1:
+            wind_field_pairs_grib1.append(this_pair)
+
+    read_indices_by_field = numpy.array(
+        [field_names_to_read_grib1.index(f) for f in field_names_grib1],
+        dtype=int
+    )
+
     _, init_time_step_hours = nwp_model_utils.get_time_steps(model_name)
 
     init_times_unix_sec, query_to_model_times_table = (
@@ -826,151 +1051,140 @@ def interp_nwp_from_xy_grid(
             method_string=temporal_interp_method_string)
     )
 
+    # Plan reads.  For each range of query times, find query points in the
+    # range and init times needed.  Then, for each init time, find the last
+    # range that needs it, after which the grids can be freed.
+    query_times_unix_sec = query_point_table[QUERY_TIME_COLUMN].values
     num_init_times = len(init_times_unix_sec)
     num_query_time_ranges = len(query_to_model_times_table.index)
-    num_fields = len(field_names)
-    interp_done_by_field = numpy.full(num_fields, False, dtype=bool)
 
-    for j in range(num_fields):
-        if interp_done_by_field[j]:
+    query_indices_by_range = (
+        [numpy.array([], dtype=int)] * num_query_time_ranges
+    )
+    init_time_needed_matrix = numpy.full(
+        (num_query_time_ranges, num_init_times), False, dtype=bool)
+
+    for i in range(num_query_time_ranges):
+        if i == num_query_time_ranges - 1:
+            query_indices_by_range[i] = numpy.where(
+                query_times_unix_sec >= query_to_model_times_table[
+                    nwp_model_utils.MIN_QUERY_TIME_COLUMN].values[-1]
+            )[0]
+        else:
+            query_indices_by_range[i] = numpy.where(numpy.logical_and(
+                query_times_unix_sec >= query_to_model_times_table[
+                    nwp_model_utils.MIN_QUERY_TIME_COLUMN].values[i],
+                query_times_unix_sec < query_to_model_times_table[
+                    nwp_model_utils.MAX_QUERY_TIME_COLUMN].values[i]
+            ))[0]
+
+        if len(query_indices_by_range[i]) == 0:
             continue
 
-        list_of_2d_grids = [None] * num_init_times
-        list_of_2d_grids_other_wind_component = [None] * num_init_times
-
-        for i in range(num_query_time_ranges):
-            if i == num_query_time_ranges - 1:
-                query_indices_in_this_range = numpy.where(
-                    query_point_table[QUERY_TIME_COLUMN].values >=
-                    query_to_model_times_table[
-                        nwp_model_utils.MIN_QUERY_TIME_COLUMN].values[-1]
-                )[0]
-            else:
-                query_indices_in_this_range = numpy.where(numpy.logical_and(
-                    query_point_table[QUERY_TIME_COLUMN].values >=
-                    query_to_model_times_table[
-                        nwp_model_utils.MIN_QUERY_TIME_COLUMN].values[i],
-                    query_point_table[QUERY_TIME_COLUMN].values <
-                    query_to_model_times_table[
-                        nwp_model_utils.MAX_QUERY_TIME_COLUMN].values[i]
-                ))[0]
-
-            (list_of_2d_grids, list_of_2d_grids_other_wind_component,
-             missing_data
-            ) = _read_nwp_for_interp_any_grid(
-                init_times_unix_sec=init_times_unix_sec,
-                query_to_model_times_row=query_to_model_times_table.iloc[[i]],
-                field_name_grib1=field_names_grib1[j],
-                field_name_other_wind_component_grib1=
-                field_names_other_wind_component_grib1[j],
-                list_of_model_grids=list_of_2d_grids,
-                list_of_model_grids_other_wind_component=
-                list_of_2d_grids_other_wind_component, model_name=model_name,
-                top_grib_directory_name=top_grib_directory_name,
-                wgrib_exe_name=wgrib_exe_name,
-                wgrib2_exe_name=wgrib2_exe_name,
-                raise_error_if_missing=raise_error_if_missing)
-
-            if missing_data:
-                continue
+        init_time_needed_matrix[i, :] = numpy.array(
+            query_to_model_times_table[
+                nwp_model_utils.MODEL_TIMES_NEEDED_COLUMN
+            ].values[i], dtype=bool
+        )
 
-            list_of_spatial_interp_arrays = [numpy.array([])] * num_init_times
-            list_of_sinterp_arrays_other_wind_component = (
-                [numpy.array([])] * num_init_times)
+    last_range_by_init_time = numpy.full(num_init_times, -1, dtype=int)
+    for t in range(num_init_times):
+        these_range_indices = numpy.where(init_time_needed_matrix[:, t])[0]
+        if len(these_range_indices) > 0:
+            last_range_by_init_time[t] = these_range_indices[-1]
+
+    num_fields_to_read = len(field_names_to_read_grib1)
+    grid_index_matrix = numpy.full(
+        (num_init_times, num_fields_to_read), -1, dtype=int)
+    field_matrix_dict_by_init_time = [None] * num_init_times
+    read_done_by_init_time = numpy.full(num_init_times, False, dtype=bool)
+
+    for i in range(num_query_time_ranges):
+        init_time_needed_indices = numpy.where(init_time_needed_matrix[i, :])[0]
+        if len(init_time_needed_indices) == 0:
+            continue
 
-            init_time_needed_indices = numpy.where(
-                query_to_model_times_table[
-                    nwp_model_utils.MODEL_TIMES_NEEDED_COLUMN
-                ].values[i])[0]
+        for t in init_time_needed_indices:
+            if read_done_by_init_time[t]:
+                continue
 
-            for t in init_time_needed_indices:
-                this_grid_id = nwp_model_utils.dimensions_to_grid(
-                    num_rows=list_of_2d_grids[t].shape[0],
-                    num_columns=list_of_2d_grids[t].shape[1]
-                )
+            read_done_by_init_time[t] = True
+            (grid_index_matrix[t, :], field_matrix_dict_by_init_time[t]
+            ) = _read_nwp_fields_for_one_init_time(
+                init_time_unix_sec=init_times_unix_sec[t],
+                field_names_grib1=field_names_to_read_grib1,
+                wind_field_pairs_grib1=wind_field_pairs_grib1,
+                model_name=model_name, grid_ids=grid_ids,
+                top_grib_directory_name=top_grib_directory_name,
+                wgrib_exe_name=wgrib_exe_name,
+                wgrib2_exe_name=wgrib2_exe_name,
+                raise_error_if_missing=raise_error_if_missing,
+                grib_cache_dir_name=grib_cache_dir_name)
+
+        # Fields missing at any init time needed are left as NaN for query
+        # points in this range.
+        available_field_indices = _find_fields_available_for_interp(
+            grid_index_matrix=grid_index_matrix,
+            init_time_needed_indices=init_time_needed_indices)
+
+        if len(available_field_indices) > 0:
+            query_indices_in_this_range = query_indices_by_range[i]
+            spatial_interp_matrix_3d = numpy.full(
+                (num_fields_to_read, len(query_indices_in_this_range),
+                 len(init_time_needed_indices)),
+                numpy.nan
+            )
 
-                this_grid_index = grid_ids.index(this_grid_id)
-
-                list_of_spatial_interp_arrays[
-                    t
-                ] = interp_from_xy_grid_to_points(
-                    input_matrix=list_of_2d_grids[t],
-                    sorted_grid_point_x_metres=x_points_by_grid_metres[
-                        this_grid_index],
-                    sorted_grid_point_y_metres=y_points_by_grid_metres[
-                        this_grid_index],
-                    query_x_coords_metres=query_point_table_by_grid[
-                        this_grid_index][QUERY_X_COLUMN].values[
-                            query_indices_in_this_range],
-                    query_y_coords_metres=query_point_table_by_grid[
-                        this_grid_index][QUERY_Y_COLUMN].values[
-                            query_indices_in_this_range],
-                    method_string=spatial_interp_method_string,
-                    spline_degree=spline_degree, extrapolate=True)
-
-                if rotate_wind_flags[j]:
-                    list_of_sinterp_arrays_other_wind_component[
-                        t
-                    ] = interp_from_xy_grid_to_points(
-                        input_matrix=list_of_2d_grids_other_wind_component[t],
-                        sorted_grid_point_x_metres=x_points_by_grid_metres[
-                            this_grid_index],
-                        sorted_grid_point_y_metres=y_points_by_grid_metres[
-                            this_grid_index],
-                        query_x_coords_metres=query_point_table_by_grid[
-                            this_grid_index][QUERY_X_COLUMN].values[
-                                query_indices_in_this_range],
-                        query_y_coords_metres=query_point_table_by_grid[
-                            this_grid_index][QUERY_Y_COLUMN].values[
-                                query_indices_in_this_range],
+            for k in range(len(init_time_needed_indices)):
+                t = init_time_needed_indices[k]
+
+                for g in numpy.unique(
+                        grid_index_matrix[t, available_field_indices]):
+                    these_field_indices = available_field_indices[
+                        grid_index_matrix[t, available_field_indices] == g
+                    ]
+
+                    spatial_interp_matrix_3d[
+                        these_field_indices, :, k
+                    ] = _interp_fields_from_xy_grid_to_points(
+                        list_of_input_matrices=[
+                            field_matrix_dict_by_init_time[t][
+                                field_names_to_read_grib1[j]]
+                            for j in these_field_indices
+                        ],
+                        sorted_grid_point_x_metres=x_points_by_grid_metres[g],
+                        sorted_grid_point_y_metres=y_points_by_grid_metres[g],
+                        query_x_coords_metres=query_point_table_by_grid[g][
+                            QUERY_X_COLUMN].values[query_indices_in_this_range],
+                        query_y_coords_metres=query_point_table_by_grid[g][
+                            QUERY_Y_COLUMN].values[query_indices_in_this_range],
                         method_string=spatial_interp_method_string,
-                        spline_degree=spline_degree, extrapolate=True)
-
-                    if grib_io.is_u_wind_field(field_names_grib1[j]):
-                        (list_of_spatial_interp_arrays[t],
-                         list_of_sinterp_arrays_other_wind_component[t]
-                        ) = nwp_model_utils.rotate_winds_to_earth_relative(
-                            u_winds_grid_relative_m_s01=
-                            list_of_spatial_interp_arrays[t],
-                            v_winds_grid_relative_m_s01=
-                            list_of_sinterp_arrays_other_wind_component[t],
-                            rotation_angle_cosines=
-                            rotation_cosine_by_query_point[
-                                query_indices_in_this_range],
-                            rotation_angle_sines=rotation_sine_by_query_point[
-                                query_indices_in_this_range]
-                        )
-
-                    if grib_io.is_v_wind_field(field_names_grib1[j]):
-                        (list_of_sinterp_arrays_other_wind_component[t],
-                         list_of_spatial_interp_arrays[t]
-                        ) = nwp_model_utils.rotate_winds_to_earth_relative(
-                            u_winds_grid_relative_m_s01=
-                            list_of_sinterp_arrays_other_wind_component[t],
-                            v_winds_grid_relative_m_s01=
-                            list_of_spatial_interp_arrays[t],
-                            rotation_angle_cosines=
-                            rotation_cosine_by_query_point[
-                                query_indices_in_this_range],
-                            rotation_angle_sines=rotation_sine_by_query_point[
-                                query_indices_in_this_range]
-                        )
-
-            spatial_interp_matrix_2d = _stack_1d_arrays_horizontally(
-                [list_of_spatial_interp_arrays[t] for
-                 t in init_time_needed_indices])
-
-            if rotate_wind_flags[j]:
-                sinterp_matrix_2d_other_wind_component = (
-                    _stack_1d_arrays_horizontally(
-                        [list_of_sinterp_arrays_other_wind_component[t] for
-                         t in init_time_needed_indices]))
+                        spline_degree=spline_degree)
+
+                for this_u_name, this_v_name in wind_field_pairs_grib1:
+                    this_u_index = field_names_to_read_grib1.index(this_u_name)
+                    this_v_index = field_names_to_read_grib1.index(this_v_name)
+                    if this_u_index not in available_field_indices:
+                        continue
+
+                    (spatial_interp_matrix_3d[this_u_index, :, k],
+                     spatial_interp_matrix_3d[this_v_index, :, k]
+                    ) = nwp_model_utils.rotate_winds_to_earth_relative(
+                        u_winds_grid_relative_m_s01=
+                        spatial_interp_matrix_3d[this_u_index, :, k],
+                        v_winds_grid_relative_m_s01=
+                        spatial_interp_matrix_3d[this_v_index, :, k],
+                        rotation_angle_cosines=rotation_cosine_by_query_point[
+                            query_indices_in_this_range],
+                        rotation_angle_sines=rotation_sine_by_query_point[
+                            query_indices_in_this_range]
+                    )
 
             (these_unique_query_times_unix_sec,
              these_query_times_orig_to_unique
             ) = numpy.unique(
-                query_point_table[QUERY_TIME_COLUMN].values[
-                    query_indices_in_this_range], return_inverse=True)
+                query_times_unix_sec[query_indices_in_this_range],
+                return_inverse=True)
 
             for k in range(len(these_unique_query_times_unix_sec)):
                 these_indices = numpy.where(
@@ -978,35 +1192,29 @@ def interp_nwp_from_xy_grid(
                 query_indices_at_this_time = query_indices_in_this_range[
                     these_indices]
 
-                these_interp_values = interp_in_time(
-                    input_matrix=spatial_interp_matrix_2d[these_indices, :],
-                    sorted_input_times_unix_sec=init_times_unix_sec[
-                        init_time_needed_indices],
-                    query_times_unix_sec=these_unique_query_times_unix_sec[[k]],
-                    method_string=temporal_interp_method_string,
-                    extrapolate=False)
-                interp_table[field_names[j]].values[
-                    query_indices_at_this_time] = these_interp_values[:, 0]
-
-                if other_wind_component_indices[j] != -1:
-                    these_interp_values = interp_in_time(
-                        input_matrix=sinterp_matrix_2d_other_wind_component[
-                            these_indices, :],
+                this_interp_matrix = numpy.full(
+                    (num_fields_to_read, len(these_indices)), numpy.nan)
+
+                this_interp_matrix[available_field_indices, :] = (
+                    interp_in_time(
+                        input_matrix=spatial_interp_matrix_3d[
+                            available_field_indices, ...][:, these_indices, :],
                         sorted_input_times_unix_sec=init_times_unix_sec[
                             init_time_needed_indices],
                         query_times_unix_sec=
                         these_unique_query_times_unix_sec[[k]],
                         method_string=temporal_interp_method_string,
-                        extrapolate=False)
+                        extrapolate=False)[..., 0]
+                )
 
-                    this_field_name = field_names[
-                        other_wind_component_indices[j]]
-                    interp_table[this_field_name].values[
-                        query_indices_at_this_time] = these_interp_values[:, 0]
+                for j in range(num_fields):
+                    interp_table[field_names[j]].values[
+                        query_indices_at_this_time
+                    ] = this_interp_matrix[read_indices_by_field[j], :]
 
-        interp_done_by_field[j] = True
-        if other_wind_component_indices[j] != -1:
-            interp_done_by_field[other_wind_component_indices[j]] = True
+        for t in init_time_needed_indices:
+            if last_range_by_init_time[t] == i:
+                field_matrix_dict_by_init_time[t] = None
 
     return interp_table
 
@@ -1019,7 +1227,7 @@ def interp_temperature_surface_from_nwp(
         spline_degree=DEFAULT_SPLINE_DEGREE,
         wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
         wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
-        raise_error_if_missing=False):
+        raise_error_if_missing=False, grib_cache_dir_name=None):
     """Interpolates temperature (isothermal) surface from NWP model.
 
     Q = number of query points
@@ -1040,6 +1248,7 @@ def interp_temperature_surface_from_nwp(
     :param wgrib_exe_name: Same.
     :param wgrib2_exe_name: Same.
     :param raise_error_if_missing: Same.
+    :param grib_cache_dir_name: Same.
     :return: isosurface_heights_m_asl: length-Q numpy array with heights of
         temperature isosurface (metres above sea level).
     """
@@ -1138,7 +1347,8 @@ def interp_temperature_surface_from_nwp(
             model_name=model_name,
             top_grib_directory_name=top_grib_directory_name,
             wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
-            raise_error_if_missing=raise_error_if_missing)
+            raise_error_if_missing=raise_error_if_missing,
+            grib_cache_dir_name=grib_cache_dir_name)
 
         if missing_data:
             continue
@@ -1154,7 +1364,8 @@ def interp_temperature_surface_from_nwp(
             model_name=model_name,
             top_grib_directory_name=top_grib_directory_name,
             wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
-            raise_error_if_missing=raise_error_if_missing)
+            raise_error_if_missing=raise_error_if_missing,
+            grib_cache_dir_name=grib_cache_dir_name)
 
         if missing_data:
             continue
@@ -2,6 +2,7 @@
 
 import copy
 import unittest
+from unittest import mock
 import numpy
 from gewittergefahr.gg_utils import interp
 from gewittergefahr.gg_utils import nwp_model_utils
@@ -49,6 +50,43 @@ WIND_ROTATION_METADATA_DICT_RAPRUC = {
     interp.OTHER_WIND_COMPONENT_INDICES_KEY: OTHER_WIND_COMPONENT_INDICES_RAPRUC
 }
 
+# The following constants are used to test _find_nearest_indices.
+SORTED_VALUES_FOR_NEAREST = numpy.array([0., 1., 2., 4., 8.])
+TEST_VALUES_FOR_NEAREST = numpy.array(
+    [-5., 0., 0.4, 0.5, 0.6, 3., 3.1, 6., 100.]
+)
+NEAREST_INDICES = numpy.array([0, 0, 0, 1, 1, 3, 3, 4, 4], dtype=int)
+
+# The following constants are used to test _read_nwp_fields_for_one_init_time.
+FIELD_NAMES_TO_READ_GRIB1 = [
+    'HGT:500 mb', 'TMP:500 mb', 'UGRD:500 mb', 'VGRD:500 mb'
+]
+WIND_FIELD_PAIRS_GRIB1 = [('UGRD:500 mb', 'VGRD:500 mb')]
+GRID_IDS_TO_READ = ['130', '252']
+
+FIELD_NAMES_BY_GRID_GRIB1 = {
+    '130': ['HGT:500 mb', 'UGRD:500 mb'],
+    '252': ['HGT:500 mb', 'UGRD:500 mb', 'VGRD:500 mb']
+}
+FIELD_MATRIX_BY_GRID = {
+    '130': numpy.full((2, 3), 1.),
+    '252': numpy.full((2, 3), 2.)
+}
+
+GRID_INDEX_BY_FIELD = numpy.array([0, -1, 1, 1], dtype=int)
+
+# The following constants are used to test _find_fields_available_for_interp.
+GRID_INDEX_MATRIX = numpy.array([
+    [0, 0, 1, 1],
+    [0, -1, 1, 1],
+    [1, 1, -1, -1]
+], dtype=int)
+
+FIRST_INIT_TIME_NEEDED_INDICES = numpy.array([0, 1], dtype=int)
+FIRST_AVAILABLE_FIELD_INDICES = numpy.array([0, 2, 3], dtype=int)
+SECOND_INIT_TIME_NEEDED_INDICES = numpy.array([0, 2], dtype=int)
+SECOND_AVAILABLE_FIELD_INDICES = numpy.array([0, 1], dtype=int)
+
 # The following constants are used to test _stack_1d_arrays_horizontally.
 LIST_OF_1D_ARRAYS = [
     numpy.array([1., 2., 3]),
@@ -206,6 +244,32 @@ def _compare_metadata_dicts(first_metadata_dict, second_metadata_dict):
     return True
 
 
+def _find_grib_file_fake(grid_id, **_):
+    """Fake version of `nwp_model_io.find_grib_file`.
+
+    :param grid_id: Grid ID.
+    :return: grib_file_name: File name, which is just the grid ID.
+    """
+
+    return grid_id
+
+
+def _read_fields_from_grib_file_fake(grid_id, field_names_grib1, **_):
+    """Fake version of `nwp_model_io.read_fields_from_grib_file`.
+
+    :param grid_id: Grid ID.
+    :param field_names_grib1: 1-D list of field names in grib1 format.
+    :return: field_matrices: 1-D list of field matrices, where fields missing
+        from the grid are None.
+    """
+
+    return [
+        FIELD_MATRIX_BY_GRID[grid_id] + 0.
+        if f in FIELD_NAMES_BY_GRID_GRIB1[grid_id] else None
+        for f in field_names_grib1
+    ]
+
+
 class InterpTests(unittest.TestCase):
     """Each method is a unit test for interp.py."""
 
@@ -248,6 +312,88 @@ class InterpTests(unittest.TestCase):
         self.assertTrue(_compare_metadata_dicts(
             this_metadata_dict, WIND_ROTATION_METADATA_DICT_RAPRUC))
 
+    def test_find_nearest_indices(self):
+        """Ensures correct output from _find_nearest_indices."""
+
+        these_indices = interp._find_nearest_indices(
+            sorted_input_values=SORTED_VALUES_FOR_NEAREST,
+            test_values=TEST_VALUES_FOR_NEAREST)
+
+        self.assertTrue(numpy.array_equal(these_indices, NEAREST_INDICES))
+
+    def test_read_nwp_fields_for_one_init_time(self):
+        """Ensures correct output from _read_nwp_fields_for_one_init_time.
+
+        In this case, one field is missing from all grids, one field is
+        available from the first grid, and both wind components must come from
+        the second grid (the first grid has only one component).
+        """
+
+        with mock.patch.object(
+                interp.nwp_model_io, 'find_grib_file',
+                side_effect=_find_grib_file_fake
+        ), mock.patch.object(
+                interp.nwp_model_io, 'read_fields_from_grib_file',
+                side_effect=_read_fields_from_grib_file_fake
+        ), mock.patch.object(interp.os.path, 'isfile', return_value=True):
+            these_grid_indices, this_field_matrix_dict = (
+                interp._read_nwp_fields_for_one_init_time(
+                    init_time_unix_sec=0,
+                    field_names_grib1=FIELD_NAMES_TO_READ_GRIB1,
+                    wind_field_pairs_grib1=WIND_FIELD_PAIRS_GRIB1,
+                    model_name=nwp_model_utils.RAP_MODEL_NAME,
+                    grid_ids=GRID_IDS_TO_READ, top_grib_directory_name='foo',
+                    wgrib_exe_name='foo', wgrib2_exe_name='foo',
+                    raise_error_if_missing=False, grib_cache_dir_name=None)
+            )
+
+        self.assertTrue(numpy.array_equal(
+            these_grid_indices, GRID_INDEX_BY_FIELD))
+        self.assertTrue(
+            set(this_field_matrix_dict.keys()) ==
+            set(['HGT:500 mb', 'UGRD:500 mb', 'VGRD:500 mb'])
+        )
+
+        for j in range(len(FIELD_NAMES_TO_READ_GRIB1)):
+            if GRID_INDEX_BY_FIELD[j] < 0:
+                continue
+
+            this_expected_matrix = FIELD_MATRIX_BY_GRID[
+                GRID_IDS_TO_READ[GRID_INDEX_BY_FIELD[j]]
+            ]
+            self.assertTrue(numpy.allclose(
+                this_field_matrix_dict[FIELD_NAMES_TO_READ_GRIB1[j]],
+                this_expected_matrix, atol=TOLERANCE
+            ))
+
+    def test_find_fields_available_for_interp_first(self):
+        """Ensures correct output from _find_fields_available_for_interp.
+
+        In this case, one field is missing at one of the init times needed, so
+        only that field is unavailable.
+        """
+
+        these_field_indices = interp._find_fields_available_for_interp(
+            grid_index_matrix=GRID_INDEX_MATRIX,
+            init_time_needed_indices=FIRST_INIT_TIME_NEEDED_INDICES)
+
+        self.assertTrue(numpy.array_equal(
+            these_field_indices, FIRST_AVAILABLE_FIELD_INDICES))
+
+    def test_find_fields_available_for_interp_second(self):
+        """Ensures correct output from _find_fields_available_for_interp.
+
+        In this case, both wind components are missing at one of the init
+        times needed.
+        """
+
+        these_field_indices = interp._find_fields_available_for_interp(
+            grid_index_matrix=GRID_INDEX_MATRIX,
+            init_time_needed_indices=SECOND_INIT_TIME_NEEDED_INDICES)
+
+        self.assertTrue(numpy.array_equal(
+            these_field_indices, SECOND_AVAILABLE_FIELD_INDICES))
+
     def test_stack_1d_arrays_horizontally_1array(self):
         """Ensures correct output from _stack_1d_arrays_horizontally.
 
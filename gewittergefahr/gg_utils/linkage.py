@@ -19,6 +19,7 @@ import os.path
 import warnings
 import numpy
 import pandas
+from scipy.spatial import cKDTree
 from gewittergefahr.gg_io import raw_wind_io
 from gewittergefahr.gg_io import tornado_io
 from gewittergefahr.gg_io import storm_tracking_io as tracking_io
@@ -135,6 +136,18 @@ MAX_LINK_DISTANCE_KEY = 'max_link_distance_metres'
 SECONDARY_START_TIME_COLUMN = 'secondary_cell_start_time_unix_sec'
 SECONDARY_END_TIME_COLUMN = 'secondary_cell_end_time_unix_sec'
 
+VERTEX_TREE_KEY = 'kd_tree_object'
+VERTEX_X_COORDS_KEY = 'vertex_x_coords_metres'
+VERTEX_Y_COORDS_KEY = 'vertex_y_coords_metres'
+VERTEX_TO_STORM_INDICES_KEY = 'vertex_to_storm_indices'
+UNIQUE_SECONDARY_IDS_KEY = 'unique_secondary_id_strings'
+STORM_TO_VERTEX_INDICES_KEY = 'storm_to_vertex_indices'
+STORM_X_LIMITS_KEY = 'storm_x_limits_metres'
+STORM_Y_LIMITS_KEY = 'storm_y_limits_metres'
+STORM_POLYGONS_KEY = 'storm_polygon_objects'
+
+KD_TREE_RADIUS_PADDING = 1e-6
+
 
 def _check_input_args(
         tracking_file_names, max_time_before_storm_start_sec,
@@ -679,39 +692,24 @@ def _interp_storms_in_time(storm_object_table, target_time_unix_sec,
     return pandas.concat(list_of_vertex_tables, axis=0, ignore_index=True)
 
 
-def _find_nearest_storms_one_time(
+def _find_nearest_storms_one_time_brute_force(
         interp_vertex_table, event_x_coords_metres, event_y_coords_metres,
-        max_link_distance_metres, max_polygon_attempt_distance_metres=30000.):
-    """Finds nearest storm to each event.
-
-    In this case all events are at the same time.
+        max_link_distance_metres, max_polygon_attempt_distance_metres):
+    """Finds nearest storm to each event, without spatial index.
 
-    N = number of events
+    This method compares every event to every vertex.  It is kept as a
+    reference for `_find_nearest_storms_one_time`, which returns the same
+    answer much faster.
 
-    :param interp_vertex_table: pandas DataFrame created by
-        `_interp_storms_in_time`.
-    :param event_x_coords_metres: length-N numpy array with x-coordinates of
-        events.
-    :param event_y_coords_metres: length-N numpy array with y-coordinates of
-        events.
-    :param max_link_distance_metres: Max linkage distance.  If the nearest storm
-        edge to event E is > `max_link_distance_metres` away, event E will not
-        be linked to any storm.
-    :param max_polygon_attempt_distance_metres: Max distance for attempting to
-        place event inside storm.
-    :return: nearest_secondary_id_strings: length-N list, where
-        nearest_secondary_id_strings[i] = secondary ID of nearest storm to [i]th
-        event.  If nearest_secondary_id_strings[i] = None, no storm was linked
-        to [i]th event.
-    :return: linkage_distances_metres: length-N numpy array of linkage
-        distances.  If linkage_distances_metres[i] = NaN, [i]th event was not
-        linked to any storm.
+    :param interp_vertex_table: See doc for `_find_nearest_storms_one_time`.
+    :param event_x_coords_metres: Same.
+    :param event_y_coords_metres: Same.
+    :param max_link_distance_metres: Same.
+    :param max_polygon_attempt_distance_metres: Same.
+    :return: nearest_secondary_id_strings: Same.
+    :return: linkage_distances_metres: Same.
     """
 
-    max_polygon_attempt_distance_metres = max([
-        max_polygon_attempt_distance_metres, 2 * max_link_distance_metres
-    ])
-
     unique_secondary_id_strings, orig_to_unique_indices = numpy.unique(
         interp_vertex_table[tracking_utils.SECONDARY_ID_COLUMN].values,
         return_inverse=True)
@@ -824,6 +822,348 @@ def _find_nearest_storms_one_time(
     return nearest_secondary_id_strings, linkage_distances_metres
 
 
+def _make_vertex_index(interp_vertex_table):
+    """Creates spatial index for interpolated storm vertices at one time.
+
+    V = number of vertices
+    S = number of unique storm cells (secondary IDs)
+
+    :param interp_vertex_table: pandas DataFrame created by
+        `_interp_storms_in_time`.
+    :return: vertex_index_dict: Dictionary with the following keys.
+    vertex_index_dict['kd_tree_object']: `scipy.spatial.cKDTree` object built
+        over all vertices.
+    vertex_index_dict['vertex_x_coords_metres']: length-V numpy array of
+        x-coordinates.
+    vertex_index_dict['vertex_y_coords_metres']: length-V numpy array of
+        y-coordinates.
+    vertex_index_dict['vertex_to_storm_indices']: length-V numpy array, where
+        vertex_to_storm_indices[j] is the index of the [j]th vertex's storm cell
+        in `unique_secondary_id_strings`.
+    vertex_index_dict['unique_secondary_id_strings']: length-S numpy array of
+        secondary IDs (sorted in ascending order).
+    vertex_index_dict['storm_to_vertex_indices']: length-S list, where the
+        [k]th item is a numpy array with indices of vertices in the [k]th storm
+        cell (in their original order).
+    vertex_index_dict['storm_x_limits_metres']: S-by-2 numpy array with
+        [min, max] x-coordinate of each storm cell.
+    vertex_index_dict['storm_y_limits_metres']: Same but for y-coordinates.
+    vertex_index_dict['storm_polygon_objects']: length-S list of polygons
+        (`shapely.geometry.Polygon` objects).  These are created lazily by
+        `_get_storm_polygon`, so items start out as None.
+    """
+
+    vertex_x_coords_metres = interp_vertex_table[STORM_VERTEX_X_COLUMN].values
+    vertex_y_coords_metres = interp_vertex_table[STORM_VERTEX_Y_COLUMN].values
+
+    unique_secondary_id_strings, vertex_to_storm_indices = numpy.unique(
+        interp_vertex_table[tracking_utils.SECONDARY_ID_COLUMN].values,
+        return_inverse=True)
+
+    sort_indices = numpy.argsort(vertex_to_storm_indices, kind='stable')
+    split_indices = numpy.cumsum(numpy.bincount(
+        vertex_to_storm_indices, minlength=len(unique_secondary_id_strings)
+    ))[:-1]
+
+    storm_to_vertex_indices = numpy.split(sort_indices, split_indices)
+
+    num_storms = len(unique_secondary_id_strings)
+    storm_x_limits_metres = numpy.full((num_storms, 2), numpy.nan)
+    storm_y_limits_metres = numpy.full((num_storms, 2), numpy.nan)
+
+    if num_storms > 0:
+        first_indices = numpy.concatenate((
+            numpy.array([0], dtype=int), split_indices
+        ))
+
+        storm_x_limits_metres[:, 0] = numpy.minimum.reduceat(
+            vertex_x_coords_metres[sort_indices], first_indices)
+        storm_x_limits_metres[:, 1] = numpy.maximum.reduceat(
+            vertex_x_coords_metres[sort_indices], first_indices)
+        storm_y_limits_metres[:, 0] = numpy.minimum.reduceat(
+            vertex_y_coords_metres[sort_indices], first_indices)
+        storm_y_limits_metres[:, 1] = numpy.maximum.reduceat(
+            vertex_y_coords_metres[sort_indices], first_indices)
+
+    if len(vertex_x_coords_metres) == 0:
+        kd_tree_object = None
+    else:
+        kd_tree_object = cKDTree(numpy.transpose(numpy.vstack((
+            vertex_x_coords_metres, vertex_y_coords_metres
+        ))))
+
+    return {
+        VERTEX_TREE_KEY: kd_tree_object,
+        VERTEX_X_COORDS_KEY: vertex_x_coords_metres,
+        VERTEX_Y_COORDS_KEY: vertex_y_coords_metres,
+        VERTEX_TO_STORM_INDICES_KEY: vertex_to_storm_indices,
+        UNIQUE_SECONDARY_IDS_KEY: unique_secondary_id_strings,
+        STORM_TO_VERTEX_INDICES_KEY: storm_to_vertex_indices,
+        STORM_X_LIMITS_KEY: storm_x_limits_metres,
+        STORM_Y_LIMITS_KEY: storm_y_limits_metres,
+        STORM_POLYGONS_KEY: [None] * len(unique_secondary_id_strings)
+    }
+
+
+def _get_storm_polygon(vertex_index_dict, storm_index):
+    """Returns polygon for one storm cell, creating it if necessary.
+
+    :param vertex_index_dict: Dictionary created by `_make_vertex_index`.  The
+        polygon will be cached in this dictionary.
+    :param storm_index: Index of storm cell in
+        `vertex_index_dict['unique_secondary_id_strings']`.
+    :return: polygon_object: `shapely.geometry.Polygon` object.
+    """
+
+    polygon_object = vertex_index_dict[STORM_POLYGONS_KEY][storm_index]
+    if polygon_object is not None:
+        return polygon_object
+
+    these_vertex_indices = vertex_index_dict[STORM_TO_VERTEX_INDICES_KEY][
+        storm_index]
+
+    polygon_object = polygons.vertex_arrays_to_polygon_object(
+        exterior_x_coords=vertex_index_dict[VERTEX_X_COORDS_KEY][
+            these_vertex_indices],
+        exterior_y_coords=vertex_index_dict[VERTEX_Y_COORDS_KEY][
+            these_vertex_indices]
+    )
+
+    vertex_index_dict[STORM_POLYGONS_KEY][storm_index] = polygon_object
+    return polygon_object
+
+
+def _find_nearest_storms_one_time(
+        interp_vertex_table, event_x_coords_metres, event_y_coords_metres,
+        max_link_distance_metres, max_polygon_attempt_distance_metres=30000.,
+        use_spatial_index=True):
+    """Finds nearest storm to each event.
+
+    In this case all events are at the same time.
+
+    N = number of events
+
+    :param interp_vertex_table: pandas DataFrame created by
+        `_interp_storms_in_time`.
+    :param event_x_coords_metres: length-N numpy array with x-coordinates of
+        events.
+    :param event_y_coords_metres: length-N numpy array with y-coordinates of
+        events.
+    :param max_link_distance_metres: Max linkage distance.  If the nearest storm
+        edge to event E is > `max_link_distance_metres` away, event E will not
+        be linked to any storm.
+    :param max_polygon_attempt_distance_metres: Max distance for attempting to
+        place event inside storm.
+    :param use_spatial_index: Boolean flag.  If True, will find candidate
+        vertices for each event with a k-d tree, then test each candidate storm
+        cell against all its candidate events at once.  If False, will compare
+        every event to every vertex (slow, but kept for reference).
+    :return: nearest_secondary_id_strings: length-N list, where
+        nearest_secondary_id_strings[i] = secondary ID of nearest storm to [i]th
+        event.  If nearest_secondary_id_strings[i] = None, no storm was linked
+        to [i]th event.
+    :return: linkage_distances_metres: length-N numpy array of linkage
+        distances.  If linkage_distances_metres[i] = NaN, [i]th event was not
+        linked to any storm.
+    """
+
+    error_checking.assert_is_boolean(use_spatial_index)
+
+    max_polygon_attempt_distance_metres = max([
+        max_polygon_attempt_distance_metres, 2 * max_link_distance_metres
+    ])
+
+    if not use_spatial_index:
+        return _find_nearest_storms_one_time_brute_force(
+            interp_vertex_table=interp_vertex_table,
+            event_x_coords_metres=event_x_coords_metres,
+            event_y_coords_metres=event_y_coords_metres,
+            max_link_distance_metres=max_link_distance_metres,
+            max_polygon_attempt_distance_metres=
+            max_polygon_attempt_distance_metres)
+
+    num_events = len(event_x_coords_metres)
+    nearest_secondary_id_strings = [None] * num_events
+    linkage_distances_metres = numpy.full(num_events, numpy.nan)
+
+    vertex_index_dict = _make_vertex_index(interp_vertex_table)
+    if vertex_index_dict[VERTEX_TREE_KEY] is None:
+        return nearest_secondary_id_strings, linkage_distances_metres
+
+    vertex_x_coords_metres = vertex_index_dict[VERTEX_X_COORDS_KEY]
+    vertex_y_coords_metres = vertex_index_dict[VERTEX_Y_COORDS_KEY]
+    vertex_to_storm_indices = vertex_index_dict[VERTEX_TO_STORM_INDICES_KEY]
+    unique_secondary_id_strings = vertex_index_dict[UNIQUE_SECONDARY_IDS_KEY]
+    storm_x_limits_metres = vertex_index_dict[STORM_X_LIMITS_KEY]
+    storm_y_limits_metres = vertex_index_dict[STORM_Y_LIMITS_KEY]
+
+    event_x_coords_metres = numpy.asarray(event_x_coords_metres, dtype=float)
+    event_y_coords_metres = numpy.asarray(event_y_coords_metres, dtype=float)
+    good_event_indices = numpy.where(numpy.logical_and(
+        numpy.isfinite(event_x_coords_metres),
+        numpy.isfinite(event_y_coords_metres)
+    ))[0]
+
+    if len(good_event_indices) == 0:
+        return nearest_secondary_id_strings, linkage_distances_metres
+
+    # Find all (event, vertex) pairs within a slightly larger box
+    # (infinity-norm ball) than necessary, then apply the exact box criterion.
+    # This guarantees that candidate vertices are the same as in the
+    # brute-force method, regardless of rounding inside the k-d trees.
+    event_tree_object = cKDTree(numpy.transpose(numpy.vstack((
+        event_x_coords_metres[good_event_indices],
+        event_y_coords_metres[good_event_indices]
+    ))))
+
+    pair_array = event_tree_object.sparse_distance_matrix(
+        vertex_index_dict[VERTEX_TREE_KEY],
+        max_distance=
+        max_polygon_attempt_distance_metres * (1. + KD_TREE_RADIUS_PADDING),
+        p=numpy.inf, output_type='ndarray'
+    )
+
+    pair_event_indices = good_event_indices[pair_array['i']]
+    pair_vertex_indices = pair_array['j'].astype(int)
+
+    pair_x_diffs_metres = numpy.absolute(
+        event_x_coords_metres[pair_event_indices] -
+        vertex_x_coords_metres[pair_vertex_indices]
+    )
+    pair_y_diffs_metres = numpy.absolute(
+        event_y_coords_metres[pair_event_indices] -
+        vertex_y_coords_metres[pair_vertex_indices]
+    )
+
+    good_pair_indices = numpy.where(numpy.logical_and(
+        pair_x_diffs_metres <= max_polygon_attempt_distance_metres,
+        pair_y_diffs_metres <= max_polygon_attempt_distance_metres
+    ))[0]
+
+    pair_event_indices = pair_event_indices[good_pair_indices]
+    pair_vertex_indices = pair_vertex_indices[good_pair_indices]
+    pair_x_diffs_metres = pair_x_diffs_metres[good_pair_indices]
+    pair_y_diffs_metres = pair_y_diffs_metres[good_pair_indices]
+
+    # Find candidate (event, storm) pairs.  A storm cannot contain the event
+    # unless its bounding box does, so other storms are not tested.
+    num_storms = len(unique_secondary_id_strings)
+    event_storm_keys = numpy.unique(
+        pair_event_indices * num_storms +
+        vertex_to_storm_indices[pair_vertex_indices]
+    )
+    es_event_indices = event_storm_keys // num_storms
+    es_storm_indices = event_storm_keys % num_storms
+
+    good_flags = numpy.logical_and(
+        numpy.logical_and(
+            storm_x_limits_metres[es_storm_indices, 0] <=
+            event_x_coords_metres[es_event_indices],
+            storm_x_limits_metres[es_storm_indices, 1] >=
+            event_x_coords_metres[es_event_indices]
+        ),
+        numpy.logical_and(
+            storm_y_limits_metres[es_storm_indices, 0] <=
+            event_y_coords_metres[es_event_indices],
+            storm_y_limits_metres[es_storm_indices, 1] >=
+            event_y_coords_metres[es_event_indices]
+        )
+    )
+
+    es_event_indices = es_event_indices[good_flags]
+    es_storm_indices = es_storm_indices[good_flags]
+
+    # Try placing each event inside storm.  Each candidate storm is tested once
+    # against all of its candidate events.
+    es_in_polygon_flags = numpy.full(len(es_event_indices), False, dtype=bool)
+
+    sort_indices = numpy.argsort(es_storm_indices, kind='stable')
+    unique_storm_indices, first_sorted_indices = numpy.unique(
+        es_storm_indices[sort_indices], return_index=True
+    )
+    es_indices_by_storm = numpy.split(sort_indices, first_sorted_indices[1:])
+
+    for this_storm_index, these_es_indices in zip(
+            unique_storm_indices, es_indices_by_storm):
+        these_event_indices = es_event_indices[these_es_indices]
+
+        es_in_polygon_flags[these_es_indices] = (
+            polygons.points_in_or_on_polygon(
+                polygon_object=_get_storm_polygon(
+                    vertex_index_dict=vertex_index_dict,
+                    storm_index=this_storm_index),
+                query_x_coords=event_x_coords_metres[these_event_indices],
+                query_y_coords=event_y_coords_metres[these_event_indices]
+            )
+        )
+
+    # If an event is inside multiple storms, the first (in order of secondary
+    # ID) wins.
+    inside_storm_indices = numpy.full(num_events, LARGE_INTEGER, dtype=int)
+    numpy.minimum.at(
+        inside_storm_indices, es_event_indices[es_in_polygon_flags],
+        es_storm_indices[es_in_polygon_flags]
+    )
+    inside_event_indices = numpy.where(
+        inside_storm_indices != LARGE_INTEGER
+    )[0]
+
+    for k in inside_event_indices:
+        nearest_secondary_id_strings[k] = unique_secondary_id_strings[
+            inside_storm_indices[k]
+        ]
+
+    linkage_distances_metres[inside_event_indices] = 0.
+
+    # Try placing other events near storm.  The nearest storm to each such
+    # event has already failed the polygon test, because
+    # `max_link_distance_metres` <= `max_polygon_attempt_distance_metres`.
+    near_pair_indices = numpy.where(numpy.logical_and(
+        numpy.logical_and(
+            pair_x_diffs_metres <= max_link_distance_metres,
+            pair_y_diffs_metres <= max_link_distance_metres
+        ),
+        inside_storm_indices[pair_event_indices] == LARGE_INTEGER
+    ))[0]
+
+    pair_event_indices = pair_event_indices[near_pair_indices]
+    pair_vertex_indices = pair_vertex_indices[near_pair_indices]
+    pair_distances_metres = numpy.sqrt(
+        pair_x_diffs_metres[near_pair_indices] ** 2 +
+        pair_y_diffs_metres[near_pair_indices] ** 2
+    )
+
+    good_pair_indices = numpy.where(
+        pair_distances_metres <= max_link_distance_metres
+    )[0]
+    pair_event_indices = pair_event_indices[good_pair_indices]
+    pair_vertex_indices = pair_vertex_indices[good_pair_indices]
+    pair_distances_metres = pair_distances_metres[good_pair_indices]
+
+    # For each event, find the nearest vertex.  Ties are broken by vertex
+    # index, as in the brute-force method.
+    sort_indices = numpy.lexsort((
+        pair_vertex_indices, pair_distances_metres, pair_event_indices
+    ))
+    near_event_indices, first_sorted_indices = numpy.unique(
+        pair_event_indices[sort_indices], return_index=True
+    )
+    nearest_pair_indices = sort_indices[first_sorted_indices]
+
+    nearest_storm_indices = vertex_to_storm_indices[
+        pair_vertex_indices[nearest_pair_indices]
+    ]
+
+    for k, this_storm_index in zip(near_event_indices, nearest_storm_indices):
+        nearest_secondary_id_strings[k] = unique_secondary_id_strings[
+            this_storm_index]
+
+    linkage_distances_metres[near_event_indices] = pair_distances_metres[
+        nearest_pair_indices]
+
+    return nearest_secondary_id_strings, linkage_distances_metres
+
+
 def _finish_tornado_linkage(
         storm_object_table, tornado_to_storm_table, tornado_row,
         nearest_secondary_id_string, nearest_storm_time_unix_sec,
@@ -1303,7 +1643,8 @@ def _find_nearest_storms(
     return event_table
 
 
-def _find_predecessors(storm_to_events_table, target_row):
+def _find_predecessors(storm_to_events_table, target_row,
+                       graph_index_dict=None):
     """Finds simple and merging predecessors of a storm object.
 
     A "simple predecessor" of storm object S is connected to S by no more than
@@ -1315,23 +1656,34 @@ def _find_predecessors(storm_to_events_table, target_row):
     :param storm_to_events_table: pandas DataFrame created by
         `_reverse_wind_linkages` or `_reverse_tornado_linkages`.
     :param target_row: Same.
+    :param graph_index_dict: Dictionary created by
+        `temporal_tracking.create_graph_index` for `storm_to_events_table`.  If
+        None, will be created on the fly.
     :return: simple_predecessor_rows: 1-D numpy array with row indices of simple
         predecessors.
     :return: merging_predecessor_rows: 1-D numpy array with row indices of
         merging predecessors.
     """
 
-    predecessor_rows_one_change = temporal_tracking.find_predecessors(
-        storm_object_table=storm_to_events_table, target_row=target_row,
+    if graph_index_dict is None:
+        graph_index_dict = temporal_tracking.create_graph_index(
+            storm_to_events_table)
+
+    predecessor_rows_one_change = temporal_tracking.find_predecessors_many(
+        storm_object_table=storm_to_events_table,
+        target_rows=numpy.array([target_row], dtype=int),
         num_seconds_back=LARGE_INTEGER, max_num_sec_id_changes=1,
         change_type_string=temporal_tracking.ANY_CHANGE_STRING,
-        return_all_on_path=True)
+        return_all_on_path=True, graph_index_dict=graph_index_dict
+    )[0]
 
-    predecessor_rows_zero_mergers = temporal_tracking.find_predecessors(
-        storm_object_table=storm_to_events_table, target_row=target_row,
+    predecessor_rows_zero_mergers = temporal_tracking.find_predecessors_many(
+        storm_object_table=storm_to_events_table,
+        target_rows=numpy.array([target_row], dtype=int),
         num_seconds_back=LARGE_INTEGER, max_num_sec_id_changes=0,
         change_type_string=temporal_tracking.MERGER_STRING,
-        return_all_on_path=True)
+        return_all_on_path=True, graph_index_dict=graph_index_dict
+    )[0]
 
     predecessor_rows_one_change = predecessor_rows_one_change.tolist()
     predecessor_rows_zero_mergers = predecessor_rows_zero_mergers.tolist()
@@ -1339,11 +1691,13 @@ def _find_predecessors(storm_to_events_table, target_row):
         set(predecessor_rows_one_change) & set(predecessor_rows_zero_mergers)
     )
 
-    predecessor_rows_one_merger = temporal_tracking.find_predecessors(
-        storm_object_table=storm_to_events_table, target_row=target_row,
+    predecessor_rows_one_merger = temporal_tracking.find_predecessors_many(
+        storm_object_table=storm_to_events_table,
+        target_rows=numpy.array([target_row], dtype=int),
         num_seconds_back=LARGE_INTEGER, max_num_sec_id_changes=1,
         change_type_string=temporal_tracking.MERGER_STRING,
-        return_all_on_path=True)
+        return_all_on_path=True, graph_index_dict=graph_index_dict
+    )[0]
 
     predecessor_rows_one_merger = predecessor_rows_one_merger.tolist()
     merging_predecessor_rows = (
@@ -1429,6 +1783,9 @@ def _reverse_wind_linkages(storm_object_table, wind_to_storm_table):
         storm_to_winds_table[RELATIVE_EVENT_TIMES_COLUMN].values[i] = []
         storm_to_winds_table[MAIN_OBJECT_FLAGS_COLUMN].values[i] = []
 
+    graph_index_dict = temporal_tracking.create_graph_index(
+        storm_to_winds_table)
+
     num_wind_obs = len(wind_to_storm_table.index)
 
     for k in range(num_wind_obs):
@@ -1461,7 +1818,8 @@ def _reverse_wind_linkages(storm_object_table, wind_to_storm_table):
 
         these_simple_pred_rows, these_merging_pred_rows = _find_predecessors(
             storm_to_events_table=storm_to_winds_table,
-            target_row=this_main_object_row)
+            target_row=this_main_object_row,
+            graph_index_dict=graph_index_dict)
 
         storm_to_winds_table[MERGING_PRED_FLAG_COLUMN].values[
             these_merging_pred_rows
@@ -1608,6 +1966,9 @@ def _reverse_tornado_linkages(storm_object_table, tornado_to_storm_table):
         storm_to_tornadoes_table[RELATIVE_EVENT_TIMES_COLUMN].values[i] = []
         storm_to_tornadoes_table[MAIN_OBJECT_FLAGS_COLUMN].values[i] = []
 
+    graph_index_dict = temporal_tracking.create_graph_index(
+        storm_to_tornadoes_table)
+
     num_tornadoes = len(tornado_to_storm_table.index)
 
     for k in range(num_tornadoes):
@@ -1640,7 +2001,8 @@ def _reverse_tornado_linkages(storm_object_table, tornado_to_storm_table):
 
         these_simple_pred_rows, these_merging_pred_rows = _find_predecessors(
             storm_to_events_table=storm_to_tornadoes_table,
-            target_row=this_main_object_row)
+            target_row=this_main_object_row,
+            graph_index_dict=graph_index_dict)
 
         storm_to_tornadoes_table[MERGING_PRED_FLAG_COLUMN].values[
             these_merging_pred_rows
@@ -2274,6 +2636,8 @@ def _share_linkages_with_predecessors(early_storm_to_events_table,
     num_early_storm_objects = len(early_storm_to_events_table.index)
     num_late_storm_objects = len(late_storm_to_events_table.index)
     num_storm_objects = num_early_storm_objects + num_late_storm_objects
+    graph_index_dict = temporal_tracking.create_graph_index(
+        storm_to_events_table)
 
     for i in range(num_early_storm_objects, num_storm_objects):
         these_main_object_flags = storm_to_events_table[
@@ -2283,10 +2647,12 @@ def _share_linkages_with_predecessors(early_storm_to_events_table,
         if len(these_event_indices) == 0:
             continue
 
-        these_rows = temporal_tracking.find_predecessors(
-            storm_object_table=storm_to_events_table, target_row=i,
+        these_rows = temporal_tracking.find_predecessors_many(
+            storm_object_table=storm_to_events_table,
+            target_rows=numpy.array([i], dtype=int),
             num_seconds_back=LARGE_INTEGER, max_num_sec_id_changes=0,
-            return_all_on_path=True)
+            return_all_on_path=True, graph_index_dict=graph_index_dict
+        )[0]
 
         storm_to_events_table[MERGING_PRED_FLAG_COLUMN].values[these_rows] = (
             numpy.logical_or(
@@ -2297,7 +2663,8 @@ def _share_linkages_with_predecessors(early_storm_to_events_table,
         )
 
         these_simple_pred_rows = _find_predecessors(
-            storm_to_events_table=storm_to_events_table, target_row=i
+            storm_to_events_table=storm_to_events_table, target_row=i,
+            graph_index_dict=graph_index_dict
         )[0]
 
         these_event_times_unix_sec = (
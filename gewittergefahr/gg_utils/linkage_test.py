@@ -344,6 +344,8 @@ LINK_DISTANCES_1TIME_METRES = numpy.array([
     numpy.nan, THIS_LONG_DISTANCE_METRES, numpy.nan, THIS_SHORT_DISTANCE_METRES
 ])
 
+RANDOM_NUM_EVENTS = 1000
+
 # The following constants are used to test _find_nearest_storms.
 INTERP_TIME_INTERVAL_SEC = 1
 
@@ -968,7 +970,10 @@ class LinkageTests(unittest.TestCase):
         ))
 
     def test_find_nearest_storms_one_time(self):
-        """Ensures correct output from _find_nearest_storms_one_time."""
+        """Ensures correct output from _find_nearest_storms_one_time.
+
+        In this case, using spatial index.
+        """
 
         these_nearest_id_strings, these_link_distances_metres = (
             linkage._find_nearest_storms_one_time(
@@ -986,6 +991,72 @@ class LinkageTests(unittest.TestCase):
             equal_nan=True, atol=TOLERANCE
         ))
 
+    def test_find_nearest_storms_one_time_no_index(self):
+        """Ensures correct output from _find_nearest_storms_one_time.
+
+        In this case, not using spatial index.
+        """
+
+        these_nearest_id_strings, these_link_distances_metres = (
+            linkage._find_nearest_storms_one_time(
+                interp_vertex_table=INTERP_VERTEX_TABLE,
+                event_x_coords_metres=WIND_X_COORDS_1TIME_METRES,
+                event_y_coords_metres=WIND_Y_COORDS_1TIME_METRES,
+                max_link_distance_metres=MAX_LINK_DISTANCE_METRES,
+                use_spatial_index=False)
+        )
+
+        self.assertTrue(
+            these_nearest_id_strings == NEAREST_SEC_ID_STRINGS_1TIME
+        )
+        self.assertTrue(numpy.allclose(
+            these_link_distances_metres, LINK_DISTANCES_1TIME_METRES,
+            equal_nan=True, atol=TOLERANCE
+        ))
+
+    def test_find_nearest_storms_one_time_random(self):
+        """Ensures correct output from _find_nearest_storms_one_time.
+
+        In this case, events are random and results with the spatial index are
+        compared to results without.
+        """
+
+        these_event_x_metres = numpy.concatenate((
+            numpy.random.uniform(low=220., high=300., size=RANDOM_NUM_EVENTS),
+            numpy.random.choice(THESE_CENTROID_X_COORDS, size=RANDOM_NUM_EVENTS)
+            + numpy.random.uniform(low=-0.5, high=0.5, size=RANDOM_NUM_EVENTS)
+        ))
+
+        these_event_y_metres = numpy.concatenate((
+            numpy.random.uniform(low=30., high=80., size=RANDOM_NUM_EVENTS),
+            numpy.random.choice(THESE_CENTROID_Y_COORDS, size=RANDOM_NUM_EVENTS)
+            + numpy.random.uniform(low=-0.5, high=0.5, size=RANDOM_NUM_EVENTS)
+        ))
+
+        these_indexed_id_strings, these_indexed_distances_metres = (
+            linkage._find_nearest_storms_one_time(
+                interp_vertex_table=INTERP_VERTEX_TABLE,
+                event_x_coords_metres=these_event_x_metres,
+                event_y_coords_metres=these_event_y_metres,
+                max_link_distance_metres=MAX_LINK_DISTANCE_METRES,
+                use_spatial_index=True)
+        )
+
+        these_brute_id_strings, these_brute_distances_metres = (
+            linkage._find_nearest_storms_one_time(
+                interp_vertex_table=INTERP_VERTEX_TABLE,
+                event_x_coords_metres=these_event_x_metres,
+                event_y_coords_metres=these_event_y_metres,
+                max_link_distance_metres=MAX_LINK_DISTANCE_METRES,
+                use_spatial_index=False)
+        )
+
+        self.assertTrue(these_indexed_id_strings == these_brute_id_strings)
+        self.assertTrue(numpy.array_equal(
+            these_indexed_distances_metres, these_brute_distances_metres,
+            equal_nan=True
+        ))
+
     def test_find_nearest_storms(self):
         """Ensures correct output from _find_nearest_storms."""
 
@@ -17,6 +17,7 @@ Lagerquist, R., McGovern, A., and Smith, T., 2017: Machine learning for real-
 import copy
 import pickle
 import os.path
+import multiprocessing
 import numpy
 import pandas
 from matplotlib import pyplot
@@ -67,6 +68,11 @@ NUM_EXAMPLES_BY_BIN_KEY = 'num_examples_by_forecast_bin'
 DOWNSAMPLING_DICT_KEY = 'downsampling_dict'
 EVALUATION_TABLE_KEY = 'evaluation_table'
 
+NUM_POSITIVES_BY_THRESHOLD_KEY = 'num_positives_by_threshold'
+NUM_NEGATIVES_BY_THRESHOLD_KEY = 'num_negatives_by_threshold'
+FORECAST_SUM_BY_BIN_KEY = 'forecast_sum_by_bin'
+NUM_EVENTS_BY_BIN_KEY = 'num_events_by_bin'
+
 POD_KEY = 'pod'
 POFD_KEY = 'pofd'
 SUCCESS_RATIO_KEY = 'success_ratio'
@@ -98,6 +104,7 @@ MIN_BINARIZATION_THRESHOLD = 0.
 MAX_BINARIZATION_THRESHOLD = 1. + TOLERANCE
 
 DEFAULT_NUM_RELIABILITY_BINS = 20
+DEFAULT_NUM_REPS_PER_CHUNK = 50
 DEFAULT_FORECAST_PRECISION = 1e-4
 THRESHOLD_ARG_FOR_UNIQUE_FORECASTS = 'unique_forecasts'
 
@@ -210,6 +217,156 @@ def _split_forecast_probs_into_bins(forecast_probabilities, num_bins):
     )[0]
 
 
+def _get_counts_by_threshold(
+        forecast_probabilities, observed_labels, binarization_thresholds):
+    """Counts positive and negative examples at or above each threshold.
+
+    This method sorts examples into threshold bins once, rather than binarizing
+    all forecasts at every threshold, so it runs in O(N log T + T) rather than
+    O(NT).
+
+    N = number of forecasts
+    T = number of binarization thresholds
+
+    :param forecast_probabilities: length-N numpy array of forecast
+        probabilities.
+    :param observed_labels: length-N numpy array of observed labels (1 for
+        "yes", 0 for "no").
+    :param binarization_thresholds: length-T numpy array of thresholds, sorted
+        in ascending order.
+    :return: num_positives_by_threshold: length-T numpy array, where the [k]th
+        value is the number of positive examples with forecast probability >=
+        binarization_thresholds[k].  This is the number of true positives.
+    :return: num_negatives_by_threshold: Same but for negative examples.  This
+        is the number of false positives.
+    """
+
+    num_thresholds = len(binarization_thresholds)
+
+    bin_index_by_example = numpy.searchsorted(
+        binarization_thresholds, forecast_probabilities, side='right'
+    ) - 1
+
+    positive_flags = observed_labels == 1
+    bin_indices_positive = bin_index_by_example[positive_flags]
+    bin_indices_negative = bin_index_by_example[numpy.invert(positive_flags)]
+
+    num_positives_by_bin = numpy.bincount(
+        bin_indices_positive[bin_indices_positive >= 0],
+        minlength=num_thresholds)
+    num_negatives_by_bin = numpy.bincount(
+        bin_indices_negative[bin_indices_negative >= 0],
+        minlength=num_thresholds)
+
+    return (
+        numpy.cumsum(num_positives_by_bin[::-1])[::-1],
+        numpy.cumsum(num_negatives_by_bin[::-1])[::-1]
+    )
+
+
+def _counts_to_contingency_table(
+        num_true_positives, num_false_positives, num_positive_examples,
+        num_negative_examples):
+    """Converts counts to contingency table.
+
+    :param num_true_positives: Number of true positives.
+    :param num_false_positives: Number of false positives.
+    :param num_positive_examples: Number of positive examples (observed label
+        = 1).
+    :param num_negative_examples: Number of negative examples (observed label
+        = 0).
+    :return: contingency_table_as_dict: See doc for `get_contingency_table`.
+    """
+
+    return {
+        NUM_TRUE_POSITIVES_KEY: int(num_true_positives),
+        NUM_FALSE_POSITIVES_KEY: int(num_false_positives),
+        NUM_FALSE_NEGATIVES_KEY:
+            int(num_positive_examples - num_true_positives),
+        NUM_TRUE_NEGATIVES_KEY:
+            int(num_negative_examples - num_false_positives)
+    }
+
+
+def _get_scores_by_threshold(
+        num_positives_by_threshold, num_negatives_by_threshold,
+        num_positive_examples, num_negative_examples):
+    """Computes POD, POFD, and success ratio at each threshold.
+
+    T = number of binarization thresholds
+
+    :param num_positives_by_threshold: length-T numpy array created by
+        `_get_counts_by_threshold`.
+    :param num_negatives_by_threshold: Same.
+    :param num_positive_examples: Total number of positive examples.
+    :param num_negative_examples: Total number of negative examples.
+    :return: pod_by_threshold: length-T numpy array of POD values.
+    :return: pofd_by_threshold: length-T numpy array of POFD values.
+    :return: success_ratio_by_threshold: length-T numpy array of success
+        ratios.
+    """
+
+    num_yes_forecasts_by_threshold = (
+        num_positives_by_threshold + num_negatives_by_threshold
+    )
+
+    num_thresholds = len(num_positives_by_threshold)
+    pod_by_threshold = numpy.full(num_thresholds, numpy.nan)
+    pofd_by_threshold = numpy.full(num_thresholds, numpy.nan)
+    success_ratio_by_threshold = numpy.full(num_thresholds, numpy.nan)
+
+    if num_positive_examples > 0:
+        pod_by_threshold = (
+            num_positives_by_threshold.astype(float) / num_positive_examples
+        )
+
+    if num_negative_examples > 0:
+        pofd_by_threshold = (
+            num_negatives_by_threshold.astype(float) / num_negative_examples
+        )
+
+    real_indices = numpy.where(num_yes_forecasts_by_threshold > 0)[0]
+    success_ratio_by_threshold[real_indices] = (
+        num_positives_by_threshold[real_indices].astype(float) /
+        num_yes_forecasts_by_threshold[real_indices]
+    )
+
+    return pod_by_threshold, pofd_by_threshold, success_ratio_by_threshold
+
+
+def _get_reliability_points(
+        num_examples_by_bin, forecast_sum_by_bin, num_events_by_bin):
+    """Computes points in reliability curve from per-bin sums.
+
+    B = number of forecast bins
+
+    :param num_examples_by_bin: length-B numpy array with number of examples in
+        each bin.
+    :param forecast_sum_by_bin: length-B numpy array with sum of forecast
+        probabilities in each bin.
+    :param num_events_by_bin: length-B numpy array with number of positive
+        examples in each bin.
+    :return: mean_forecast_prob_by_bin: See doc for
+        `get_points_in_reliability_curve`.
+    :return: mean_observed_label_by_bin: Same.
+    """
+
+    num_forecast_bins = len(num_examples_by_bin)
+    mean_forecast_prob_by_bin = numpy.full(num_forecast_bins, numpy.nan)
+    mean_observed_label_by_bin = numpy.full(num_forecast_bins, numpy.nan)
+
+    real_indices = numpy.where(num_examples_by_bin > 0)[0]
+    mean_forecast_prob_by_bin[real_indices] = (
+        forecast_sum_by_bin[real_indices] / num_examples_by_bin[real_indices]
+    )
+    mean_observed_label_by_bin[real_indices] = (
+        num_events_by_bin[real_indices].astype(float) /
+        num_examples_by_bin[real_indices]
+    )
+
+    return mean_forecast_prob_by_bin, mean_observed_label_by_bin
+
+
 def get_binarization_thresholds(
         threshold_arg, forecast_probabilities=None,
         forecast_precision=DEFAULT_FORECAST_PRECISION):
@@ -340,23 +497,33 @@ def find_best_binarization_threshold(
 
         raise ValueError(error_string)
 
+    _check_forecast_probs_and_observed_labels(
+        forecast_probabilities, observed_labels)
+
     possible_thresholds = get_binarization_thresholds(
         threshold_arg=threshold_arg,
         forecast_probabilities=forecast_probabilities,
         forecast_precision=forecast_precision)
 
+    num_positives_by_threshold, num_negatives_by_threshold = (
+        _get_counts_by_threshold(
+            forecast_probabilities=forecast_probabilities,
+            observed_labels=observed_labels,
+            binarization_thresholds=possible_thresholds)
+    )
+
+    num_positive_examples = numpy.sum(observed_labels == 1)
+    num_negative_examples = len(observed_labels) - num_positive_examples
+
     num_thresholds = len(possible_thresholds)
     criterion_values = numpy.full(num_thresholds, numpy.nan)
 
     for i in range(num_thresholds):
-        these_forecast_labels = binarize_forecast_probs(
-            forecast_probabilities=forecast_probabilities,
-            binarization_threshold=possible_thresholds[i]
-        )
-
-        this_contingency_table_as_dict = get_contingency_table(
-            forecast_labels=these_forecast_labels,
-            observed_labels=observed_labels)
+        this_contingency_table_as_dict = _counts_to_contingency_table(
+            num_true_positives=num_positives_by_threshold[i],
+            num_false_positives=num_negatives_by_threshold[i],
+            num_positive_examples=num_positive_examples,
+            num_negative_examples=num_negative_examples)
 
         criterion_values[i] = criterion_function(this_contingency_table_as_dict)
 
@@ -740,19 +907,21 @@ def get_points_in_roc_curve(
         forecast_probabilities=forecast_probabilities,
         forecast_precision=forecast_precision)
 
-    num_thresholds = len(binarization_thresholds)
-    pofd_by_threshold = numpy.full(num_thresholds, numpy.nan)
-    pod_by_threshold = numpy.full(num_thresholds, numpy.nan)
+    num_positives_by_threshold, num_negatives_by_threshold = (
+        _get_counts_by_threshold(
+            forecast_probabilities=forecast_probabilities,
+            observed_labels=observed_labels,
+            binarization_thresholds=binarization_thresholds)
+    )
 
-    for i in range(num_thresholds):
-        these_forecast_labels = binarize_forecast_probs(
-            forecast_probabilities, binarization_thresholds[i]
-        )
-        this_contingency_table_as_dict = get_contingency_table(
-            these_forecast_labels, observed_labels)
+    num_positive_examples = numpy.sum(observed_labels == 1)
 
-        pofd_by_threshold[i] = get_pofd(this_contingency_table_as_dict)
-        pod_by_threshold[i] = get_pod(this_contingency_table_as_dict)
+    pod_by_threshold, pofd_by_threshold = _get_scores_by_threshold(
+        num_positives_by_threshold=num_positives_by_threshold,
+        num_negatives_by_threshold=num_negatives_by_threshold,
+        num_positive_examples=num_positive_examples,
+        num_negative_examples=len(observed_labels) - num_positive_examples
+    )[:2]
 
     return pofd_by_threshold, pod_by_threshold
 
@@ -843,20 +1012,22 @@ def get_points_in_performance_diagram(
         forecast_probabilities=forecast_probabilities,
         forecast_precision=forecast_precision)
 
-    num_thresholds = len(binarization_thresholds)
-    success_ratio_by_threshold = numpy.full(num_thresholds, numpy.nan)
-    pod_by_threshold = numpy.full(num_thresholds, numpy.nan)
+    num_positives_by_threshold, num_negatives_by_threshold = (
+        _get_counts_by_threshold(
+            forecast_probabilities=forecast_probabilities,
+            observed_labels=observed_labels,
+            binarization_thresholds=binarization_thresholds)
+    )
 
-    for i in range(num_thresholds):
-        these_forecast_labels = binarize_forecast_probs(
-            forecast_probabilities, binarization_thresholds[i]
-        )
-        this_contingency_table_as_dict = get_contingency_table(
-            these_forecast_labels, observed_labels)
+    num_positive_examples = numpy.sum(observed_labels == 1)
 
-        success_ratio_by_threshold[i] = get_success_ratio(
-            this_contingency_table_as_dict)
-        pod_by_threshold[i] = get_pod(this_contingency_table_as_dict)
+    pod_by_threshold, _, success_ratio_by_threshold = (
+        _get_scores_by_threshold(
+            num_positives_by_threshold=num_positives_by_threshold,
+            num_negatives_by_threshold=num_negatives_by_threshold,
+            num_positive_examples=num_positive_examples,
+            num_negative_examples=len(observed_labels) - num_positive_examples)
+    )
 
     return success_ratio_by_threshold, pod_by_threshold
 
@@ -1058,20 +1229,21 @@ def get_points_in_reliability_curve(
     bin_index_by_example = _split_forecast_probs_into_bins(
         forecast_probabilities, num_forecast_bins)
 
-    mean_forecast_prob_by_bin = numpy.full(num_forecast_bins, numpy.nan)
-    mean_observed_label_by_bin = numpy.full(num_forecast_bins, numpy.nan)
-    num_examples_by_bin = numpy.full(num_forecast_bins, -1, dtype=int)
-
-    for i in range(num_forecast_bins):
-        these_example_indices = numpy.where(bin_index_by_example == i)[0]
-
-        num_examples_by_bin[i] = len(these_example_indices)
-        mean_forecast_prob_by_bin[i] = numpy.mean(
-            forecast_probabilities[these_example_indices]
-        )
-        mean_observed_label_by_bin[i] = numpy.mean(
-            observed_labels[these_example_indices].astype(float)
-        )
+    num_examples_by_bin = numpy.bincount(
+        bin_index_by_example, minlength=num_forecast_bins)
+    forecast_sum_by_bin = numpy.bincount(
+        bin_index_by_example, weights=forecast_probabilities,
+        minlength=num_forecast_bins)
+    num_events_by_bin = numpy.bincount(
+        bin_index_by_example[observed_labels == 1],
+        minlength=num_forecast_bins)
+
+    mean_forecast_prob_by_bin, mean_observed_label_by_bin = (
+        _get_reliability_points(
+            num_examples_by_bin=num_examples_by_bin,
+            forecast_sum_by_bin=forecast_sum_by_bin,
+            num_events_by_bin=num_events_by_bin)
+    )
 
     return (mean_forecast_prob_by_bin, mean_observed_label_by_bin,
             num_examples_by_bin)
@@ -1263,65 +1435,165 @@ def get_no_resolution_line_for_reliability_curve(mean_observed_label):
     return x_values, y_values
 
 
-def run_evaluation(
-        forecast_probabilities, observed_labels, best_prob_threshold,
-        all_prob_thresholds, climatology):
-    """Runs full evaluation (for binary-classification problem).
+def init_evaluation_counts(
+        best_prob_threshold, all_prob_thresholds,
+        num_reliability_bins=DEFAULT_NUM_RELIABILITY_BINS):
+    """Initializes counts for streaming evaluation.
 
-    The input args `forecast_probabilities` and `observed_labels` may contain
-    all data or just one bootstrap replicate.
+    The counts are sufficient statistics for `run_evaluation`: per-threshold
+    counts of positive and negative examples (for the ROC curve and
+    performance diagram), the contingency table at the best threshold, and
+    per-bin sums for the reliability curve.  Because they are additive, data
+    may be passed to `update_evaluation_counts` in any number of chunks.
 
-    E = number of examples
     T = number of probability thresholds
     B = number of bins for reliability curve
 
+    :param best_prob_threshold: See doc for `run_evaluation`.
+    :param all_prob_thresholds: Same.
+    :param num_reliability_bins: Number of bins for reliability curve.
+    :return: evaluation_counts_dict: Dictionary with the following keys.
+    evaluation_counts_dict['best_prob_threshold']: Best probability threshold.
+    evaluation_counts_dict['all_prob_thresholds']: length-T numpy array of
+        probability thresholds (padded by `get_binarization_thresholds`).
+    evaluation_counts_dict['num_true_positives']: Number of true positives at
+        best threshold.
+    evaluation_counts_dict['num_false_positives']: Same but for false
+        positives.
+    evaluation_counts_dict['num_false_negatives']: Same but for false
+        negatives.
+    evaluation_counts_dict['num_true_negatives']: Same but for true negatives.
+    evaluation_counts_dict['num_positives_by_threshold']: length-T numpy array
+        with number of true positives at each threshold.
+    evaluation_counts_dict['num_negatives_by_threshold']: length-T numpy array
+        with number of false positives at each threshold.
+    evaluation_counts_dict['num_examples_by_forecast_bin']: length-B numpy
+        array with number of examples in each reliability bin.
+    evaluation_counts_dict['forecast_sum_by_bin']: length-B numpy array with sum
+        of forecast probabilities in each reliability bin.
+    evaluation_counts_dict['num_events_by_bin']: length-B numpy array with
+        number of positive examples in each reliability bin.
+    """
+
+    error_checking.assert_is_geq(
+        best_prob_threshold, MIN_BINARIZATION_THRESHOLD)
+    error_checking.assert_is_leq(
+        best_prob_threshold, MAX_BINARIZATION_THRESHOLD)
+    error_checking.assert_is_integer(num_reliability_bins)
+    error_checking.assert_is_geq(num_reliability_bins, 2)
+
+    all_prob_thresholds = get_binarization_thresholds(
+        threshold_arg=all_prob_thresholds)
+    num_thresholds = len(all_prob_thresholds)
+
+    return {
+        BEST_THRESHOLD_KEY: best_prob_threshold,
+        ALL_THRESHOLDS_KEY: all_prob_thresholds,
+        NUM_TRUE_POSITIVES_KEY: 0,
+        NUM_FALSE_POSITIVES_KEY: 0,
+        NUM_FALSE_NEGATIVES_KEY: 0,
+        NUM_TRUE_NEGATIVES_KEY: 0,
+        NUM_POSITIVES_BY_THRESHOLD_KEY:
+            numpy.full(num_thresholds, 0, dtype=int),
+        NUM_NEGATIVES_BY_THRESHOLD_KEY:
+            numpy.full(num_thresholds, 0, dtype=int),
+        NUM_EXAMPLES_BY_BIN_KEY:
+            numpy.full(num_reliability_bins, 0, dtype=int),
+        FORECAST_SUM_BY_BIN_KEY: numpy.full(num_reliability_bins, 0.),
+        NUM_EVENTS_BY_BIN_KEY: numpy.full(num_reliability_bins, 0, dtype=int)
+    }
+
+
+def update_evaluation_counts(
+        evaluation_counts_dict, forecast_probabilities, observed_labels):
+    """Adds one chunk of data to counts for streaming evaluation.
+
+    Each example is touched a constant number of times, regardless of the
+    number of thresholds or reliability bins.
+
+    :param evaluation_counts_dict: Dictionary created by
+        `init_evaluation_counts` (possibly already updated with other chunks).
     :param forecast_probabilities: length-E numpy array of forecast probs.
     :param observed_labels: length-E numpy array of observed labels (all 0 or
         1).
-    :param best_prob_threshold: Best probability threshold (will be used to
-        binarize forecasts).
-    :param all_prob_thresholds: length-T numpy array of probability thresholds
-        to use for ROC curve and performance diagram.
-    :param climatology: Climatology (frequency of positive class in the entire
-        dataset).
-    :return: evaluation_table: pandas DataFrame with one row and the following
-        columns.  All values are scalar unless noted otherwise.
-    evaluation_table['num_true_positives']
-    evaluation_table['num_false_positives']
-    evaluation_table['num_false_negatives']
-    evaluation_table['num_true_negatives']
-    evaluation_table['probability_of_detection']
-    evaluation_table['probability_of_false_detection']
-    evaluation_table['success_ratio']
-    evaluation_table['frequency_of_correct_nulls']
-    evaluation_table['accuracy']
-    evaluation_table['critical_success_index']
-    evaluation_table['frequency_bias']
-    evaluation_table['peirce_score']
-    evaluation_table['heidke_score']
-    evaluation_table['pod_by_threshold']: length-T numpy array of POD values
-        (probability of detection).
-    evaluation_table['pofd_by_threshold']: length-T numpy array of POFD values
-        (probability of false detection).
-    evaluation_table['area_under_roc_curve']
-    evaluation_table['success_ratio_by_threshold']: length-T numpy array of
-        success ratios.
-    evaluation_table['area_under_perf_diagram']
-    evaluation_table['mean_forecast_by_bin']: length-B numpy array of mean
-        forecast probabilities.
-    evaluation_table['event_frequency_by_bin']: length-B numpy array of event
-        frequencies.
-    evaluation_table['reliability']
-    evaluation_table['resolution']
-    evaluation_table['brier_skill_score']
+    :return: evaluation_counts_dict: Same as input but with updated counts.
     """
 
-    forecast_labels = binarize_forecast_probs(
+    _check_forecast_probs_and_observed_labels(
+        forecast_probabilities, observed_labels)
+
+    num_positives_by_threshold, num_negatives_by_threshold = (
+        _get_counts_by_threshold(
+            forecast_probabilities=forecast_probabilities,
+            observed_labels=observed_labels,
+            binarization_thresholds=evaluation_counts_dict[ALL_THRESHOLDS_KEY]
+        )
+    )
+
+    evaluation_counts_dict[NUM_POSITIVES_BY_THRESHOLD_KEY] += (
+        num_positives_by_threshold
+    )
+    evaluation_counts_dict[NUM_NEGATIVES_BY_THRESHOLD_KEY] += (
+        num_negatives_by_threshold
+    )
+
+    positive_flags = observed_labels == 1
+    yes_forecast_flags = (
+        forecast_probabilities >= evaluation_counts_dict[BEST_THRESHOLD_KEY]
+    )
+
+    num_true_positives = numpy.sum(
+        numpy.logical_and(yes_forecast_flags, positive_flags)
+    )
+    num_false_positives = numpy.sum(yes_forecast_flags) - num_true_positives
+    num_positive_examples = numpy.sum(positive_flags)
+
+    this_contingency_table_as_dict = _counts_to_contingency_table(
+        num_true_positives=num_true_positives,
+        num_false_positives=num_false_positives,
+        num_positive_examples=num_positive_examples,
+        num_negative_examples=len(observed_labels) - num_positive_examples)
+
+    for this_key in this_contingency_table_as_dict:
+        evaluation_counts_dict[this_key] += (
+            this_contingency_table_as_dict[this_key]
+        )
+
+    num_reliability_bins = len(evaluation_counts_dict[NUM_EXAMPLES_BY_BIN_KEY])
+    bin_index_by_example = _split_forecast_probs_into_bins(
         forecast_probabilities=forecast_probabilities,
-        binarization_threshold=best_prob_threshold)
+        num_bins=num_reliability_bins)
+
+    evaluation_counts_dict[NUM_EXAMPLES_BY_BIN_KEY] += numpy.bincount(
+        bin_index_by_example, minlength=num_reliability_bins)
+    evaluation_counts_dict[FORECAST_SUM_BY_BIN_KEY] += numpy.bincount(
+        bin_index_by_example, weights=forecast_probabilities,
+        minlength=num_reliability_bins)
+    evaluation_counts_dict[NUM_EVENTS_BY_BIN_KEY] += numpy.bincount(
+        bin_index_by_example[positive_flags], minlength=num_reliability_bins)
+
+    return evaluation_counts_dict
+
 
-    contingency_table_as_dict = get_contingency_table(
-        forecast_labels=forecast_labels, observed_labels=observed_labels)
+def run_evaluation_from_counts(evaluation_counts_dict, climatology):
+    """Runs full evaluation from counts (for binary-classification problem).
+
+    This method does not touch individual examples, so it runs in O(T + B)
+    time, where T = number of probability thresholds and B = number of bins
+    for reliability curve.
+
+    :param evaluation_counts_dict: Dictionary created by
+        `init_evaluation_counts` and `update_evaluation_counts`.
+    :param climatology: See doc for `run_evaluation`.
+    :return: evaluation_table: Same.
+    """
+
+    contingency_table_as_dict = dict([
+        (k, evaluation_counts_dict[k]) for k in [
+            NUM_TRUE_POSITIVES_KEY, NUM_FALSE_POSITIVES_KEY,
+            NUM_FALSE_NEGATIVES_KEY, NUM_TRUE_NEGATIVES_KEY
+        ]
+    ])
 
     evaluation_dict = copy.deepcopy(contingency_table_as_dict)
 
@@ -1363,34 +1635,42 @@ def run_evaluation(
         EVENT_FREQ_BY_BIN_KEY: nested_array
     })
 
-    pofd_by_threshold, pod_by_threshold = get_points_in_roc_curve(
-        forecast_probabilities=forecast_probabilities,
-        observed_labels=observed_labels,
-        threshold_arg=all_prob_thresholds)
+    num_positive_examples = (
+        contingency_table_as_dict[NUM_TRUE_POSITIVES_KEY] +
+        contingency_table_as_dict[NUM_FALSE_NEGATIVES_KEY]
+    )
+    num_negative_examples = (
+        contingency_table_as_dict[NUM_FALSE_POSITIVES_KEY] +
+        contingency_table_as_dict[NUM_TRUE_NEGATIVES_KEY]
+    )
+
+    pod_by_threshold, pofd_by_threshold, success_ratio_by_threshold = (
+        _get_scores_by_threshold(
+            num_positives_by_threshold=
+            evaluation_counts_dict[NUM_POSITIVES_BY_THRESHOLD_KEY],
+            num_negatives_by_threshold=
+            evaluation_counts_dict[NUM_NEGATIVES_BY_THRESHOLD_KEY],
+            num_positive_examples=num_positive_examples,
+            num_negative_examples=num_negative_examples)
+    )
 
     evaluation_table[POFD_BY_THRESHOLD_KEY].values[0] = pofd_by_threshold
     evaluation_table[POD_BY_THRESHOLD_KEY].values[0] = pod_by_threshold
+    evaluation_table[SR_BY_THRESHOLD_KEY].values[0] = success_ratio_by_threshold
 
     auc = get_area_under_roc_curve(
         pofd_by_threshold=pofd_by_threshold, pod_by_threshold=pod_by_threshold)
 
-    success_ratio_by_threshold = get_points_in_performance_diagram(
-        forecast_probabilities=forecast_probabilities,
-        observed_labels=observed_labels,
-        threshold_arg=all_prob_thresholds
-    )[0]
-
-    evaluation_table[SR_BY_THRESHOLD_KEY].values[0] = success_ratio_by_threshold
-
     aupd = get_area_under_perf_diagram(
         success_ratio_by_threshold=success_ratio_by_threshold,
         pod_by_threshold=pod_by_threshold)
 
-    mean_forecast_by_bin, event_frequency_by_bin, num_examples_by_bin = (
-        get_points_in_reliability_curve(
-            forecast_probabilities=forecast_probabilities,
-            observed_labels=observed_labels,
-            num_forecast_bins=DEFAULT_NUM_RELIABILITY_BINS)
+    num_examples_by_bin = evaluation_counts_dict[NUM_EXAMPLES_BY_BIN_KEY]
+
+    mean_forecast_by_bin, event_frequency_by_bin = _get_reliability_points(
+        num_examples_by_bin=num_examples_by_bin,
+        forecast_sum_by_bin=evaluation_counts_dict[FORECAST_SUM_BY_BIN_KEY],
+        num_events_by_bin=evaluation_counts_dict[NUM_EVENTS_BY_BIN_KEY]
     )
 
     evaluation_table[MEAN_FORECAST_BY_BIN_KEY].values[0] = mean_forecast_by_bin
@@ -1410,6 +1690,595 @@ def run_evaluation(
     })
 
 
+def run_evaluation(
+        forecast_probabilities, observed_labels, best_prob_threshold,
+        all_prob_thresholds, climatology):
+    """Runs full evaluation (for binary-classification problem).
+
+    The input args `forecast_probabilities` and `observed_labels` may contain
+    all data or just one bootstrap replicate.  For data that do not fit in
+    memory, call `init_evaluation_counts`, then `update_evaluation_counts` for
+    each chunk, then `run_evaluation_from_counts`.
+
+    E = number of examples
+    T = number of probability thresholds
+    B = number of bins for reliability curve
+
+    :param forecast_probabilities: length-E numpy array of forecast probs.
+    :param observed_labels: length-E numpy array of observed labels (all 0 or
+        1).
+    :param best_prob_threshold: Best probability threshold (will be used to
+        binarize forecasts).
+    :param all_prob_thresholds: length-T numpy array of probability thresholds
+        to use for ROC curve and performance diagram.
+    :param climatology: Climatology (frequency of positive class in the entire
+        dataset).
+    :return: evaluation_table: pandas DataFrame with one row and the following
+        columns.  All values are scalar unless noted otherwise.
+    evaluation_table['num_true_positives']
+    evaluation_table['num_false_positives']
+    evaluation_table['num_false_negatives']
+    evaluation_table['num_true_negatives']
+    evaluation_table['probability_of_detection']
+    evaluation_table['probability_of_false_detection']
+    evaluation_table['success_ratio']
+    evaluation_table['frequency_of_correct_nulls']
+    evaluation_table['accuracy']
+    evaluation_table['critical_success_index']
+    evaluation_table['frequency_bias']
+    evaluation_table['peirce_score']
+    evaluation_table['heidke_score']
+    evaluation_table['pod_by_threshold']: length-T numpy array of POD values
+        (probability of detection).
+    evaluation_table['pofd_by_threshold']: length-T numpy array of POFD values
+        (probability of false detection).
+    evaluation_table['area_under_roc_curve']
+    evaluation_table['success_ratio_by_threshold']: length-T numpy array of
+        success ratios.
+    evaluation_table['area_under_perf_diagram']
+    evaluation_table['mean_forecast_by_bin']: length-B numpy array of mean
+        forecast probabilities.
+    evaluation_table['event_frequency_by_bin']: length-B numpy array of event
+        frequencies.
+    evaluation_table['reliability']
+    evaluation_table['resolution']
+    evaluation_table['brier_skill_score']
+    """
+
+    evaluation_counts_dict = init_evaluation_counts(
+        best_prob_threshold=best_prob_threshold,
+        all_prob_thresholds=all_prob_thresholds,
+        num_reliability_bins=DEFAULT_NUM_RELIABILITY_BINS)
+
+    evaluation_counts_dict = update_evaluation_counts(
+        evaluation_counts_dict=evaluation_counts_dict,
+        forecast_probabilities=forecast_probabilities,
+        observed_labels=observed_labels)
+
+    return run_evaluation_from_counts(
+        evaluation_counts_dict=evaluation_counts_dict, climatology=climatology)
+
+
+def _get_bootstrap_cells(
+        forecast_probabilities, observed_labels, best_prob_threshold,
+        all_prob_thresholds, num_reliability_bins):
+    """Groups examples into cells for batched bootstrapping.
+
+    Examples in the same cell have the same observed label, fall in the same
+    threshold bin and reliability bin, and are on the same side of the best
+    threshold.  Thus, for all scores except mean forecast probability in each
+    reliability bin, examples in the same cell are interchangeable.  For mean
+    forecast probability, each example is represented by the mean of its cell.
+
+    E = number of examples
+    C = number of cells
+
+    :param forecast_probabilities: length-E numpy array of forecast probs.
+    :param observed_labels: length-E numpy array of observed labels.
+    :param best_prob_threshold: See doc for `run_evaluation`.
+    :param all_prob_thresholds: Same, but already padded by
+        `get_binarization_thresholds`.
+    :param num_reliability_bins: Number of bins for reliability curve.
+    :return: threshold_bin_by_cell: length-C numpy array of threshold-bin
+        indices, sorted in ascending order.
+    :return: reliability_bin_by_cell: length-C numpy array of reliability-bin
+        indices.
+    :return: yes_forecast_flag_by_cell: length-C numpy array of Boolean flags,
+        indicating which cells are at or above the best threshold.
+    :return: label_by_cell: length-C numpy array of observed labels.
+    :return: num_examples_by_cell: length-C numpy array of example counts.
+    :return: mean_forecast_by_cell: length-C numpy array of mean forecast
+        probabilities.
+    :return: cell_index_by_example: length-E numpy array of cell indices.
+    """
+
+    threshold_bin_by_example = numpy.searchsorted(
+        all_prob_thresholds, forecast_probabilities, side='right'
+    ) - 1
+    reliability_bin_by_example = _split_forecast_probs_into_bins(
+        forecast_probabilities=forecast_probabilities,
+        num_bins=num_reliability_bins)
+    yes_forecast_flag_by_example = (
+        forecast_probabilities >= best_prob_threshold
+    ).astype(int)
+
+    cell_id_by_example = (
+        threshold_bin_by_example.astype(numpy.int64) * num_reliability_bins +
+        reliability_bin_by_example
+    )
+    cell_id_by_example = (
+        (cell_id_by_example * 2 + yes_forecast_flag_by_example) * 2 +
+        observed_labels
+    )
+
+    unique_cell_ids, cell_index_by_example, num_examples_by_cell = (
+        numpy.unique(
+            cell_id_by_example, return_inverse=True, return_counts=True)
+    )
+
+    mean_forecast_by_cell = (
+        numpy.bincount(cell_index_by_example, weights=forecast_probabilities) /
+        num_examples_by_cell
+    )
+
+    label_by_cell = (unique_cell_ids % 2).astype(int)
+    yes_forecast_flag_by_cell = (unique_cell_ids // 2) % 2 == 1
+    reliability_bin_by_cell = (
+        (unique_cell_ids // 4) % num_reliability_bins
+    ).astype(int)
+    threshold_bin_by_cell = (
+        unique_cell_ids // (4 * num_reliability_bins)
+    ).astype(int)
+
+    return (threshold_bin_by_cell, reliability_bin_by_cell,
+            yes_forecast_flag_by_cell, label_by_cell, num_examples_by_cell,
+            mean_forecast_by_cell, cell_index_by_example)
+
+
+def _sum_over_cells(count_matrix, bin_by_cell, num_bins):
+    """Sums counts over all cells in each bin, for each replicate.
+
+    R = number of replicates
+    C = number of cells
+    K = number of bins
+
+    :param count_matrix: R-by-C numpy array of counts.
+    :param bin_by_cell: length-C numpy array of bin indices, sorted in
+        ascending order.
+    :param num_bins: Number of bins.
+    :return: count_by_bin_matrix: R-by-K numpy array of counts.
+    """
+
+    count_by_bin_matrix = numpy.full(
+        (count_matrix.shape[0], num_bins), 0, dtype=count_matrix.dtype)
+    if count_matrix.shape[1] == 0:
+        return count_by_bin_matrix
+
+    unique_bins, first_cell_indices = numpy.unique(
+        bin_by_cell, return_index=True)
+    count_by_bin_matrix[:, unique_bins] = numpy.add.reduceat(
+        count_matrix, first_cell_indices, axis=1)
+
+    return count_by_bin_matrix
+
+
+def _divide_or_nan(numerators, denominators):
+    """Divides element-wise, returning NaN wherever denominator is zero.
+
+    :param numerators: numpy array.
+    :param denominators: numpy array (same shape, or shape that can be
+        broadcast to that of `numerators`).
+    :return: quotients: numpy array (same shape as `numerators`).
+    """
+
+    numerators, denominators = numpy.broadcast_arrays(
+        numerators, denominators)
+
+    quotients = numpy.full(numerators.shape, numpy.nan)
+    real_flags = denominators != 0
+    quotients[real_flags] = (
+        numerators[real_flags].astype(float) / denominators[real_flags]
+    )
+
+    return quotients
+
+
+def _get_areas_for_replicates(x_matrix, y_matrix):
+    """Computes area under curve for each replicate.
+
+    Points with NaN in either coordinate are ignored, like in
+    `get_area_under_roc_curve` and `get_area_under_perf_diagram`.  Each row
+    must be sorted the same way as in those methods, because the order of
+    points with tied x-values changes the area.  With the same sort, areas
+    match those methods to within floating-point roundoff.
+
+    R = number of replicates
+    T = number of points in each curve
+
+    :param x_matrix: R-by-T numpy array of x-coordinates, sorted in the order
+        the curve is traversed (either ascending or descending x), with NaN's
+        at the end.
+    :param y_matrix: R-by-T numpy array of y-coordinates.
+    :return: areas: length-R numpy array of areas.
+    """
+
+    real_flag_matrix = numpy.invert(numpy.logical_or(
+        numpy.isnan(x_matrix), numpy.isnan(y_matrix)
+    ))
+
+    # Areas of trapezoids between consecutive real points.  The real points in
+    # each row are contiguous, since NaN's are sorted to the end.
+    segment_flag_matrix = numpy.logical_and(
+        real_flag_matrix[:, :-1], real_flag_matrix[:, 1:]
+    )
+    segment_area_matrix = numpy.where(
+        segment_flag_matrix,
+        (x_matrix[:, 1:] - x_matrix[:, :-1]) *
+        (y_matrix[:, 1:] + y_matrix[:, :-1]) / 2.,
+        0.
+    )
+
+    areas = numpy.absolute(numpy.sum(segment_area_matrix, axis=1))
+    areas[numpy.invert(numpy.any(real_flag_matrix, axis=1))] = numpy.nan
+    return areas
+
+
+def _evaluate_replicates(cell_tuple, count_matrix, num_thresholds,
+                         num_reliability_bins):
+    """Runs evaluation for replicates given as counts over cells.
+
+    R = number of replicates
+    C = number of cells
+
+    :param cell_tuple: Tuple returned by `_get_bootstrap_cells`, without the
+        last element.
+    :param count_matrix: R-by-C numpy array with number of examples drawn from
+        each cell in each replicate.
+    :param num_thresholds: Number of probability thresholds.
+    :param num_reliability_bins: Number of bins for reliability curve.
+    :return: result_dict: Dictionary where each key is a column in the table
+        returned by `run_evaluation` and each value is a length-R numpy array
+        (for scalar columns) or R-by-K numpy array (for array columns).
+    """
+
+    (threshold_bin_by_cell, reliability_bin_by_cell, yes_forecast_flag_by_cell,
+     label_by_cell, _, mean_forecast_by_cell
+    ) = cell_tuple
+
+    num_replicates = count_matrix.shape[0]
+    num_cells = count_matrix.shape[1]
+
+    # Compute counts at each threshold.
+    positive_cell_flags = label_by_cell == 1
+    negative_cell_flags = numpy.invert(positive_cell_flags)
+
+    num_positives_matrix = _sum_over_cells(
+        count_matrix=count_matrix[:, positive_cell_flags],
+        bin_by_cell=threshold_bin_by_cell[positive_cell_flags],
+        num_bins=num_thresholds)
+    num_positives_matrix = numpy.cumsum(
+        num_positives_matrix[:, ::-1], axis=1
+    )[:, ::-1]
+
+    num_negatives_matrix = _sum_over_cells(
+        count_matrix=count_matrix[:, negative_cell_flags],
+        bin_by_cell=threshold_bin_by_cell[negative_cell_flags],
+        num_bins=num_thresholds)
+    num_negatives_matrix = numpy.cumsum(
+        num_negatives_matrix[:, ::-1], axis=1
+    )[:, ::-1]
+
+    num_positive_examples = numpy.sum(
+        count_matrix[:, positive_cell_flags], axis=1)
+    num_negative_examples = numpy.sum(
+        count_matrix[:, negative_cell_flags], axis=1)
+
+    # Compute scores at best threshold.
+    num_true_positives = numpy.sum(
+        count_matrix[:, numpy.logical_and(
+            positive_cell_flags, yes_forecast_flag_by_cell
+        )],
+        axis=1
+    )
+    num_false_positives = numpy.sum(
+        count_matrix[:, numpy.logical_and(
+            negative_cell_flags, yes_forecast_flag_by_cell
+        )],
+        axis=1
+    )
+    num_false_negatives = num_positive_examples - num_true_positives
+    num_true_negatives = num_negative_examples - num_false_positives
+
+    num_examples = num_positive_examples + num_negative_examples
+    num_yes_forecasts = num_true_positives + num_false_positives
+    num_no_forecasts = num_false_negatives + num_true_negatives
+
+    pod_values = _divide_or_nan(num_true_positives, num_positive_examples)
+    pofd_values = _divide_or_nan(num_false_positives, num_negative_examples)
+
+    expected_num_correct = _divide_or_nan(
+        num_yes_forecasts * num_positive_examples +
+        num_no_forecasts * num_negative_examples,
+        num_examples
+    )
+
+    result_dict = {
+        NUM_TRUE_POSITIVES_KEY: num_true_positives,
+        NUM_FALSE_POSITIVES_KEY: num_false_positives,
+        NUM_FALSE_NEGATIVES_KEY: num_false_negatives,
+        NUM_TRUE_NEGATIVES_KEY: num_true_negatives,
+        POD_KEY: pod_values,
+        POFD_KEY: pofd_values,
+        SUCCESS_RATIO_KEY:
+            _divide_or_nan(num_true_positives, num_yes_forecasts),
+        FOCN_KEY:
+            1. - _divide_or_nan(num_false_negatives, num_no_forecasts),
+        ACCURACY_KEY: _divide_or_nan(
+            num_true_positives + num_true_negatives, num_examples
+        ),
+        CSI_KEY: _divide_or_nan(
+            num_true_positives,
+            num_true_positives + num_false_positives + num_false_negatives
+        ),
+        FREQUENCY_BIAS_KEY:
+            _divide_or_nan(num_yes_forecasts, num_positive_examples),
+        PEIRCE_SCORE_KEY: pod_values - pofd_values,
+        HEIDKE_SCORE_KEY: _divide_or_nan(
+            num_true_positives + num_true_negatives - expected_num_correct,
+            num_examples - expected_num_correct
+        )
+    }
+
+    # Compute curves and areas.
+    pod_matrix = _divide_or_nan(
+        num_positives_matrix, numpy.expand_dims(num_positive_examples, -1)
+    )
+    pofd_matrix = _divide_or_nan(
+        num_negatives_matrix, numpy.expand_dims(num_negative_examples, -1)
+    )
+    success_ratio_matrix = _divide_or_nan(
+        num_positives_matrix, num_positives_matrix + num_negatives_matrix
+    )
+
+    # Sort points the same way as `get_area_under_roc_curve` and
+    # `get_area_under_perf_diagram`, so that tied x-values are in the same
+    # order.  Each row is sorted with the same algorithm as a 1-D array.
+    row_indices = numpy.expand_dims(numpy.arange(num_replicates), -1)
+    roc_sort_index_matrix = numpy.argsort(-pofd_matrix, axis=1)
+    perf_diagram_sort_index_matrix = numpy.argsort(
+        success_ratio_matrix, axis=1)
+
+    result_dict.update({
+        POD_BY_THRESHOLD_KEY: pod_matrix,
+        POFD_BY_THRESHOLD_KEY: pofd_matrix,
+        AUC_KEY: _get_areas_for_replicates(
+            x_matrix=pofd_matrix[row_indices, roc_sort_index_matrix],
+            y_matrix=pod_matrix[row_indices, roc_sort_index_matrix]
+        ),
+        SR_BY_THRESHOLD_KEY: success_ratio_matrix,
+        AUPD_KEY: _get_areas_for_replicates(
+            x_matrix=success_ratio_matrix[
+                row_indices, perf_diagram_sort_index_matrix],
+            y_matrix=pod_matrix[row_indices, perf_diagram_sort_index_matrix]
+        )
+    })
+
+    # Compute reliability curve and Brier skill score.
+    bin_matrix = numpy.full((num_cells, num_reliability_bins), 0, dtype=int)
+    bin_matrix[numpy.arange(num_cells), reliability_bin_by_cell] = 1
+
+    num_examples_by_bin_matrix = numpy.dot(count_matrix, bin_matrix)
+    mean_forecast_by_bin_matrix = _divide_or_nan(
+        numpy.dot(count_matrix * mean_forecast_by_cell, bin_matrix),
+        num_examples_by_bin_matrix
+    )
+    event_freq_by_bin_matrix = _divide_or_nan(
+        numpy.dot(count_matrix[:, positive_cell_flags],
+                  bin_matrix[positive_cell_flags, :]),
+        num_examples_by_bin_matrix
+    )
+
+    climatologies = num_positive_examples.astype(float) / num_examples
+    climatology_matrix = numpy.expand_dims(climatologies, -1)
+
+    reliabilities = numpy.nansum(
+        num_examples_by_bin_matrix *
+        (mean_forecast_by_bin_matrix - event_freq_by_bin_matrix) ** 2,
+        axis=1
+    ) / num_examples
+    resolutions = numpy.nansum(
+        num_examples_by_bin_matrix *
+        (event_freq_by_bin_matrix - climatology_matrix) ** 2,
+        axis=1
+    ) / num_examples
+
+    uncertainties = climatologies * (1. - climatologies)
+    brier_scores = uncertainties + reliabilities - resolutions
+
+    result_dict.update({
+        MEAN_FORECAST_BY_BIN_KEY: mean_forecast_by_bin_matrix,
+        EVENT_FREQ_BY_BIN_KEY: event_freq_by_bin_matrix,
+        RELIABILITY_KEY: reliabilities,
+        RESOLUTION_KEY: resolutions,
+        BSS_KEY: 1. - brier_scores / uncertainties
+    })
+
+    return result_dict
+
+
+def _evaluate_bootstrap_chunk(argument_dict):
+    """Runs evaluation for one chunk of bootstrap replicates.
+
+    This method is a top-level function, so that it can be used by
+    `multiprocessing.Pool`.
+
+    R = number of replicates in chunk
+
+    :param argument_dict: Dictionary with the following keys.
+    argument_dict['cell_tuple']: Tuple returned by `_get_bootstrap_cells`,
+        without the last element.
+    argument_dict['num_examples_by_class']: length-2 numpy array with number of
+        examples to draw from each class (negative, then positive).
+    argument_dict['num_thresholds']: Number of probability thresholds.
+    argument_dict['num_reliability_bins']: Number of bins for reliability curve.
+    argument_dict['num_replicates']: Number of replicates (R).
+    argument_dict['random_seed']: Seed for random-number generator.
+    :return: result_dict: See doc for `_evaluate_replicates`.
+    """
+
+    label_by_cell = argument_dict['cell_tuple'][3]
+    num_examples_by_cell = argument_dict['cell_tuple'][4]
+
+    num_examples_by_class = argument_dict['num_examples_by_class']
+    num_thresholds = argument_dict['num_thresholds']
+    num_reliability_bins = argument_dict['num_reliability_bins']
+    num_replicates = argument_dict['num_replicates']
+    random_state_object = numpy.random.RandomState(
+        argument_dict['random_seed'])
+
+    # Draw replicates.  Drawing n examples with replacement from a class is the
+    # same as drawing a multinomial sample over cells in the class.
+    num_cells = len(label_by_cell)
+    count_matrix = numpy.full((num_replicates, num_cells), 0, dtype=int)
+
+    for this_label in [0, 1]:
+        these_cell_indices = numpy.where(label_by_cell == this_label)[0]
+        if len(these_cell_indices) == 0:
+            continue
+
+        these_probs = (
+            num_examples_by_cell[these_cell_indices].astype(float) /
+            numpy.sum(num_examples_by_cell[these_cell_indices])
+        )
+
+        count_matrix[:, these_cell_indices] = random_state_object.multinomial(
+            num_examples_by_class[this_label], these_probs,
+            size=num_replicates)
+
+    return _evaluate_replicates(
+        cell_tuple=argument_dict['cell_tuple'], count_matrix=count_matrix,
+        num_thresholds=num_thresholds,
+        num_reliability_bins=num_reliability_bins)
+
+
+def run_bootstrapped_evaluation(
+        forecast_probabilities, observed_labels, best_prob_threshold,
+        all_prob_thresholds, num_bootstrap_reps, num_examples_by_class=None,
+        num_reps_per_chunk=DEFAULT_NUM_REPS_PER_CHUNK, num_processes=1):
+    """Runs full evaluation for many bootstrap replicates at once.
+
+    This method is equivalent to calling `run_evaluation` once per replicate,
+    where each replicate is drawn with replacement separately from each class
+    (as in `scripts/evaluate_cnn.py`).  However, examples are grouped into
+    cells once (see `_get_bootstrap_cells`), each replicate is drawn as
+    multinomial counts over cells, and scores for all replicates are computed
+    with matrix operations.  The only approximation is in mean forecast
+    probability for each reliability bin, which uses the mean probability in
+    each cell.
+
+    E = number of examples
+    R = number of bootstrap replicates
+
+    :param forecast_probabilities: length-E numpy array of forecast probs.
+    :param observed_labels: length-E numpy array of observed labels (all 0 or
+        1).
+    :param best_prob_threshold: See doc for `run_evaluation`.
+    :param all_prob_thresholds: Same.
+    :param num_bootstrap_reps: Number of bootstrap replicates (R).
+    :param num_examples_by_class: length-2 numpy array with number of examples
+        to draw from each class (negative, then positive).  Use this for
+        downsampling.  If None, each replicate will have as many examples per
+        class as the full dataset.
+    :param num_reps_per_chunk: Number of replicates to compute at once.  Memory
+        usage is proportional to this number times the number of thresholds.
+    :param num_processes: Number of processes over which to spread chunks.
+    :return: evaluation_table: pandas DataFrame with R rows and the columns
+        listed in `run_evaluation`.
+    """
+
+    _check_forecast_probs_and_observed_labels(
+        forecast_probabilities, observed_labels)
+    error_checking.assert_is_integer(num_bootstrap_reps)
+    error_checking.assert_is_greater(num_bootstrap_reps, 0)
+    error_checking.assert_is_integer(num_reps_per_chunk)
+    error_checking.assert_is_greater(num_reps_per_chunk, 0)
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
+
+    if num_examples_by_class is None:
+        num_examples_by_class = numpy.array([
+            numpy.sum(observed_labels == 0), numpy.sum(observed_labels == 1)
+        ], dtype=int)
+
+    error_checking.assert_is_integer_numpy_array(num_examples_by_class)
+    error_checking.assert_is_numpy_array(
+        num_examples_by_class, exact_dimensions=numpy.array([2], dtype=int)
+    )
+    error_checking.assert_is_geq_numpy_array(num_examples_by_class, 0)
+
+    all_prob_thresholds = get_binarization_thresholds(
+        threshold_arg=all_prob_thresholds)
+
+    cell_tuple = _get_bootstrap_cells(
+        forecast_probabilities=forecast_probabilities,
+        observed_labels=observed_labels,
+        best_prob_threshold=best_prob_threshold,
+        all_prob_thresholds=all_prob_thresholds,
+        num_reliability_bins=DEFAULT_NUM_RELIABILITY_BINS
+    )[:-1]
+
+    print((
+        'Grouped {0:d} examples into {1:d} cells for bootstrapping.'
+    ).format(
+        len(observed_labels), len(cell_tuple[0])
+    ))
+
+    first_rep_indices = numpy.arange(
+        0, num_bootstrap_reps, num_reps_per_chunk, dtype=int)
+    num_reps_by_chunk = numpy.minimum(
+        num_reps_per_chunk, num_bootstrap_reps - first_rep_indices)
+    random_seeds = numpy.random.randint(
+        0, high=numpy.iinfo(numpy.int32).max, size=len(first_rep_indices))
+
+    list_of_argument_dicts = [{
+        'cell_tuple': cell_tuple,
+        'num_examples_by_class': num_examples_by_class,
+        'num_thresholds': len(all_prob_thresholds),
+        'num_reliability_bins': DEFAULT_NUM_RELIABILITY_BINS,
+        'num_replicates': num_reps_by_chunk[i],
+        'random_seed': random_seeds[i]
+    } for i in range(len(first_rep_indices))]
+
+    if num_processes == 1:
+        list_of_result_dicts = [
+            _evaluate_bootstrap_chunk(d) for d in list_of_argument_dicts
+        ]
+    else:
+        worker_pool = multiprocessing.Pool(num_processes)
+
+        try:
+            list_of_result_dicts = worker_pool.map(
+                _evaluate_bootstrap_chunk, list_of_argument_dicts)
+        finally:
+            worker_pool.terminate()
+            worker_pool.join()
+
+    evaluation_dict = {}
+
+    for this_key in EVALUATION_TABLE_COLUMNS:
+        this_matrix = numpy.concatenate(
+            [d[this_key] for d in list_of_result_dicts], axis=0
+        )
+
+        if len(this_matrix.shape) == 1:
+            evaluation_dict[this_key] = this_matrix
+        else:
+            evaluation_dict[this_key] = [this_row for this_row in this_matrix]
+
+    evaluation_table = pandas.DataFrame.from_dict(evaluation_dict)
+    return evaluation_table[EVALUATION_TABLE_COLUMNS]
+
+
 def find_file_from_prediction_file(
         input_prediction_file_name, output_dir_name,
         raise_error_if_missing=True):
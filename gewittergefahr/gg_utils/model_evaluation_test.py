@@ -116,6 +116,51 @@ SUCCESS_RATIO_BY_THRESHOLD = numpy.array([
     0.5, 0.5, 5. / 9, 0.625, 5. / 7, 0.833333, 1, 1, 1, 1, numpy.nan
 ])
 
+# The following constants are used to test _get_counts_by_threshold and
+# update_evaluation_counts.
+NUM_POSITIVES_BY_THRESHOLD = numpy.array(
+    [5, 5, 5, 5, 5, 5, 5, 4, 3, 2, 0], dtype=int
+)
+NUM_NEGATIVES_BY_THRESHOLD = numpy.array(
+    [5, 5, 4, 3, 2, 1, 0, 0, 0, 0, 0], dtype=int
+)
+BEST_PROB_THRESHOLD = 0.5
+
+# The following constants are used to test _get_areas_for_replicates.
+POFD_MATRIX_FOR_AREAS = numpy.vstack((
+    POFD_BY_THRESHOLD, numpy.full(len(POFD_BY_THRESHOLD), numpy.nan)
+))
+POD_MATRIX_FOR_AREAS = numpy.vstack((
+    POD_BY_THRESHOLD, numpy.full(len(POD_BY_THRESHOLD), numpy.nan)
+))
+AREAS_UNDER_ROC_CURVE = numpy.array([1, numpy.nan])
+
+# The following constants are used to test _evaluate_replicates.  The extra
+# threshold at 0.9515 puts examples with different probabilities in different
+# cells, so that mean forecast probability in each reliability bin is exact.
+THRESHOLDS_FOR_REPLICATES = numpy.array([
+    0, 0.04, 0.05, 0.08, 0.11, 0.18, 0.27, 0.29, 0.8, 0.95, 0.9515,
+    model_eval.MAX_BINARIZATION_THRESHOLD
+])
+EXAMPLE_INDICES_BY_REPLICATE = [
+    numpy.linspace(0, 9, num=10, dtype=int),
+    numpy.array([0, 0, 1, 3, 4, 5, 5, 6, 8, 9], dtype=int),
+    numpy.array([2, 2, 2, 4, 1, 7, 7, 7, 7, 5], dtype=int),
+    numpy.array([3, 3, 3, 3, 3, 9, 9, 9, 9, 9], dtype=int)
+]
+
+# The following constants are used to test _sum_over_cells.
+COUNT_MATRIX_FOR_CELLS = numpy.array([
+    [1, 2, 3, 4, 5],
+    [0, 1, 0, 1, 0]
+], dtype=int)
+BIN_BY_CELL = numpy.array([0, 0, 2, 3, 3], dtype=int)
+NUM_BINS_FOR_CELLS = 5
+COUNT_BY_BIN_MATRIX = numpy.array([
+    [3, 0, 3, 9, 0],
+    [1, 0, 0, 1, 0]
+], dtype=int)
+
 # The following constants are used to test get_sr_pod_grid and
 # get_pofd_pod_grid.
 POD_GRID_SPACING = 0.5
@@ -585,6 +630,131 @@ class ModelEvaluationTests(unittest.TestCase):
             these_pod, POD_BY_THRESHOLD, atol=TOLERANCE
         ))
 
+    def test_get_counts_by_threshold(self):
+        """Ensures correct output from _get_counts_by_threshold."""
+
+        these_num_positives, these_num_negatives = (
+            model_eval._get_counts_by_threshold(
+                forecast_probabilities=FORECAST_PROBABILITIES,
+                observed_labels=OBSERVED_LABELS,
+                binarization_thresholds=ROC_AND_PERFORMANCE_THRESHOLDS)
+        )
+
+        self.assertTrue(numpy.array_equal(
+            these_num_positives, NUM_POSITIVES_BY_THRESHOLD
+        ))
+        self.assertTrue(numpy.array_equal(
+            these_num_negatives, NUM_NEGATIVES_BY_THRESHOLD
+        ))
+
+    def test_update_evaluation_counts_in_chunks(self):
+        """Ensures correct output from update_evaluation_counts.
+
+        In this case, data are passed in two chunks.
+        """
+
+        this_counts_dict = model_eval.init_evaluation_counts(
+            best_prob_threshold=BEST_PROB_THRESHOLD,
+            all_prob_thresholds=ROC_AND_PERFORMANCE_THRESHOLDS,
+            num_reliability_bins=NUM_FORECAST_BINS)
+
+        for these_indices in [numpy.arange(0, 3), numpy.arange(3, 10)]:
+            this_counts_dict = model_eval.update_evaluation_counts(
+                evaluation_counts_dict=this_counts_dict,
+                forecast_probabilities=FORECAST_PROBABILITIES[these_indices],
+                observed_labels=OBSERVED_LABELS[these_indices])
+
+        for this_key in CONTINGENCY_TABLE_THRESHOLD_HALF:
+            self.assertTrue(
+                this_counts_dict[this_key] ==
+                CONTINGENCY_TABLE_THRESHOLD_HALF[this_key]
+            )
+
+        self.assertTrue(numpy.array_equal(
+            this_counts_dict[model_eval.NUM_POSITIVES_BY_THRESHOLD_KEY],
+            NUM_POSITIVES_BY_THRESHOLD
+        ))
+        self.assertTrue(numpy.array_equal(
+            this_counts_dict[model_eval.NUM_NEGATIVES_BY_THRESHOLD_KEY],
+            NUM_NEGATIVES_BY_THRESHOLD
+        ))
+        self.assertTrue(numpy.array_equal(
+            this_counts_dict[model_eval.NUM_EXAMPLES_BY_BIN_KEY],
+            NUM_EXAMPLES_BY_BIN
+        ))
+
+    def test_get_areas_for_replicates(self):
+        """Ensures correct output from _get_areas_for_replicates."""
+
+        these_areas = model_eval._get_areas_for_replicates(
+            x_matrix=POFD_MATRIX_FOR_AREAS, y_matrix=POD_MATRIX_FOR_AREAS)
+
+        self.assertTrue(numpy.allclose(
+            these_areas, AREAS_UNDER_ROC_CURVE, atol=TOLERANCE, equal_nan=True
+        ))
+
+    def test_evaluate_replicates(self):
+        """Ensures correct output from _evaluate_replicates.
+
+        In this case, the batched evaluation of each replicate should match
+        `run_evaluation` on the same examples, to within TOLERANCE.
+        """
+
+        this_cell_tuple = model_eval._get_bootstrap_cells(
+            forecast_probabilities=FORECAST_PROBABILITIES,
+            observed_labels=OBSERVED_LABELS,
+            best_prob_threshold=BEST_PROB_THRESHOLD,
+            all_prob_thresholds=THRESHOLDS_FOR_REPLICATES,
+            num_reliability_bins=model_eval.DEFAULT_NUM_RELIABILITY_BINS)
+
+        this_cell_index_by_example = this_cell_tuple[-1]
+        this_cell_tuple = this_cell_tuple[:-1]
+        this_num_cells = len(this_cell_tuple[0])
+
+        this_count_matrix = numpy.vstack([
+            numpy.bincount(
+                this_cell_index_by_example[these_indices],
+                minlength=this_num_cells)
+            for these_indices in EXAMPLE_INDICES_BY_REPLICATE
+        ])
+
+        this_result_dict = model_eval._evaluate_replicates(
+            cell_tuple=this_cell_tuple, count_matrix=this_count_matrix,
+            num_thresholds=len(THRESHOLDS_FOR_REPLICATES),
+            num_reliability_bins=model_eval.DEFAULT_NUM_RELIABILITY_BINS)
+
+        for i in range(len(EXAMPLE_INDICES_BY_REPLICATE)):
+            these_indices = EXAMPLE_INDICES_BY_REPLICATE[i]
+
+            this_evaluation_table = model_eval.run_evaluation(
+                forecast_probabilities=FORECAST_PROBABILITIES[these_indices],
+                observed_labels=OBSERVED_LABELS[these_indices],
+                best_prob_threshold=BEST_PROB_THRESHOLD,
+                all_prob_thresholds=THRESHOLDS_FOR_REPLICATES,
+                climatology=numpy.mean(OBSERVED_LABELS[these_indices])
+            )
+
+            for this_key in model_eval.EVALUATION_TABLE_COLUMNS:
+                this_expected_value = numpy.array(
+                    this_evaluation_table[this_key].values[0], dtype=float
+                )
+
+                self.assertTrue(numpy.allclose(
+                    this_result_dict[this_key][i], this_expected_value,
+                    atol=TOLERANCE, equal_nan=True
+                ))
+
+    def test_sum_over_cells(self):
+        """Ensures correct output from _sum_over_cells."""
+
+        this_count_matrix = model_eval._sum_over_cells(
+            count_matrix=COUNT_MATRIX_FOR_CELLS, bin_by_cell=BIN_BY_CELL,
+            num_bins=NUM_BINS_FOR_CELLS)
+
+        self.assertTrue(numpy.array_equal(
+            this_count_matrix, COUNT_BY_BIN_MATRIX
+        ))
+
     def test_get_area_under_roc_curve_no_nan(self):
         """Ensures correct output from get_area_under_roc_curve.
 
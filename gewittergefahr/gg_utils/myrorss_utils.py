@@ -150,13 +150,14 @@ def get_echo_tops(unix_time_sec, spc_date_string, top_directory_name,
     print('Computing echo tops at the {0:d} horizontal grid points...'.format(
         num_horiz_points_to_consider))
 
-    for i in range(num_horiz_points_to_consider):
-        echo_top_matrix_m_asl[
-            grid_rows_to_consider[i], grid_columns_to_consider[i]] = (
-                radar_utils.get_echo_top_single_column(
-                    reflectivities_dbz=reflectivity_matrix_dbz[:, i],
-                    heights_m_asl=grid_point_heights_m_asl,
-                    critical_reflectivity_dbz=critical_reflectivity_dbz))
+    echo_top_matrix_m_asl[grid_rows_to_consider, grid_columns_to_consider] = (
+        radar_utils.get_echo_tops_3d(
+            reflectivity_matrix_dbz=numpy.expand_dims(
+                reflectivity_matrix_dbz, axis=1),
+            heights_m_asl=grid_point_heights_m_asl,
+            critical_reflectivity_dbz=critical_reflectivity_dbz
+        )[0, :]
+    )
 
     return (numpy.flipud(echo_top_matrix_m_asl), grid_point_latitudes_deg[::-1],
             grid_point_longitudes_deg, metadata_dict)
@@ -10,6 +10,7 @@ In general, x- and y- coordinates may be in one of three formats:
 import numpy
 import cv2
 import shapely.geometry
+import shapely.vectorized
 from gewittergefahr.gg_utils import grids
 from gewittergefahr.gg_utils import projections
 from gewittergefahr.gg_utils import error_checking
@@ -481,6 +482,47 @@ def _vertices_from_grid_points_to_edges_complex_direction(
     return new_rows, new_columns
 
 
+def _get_complement_of_polygon(polygon_object):
+    """Returns complement of polygon within (padded) bounding box.
+
+    The complement is built directly from the polygon's rings, without overlay
+    operations, so its inner boundary is exactly the polygon's boundary.
+
+    :param polygon_object: `shapely.geometry.Polygon` object.
+    :return: complement_object: `shapely.geometry.MultiPolygon` object.  The
+        first polygon is the padded bounding box, with the original exterior as
+        a hole.  Each other polygon is one hole of the original polygon.
+    """
+
+    min_x_coord, min_y_coord, max_x_coord, max_y_coord = polygon_object.bounds
+    padding = max([max_x_coord - min_x_coord, max_y_coord - min_y_coord, 1.])
+
+    min_x_coord -= padding
+    max_x_coord += padding
+    min_y_coord -= padding
+    max_y_coord += padding
+
+    box_coords_as_list = [
+        (min_x_coord, min_y_coord), (max_x_coord, min_y_coord),
+        (max_x_coord, max_y_coord), (min_x_coord, max_y_coord),
+        (min_x_coord, min_y_coord)
+    ]
+
+    outer_polygon_object = shapely.geometry.Polygon(
+        shell=box_coords_as_list,
+        holes=(list(polygon_object.exterior.coords),)
+    )
+
+    hole_polygon_objects = [
+        shapely.geometry.Polygon(shell=list(this_interior.coords))
+        for this_interior in polygon_object.interiors
+    ]
+
+    return shapely.geometry.MultiPolygon(
+        [outer_polygon_object] + hole_polygon_objects
+    )
+
+
 def project_latlng_to_xy(
         polygon_object_latlng, projection_object=None, false_easting_metres=0,
         false_northing_metres=0.):
@@ -858,12 +900,10 @@ def simple_polygon_to_grid_points(vertex_row_indices, vertex_column_indices):
     grid_point_column_vector = numpy.reshape(
         grid_point_column_matrix, grid_point_column_matrix.size)
 
-    num_grid_points = len(grid_point_row_vector)
-    in_polygon_flags = numpy.full(num_grid_points, False, dtype=bool)
-    for i in range(num_grid_points):
-        in_polygon_flags[i] = point_in_or_on_polygon(
-            polygon_object, query_x_coordinate=grid_point_column_vector[i],
-            query_y_coordinate=grid_point_row_vector[i])
+    in_polygon_flags = points_in_or_on_polygon(
+        polygon_object=polygon_object,
+        query_x_coords=grid_point_column_vector.astype(float),
+        query_y_coords=grid_point_row_vector.astype(float))
 
     in_polygon_indices = numpy.where(in_polygon_flags)[0]
     return (grid_point_row_vector[in_polygon_indices],
@@ -936,6 +976,108 @@ def point_in_or_on_polygon(
     return polygon_object.touches(point_object)
 
 
+def points_in_or_on_polygon(polygon_object, query_x_coords, query_y_coords):
+    """Finds points inside/touching the polygon.
+
+    This is a vectorized version of `point_in_or_on_polygon`.  Points outside
+    the polygon's bounding box are rejected without calling shapely, and the
+    rest are tested with `shapely.vectorized`.
+
+    N = number of query points
+
+    :param polygon_object: `shapely.geometry.Polygon` object.
+    :param query_x_coords: length-N numpy array with x-coordinates of query
+        points.
+    :param query_y_coords: length-N numpy array with y-coordinates of query
+        points.
+    :return: in_polygon_flags: length-N numpy array of Boolean flags.  True
+        means that the point is inside/touching the polygon.
+    """
+
+    error_checking.assert_is_numpy_array_without_nan(query_x_coords)
+    error_checking.assert_is_numpy_array(query_x_coords, num_dimensions=1)
+
+    num_query_points = len(query_x_coords)
+    error_checking.assert_is_numpy_array_without_nan(query_y_coords)
+    error_checking.assert_is_numpy_array(
+        query_y_coords, exact_dimensions=numpy.array([num_query_points]))
+
+    in_polygon_flags = numpy.full(num_query_points, False, dtype=bool)
+    if num_query_points == 0 or polygon_object.is_empty:
+        return in_polygon_flags
+
+    min_x_coord, min_y_coord, max_x_coord, max_y_coord = polygon_object.bounds
+
+    trial_indices = numpy.where(numpy.logical_and(
+        numpy.logical_and(
+            query_x_coords >= min_x_coord, query_x_coords <= max_x_coord
+        ),
+        numpy.logical_and(
+            query_y_coords >= min_y_coord, query_y_coords <= max_y_coord
+        )
+    ))[0]
+
+    if len(trial_indices) == 0:
+        return in_polygon_flags
+
+    these_x_coords = numpy.ascontiguousarray(
+        query_x_coords[trial_indices], dtype=float)
+    these_y_coords = numpy.ascontiguousarray(
+        query_y_coords[trial_indices], dtype=float)
+
+    these_flags = shapely.vectorized.contains(
+        polygon_object, these_x_coords, these_y_coords)
+
+    # A point not inside the polygon touches it iff the point is also not
+    # inside the complement.  This is much faster than
+    # `shapely.vectorized.touches`, which does not use prepared geometry.
+    these_outside_indices = numpy.where(numpy.invert(these_flags))[0]
+    if len(these_outside_indices) > 0:
+        these_flags[these_outside_indices] = numpy.invert(
+            shapely.vectorized.contains(
+                _get_complement_of_polygon(polygon_object),
+                these_x_coords[these_outside_indices],
+                these_y_coords[these_outside_indices]
+            )
+        )
+
+    in_polygon_flags[trial_indices] = these_flags
+    return in_polygon_flags
+
+
+def points_in_or_on_polygons(polygon_objects, query_x_coords, query_y_coords):
+    """Finds points inside/touching each polygon.
+
+    N = number of query points
+    M = number of polygons
+
+    :param polygon_objects: length-M list of `shapely.geometry.Polygon`
+        objects.
+    :param query_x_coords: length-N numpy array with x-coordinates of query
+        points.
+    :param query_y_coords: length-N numpy array with y-coordinates of query
+        points.
+    :return: in_polygon_matrix: N-by-M numpy array of Boolean flags.  If
+        in_polygon_matrix[i, j] = True, the [i]th point is inside/touching the
+        [j]th polygon.
+    """
+
+    error_checking.assert_is_list(polygon_objects)
+
+    num_polygons = len(polygon_objects)
+    num_query_points = len(query_x_coords)
+    in_polygon_matrix = numpy.full(
+        (num_query_points, num_polygons), False, dtype=bool
+    )
+
+    for j in range(num_polygons):
+        in_polygon_matrix[:, j] = points_in_or_on_polygon(
+            polygon_object=polygon_objects[j], query_x_coords=query_x_coords,
+            query_y_coords=query_y_coords)
+
+    return in_polygon_matrix
+
+
 def buffer_simple_polygon(
         vertex_x_metres, vertex_y_metres, max_buffer_dist_metres,
         min_buffer_dist_metres=numpy.nan, preserve_angles=False):
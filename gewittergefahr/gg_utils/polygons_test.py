@@ -201,6 +201,22 @@ Y_IN_NESTED_BUFFER = 5.
 Y_ON_NESTED_BUFFER = 5.
 Y_OUTSIDE_NESTED_BUFFER = 5.
 
+# The following constants are used to test points_in_or_on_polygon and
+# points_in_or_on_polygons.
+QUERY_X_COORDS_METRES = numpy.array([
+    X_IN_NESTED_BUFFER, X_ON_NESTED_BUFFER, X_OUTSIDE_NESTED_BUFFER, 100., 3.,
+    4.
+])
+QUERY_Y_COORDS_METRES = numpy.array([
+    Y_IN_NESTED_BUFFER, Y_ON_NESTED_BUFFER, Y_OUTSIDE_NESTED_BUFFER, 5., 3., 3.
+])
+IN_EXCL_BUFFER_FLAGS = numpy.array([1, 1, 0, 0, 0, 0], dtype=bool)
+IN_2HOLES_FLAGS = numpy.array([0, 0, 1, 0, 0, 1], dtype=bool)
+
+IN_POLYGON_MATRIX = numpy.transpose(numpy.vstack((
+    IN_EXCL_BUFFER_FLAGS, IN_2HOLES_FLAGS
+)))
+
 
 class PolygonsTests(unittest.TestCase):
     """Each method is a unit test for polygons.py."""
@@ -667,6 +683,39 @@ class PolygonsTests(unittest.TestCase):
             query_y_coordinate=Y_IN_NESTED_BUFFER)
         self.assertTrue(this_flag)
 
+    def test_points_in_or_on_polygon(self):
+        """Ensures correct output from points_in_or_on_polygon."""
+
+        these_flags = polygons.points_in_or_on_polygon(
+            polygon_object=POLYGON_OBJECT_EXCL_BUFFER_XY_METRES,
+            query_x_coords=QUERY_X_COORDS_METRES,
+            query_y_coords=QUERY_Y_COORDS_METRES)
+        self.assertTrue(numpy.array_equal(these_flags, IN_EXCL_BUFFER_FLAGS))
+
+    def test_points_in_or_on_polygon_holes(self):
+        """Ensures correct output from points_in_or_on_polygon.
+
+        In this case, the polygon has two holes.
+        """
+
+        these_flags = polygons.points_in_or_on_polygon(
+            polygon_object=POLYGON_OBJECT_2HOLES_XY_METRES,
+            query_x_coords=QUERY_X_COORDS_METRES,
+            query_y_coords=QUERY_Y_COORDS_METRES)
+        self.assertTrue(numpy.array_equal(these_flags, IN_2HOLES_FLAGS))
+
+    def test_points_in_or_on_polygons(self):
+        """Ensures correct output from points_in_or_on_polygons."""
+
+        this_matrix = polygons.points_in_or_on_polygons(
+            polygon_objects=[
+                POLYGON_OBJECT_EXCL_BUFFER_XY_METRES,
+                POLYGON_OBJECT_2HOLES_XY_METRES
+            ],
+            query_x_coords=QUERY_X_COORDS_METRES,
+            query_y_coords=QUERY_Y_COORDS_METRES)
+        self.assertTrue(numpy.array_equal(this_matrix, IN_POLYGON_MATRIX))
+
     def test_buffer_simple_polygon_small_inclusive(self):
         """Ensures correct output from buffer_simple_polygon.
 
@@ -4,11 +4,11 @@ Radar data may come from either MYRORSS (Multi-year Reanalysis of Remotely
 Sensed Storms) or MRMS (Multi-radar Multi-sensor).
 """
 
-import copy
 import numpy
 from gewittergefahr.gg_io import myrorss_and_mrms_io
 from gewittergefahr.gg_utils import grids
 from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import error_checking
 
 MIN_CENTER_LAT_COLUMN = 'min_center_lat_deg'
 MAX_CENTER_LAT_COLUMN = 'max_center_lat_deg'
@@ -17,7 +17,7 @@ MAX_CENTER_LNG_COLUMN = 'max_center_lng_deg'
 
 
 def _convert(sparse_grid_table, field_name, num_grid_rows, num_grid_columns,
-             ignore_if_below=None):
+             ignore_if_below=None, full_matrix=None):
     """Converts data from sparse to full grid.
 
     M = number of rows in grid
@@ -33,37 +33,86 @@ def _convert(sparse_grid_table, field_name, num_grid_rows, num_grid_columns,
         all values < `ignore_if_below` -- in other words, will not put them in
         the full grid.  If `ignore_if_below is None`, this method will put all
         values in the full grid.
+    :param full_matrix: Preallocated M-by-N numpy array of floats (may be
+        float32), into which values will be written.  Any existing values will
+        be overwritten.  If None, a new float64 array will be allocated.
     :return: full_radar_matrix: M-by-N numpy array with values of `field_name`.
+        If `full_matrix` was specified, this is the same object.
     """
 
+    if full_matrix is None:
+        full_matrix = numpy.full((num_grid_rows, num_grid_columns), numpy.nan)
+    else:
+        error_checking.assert_is_real_numpy_array(full_matrix)
+        error_checking.assert_is_numpy_array(
+            full_matrix,
+            exact_dimensions=numpy.array(
+                [num_grid_rows, num_grid_columns], dtype=int
+            )
+        )
+
+        if not full_matrix.flags.c_contiguous:
+            raise ValueError('full_matrix must be C-contiguous.')
+
+        full_matrix.fill(numpy.nan)
+
+    data_values = sparse_grid_table[field_name].values
+    run_lengths = numpy.round(
+        sparse_grid_table[myrorss_and_mrms_io.NUM_GRID_CELL_COLUMN].values
+    ).astype(int)
+
+    good_flags = run_lengths > 0
     if ignore_if_below is not None:
-        these_indices = numpy.where(
-            sparse_grid_table[field_name].values >= ignore_if_below
-        )[0]
-        sparse_grid_table = sparse_grid_table.iloc[these_indices]
-
-    start_indices_tuple = (
-        sparse_grid_table[myrorss_and_mrms_io.GRID_ROW_COLUMN].values,
-        sparse_grid_table[myrorss_and_mrms_io.GRID_COLUMN_COLUMN].values
-    )
+        good_flags = numpy.logical_and(
+            good_flags, data_values >= ignore_if_below
+        )
+
+    good_indices = numpy.where(good_flags)[0]
+    if len(good_indices) == 0:
+        return full_matrix
+
+    data_values = data_values[good_indices]
+    run_lengths = run_lengths[good_indices]
+
     start_indices_flat = numpy.ravel_multi_index(
-        start_indices_tuple, (num_grid_rows, num_grid_columns)
-    )
-    end_indices_flat = (
-        start_indices_flat +
-        sparse_grid_table[myrorss_and_mrms_io.NUM_GRID_CELL_COLUMN].values - 1
+        (sparse_grid_table[myrorss_and_mrms_io.GRID_ROW_COLUMN].values[
+            good_indices],
+         sparse_grid_table[myrorss_and_mrms_io.GRID_COLUMN_COLUMN].values[
+             good_indices]),
+        (num_grid_rows, num_grid_columns)
     )
-    data_values_flat = sparse_grid_table[field_name].values
 
-    full_matrix = numpy.full(num_grid_rows * num_grid_columns, numpy.nan)
-
-    for i, j, k in zip(start_indices_flat, end_indices_flat, data_values_flat):
-        full_matrix[i:(j + 1)] = k
+    # Decode all runs at once.  For the [k]th grid cell in the [i]th run, the
+    # flat index is start_indices_flat[i] + k.
+    run_end_positions = numpy.cumsum(run_lengths)
+    indices_flat = numpy.arange(run_end_positions[-1]) + numpy.repeat(
+        start_indices_flat - run_end_positions + run_lengths, run_lengths
+    )
+    values_flat = numpy.repeat(data_values, run_lengths)
+
+    # In files written by MYRORSS and MRMS, runs are sorted and do not overlap
+    # or extend past the end of the grid.  Handling other cases is slower, but
+    # results are the same as writing runs one at a time, in order.
+    num_grid_points = num_grid_rows * num_grid_columns
+    run_end_indices_flat = start_indices_flat + run_lengths
+
+    if numpy.max(run_end_indices_flat) > num_grid_points:
+        good_indices = numpy.where(indices_flat < num_grid_points)[0]
+        indices_flat = indices_flat[good_indices]
+        values_flat = values_flat[good_indices]
+
+    if numpy.any(start_indices_flat[1:] < run_end_indices_flat[:-1]):
+        indices_flat, these_reverse_indices = numpy.unique(
+            indices_flat[::-1], return_index=True
+        )
+        values_flat = values_flat[::-1][these_reverse_indices]
 
-    return numpy.reshape(full_matrix, (num_grid_rows, num_grid_columns))
+    full_matrix.ravel()[indices_flat] = values_flat
+    return full_matrix
 
 
-def sparse_to_full_grid(sparse_grid_table, metadata_dict, ignore_if_below=None):
+def sparse_to_full_grid(sparse_grid_table, metadata_dict, ignore_if_below=None,
+                        full_matrix=None):
     """Converts data from sparse to full grid (public wrapper for _convert).
 
     M = number of rows (unique grid-point latitudes)
@@ -75,6 +124,8 @@ def sparse_to_full_grid(sparse_grid_table, metadata_dict, ignore_if_below=None):
         `myrorss_and_mrms_io.read_metadata_from_raw_file`.
     :param ignore_if_below: This method will ignore radar values <
         `ignore_if_below`.  If None, this method will consider all values.
+    :param full_matrix: Preallocated M-by-N numpy array, into which values will
+        be written.  See doc for `_convert`.
     :return: full_matrix: M-by-N numpy array of radar values.  Latitude
         decreases down each column, and longitude increases to the right along
         each row.
@@ -103,11 +154,11 @@ def sparse_to_full_grid(sparse_grid_table, metadata_dict, ignore_if_below=None):
     )
 
     full_matrix = _convert(
-        sparse_grid_table=copy.deepcopy(sparse_grid_table),
+        sparse_grid_table=sparse_grid_table,
         field_name=metadata_dict[radar_utils.FIELD_NAME_COLUMN],
         num_grid_rows=metadata_dict[radar_utils.NUM_LAT_COLUMN],
         num_grid_columns=metadata_dict[radar_utils.NUM_LNG_COLUMN],
-        ignore_if_below=ignore_if_below)
+        ignore_if_below=ignore_if_below, full_matrix=full_matrix)
 
     return (
         full_matrix, unique_grid_point_lat_deg[::-1], unique_grid_point_lng_deg
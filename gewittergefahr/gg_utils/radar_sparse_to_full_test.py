@@ -41,6 +41,22 @@ FULL_MATRIX_LESS_THAN_51_IGNORED = numpy.array([
     [65., 65., 65., 65., numpy.nan, numpy.nan]
 ])
 
+THIS_DICT = {
+    myrorss_and_mrms_io.GRID_ROW_COLUMN: numpy.array([0, 0, 3], dtype=int),
+    myrorss_and_mrms_io.GRID_COLUMN_COLUMN: numpy.array([1, 4, 4], dtype=int),
+    myrorss_and_mrms_io.NUM_GRID_CELL_COLUMN: numpy.array([5, 3, 5], dtype=int),
+    RADAR_FIELD_NAME: numpy.array([20, 40, 60], dtype=float)
+}
+
+OVERLAPPING_SPARSE_GRID_TABLE = pandas.DataFrame.from_dict(THIS_DICT)
+
+FULL_MATRIX_OVERLAPPING = numpy.array([
+    [numpy.nan, 20., 20., 20., 40., 40.],
+    [40., numpy.nan, numpy.nan, numpy.nan, numpy.nan, numpy.nan],
+    [numpy.nan, numpy.nan, numpy.nan, numpy.nan, numpy.nan, numpy.nan],
+    [numpy.nan, numpy.nan, numpy.nan, numpy.nan, 60., 60.]
+])
+
 
 class RadarSparseToFullTests(unittest.TestCase):
     """Each method is a unit test for radar_sparse_to_full.py."""
@@ -78,6 +94,47 @@ class RadarSparseToFullTests(unittest.TestCase):
             equal_nan=True
         ))
 
+    def test_convert_preallocated_float32(self):
+        """Ensures correct output from _convert.
+
+        In this case, values are written into a preallocated float32 matrix
+        that already contains garbage.
+        """
+
+        this_buffer_matrix = numpy.full(
+            (NUM_GRID_ROWS, NUM_GRID_COLUMNS), -999., dtype=numpy.float32
+        )
+
+        this_full_matrix = radar_s2f._convert(
+            sparse_grid_table=SPARSE_GRID_TABLE, field_name=RADAR_FIELD_NAME,
+            num_grid_rows=NUM_GRID_ROWS, num_grid_columns=NUM_GRID_COLUMNS,
+            ignore_if_below=None, full_matrix=this_buffer_matrix)
+
+        self.assertTrue(this_full_matrix is this_buffer_matrix)
+        self.assertTrue(this_full_matrix.dtype == numpy.float32)
+        self.assertTrue(numpy.allclose(
+            this_full_matrix, FULL_MATRIX_NO_VALUES_IGNORED, atol=TOLERANCE,
+            equal_nan=True
+        ))
+
+    def test_convert_overlapping_runs(self):
+        """Ensures correct output from _convert.
+
+        In this case, runs overlap (later runs overwrite earlier ones) and the
+        last run extends past the end of the grid (so it is truncated).
+        """
+
+        this_full_matrix = radar_s2f._convert(
+            sparse_grid_table=OVERLAPPING_SPARSE_GRID_TABLE,
+            field_name=RADAR_FIELD_NAME,
+            num_grid_rows=NUM_GRID_ROWS, num_grid_columns=NUM_GRID_COLUMNS,
+            ignore_if_below=None)
+
+        self.assertTrue(numpy.allclose(
+            this_full_matrix, FULL_MATRIX_OVERLAPPING, atol=TOLERANCE,
+            equal_nan=True
+        ))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,7 +3,10 @@
 These are usually spatial statistics based on values inside a storm object.
 """
 
+import copy
 import pickle
+import functools
+import multiprocessing
 import numpy
 import pandas
 import scipy.stats
@@ -16,6 +19,7 @@ from gewittergefahr.gg_utils import radar_sparse_to_full as radar_s2f
 from gewittergefahr.gg_utils import time_conversion
 from gewittergefahr.gg_utils import dilation
 from gewittergefahr.gg_utils import number_rounding as rounder
+from gewittergefahr.gg_utils import general_utils
 from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 
@@ -191,6 +195,199 @@ def _check_statistic_params(statistic_names, percentile_levels):
         rounder.round_to_nearest(percentile_levels, PERCENTILE_LEVEL_PRECISION))
 
 
+def _get_grid_points_by_storm(
+        storm_object_table, radar_metadata_dict_for_tracking,
+        new_grid_metadata_dict):
+    """Finds grid points in all storm objects, as one flat array.
+
+    N = number of storm objects
+    G = total number of grid points in storm objects (a grid point is counted
+        once for each storm object containing it)
+
+    :param storm_object_table: See doc for
+        `get_storm_based_radar_stats_myrorss_or_mrms`.
+    :param radar_metadata_dict_for_tracking: Same.
+    :param new_grid_metadata_dict: Dictionary with keys listed in
+        `get_grid_points_in_storm_objects`, describing radar grid for which we
+        want grid points.
+    :return: grid_rows: length-G numpy array of row indices (integers).
+    :return: grid_columns: length-G numpy array of column indices (integers).
+    :return: storm_indices: length-G numpy array of storm-object indices
+        (integers from 0...[N - 1]).
+    """
+
+    if (radar_metadata_dict_for_tracking is None or are_grids_equal(
+            radar_metadata_dict_for_tracking, new_grid_metadata_dict)):
+        rows_by_storm = storm_object_table[
+            tracking_utils.ROWS_IN_STORM_COLUMN].values.tolist()
+        columns_by_storm = storm_object_table[
+            tracking_utils.COLUMNS_IN_STORM_COLUMN].values.tolist()
+
+        num_points_by_storm = numpy.array(
+            [len(r) for r in rows_by_storm], dtype=int
+        )
+        grid_rows = numpy.concatenate(rows_by_storm)
+        grid_columns = numpy.concatenate(columns_by_storm)
+    else:
+        latitudes_by_storm_deg = storm_object_table[
+            tracking_utils.LATITUDES_IN_STORM_COLUMN].values.tolist()
+        longitudes_by_storm_deg = storm_object_table[
+            tracking_utils.LONGITUDES_IN_STORM_COLUMN].values.tolist()
+
+        num_points_by_storm = numpy.array(
+            [len(l) for l in latitudes_by_storm_deg], dtype=int
+        )
+
+        # One conversion for all storm objects, rather than one per storm.
+        grid_rows, grid_columns = radar_utils.latlng_to_rowcol(
+            latitudes_deg=numpy.concatenate(latitudes_by_storm_deg),
+            longitudes_deg=numpy.concatenate(longitudes_by_storm_deg),
+            nw_grid_point_lat_deg=new_grid_metadata_dict[
+                radar_utils.NW_GRID_POINT_LAT_COLUMN],
+            nw_grid_point_lng_deg=new_grid_metadata_dict[
+                radar_utils.NW_GRID_POINT_LNG_COLUMN],
+            lat_spacing_deg=new_grid_metadata_dict[
+                radar_utils.LAT_SPACING_COLUMN],
+            lng_spacing_deg=new_grid_metadata_dict[
+                radar_utils.LNG_SPACING_COLUMN]
+        )
+
+    num_storm_objects = len(num_points_by_storm)
+    storm_indices = numpy.repeat(
+        numpy.linspace(
+            0, num_storm_objects - 1, num=num_storm_objects, dtype=int
+        ),
+        num_points_by_storm
+    )
+
+    return grid_rows.astype(int), grid_columns.astype(int), storm_indices
+
+
+def _get_stats_one_time(
+        file_names_time_and_storm_table, radar_field_name_by_pair,
+        radar_height_by_pair_m_asl, radar_metadata_dict_for_tracking,
+        statistic_names, percentile_levels, radar_source,
+        dilate_azimuthal_shear, dilation_half_width_in_pixels,
+        dilation_percentile_level):
+    """Computes radar statistics for all storm objects at one time step.
+
+    N = number of storm objects at the given time
+    P = number of field/height pairs
+    S = number of non-percentile-based statistics
+    Q = number of percentile levels
+
+    :param file_names_time_and_storm_table: Tuple with the following items.
+    file_names_time_and_storm_table[0]: length-P list of paths to radar files
+        (None for missing files).
+    file_names_time_and_storm_table[1]: Valid time (string, used only for log
+        messages).
+    file_names_time_and_storm_table[2]: pandas DataFrame with N rows, containing
+        storm objects at the given time.
+    :param radar_field_name_by_pair: See doc for
+        `get_storm_based_radar_stats_myrorss_or_mrms`.
+    :param radar_height_by_pair_m_asl: Same.
+    :param radar_metadata_dict_for_tracking: Same.
+    :param statistic_names: Same.
+    :param percentile_levels: Same.
+    :param radar_source: Same.
+    :param dilate_azimuthal_shear: Same.
+    :param dilation_half_width_in_pixels: Same.
+    :param dilation_percentile_level: Same.
+    :return: statistic_matrix: N-by-P-by-S numpy array of statistic values.
+    :return: percentile_matrix: N-by-P-by-Q numpy array of percentiles.
+    """
+
+    radar_file_names, valid_time_string, storm_object_table = (
+        file_names_time_and_storm_table
+    )
+
+    num_storm_objects = len(storm_object_table.index)
+    num_field_height_pairs = len(radar_field_name_by_pair)
+
+    statistic_matrix = numpy.full(
+        (num_storm_objects, num_field_height_pairs, len(statistic_names)),
+        numpy.nan
+    )
+    percentile_matrix = numpy.full(
+        (num_storm_objects, num_field_height_pairs, len(percentile_levels)),
+        numpy.nan
+    )
+
+    if num_storm_objects == 0:
+        return statistic_matrix, percentile_matrix
+
+    print('Computing stats for {0:d} storm objects at {1:s}...'.format(
+        num_storm_objects, valid_time_string
+    ))
+
+    # Grid points in storm objects depend only on the radar grid, which is
+    # shared by most fields, so they are found once for each grid.
+    grid_point_dict = {}
+
+    for j in range(num_field_height_pairs):
+        if radar_file_names[j] is None:
+            continue
+
+        this_metadata_dict = myrorss_and_mrms_io.read_metadata_from_raw_file(
+            radar_file_names[j], data_source=radar_source)
+
+        this_grid_key = tuple(
+            this_metadata_dict[k] for k in GRID_METADATA_KEYS_TO_COMPARE
+        )
+
+        if this_grid_key not in grid_point_dict:
+            grid_point_dict[this_grid_key] = _get_grid_points_by_storm(
+                storm_object_table=storm_object_table,
+                radar_metadata_dict_for_tracking=
+                radar_metadata_dict_for_tracking,
+                new_grid_metadata_dict=this_metadata_dict)
+
+        these_grid_rows, these_grid_columns, these_storm_indices = (
+            grid_point_dict[this_grid_key]
+        )
+
+        this_sparse_grid_table = (
+            myrorss_and_mrms_io.read_data_from_sparse_grid_file(
+                radar_file_names[j],
+                field_name_orig=this_metadata_dict[
+                    myrorss_and_mrms_io.FIELD_NAME_COLUMN_ORIG],
+                data_source=radar_source,
+                sentinel_values=this_metadata_dict[
+                    radar_utils.SENTINEL_VALUE_COLUMN]
+            )
+        )
+
+        this_radar_matrix = radar_s2f.sparse_to_full_grid(
+            this_sparse_grid_table, this_metadata_dict
+        )[0]
+
+        if (dilate_azimuthal_shear and radar_field_name_by_pair[j] in
+                AZIMUTHAL_SHEAR_FIELD_NAMES):
+            print('Dilating azimuthal-shear field...')
+
+            this_radar_matrix = dilation.dilate_2d_matrix(
+                this_radar_matrix, percentile_level=dilation_percentile_level,
+                half_width_in_pixels=dilation_half_width_in_pixels,
+                take_largest_absolute_value=True)
+
+        this_radar_matrix[numpy.isnan(this_radar_matrix)] = 0.
+
+        these_radar_values = extract_radar_grid_points(
+            this_radar_matrix, row_indices=these_grid_rows,
+            column_indices=these_grid_columns)
+
+        statistic_matrix[:, j, :], percentile_matrix[:, j, :] = (
+            get_spatial_statistics_by_region(
+                radar_values=these_radar_values,
+                region_indices=these_storm_indices,
+                num_regions=num_storm_objects,
+                statistic_names=statistic_names,
+                percentile_levels=percentile_levels)
+        )
+
+    return statistic_matrix, percentile_matrix
+
+
 def are_grids_equal(orig_metadata_dict, new_metadata_dict):
     """Indicates whether or not two grids are equal.
 
@@ -449,6 +646,149 @@ def get_spatial_statistics(radar_field, statistic_names=DEFAULT_STATISTIC_NAMES,
     return statistic_values, percentile_values
 
 
+def get_spatial_statistics_by_region(
+        radar_values, region_indices, num_regions,
+        statistic_names=DEFAULT_STATISTIC_NAMES,
+        percentile_levels=DEFAULT_PERCENTILE_LEVELS):
+    """Computes spatial statistics for many regions at once.
+
+    This method is equivalent to calling `get_spatial_statistics` once for each
+    region (e.g., storm object), but all regions are handled together.  Values
+    are sorted by region and then by magnitude, so each statistic is a reduction
+    over one contiguous segment per region.  Percentiles are interpolated the
+    same way as in `numpy.percentile`, and skewness and kurtosis are computed
+    the same way as in `scipy.stats`.
+
+    V = number of values
+    R = number of regions
+    N = number of non-percentile-based statistics
+    P = number of percentile levels
+
+    :param radar_values: length-V numpy array of radar values.  NaN's are
+        ignored.
+    :param region_indices: length-V numpy array of region indices (integers
+        from 0...[R - 1]).  radar_values[k] belongs to region region_indices[k].
+        A grid point in several regions should be repeated once for each.
+    :param num_regions: Number of regions (R in the above discussion).
+    :param statistic_names: length-N list of non-percentile-based statistics.
+    :param percentile_levels: length-P numpy array of percentile levels.
+    :return: statistic_matrix: R-by-N numpy array of statistic values.  For
+        regions with no (non-NaN) values, everything is NaN.
+    :return: percentile_matrix: R-by-P numpy array of percentiles.
+    """
+
+    error_checking.assert_is_real_numpy_array(radar_values)
+    error_checking.assert_is_numpy_array(radar_values, num_dimensions=1)
+    num_values = len(radar_values)
+
+    error_checking.assert_is_integer(num_regions)
+    error_checking.assert_is_geq(num_regions, 0)
+    error_checking.assert_is_integer_numpy_array(region_indices)
+    error_checking.assert_is_numpy_array(
+        region_indices, exact_dimensions=numpy.array([num_values]))
+    error_checking.assert_is_geq_numpy_array(region_indices, 0)
+    error_checking.assert_is_less_than_numpy_array(region_indices, num_regions)
+
+    percentile_levels = _check_statistic_params(
+        statistic_names, percentile_levels)
+
+    num_statistics = len(statistic_names)
+    num_percentiles = len(percentile_levels)
+    statistic_matrix = numpy.full((num_regions, num_statistics), numpy.nan)
+    percentile_matrix = numpy.full((num_regions, num_percentiles), numpy.nan)
+
+    real_flags = numpy.invert(numpy.isnan(radar_values))
+    radar_values = radar_values[real_flags].astype(float)
+    region_indices = region_indices[real_flags]
+
+    if len(radar_values) == 0:
+        return statistic_matrix, percentile_matrix
+
+    sort_indices = numpy.lexsort((radar_values, region_indices))
+    radar_values = radar_values[sort_indices]
+    region_indices = region_indices[sort_indices]
+
+    num_values_by_region = numpy.bincount(
+        region_indices, minlength=num_regions
+    ).astype(float)
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        mean_by_region = numpy.bincount(
+            region_indices, weights=radar_values, minlength=num_regions
+        ) / num_values_by_region
+
+        deviations = radar_values - mean_by_region[region_indices]
+        sum_sq_deviation_by_region = numpy.bincount(
+            region_indices, weights=deviations ** 2, minlength=num_regions)
+        moment_by_region = [sum_sq_deviation_by_region / num_values_by_region]
+
+        moment_by_region += [
+            numpy.bincount(
+                region_indices, weights=deviations ** k, minlength=num_regions
+            ) / num_values_by_region
+            for k in [3, 4]
+        ]
+
+        # Same test for zero variance as in `scipy.stats.skew` and
+        # `scipy.stats.kurtosis`.
+        zero_var_flags = moment_by_region[0] <= (
+            numpy.finfo(float).resolution * mean_by_region
+        ) ** 2
+
+        for i in range(num_statistics):
+            if statistic_names[i] == AVERAGE_NAME:
+                statistic_matrix[:, i] = mean_by_region
+
+            elif statistic_names[i] == STANDARD_DEVIATION_NAME:
+                statistic_matrix[:, i] = numpy.sqrt(
+                    sum_sq_deviation_by_region / (num_values_by_region - 1)
+                )
+                statistic_matrix[num_values_by_region < 2, i] = numpy.nan
+
+            elif statistic_names[i] == SKEWNESS_NAME:
+                these_values = (
+                    moment_by_region[1] / moment_by_region[0] ** 1.5
+                )
+                these_flags = num_values_by_region > 2
+                these_values[these_flags] *= (
+                    numpy.sqrt(
+                        (num_values_by_region[these_flags] - 1) *
+                        num_values_by_region[these_flags]
+                    ) /
+                    (num_values_by_region[these_flags] - 2)
+                )
+
+                these_values[zero_var_flags] = numpy.nan
+                statistic_matrix[:, i] = these_values
+
+            elif statistic_names[i] == KURTOSIS_NAME:
+                these_values = (
+                    moment_by_region[2] / moment_by_region[0] ** 2 - 3
+                )
+                these_flags = num_values_by_region > 3
+                these_counts = num_values_by_region[these_flags]
+                these_values[these_flags] = (
+                    1. / (these_counts - 2) / (these_counts - 3) *
+                    (
+                        (these_counts ** 2 - 1) *
+                        moment_by_region[2][these_flags] /
+                        moment_by_region[0][these_flags] ** 2
+                        - 3 * (these_counts - 1) ** 2
+                    )
+                )
+
+                these_values[zero_var_flags] = numpy.nan
+                statistic_matrix[:, i] = these_values
+
+    percentile_matrix = general_utils.get_segment_percentiles(
+        sorted_values=radar_values, sorted_segment_indices=region_indices,
+        num_segments=num_regions, percentile_levels=percentile_levels)
+
+    non_empty_flags = num_values_by_region > 0
+    statistic_matrix[numpy.invert(non_empty_flags), :] = numpy.nan
+    return statistic_matrix, percentile_matrix
+
+
 def get_storm_based_radar_stats_myrorss_or_mrms(
         storm_object_table, top_radar_dir_name,
         radar_metadata_dict_for_tracking,
@@ -459,11 +799,15 @@ def get_storm_based_radar_stats_myrorss_or_mrms(
         radar_source=radar_utils.MYRORSS_SOURCE_ID,
         dilate_azimuthal_shear=False,
         dilation_half_width_in_pixels=dilation.DEFAULT_HALF_WIDTH,
-        dilation_percentile_level=DEFAULT_DILATION_PERCENTILE_LEVEL):
+        dilation_percentile_level=DEFAULT_DILATION_PERCENTILE_LEVEL,
+        num_processes=1):
     """Computes radar statistics for each storm object.
 
     In this case, radar data must be from MYRORSS or MRMS.
 
+    Each radar file is read once, and stats for all storm objects in the file
+    are computed at once by `get_spatial_statistics_by_region`.
+
     N = number of storm objects
     P = number of field/height pairs
     S = number of statistics (percentile- and non-percentile-based)
@@ -493,6 +837,8 @@ def get_storm_based_radar_stats_myrorss_or_mrms(
         `dilation.dilate_2d_matrix`.
     :param dilation_percentile_level: See documentation for
         `dilation.dilate_2d_matrix`.
+    :param num_processes: Number of processes (each process handles one time
+        step at once).
     :return: storm_object_statistic_table: pandas DataFrame with 2 + S * P
         columns.  The last S * P columns are one for each statistic-field-height
         tuple.  Names of these columns are determined by
@@ -506,6 +852,8 @@ def get_storm_based_radar_stats_myrorss_or_mrms(
     """
 
     error_checking.assert_is_boolean(dilate_azimuthal_shear)
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
     percentile_levels = _check_statistic_params(
         statistic_names, percentile_levels)
 
@@ -554,94 +902,58 @@ def get_storm_based_radar_stats_myrorss_or_mrms(
         for t in valid_times_unix_sec
     ]
 
-    for j in range(num_field_height_pairs):
-        for i in range(num_valid_times):
-            if radar_file_name_matrix[i, j] is None:
-                continue
-
-            print((
-                'Computing stats for "{0:s}" at {1:d} metres ASL and {2:s}...'
-            ).format(
-                radar_field_name_by_pair[j],
-                int(numpy.round(radar_height_by_pair_m_asl[j])),
-                valid_time_strings[i]
-            ))
+    storm_columns_to_pass = copy.deepcopy(STORM_OBJECT_TO_GRID_PTS_COLUMNS)
+    if radar_metadata_dict_for_tracking is not None:
+        storm_columns_to_pass += GRID_POINT_LATLNG_COLUMNS
 
-            this_metadata_dict = (
-                myrorss_and_mrms_io.read_metadata_from_raw_file(
-                    radar_file_name_matrix[i, j], data_source=radar_source)
-            )
+    storm_table_to_pass = storm_object_table[storm_columns_to_pass]
 
-            if radar_metadata_dict_for_tracking is None:
-                this_storm_to_grid_points_table = storm_object_table[
-                    STORM_OBJECT_TO_GRID_PTS_COLUMNS]
-            else:
-                this_storm_to_grid_points_table = (
-                    get_grid_points_in_storm_objects(
-                        storm_object_table=storm_object_table,
-                        orig_grid_metadata_dict=
-                        radar_metadata_dict_for_tracking,
-                        new_grid_metadata_dict=this_metadata_dict)
-                )
-
-            # Read data for [j]th field/height pair at [i]th time step.
-            sparse_grid_table_this_field_height = (
-                myrorss_and_mrms_io.read_data_from_sparse_grid_file(
-                    radar_file_name_matrix[i, j],
-                    field_name_orig=this_metadata_dict[
-                        myrorss_and_mrms_io.FIELD_NAME_COLUMN_ORIG],
-                    data_source=radar_source,
-                    sentinel_values=this_metadata_dict[
-                        radar_utils.SENTINEL_VALUE_COLUMN]
-                )
-            )
+    # Each worker gets only the storm objects at its own time step.
+    storm_indices_by_time = []
+    work_items = []
 
-            radar_matrix_this_field_height = radar_s2f.sparse_to_full_grid(
-                sparse_grid_table_this_field_height, this_metadata_dict
-            )[0]
-
-            if (dilate_azimuthal_shear and radar_field_name_by_pair[j] in
-                    AZIMUTHAL_SHEAR_FIELD_NAMES):
-                print('Dilating azimuthal-shear field...')
-
-                radar_matrix_this_field_height = dilation.dilate_2d_matrix(
-                    radar_matrix_this_field_height,
-                    percentile_level=dilation_percentile_level,
-                    half_width_in_pixels=dilation_half_width_in_pixels,
-                    take_largest_absolute_value=True)
-
-            radar_matrix_this_field_height[
-                numpy.isnan(radar_matrix_this_field_height)
-            ] = 0.
-
-            # Find storm objects at [i]th valid time.
-            these_storm_flags = numpy.logical_and(
-                storm_object_table[tracking_utils.VALID_TIME_COLUMN].values ==
-                valid_times_unix_sec[i],
-                storm_object_table[tracking_utils.SPC_DATE_COLUMN].values ==
-                valid_spc_date_strings[i]
-            )
+    for i in range(num_valid_times):
+        these_storm_flags = numpy.logical_and(
+            storm_object_table[tracking_utils.VALID_TIME_COLUMN].values ==
+            valid_times_unix_sec[i],
+            storm_object_table[tracking_utils.SPC_DATE_COLUMN].values ==
+            valid_spc_date_strings[i]
+        )
 
-            these_storm_indices = numpy.where(these_storm_flags)[0]
-
-            # Extract storm-based radar stats for [j]th field/height pair at
-            # [i]th time step.
-            for this_storm_index in these_storm_indices:
-                radar_values_this_storm = extract_radar_grid_points(
-                    radar_matrix_this_field_height,
-                    row_indices=this_storm_to_grid_points_table[
-                        tracking_utils.ROWS_IN_STORM_COLUMN].values[
-                            this_storm_index].astype(int),
-                    column_indices=this_storm_to_grid_points_table[
-                        tracking_utils.COLUMNS_IN_STORM_COLUMN].values[
-                            this_storm_index].astype(int)
-                )
+        these_storm_indices = numpy.where(these_storm_flags)[0]
+        storm_indices_by_time.append(these_storm_indices)
+
+        work_items.append((
+            radar_file_name_matrix[i, :].tolist(), valid_time_strings[i],
+            storm_table_to_pass.iloc[these_storm_indices]
+        ))
+
+    stats_function = functools.partial(
+        _get_stats_one_time, radar_field_name_by_pair=radar_field_name_by_pair,
+        radar_height_by_pair_m_asl=radar_height_by_pair_m_asl,
+        radar_metadata_dict_for_tracking=radar_metadata_dict_for_tracking,
+        statistic_names=statistic_names, percentile_levels=percentile_levels,
+        radar_source=radar_source,
+        dilate_azimuthal_shear=dilate_azimuthal_shear,
+        dilation_half_width_in_pixels=dilation_half_width_in_pixels,
+        dilation_percentile_level=dilation_percentile_level)
+
+    if num_processes == 1:
+        worker_pool = None
+        result_iterator = map(stats_function, work_items)
+    else:
+        worker_pool = multiprocessing.Pool(num_processes)
+        result_iterator = worker_pool.imap(
+            stats_function, work_items, chunksize=1)
 
-                (statistic_matrix[this_storm_index, j, :],
-                 percentile_matrix[this_storm_index, j, :]
-                ) = get_spatial_statistics(
-                    radar_values_this_storm, statistic_names=statistic_names,
-                    percentile_levels=percentile_levels)
+    try:
+        for i, this_result in enumerate(result_iterator):
+            statistic_matrix[storm_indices_by_time[i], ...] = this_result[0]
+            percentile_matrix[storm_indices_by_time[i], ...] = this_result[1]
+    finally:
+        if worker_pool is not None:
+            worker_pool.terminate()
+            worker_pool.join()
 
     # Create pandas DataFrame.
     storm_object_statistic_dict = {}
@@ -56,6 +56,27 @@ STATISTIC_VALUES = numpy.array([30, 24.494897, 0.170103, -1.75])
 PERCENTILE_LEVELS = numpy.array([0, 5, 25, 50, 75, 95, 100], dtype=float)
 PERCENTILE_VALUES = numpy.array([0, 4, 20, 20, 50, 58, 60], dtype=float)
 
+# The following constants are used to test get_spatial_statistics_by_region.
+# Region 0 has the same values as RADAR_FIELD_FOR_STATS (shuffled), region 1
+# has one value, and region 2 has no values.
+RADAR_VALUES_BY_REGION = numpy.array(
+    [50, 7, 20, numpy.nan, 0, 60, 20], dtype=float
+)
+REGION_INDICES = numpy.array([0, 1, 0, 0, 0, 0, 0], dtype=int)
+NUM_REGIONS = 3
+
+STATISTIC_MATRIX_BY_REGION = numpy.array([
+    STATISTIC_VALUES,
+    [7, numpy.nan, numpy.nan, numpy.nan],
+    [numpy.nan, numpy.nan, numpy.nan, numpy.nan]
+])
+
+PERCENTILE_MATRIX_BY_REGION = numpy.array([
+    PERCENTILE_VALUES,
+    numpy.full(len(PERCENTILE_LEVELS), 7.),
+    numpy.full(len(PERCENTILE_LEVELS), numpy.nan)
+])
+
 
 class RadarStatisticsTests(unittest.TestCase):
     """Each method is a unit test for radar_statistics.py."""
@@ -214,6 +235,35 @@ class RadarStatisticsTests(unittest.TestCase):
             these_percentile_values, PERCENTILE_VALUES, atol=TOLERANCE
         ))
 
+    def test_get_spatial_statistics_by_region(self):
+        """Ensures correct output from get_spatial_statistics_by_region."""
+
+        this_statistic_matrix, this_percentile_matrix = (
+            radar_stats.get_spatial_statistics_by_region(
+                radar_values=RADAR_VALUES_BY_REGION,
+                region_indices=REGION_INDICES, num_regions=NUM_REGIONS,
+                statistic_names=STATISTIC_NAMES,
+                percentile_levels=PERCENTILE_LEVELS)
+        )
+
+        self.assertTrue(numpy.allclose(
+            this_statistic_matrix, STATISTIC_MATRIX_BY_REGION, equal_nan=True,
+            atol=TOLERANCE
+        ))
+        self.assertTrue(numpy.allclose(
+            this_percentile_matrix, PERCENTILE_MATRIX_BY_REGION,
+            equal_nan=True, atol=TOLERANCE
+        ))
+
+        for i in range(NUM_REGIONS - 1):
+            these_values = RADAR_VALUES_BY_REGION[REGION_INDICES == i]
+            these_values = these_values[numpy.invert(numpy.isnan(these_values))]
+
+            self.assertTrue(numpy.array_equal(
+                this_percentile_matrix[i, :],
+                numpy.percentile(these_values, PERCENTILE_LEVELS)
+            ))
+
 
 if __name__ == '__main__':
     unittest.main()
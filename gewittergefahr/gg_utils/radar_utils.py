@@ -634,3 +634,130 @@ def get_echo_top_single_column(
         heights_m_asl[indices_for_interp], kind='linear', bounds_error=False,
         fill_value='extrapolate', assume_sorted=False)
     return interp_object(critical_reflectivity_dbz)
+
+
+def get_echo_tops_3d(
+        reflectivity_matrix_dbz, heights_m_asl, critical_reflectivity_dbz,
+        num_rows_per_chunk=None):
+    """Finds echo top at each horizontal location.
+
+    "Echo top" = maximum height with reflectivity >= critical value.
+
+    This method is a vectorized version of `get_echo_top_single_column`, with
+    the same results (up to rounding error).  For each column, it finds the
+    highest critical level and the first subcritical level above it, then
+    interpolates linearly between the two.  If there is no subcritical level
+    above, it extrapolates from the highest critical level.  NaN's are neither
+    critical nor subcritical.
+
+    H = number of heights
+    M = number of rows in grid
+    N = number of columns in grid
+
+    :param reflectivity_matrix_dbz: H-by-M-by-N numpy array of reflectivities.
+    :param heights_m_asl: length-H numpy array of heights (metres above sea
+        level).  This method assumes that heights are sorted in ascending order.
+    :param critical_reflectivity_dbz: Critical reflectivity.
+    :param num_rows_per_chunk: Number of rows to handle at once.  Use this to
+        bound memory usage on large grids.  If None, will handle all rows at
+        once.
+    :return: echo_top_matrix_m_asl: M-by-N numpy array of echo tops (metres
+        above sea level).  If there is no critical level in a column, the echo
+        top is NaN.
+    """
+
+    error_checking.assert_is_real_numpy_array(reflectivity_matrix_dbz)
+    error_checking.assert_is_numpy_array(
+        reflectivity_matrix_dbz, num_dimensions=3)
+
+    num_heights = reflectivity_matrix_dbz.shape[0]
+    num_grid_rows = reflectivity_matrix_dbz.shape[1]
+
+    error_checking.assert_is_geq_numpy_array(heights_m_asl, 0.)
+    error_checking.assert_is_numpy_array(
+        heights_m_asl, exact_dimensions=numpy.array([num_heights]))
+    error_checking.assert_is_greater(critical_reflectivity_dbz, 0.)
+
+    if num_rows_per_chunk is None:
+        num_rows_per_chunk = max([num_grid_rows, 1])
+    error_checking.assert_is_integer(num_rows_per_chunk)
+    error_checking.assert_is_greater(num_rows_per_chunk, 0)
+
+    heights_m_asl = numpy.array(heights_m_asl, dtype=float)
+    echo_top_matrix_m_asl = numpy.full(
+        reflectivity_matrix_dbz.shape[1:], numpy.nan)
+
+    # Spacing used for extrapolation above highest critical level.  For the top
+    # level, this is the spacing below (same as in the single-column method,
+    # including the edge case with only one height).
+    extrap_spacings_metres = numpy.concatenate((
+        numpy.diff(heights_m_asl),
+        heights_m_asl[[-1]] - heights_m_asl[[-2 if num_heights > 1 else -1]]
+    ))
+
+    height_indices = numpy.linspace(
+        0, num_heights - 1, num=num_heights, dtype=int
+    )[:, numpy.newaxis, numpy.newaxis]
+
+    for i in range(0, num_grid_rows, num_rows_per_chunk):
+        this_last_row = min([i + num_rows_per_chunk, num_grid_rows])
+        this_refl_matrix_dbz = reflectivity_matrix_dbz[:, i:this_last_row, :]
+
+        this_critical_matrix = (
+            this_refl_matrix_dbz >= critical_reflectivity_dbz
+        )
+        these_good_flags = numpy.any(this_critical_matrix, axis=0)
+        if not numpy.any(these_good_flags):
+            continue
+
+        these_critical_indices = num_heights - 1 - numpy.argmax(
+            this_critical_matrix[::-1, ...], axis=0
+        )
+
+        this_subcritical_matrix = numpy.logical_and(
+            this_refl_matrix_dbz < critical_reflectivity_dbz,
+            height_indices > these_critical_indices[numpy.newaxis, ...]
+        )
+        these_interp_flags = numpy.any(this_subcritical_matrix, axis=0)
+        these_subcritical_indices = numpy.argmax(
+            this_subcritical_matrix, axis=0)
+
+        these_critical_refls_dbz = numpy.take_along_axis(
+            this_refl_matrix_dbz, these_critical_indices[numpy.newaxis, ...],
+            axis=0
+        )[0, ...]
+        these_subcritical_refls_dbz = numpy.take_along_axis(
+            this_refl_matrix_dbz, these_subcritical_indices[numpy.newaxis, ...],
+            axis=0
+        )[0, ...]
+
+        these_critical_heights_m_asl = heights_m_asl[these_critical_indices]
+        these_subcritical_heights_m_asl = heights_m_asl[
+            these_subcritical_indices]
+
+        # Extrapolation, where there is no subcritical level above.
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            this_echo_top_matrix_m_asl = (
+                these_critical_heights_m_asl +
+                extrap_spacings_metres[these_critical_indices] * (
+                    1. - critical_reflectivity_dbz / these_critical_refls_dbz
+                )
+            )
+
+            # Interpolation, in the same form as `scipy.interpolate.interp1d`
+            # (starting from the point with lower reflectivity).
+            these_interp_tops_m_asl = (
+                these_subcritical_heights_m_asl +
+                (critical_reflectivity_dbz - these_subcritical_refls_dbz) *
+                (these_critical_heights_m_asl -
+                 these_subcritical_heights_m_asl) /
+                (these_critical_refls_dbz - these_subcritical_refls_dbz)
+            )
+
+        this_echo_top_matrix_m_asl[these_interp_flags] = (
+            these_interp_tops_m_asl[these_interp_flags]
+        )
+        this_echo_top_matrix_m_asl[numpy.invert(these_good_flags)] = numpy.nan
+        echo_top_matrix_m_asl[i:this_last_row, :] = this_echo_top_matrix_m_asl
+
+    return echo_top_matrix_m_asl
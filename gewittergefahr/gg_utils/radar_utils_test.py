@@ -501,6 +501,40 @@ class RadarUtilsTests(unittest.TestCase):
             equal_nan=True
         ))
 
+    def test_get_echo_tops_3d_no_chunks(self):
+        """Ensures correct output from get_echo_tops_3d.
+
+        In this case, all rows are handled at once.
+        """
+
+        this_echo_top_matrix_m_asl = radar_utils.get_echo_tops_3d(
+            reflectivity_matrix_dbz=REFLECTIVITY_MATRIX_DBZ,
+            heights_m_asl=GRID_POINT_HEIGHTS_M_ASL,
+            critical_reflectivity_dbz=CRIT_REFL_FOR_ECHO_TOPS_DBZ,
+            num_rows_per_chunk=None)
+
+        self.assertTrue(numpy.allclose(
+            this_echo_top_matrix_m_asl, ECHO_TOP_MATRIX_M_ASL, atol=TOLERANCE,
+            equal_nan=True
+        ))
+
+    def test_get_echo_tops_3d_one_row_per_chunk(self):
+        """Ensures correct output from get_echo_tops_3d.
+
+        In this case, rows are handled one at a time.
+        """
+
+        this_echo_top_matrix_m_asl = radar_utils.get_echo_tops_3d(
+            reflectivity_matrix_dbz=REFLECTIVITY_MATRIX_DBZ,
+            heights_m_asl=GRID_POINT_HEIGHTS_M_ASL,
+            critical_reflectivity_dbz=CRIT_REFL_FOR_ECHO_TOPS_DBZ,
+            num_rows_per_chunk=1)
+
+        self.assertTrue(numpy.allclose(
+            this_echo_top_matrix_m_asl, ECHO_TOP_MATRIX_M_ASL, atol=TOLERANCE,
+            equal_nan=True
+        ))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,12 @@
 """Methods for computing shape statistics."""
 
+import os
 import copy
+import fcntl
 import pickle
+import hashlib
+import functools
+import multiprocessing
 import numpy
 import skimage.measure
 from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
@@ -15,6 +20,19 @@ from gewittergefahr.gg_utils import error_checking
 # TODO(thunderhoser): may add moments to list of shape statistics.
 
 REPORT_EVERY_N_STORM_OBJECTS = 100
+NUM_STORM_OBJECTS_PER_CHUNK = 25
+
+# Shape statistics are cached by hash of the polygon and centroid, because the
+# same storm objects recur across tracking reanalyses and lead times.  The
+# in-memory cache lasts for one session and is emptied when full.  To reuse
+# statistics across runs, pass `cache_dir_name` to
+# `get_stats_for_storm_objects`, which keeps one cache file per set of
+# settings.  Several processes may share one cache file, because writers lock
+# the file and merge their new statistics into it.  The file keeps at most
+# `MAX_CACHE_FILE_SIZE` storm objects, dropping the oldest first.
+STATISTIC_CACHE_DICT = {}
+MAX_CACHE_SIZE = 1000000
+MAX_CACHE_FILE_SIZE = 1000000
 
 RADIANS_TO_DEGREES = 180. / numpy.pi
 GRID_SPACING_FOR_BINARY_MATRIX_DEFAULT_METRES = 100.
@@ -223,6 +241,189 @@ def _xy_polygon_to_binary_matrix(
         (num_grid_rows, num_grid_columns), vertex_array_xy_metres)
 
 
+def _hash_storm_object(polygon_object_latlng, centroid_latitude_deg,
+                       centroid_longitude_deg):
+    """Hashes storm object, for use as key in the statistic cache.
+
+    :param polygon_object_latlng: See doc for `_project_polygon_latlng_to_xy`.
+    :param centroid_latitude_deg: Same.
+    :param centroid_longitude_deg: Same.
+    :return: hash_string: Hex digest.
+    """
+
+    hash_object = hashlib.sha1()
+    ring_objects = (
+        [polygon_object_latlng.exterior] + list(polygon_object_latlng.interiors)
+    )
+
+    # The shape of each vertex matrix is hashed too, so that vertices cannot
+    # shift between rings without changing the hash.
+    for this_ring_object in ring_objects:
+        this_vertex_matrix = numpy.ascontiguousarray(
+            numpy.array(this_ring_object.coords), dtype=float
+        )
+
+        hash_object.update(str(this_vertex_matrix.shape).encode('utf-8'))
+        hash_object.update(this_vertex_matrix)
+
+    hash_object.update(numpy.array(
+        [centroid_latitude_deg, centroid_longitude_deg], dtype=float
+    ))
+
+    return hash_object.hexdigest()
+
+
+def _find_cache_file(cache_dir_name, settings_key):
+    """Finds cache file with shape statistics for one set of settings.
+
+    :param cache_dir_name: Name of cache directory.
+    :param settings_key: Tuple with settings (statistic names, grid spacing for
+        binary matrix, and smoothing parameters).
+    :return: cache_file_name: Path to cache file.
+    """
+
+    settings_hash_string = hashlib.sha1(
+        str(settings_key).encode('utf-8')
+    ).hexdigest()
+
+    return '{0:s}/shape_statistics_cache_{1:s}.p'.format(
+        cache_dir_name, settings_hash_string)
+
+
+def _read_cache_file(cache_file_name):
+    """Reads shape statistics from cache file.
+
+    :param cache_file_name: Path to cache file.
+    :return: cache_dict: Dictionary, where each key is a hash created by
+        `_hash_storm_object` and each value is a numpy array of statistics.  If
+        the file does not exist, this is empty.
+    """
+
+    if not os.path.isfile(cache_file_name):
+        return {}
+
+    pickle_file_handle = open(cache_file_name, 'rb')
+    cache_dict = pickle.load(pickle_file_handle)
+    pickle_file_handle.close()
+
+    return cache_dict
+
+
+def _write_cache_file(new_cache_dict, cache_file_name,
+                      max_cache_size=MAX_CACHE_FILE_SIZE):
+    """Adds shape statistics to cache file.
+
+    Other processes may write the same file at once, so the file is locked and
+    re-read, and new statistics are merged into it.  If the merged cache has
+    more than `max_cache_size` entries, the oldest are dropped.  The file is
+    first written under a temporary name and then renamed, so that an
+    interruption during writing cannot corrupt the cache.
+
+    :param new_cache_dict: Dictionary with new statistics, in the format
+        documented for `_read_cache_file`.
+    :param cache_file_name: Path to cache file.
+    :param max_cache_size: Max number of entries in cache file.
+    """
+
+    error_checking.assert_is_integer(max_cache_size)
+    error_checking.assert_is_greater(max_cache_size, 0)
+
+    file_system_utils.mkdir_recursive_if_necessary(file_name=cache_file_name)
+    lock_file_handle = open('{0:s}.lock'.format(cache_file_name), 'w')
+    fcntl.flock(lock_file_handle, fcntl.LOCK_EX)
+
+    try:
+        cache_dict = _read_cache_file(cache_file_name)
+        cache_dict.update(new_cache_dict)
+
+        num_extra_entries = len(cache_dict) - max_cache_size
+        if num_extra_entries > 0:
+            for this_key in list(cache_dict.keys())[:num_extra_entries]:
+                del cache_dict[this_key]
+
+        temp_file_name = '{0:s}.{1:d}.tmp'.format(
+            cache_file_name, os.getpid())
+
+        pickle_file_handle = open(temp_file_name, 'wb')
+        pickle.dump(cache_dict, pickle_file_handle)
+        pickle_file_handle.close()
+
+        os.replace(temp_file_name, cache_file_name)
+    finally:
+        fcntl.flock(lock_file_handle, fcntl.LOCK_UN)
+        lock_file_handle.close()
+
+
+def _get_stats_one_storm_object(
+        polygon_and_centroid, statistic_names,
+        grid_spacing_for_binary_matrix_metres,
+        num_vertices_in_smoothing_half_window, num_smoothing_iterations):
+    """Computes shape statistics for one storm object.
+
+    K = number of statistics
+
+    :param polygon_and_centroid: Tuple with the following items.
+    polygon_and_centroid[0]: See doc for `_project_polygon_latlng_to_xy`.
+    polygon_and_centroid[1]: Centroid latitude (deg N).
+    polygon_and_centroid[2]: Centroid longitude (deg E).
+    :param statistic_names: length-K list of statistics to compute.
+    :param grid_spacing_for_binary_matrix_metres: See doc for
+        `get_stats_for_storm_objects`.
+    :param num_vertices_in_smoothing_half_window: Same.
+    :param num_smoothing_iterations: Same.
+    :return: statistic_values: length-K numpy array of values.
+    """
+
+    polygon_object_latlng, centroid_latitude_deg, centroid_longitude_deg = (
+        polygon_and_centroid
+    )
+
+    basic_stat_names = _get_basic_statistic_names(statistic_names)
+    region_property_names = _get_region_property_names(statistic_names)
+    curvature_based_stat_names = _get_curvature_based_stat_names(
+        statistic_names)
+
+    polygon_object_xy = _project_polygon_latlng_to_xy(
+        polygon_object_latlng=polygon_object_latlng,
+        centroid_latitude_deg=centroid_latitude_deg,
+        centroid_longitude_deg=centroid_longitude_deg)
+
+    statistic_dict = {}
+
+    if basic_stat_names:
+        statistic_dict.update(
+            get_basic_statistics(polygon_object_xy, basic_stat_names)
+        )
+
+    if region_property_names:
+        binary_image_matrix = _xy_polygon_to_binary_matrix(
+            polygon_object_xy, grid_spacing_for_binary_matrix_metres)
+
+        statistic_dict.update(get_region_properties(
+            binary_image_matrix, property_names=region_property_names
+        ))
+
+    if curvature_based_stat_names:
+        vertex_x_smoothed_metres, vertex_y_smoothed_metres = (
+            sia.sia_for_closed_polygon(
+                polygon_object_xy,
+                num_vertices_in_half_window=
+                num_vertices_in_smoothing_half_window,
+                num_iterations=num_smoothing_iterations,
+                check_input_args=False)
+        )
+
+        polygon_object_xy_smoothed = polygons.vertex_arrays_to_polygon_object(
+            vertex_x_smoothed_metres, vertex_y_smoothed_metres)
+
+        statistic_dict.update(get_curvature_based_stats(
+            polygon_object_xy_smoothed,
+            statistic_names=curvature_based_stat_names
+        ))
+
+    return numpy.array([statistic_dict[n] for n in statistic_names])
+
+
 def get_statistic_columns(statistic_table):
     """Returns names of columns with shape statistics.
 
@@ -372,7 +573,8 @@ def get_stats_for_storm_objects(
         GRID_SPACING_FOR_BINARY_MATRIX_DEFAULT_METRES,
         num_vertices_in_smoothing_half_window=
         NUM_VERTICES_IN_SMOOTHING_HALF_WINDOW_DEFAULT,
-        num_smoothing_iterations=NUM_SMOOTHING_ITERS_DEFAULT):
+        num_smoothing_iterations=NUM_SMOOTHING_ITERS_DEFAULT,
+        num_processes=1, use_cache=True, cache_dir_name=None):
     """Computes shape statistics for one or more storm objects.
 
     K = number of statistics
@@ -387,6 +589,16 @@ def get_stats_for_storm_objects(
         `smoothing_via_iterative_averaging.sia_for_closed_polygon`.
     :param num_smoothing_iterations: See documentation for
         `smoothing_via_iterative_averaging.sia_for_closed_polygon`.
+    :param num_processes: Number of processes used to compute statistics
+        (storm objects are split among processes).
+    :param use_cache: Boolean flag.  If True, will reuse statistics for storm
+        objects (polygon and centroid) already handled in this session, and
+        will cache statistics for new storm objects.
+    :param cache_dir_name: Name of directory with cache files, used only if
+        `use_cache = True`.  Statistics will also be reused from, and new
+        statistics added to, the cache file for the given settings, so that
+        they persist across runs.  Concurrent runs may share one directory.  If
+        None, the cache is kept only in memory.
     :return: storm_shape_statistic_table: pandas DataFrame with 2 + K columns,
         where the last K columns are shape statistics.  Names of these columns
         come from the input list statistic_names.  The first 2 columns are
@@ -396,80 +608,151 @@ def get_stats_for_storm_objects(
     """
 
     _check_statistic_names(statistic_names)
-    basic_stat_names = _get_basic_statistic_names(statistic_names)
-    region_property_names = _get_region_property_names(statistic_names)
-    curvature_based_stat_names = _get_curvature_based_stat_names(
-        statistic_names)
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
+    error_checking.assert_is_boolean(use_cache)
+    if cache_dir_name is not None:
+        error_checking.assert_is_string(cache_dir_name)
+
+    if _get_curvature_based_stat_names(statistic_names):
+        error_checking.assert_is_integer(num_vertices_in_smoothing_half_window)
+        error_checking.assert_is_geq(num_vertices_in_smoothing_half_window, 1)
+        error_checking.assert_is_integer(num_smoothing_iterations)
+        error_checking.assert_is_geq(num_smoothing_iterations, 1)
 
     num_storm_objects = len(storm_object_table.index)
-    nan_array = numpy.full(num_storm_objects, numpy.nan)
+    num_statistics = len(statistic_names)
+    statistic_matrix = numpy.full(
+        (num_storm_objects, num_statistics), numpy.nan)
+
+    polygon_objects_latlng = storm_object_table[
+        tracking_utils.LATLNG_POLYGON_COLUMN].values
+    centroid_latitudes_deg = storm_object_table[
+        tracking_utils.CENTROID_LATITUDE_COLUMN].values
+    centroid_longitudes_deg = storm_object_table[
+        tracking_utils.CENTROID_LONGITUDE_COLUMN].values
+
+    settings_key = (
+        tuple(statistic_names), grid_spacing_for_binary_matrix_metres,
+        num_vertices_in_smoothing_half_window, num_smoothing_iterations
+    )
 
-    argument_dict = {}
-    for this_name in statistic_names:
-        argument_dict.update({this_name: nan_array})
-    storm_object_table = storm_object_table.assign(**argument_dict)
+    if use_cache and cache_dir_name is not None:
+        cache_file_name = _find_cache_file(
+            cache_dir_name=cache_dir_name, settings_key=settings_key)
 
-    for i in range(num_storm_objects):
-        if numpy.mod(i, REPORT_EVERY_N_STORM_OBJECTS) == 0 and i > 0:
-            print((
-                'Have computed shape statistics for {0:d} of {1:d} storm '
-                'objects...'
-            ).format(
-                i, num_storm_objects
-            ))
-
-        this_polygon_object_xy = _project_polygon_latlng_to_xy(
-            polygon_object_latlng=storm_object_table[
-                tracking_utils.LATLNG_POLYGON_COLUMN].values[i],
-            centroid_latitude_deg=storm_object_table[
-                tracking_utils.CENTROID_LATITUDE_COLUMN].values[i],
-            centroid_longitude_deg=storm_object_table[
-                tracking_utils.CENTROID_LONGITUDE_COLUMN].values[i]
-        )
+        print('Reading cached shape statistics from: "{0:s}"...'.format(
+            cache_file_name))
+        file_cache_dict = _read_cache_file(cache_file_name)
+    else:
+        cache_file_name = None
+        file_cache_dict = {}
 
-        if basic_stat_names:
-            this_basic_stat_dict = get_basic_statistics(
-                this_polygon_object_xy, basic_stat_names)
+    # Find storm objects that still need statistics.  Storm objects with the
+    # same polygon and centroid are handled only once.
+    storm_indices_by_cache_key = {}
 
-            for this_name in basic_stat_names:
-                storm_object_table[this_name].values[i] = this_basic_stat_dict[
-                    this_name]
+    for i in range(num_storm_objects):
+        this_cache_key = settings_key + (_hash_storm_object(
+            polygon_object_latlng=polygon_objects_latlng[i],
+            centroid_latitude_deg=centroid_latitudes_deg[i],
+            centroid_longitude_deg=centroid_longitudes_deg[i]
+        ),)
+
+        if use_cache and this_cache_key in STATISTIC_CACHE_DICT:
+            statistic_matrix[i, :] = STATISTIC_CACHE_DICT[this_cache_key]
+            continue
 
-        if region_property_names:
-            this_binary_image_matrix = _xy_polygon_to_binary_matrix(
-                this_polygon_object_xy, grid_spacing_for_binary_matrix_metres)
+        if this_cache_key[-1] in file_cache_dict:
+            statistic_matrix[i, :] = file_cache_dict[this_cache_key[-1]]
+            continue
 
-            this_region_prop_dict = get_region_properties(
-                this_binary_image_matrix, property_names=region_property_names)
+        if this_cache_key not in storm_indices_by_cache_key:
+            storm_indices_by_cache_key[this_cache_key] = []
 
-            for this_name in region_property_names:
-                storm_object_table[this_name].values[i] = this_region_prop_dict[
-                    this_name]
+        storm_indices_by_cache_key[this_cache_key].append(i)
 
-        if curvature_based_stat_names:
-            these_x_smoothed_metres, these_y_smoothed_metres = (
-                sia.sia_for_closed_polygon(
-                    this_polygon_object_xy,
-                    num_vertices_in_half_window=
-                    num_vertices_in_smoothing_half_window,
-                    num_iterations=num_smoothing_iterations,
-                    check_input_args=i == 0))
+    cache_keys_to_compute = list(storm_indices_by_cache_key.keys())
+    num_storm_objects_to_compute = len(cache_keys_to_compute)
 
-            this_polygon_object_xy_smoothed = (
-                polygons.vertex_arrays_to_polygon_object(
-                    these_x_smoothed_metres, these_y_smoothed_metres))
+    print((
+        'Computing shape statistics for {0:d} of {1:d} storm objects (others '
+        'are cached or repeated)...'
+    ).format(
+        num_storm_objects_to_compute, num_storm_objects
+    ))
 
-            this_curvature_based_stat_dict = get_curvature_based_stats(
-                this_polygon_object_xy_smoothed,
-                statistic_names=curvature_based_stat_names)
+    work_items = [
+        (
+            polygon_objects_latlng[storm_indices_by_cache_key[k][0]],
+            centroid_latitudes_deg[storm_indices_by_cache_key[k][0]],
+            centroid_longitudes_deg[storm_indices_by_cache_key[k][0]]
+        )
+        for k in cache_keys_to_compute
+    ]
 
-            for this_name in curvature_based_stat_names:
-                storm_object_table[this_name].values[i] = (
-                    this_curvature_based_stat_dict[this_name])
+    stats_function = functools.partial(
+        _get_stats_one_storm_object, statistic_names=statistic_names,
+        grid_spacing_for_binary_matrix_metres=
+        grid_spacing_for_binary_matrix_metres,
+        num_vertices_in_smoothing_half_window=
+        num_vertices_in_smoothing_half_window,
+        num_smoothing_iterations=num_smoothing_iterations)
+
+    if num_processes == 1:
+        worker_pool = None
+        result_iterator = map(stats_function, work_items)
+    else:
+        worker_pool = multiprocessing.Pool(num_processes)
+        result_iterator = worker_pool.imap(
+            stats_function, work_items, chunksize=NUM_STORM_OBJECTS_PER_CHUNK)
+
+    new_file_cache_dict = {}
+
+    try:
+        for j, these_values in enumerate(result_iterator):
+            if numpy.mod(j, REPORT_EVERY_N_STORM_OBJECTS) == 0 and j > 0:
+                print((
+                    'Have computed shape statistics for {0:d} of {1:d} storm '
+                    'objects...'
+                ).format(
+                    j, num_storm_objects_to_compute
+                ))
+
+            this_cache_key = cache_keys_to_compute[j]
+            statistic_matrix[
+                storm_indices_by_cache_key[this_cache_key], :
+            ] = these_values
+
+            if not use_cache:
+                continue
+
+            if len(STATISTIC_CACHE_DICT) >= MAX_CACHE_SIZE:
+                STATISTIC_CACHE_DICT.clear()
+
+            STATISTIC_CACHE_DICT[this_cache_key] = these_values
+            if cache_file_name is not None:
+                new_file_cache_dict[this_cache_key[-1]] = these_values
+    finally:
+        if worker_pool is not None:
+            worker_pool.terminate()
+            worker_pool.join()
+
+    if cache_file_name is not None and len(new_file_cache_dict) > 0:
+        print('Writing cached shape statistics to: "{0:s}"...'.format(
+            cache_file_name))
+        _write_cache_file(
+            new_cache_dict=new_file_cache_dict,
+            cache_file_name=cache_file_name)
 
     print('Have computed shape statistics for all {0:d} storm objects!'.format(
         num_storm_objects))
 
+    argument_dict = {}
+    for k in range(num_statistics):
+        argument_dict.update({statistic_names[k]: statistic_matrix[:, k]})
+    storm_object_table = storm_object_table.assign(**argument_dict)
+
     return storm_object_table[STORM_COLUMNS_TO_KEEP + statistic_names]
 
 
@@ -1,10 +1,14 @@
 """Unit tests for shape_statistics.py."""
 
+import tempfile
 import unittest
 import numpy
+import pandas
 from gewittergefahr.gg_utils import shape_statistics as shape_stats
 from gewittergefahr.gg_utils import polygons
+from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
 
+TOLERANCE = 1e-6
 FAKE_STATISTIC_NAME = 'foo'
 
 VERTEX_X_METRES = numpy.array(
@@ -41,6 +45,75 @@ VERTEX_Y_METRES_OFFSET = VERTEX_Y_METRES + Y_OFFSET_METRES
 POLYGON_OBJECT_XY_OFFSET = polygons.vertex_arrays_to_polygon_object(
     VERTEX_X_METRES_OFFSET, VERTEX_Y_METRES_OFFSET)
 
+# The following constants are used to test _hash_storm_object.
+CENTROID_LATITUDE_DEG = 3.
+CENTROID_LONGITUDE_DEG = 4.
+
+HOLE_X_METRES = numpy.array([3.5, 4.5, 4.5, 3.5, 3.5])
+HOLE_Y_METRES = numpy.array([1.5, 1.5, 2.5, 2.5, 1.5])
+POLYGON_OBJECT_XY_WITH_HOLE = polygons.vertex_arrays_to_polygon_object(
+    exterior_x_coords=VERTEX_X_METRES, exterior_y_coords=VERTEX_Y_METRES,
+    hole_x_coords_list=[HOLE_X_METRES], hole_y_coords_list=[HOLE_Y_METRES]
+)
+
+# The following constants are used to test get_stats_for_storm_objects.
+DEGREES_PER_METRE_FOR_TABLE = 0.01
+CENTROID_LATITUDES_DEG = numpy.array([35., 36., 35.])
+CENTROID_LONGITUDES_DEG = numpy.array([262., 263., 262.])
+
+THIS_FIRST_POLYGON_OBJECT = polygons.vertex_arrays_to_polygon_object(
+    CENTROID_LONGITUDES_DEG[0] + DEGREES_PER_METRE_FOR_TABLE * VERTEX_X_METRES,
+    CENTROID_LATITUDES_DEG[0] + DEGREES_PER_METRE_FOR_TABLE * VERTEX_Y_METRES
+)
+THIS_SECOND_POLYGON_OBJECT = polygons.vertex_arrays_to_polygon_object(
+    CENTROID_LONGITUDES_DEG[1] + DEGREES_PER_METRE_FOR_TABLE * VERTEX_Y_METRES,
+    CENTROID_LATITUDES_DEG[1] + DEGREES_PER_METRE_FOR_TABLE * VERTEX_X_METRES
+)
+
+# The third storm object repeats the first.
+STORM_OBJECT_TABLE = pandas.DataFrame.from_dict({
+    tracking_utils.FULL_ID_COLUMN: ['foo', 'bar', 'moo'],
+    tracking_utils.VALID_TIME_COLUMN: numpy.array([0, 0, 300], dtype=int),
+    tracking_utils.CENTROID_LATITUDE_COLUMN: CENTROID_LATITUDES_DEG,
+    tracking_utils.CENTROID_LONGITUDE_COLUMN: CENTROID_LONGITUDES_DEG,
+    tracking_utils.LATLNG_POLYGON_COLUMN: [
+        THIS_FIRST_POLYGON_OBJECT, THIS_SECOND_POLYGON_OBJECT,
+        THIS_FIRST_POLYGON_OBJECT
+    ]
+})
+
+# The following constants are used to test _write_cache_file.
+FIRST_CACHE_DICT = {
+    'foo': numpy.array([1, 2, 3], dtype=float),
+    'bar': numpy.array([4, 5, 6], dtype=float)
+}
+SECOND_CACHE_DICT = {
+    'moo': numpy.array([7, 8, 9], dtype=float),
+    'hal': numpy.array([10, 11, 12], dtype=float)
+}
+MERGED_CACHE_DICT = {**FIRST_CACHE_DICT, **SECOND_CACHE_DICT}
+
+
+def _compare_statistic_tables(first_statistic_table, second_statistic_table):
+    """Compares two tables created by `get_stats_for_storm_objects`.
+
+    :param first_statistic_table: First table.
+    :param second_statistic_table: Second table.
+    :return: are_tables_equal: Boolean flag.
+    """
+
+    if list(first_statistic_table) != list(second_statistic_table):
+        return False
+
+    for this_column in shape_stats.DEFAULT_STATISTIC_NAMES:
+        if not numpy.allclose(
+                first_statistic_table[this_column].values,
+                second_statistic_table[this_column].values,
+                atol=TOLERANCE, equal_nan=True):
+            return False
+
+    return True
+
 
 class ShapeStatisticsTests(unittest.TestCase):
     """Each method is a unit test for shape_statistics.py."""
@@ -138,6 +211,159 @@ class ShapeStatisticsTests(unittest.TestCase):
             this_binary_image_matrix, BINARY_IMAGE_MATRIX
         ))
 
+    def test_hash_storm_object_same(self):
+        """Ensures correct output from _hash_storm_object.
+
+        In this case the two storm objects are the same, so hashes should be
+        equal.
+        """
+
+        this_first_hash = shape_stats._hash_storm_object(
+            polygon_object_latlng=POLYGON_OBJECT_XY,
+            centroid_latitude_deg=CENTROID_LATITUDE_DEG,
+            centroid_longitude_deg=CENTROID_LONGITUDE_DEG)
+
+        this_second_hash = shape_stats._hash_storm_object(
+            polygon_object_latlng=polygons.vertex_arrays_to_polygon_object(
+                VERTEX_X_METRES + 0., VERTEX_Y_METRES + 0.),
+            centroid_latitude_deg=CENTROID_LATITUDE_DEG,
+            centroid_longitude_deg=CENTROID_LONGITUDE_DEG)
+
+        self.assertTrue(this_first_hash == this_second_hash)
+
+    def test_hash_storm_object_different(self):
+        """Ensures correct output from _hash_storm_object.
+
+        In this case the two storm objects have different centroids, so hashes
+        should be different.
+        """
+
+        this_first_hash = shape_stats._hash_storm_object(
+            polygon_object_latlng=POLYGON_OBJECT_XY,
+            centroid_latitude_deg=CENTROID_LATITUDE_DEG,
+            centroid_longitude_deg=CENTROID_LONGITUDE_DEG)
+
+        this_second_hash = shape_stats._hash_storm_object(
+            polygon_object_latlng=POLYGON_OBJECT_XY,
+            centroid_latitude_deg=CENTROID_LATITUDE_DEG + 0.01,
+            centroid_longitude_deg=CENTROID_LONGITUDE_DEG)
+
+        self.assertFalse(this_first_hash == this_second_hash)
+
+    def test_hash_storm_object_hole(self):
+        """Ensures correct output from _hash_storm_object.
+
+        In this case the two storm objects differ only by a hole, so hashes
+        should be different.
+        """
+
+        this_first_hash = shape_stats._hash_storm_object(
+            polygon_object_latlng=POLYGON_OBJECT_XY,
+            centroid_latitude_deg=CENTROID_LATITUDE_DEG,
+            centroid_longitude_deg=CENTROID_LONGITUDE_DEG)
+
+        this_second_hash = shape_stats._hash_storm_object(
+            polygon_object_latlng=POLYGON_OBJECT_XY_WITH_HOLE,
+            centroid_latitude_deg=CENTROID_LATITUDE_DEG,
+            centroid_longitude_deg=CENTROID_LONGITUDE_DEG)
+
+        self.assertFalse(this_first_hash == this_second_hash)
+
+    def test_get_stats_for_storm_objects_pool(self):
+        """Ensures correct output from get_stats_for_storm_objects.
+
+        In this case, statistics computed in a process pool should match those
+        computed serially, without the cache.
+        """
+
+        this_serial_table = shape_stats.get_stats_for_storm_objects(
+            STORM_OBJECT_TABLE, num_processes=1, use_cache=False)
+        this_pool_table = shape_stats.get_stats_for_storm_objects(
+            STORM_OBJECT_TABLE, num_processes=2, use_cache=False)
+
+        self.assertTrue(_compare_statistic_tables(
+            this_serial_table, this_pool_table
+        ))
+
+    def test_get_stats_for_storm_objects_cache(self):
+        """Ensures correct output from get_stats_for_storm_objects.
+
+        In this case, statistics read from the in-memory cache and from the
+        cache file should match those computed serially, without the cache.
+        """
+
+        this_serial_table = shape_stats.get_stats_for_storm_objects(
+            STORM_OBJECT_TABLE, num_processes=1, use_cache=False)
+
+        with tempfile.TemporaryDirectory() as this_cache_dir_name:
+            shape_stats.STATISTIC_CACHE_DICT.clear()
+            shape_stats.get_stats_for_storm_objects(
+                STORM_OBJECT_TABLE, use_cache=True,
+                cache_dir_name=this_cache_dir_name)
+
+            this_memory_table = shape_stats.get_stats_for_storm_objects(
+                STORM_OBJECT_TABLE, use_cache=True)
+
+            shape_stats.STATISTIC_CACHE_DICT.clear()
+            this_file_table = shape_stats.get_stats_for_storm_objects(
+                STORM_OBJECT_TABLE, use_cache=True,
+                cache_dir_name=this_cache_dir_name)
+
+        self.assertTrue(_compare_statistic_tables(
+            this_serial_table, this_memory_table
+        ))
+        self.assertTrue(_compare_statistic_tables(
+            this_serial_table, this_file_table
+        ))
+
+    def test_write_cache_file_merge(self):
+        """Ensures correct output from _write_cache_file.
+
+        In this case, two writers add different entries to the same file, and
+        the file should keep both.
+        """
+
+        with tempfile.TemporaryDirectory() as this_cache_dir_name:
+            this_file_name = '{0:s}/cache.p'.format(this_cache_dir_name)
+            shape_stats._write_cache_file(
+                new_cache_dict=FIRST_CACHE_DICT, cache_file_name=this_file_name)
+            shape_stats._write_cache_file(
+                new_cache_dict=SECOND_CACHE_DICT,
+                cache_file_name=this_file_name)
+
+            this_cache_dict = shape_stats._read_cache_file(this_file_name)
+
+        self.assertTrue(
+            set(this_cache_dict.keys()) == set(MERGED_CACHE_DICT.keys())
+        )
+        for this_key in MERGED_CACHE_DICT:
+            self.assertTrue(numpy.allclose(
+                this_cache_dict[this_key], MERGED_CACHE_DICT[this_key],
+                atol=TOLERANCE
+            ))
+
+    def test_write_cache_file_too_large(self):
+        """Ensures correct output from _write_cache_file.
+
+        In this case, the merged cache is too large, so the oldest entries
+        should be dropped.
+        """
+
+        with tempfile.TemporaryDirectory() as this_cache_dir_name:
+            this_file_name = '{0:s}/cache.p'.format(this_cache_dir_name)
+            shape_stats._write_cache_file(
+                new_cache_dict=FIRST_CACHE_DICT, cache_file_name=this_file_name)
+            shape_stats._write_cache_file(
+                new_cache_dict=SECOND_CACHE_DICT,
+                cache_file_name=this_file_name,
+                max_cache_size=len(SECOND_CACHE_DICT))
+
+            this_cache_dict = shape_stats._read_cache_file(this_file_name)
+
+        self.assertTrue(
+            set(this_cache_dict.keys()) == set(SECOND_CACHE_DICT.keys())
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
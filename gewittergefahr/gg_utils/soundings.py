@@ -17,7 +17,6 @@ import os.path
 import numpy
 import pandas
 import netCDF4
-from scipy.interpolate import interp1d as scipy_interp1d
 from gewittergefahr.gg_io import grib_io
 from gewittergefahr.gg_io import netcdf_io
 from gewittergefahr.gg_utils import geodetic_utils
@@ -381,7 +380,7 @@ def _create_target_points_for_interp(storm_object_table, lead_times_seconds):
 def _interp_soundings_from_nwp(
         target_point_table, top_grib_directory_name, include_surface,
         model_name, use_all_grids, grid_id, wgrib_exe_name, wgrib2_exe_name,
-        raise_error_if_missing):
+        raise_error_if_missing, grib_cache_dir_name=None):
     """Interpolates soundings from NWP model to target points.
 
     Each target point consists of (latitude, longitude, time).
@@ -397,6 +396,7 @@ def _interp_soundings_from_nwp(
     :param wgrib_exe_name: Same.
     :param wgrib2_exe_name: Same.
     :param raise_error_if_missing: Same.
+    :param grib_cache_dir_name: Same.
     :return: interp_table: pandas DataFrame, where each column is one field and
         each row is one target point.  Column names are from the list
     """
@@ -416,7 +416,8 @@ def _interp_soundings_from_nwp(
         temporal_interp_method_string=interp.PREV_NEIGHBOUR_METHOD_STRING,
         spatial_interp_method_string=interp.NEAREST_NEIGHBOUR_METHOD_STRING,
         wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
-        raise_error_if_missing=raise_error_if_missing)
+        raise_error_if_missing=raise_error_if_missing,
+        grib_cache_dir_name=grib_cache_dir_name)
 
 
 def _convert_interp_table_to_soundings(
@@ -500,6 +501,84 @@ def _convert_interp_table_to_soundings(
     }
 
 
+def _interp_soundings_linear(x_matrix, y_matrix, new_x_matrix,
+                             valid_flag_matrix=None):
+    """Linear interpolation along the vertical axis of many soundings at once.
+
+    For each sounding i, this method returns the same values (bit for bit) as
+    `scipy.interpolate.interp1d` with `kind = "linear"`,
+    `fill_value = "extrapolate"`, and `assume_sorted = False`, fit to
+    x_matrix[i, valid_flag_matrix[i, :]] and
+    y_matrix[i, valid_flag_matrix[i, :], ...].
+
+    N = number of soundings
+    P = number of input levels in each sounding
+    H = number of output levels in each sounding
+    K = number of fields to interpolate
+
+    :param x_matrix: N-by-P numpy array of independent-variable values.
+    :param y_matrix: N-by-P-by-K numpy array of dependent-variable values.
+    :param new_x_matrix: N-by-H numpy array of independent-variable values at
+        which to interpolate.
+    :param valid_flag_matrix: N-by-P numpy array of Boolean flags, indicating
+        which input levels may be used for interpolation.  If None, all levels
+        will be used.  Each sounding must have >= 2 valid levels.
+    :return: new_y_matrix: N-by-H-by-K numpy array of interpolated values.
+    """
+
+    num_soundings = x_matrix.shape[0]
+    num_input_levels = x_matrix.shape[1]
+    if valid_flag_matrix is None:
+        valid_flag_matrix = numpy.full(x_matrix.shape, True, dtype=bool)
+
+    # Sort each sounding by x (NaN's last), then move invalid levels to the
+    # end.  Both sorts are stable, so valid levels end up in the same order
+    # that interp1d would use.
+    row_indices = numpy.expand_dims(numpy.arange(num_soundings), axis=-1)
+    sort_indices = numpy.argsort(x_matrix, axis=1, kind='mergesort')
+    sort_indices = sort_indices[
+        row_indices,
+        numpy.argsort(
+            numpy.invert(valid_flag_matrix[row_indices, sort_indices]),
+            axis=1, kind='mergesort'
+        )
+    ]
+
+    sorted_x_matrix = x_matrix[row_indices, sort_indices]
+    sorted_y_matrix = y_matrix[row_indices, sort_indices, ...]
+    num_valid_levels_by_sounding = numpy.sum(valid_flag_matrix, axis=1)
+
+    # Equivalent to numpy.searchsorted in each sounding.
+    high_index_matrix = numpy.zeros(new_x_matrix.shape, dtype=int)
+    for j in range(num_input_levels):
+        these_flags = numpy.logical_and(
+            sorted_x_matrix[:, [j]] < new_x_matrix,
+            numpy.expand_dims(num_valid_levels_by_sounding > j, axis=-1)
+        )
+        high_index_matrix += these_flags.astype(int)
+
+    high_index_matrix = numpy.clip(
+        high_index_matrix, 1,
+        numpy.expand_dims(num_valid_levels_by_sounding - 1, axis=-1)
+    )
+    low_index_matrix = high_index_matrix - 1
+
+    low_x_matrix = sorted_x_matrix[row_indices, low_index_matrix]
+    high_x_matrix = sorted_x_matrix[row_indices, high_index_matrix]
+    low_y_matrix = sorted_y_matrix[row_indices, low_index_matrix, ...]
+    high_y_matrix = sorted_y_matrix[row_indices, high_index_matrix, ...]
+
+    slope_matrix = (
+        (high_y_matrix - low_y_matrix) /
+        numpy.expand_dims(high_x_matrix - low_x_matrix, axis=-1)
+    )
+
+    return (
+        slope_matrix * numpy.expand_dims(new_x_matrix - low_x_matrix, axis=-1)
+        + low_y_matrix
+    )
+
+
 def _get_pressures(sounding_dict):
     """Returns pressure levels in soundings.
 
@@ -513,13 +592,10 @@ def _get_pressures(sounding_dict):
         return sounding_dict[SOUNDING_MATRIX_KEY][..., pressure_index]
 
     num_storm_objects = sounding_dict[SOUNDING_MATRIX_KEY].shape[0]
-    num_pressure_levels = sounding_dict[SOUNDING_MATRIX_KEY].shape[1]
-    pressure_matrix_pascals = numpy.full(
-        (num_storm_objects, num_pressure_levels), numpy.nan)
-
-    for i in range(num_storm_objects):
-        pressure_matrix_pascals[i, :] = sounding_dict[
-            PRESSURE_LEVELS_WITH_SFC_KEY]
+    pressure_matrix_pascals = numpy.tile(
+        numpy.array(sounding_dict[PRESSURE_LEVELS_WITH_SFC_KEY], dtype=float),
+        (num_storm_objects, 1)
+    )
 
     if sounding_dict[SURFACE_PRESSURES_KEY] is not None:
         surface_index = numpy.where(
@@ -737,48 +813,49 @@ def _fill_nans_in_soundings(
         SPECIFIC_HUMIDITY_NAME
     ]
 
-    for i in range(num_soundings):
-        for this_field_name in field_names_to_interp:
-            this_field_index = field_names.index(this_field_name)
-            these_real_flags = numpy.invert(numpy.isnan(
-                sounding_matrix[i, :, this_field_index]
-            ))
+    num_pressure_levels = sounding_matrix.shape[1]
 
-            if numpy.all(these_real_flags):
-                continue
+    for this_field_name in field_names_to_interp:
+        this_field_index = field_names.index(this_field_name)
+        this_real_flag_matrix = numpy.invert(numpy.isnan(
+            sounding_matrix[..., this_field_index]
+        ))
+        these_num_real = numpy.sum(this_real_flag_matrix, axis=1)
 
-            if (numpy.sum(these_real_flags) <
-                    min_num_pressure_levels_without_nan):
-                keep_sounding_flags[i] = False
-                break
-
-            these_nan_indices = numpy.where(numpy.invert(these_real_flags))[0]
-            these_real_indices = numpy.where(these_real_flags)[0]
-
-            if this_field_name == GEOPOTENTIAL_HEIGHT_NAME:
-                interp_object = scipy_interp1d(
-                    x=numpy.log(pressure_matrix_pascals[i, these_real_indices]),
-                    y=sounding_matrix[i, these_real_indices, this_field_index],
-                    kind='linear', bounds_error=False, fill_value='extrapolate',
-                    assume_sorted=False)
-
-                sounding_matrix[i, these_nan_indices, this_field_index] = (
-                    interp_object(
-                        numpy.log(pressure_matrix_pascals[i, these_nan_indices])
-                    )
-                )
-            else:
-                interp_object = scipy_interp1d(
-                    x=sounding_matrix[i, these_real_indices, height_index],
-                    y=sounding_matrix[i, these_real_indices, this_field_index],
-                    kind='linear', bounds_error=False, fill_value='extrapolate',
-                    assume_sorted=False)
-
-                sounding_matrix[i, these_nan_indices, this_field_index] = (
-                    interp_object(
-                        sounding_matrix[i, these_nan_indices, height_index]
-                    )
-                )
+        these_flags = numpy.logical_and(
+            these_num_real < num_pressure_levels,
+            these_num_real < min_num_pressure_levels_without_nan
+        )
+        keep_sounding_flags[these_flags] = False
+
+        these_indices = numpy.where(numpy.logical_and(
+            keep_sounding_flags, these_num_real < num_pressure_levels
+        ))[0]
+
+        if len(these_indices) == 0:
+            continue
+
+        this_real_flag_matrix = this_real_flag_matrix[these_indices, :]
+
+        if this_field_name == GEOPOTENTIAL_HEIGHT_NAME:
+            this_x_matrix = numpy.log(pressure_matrix_pascals[these_indices, :])
+        else:
+            this_x_matrix = sounding_matrix[these_indices, :, height_index]
+
+        this_interp_matrix = _interp_soundings_linear(
+            x_matrix=this_x_matrix,
+            y_matrix=numpy.expand_dims(
+                sounding_matrix[these_indices, :, this_field_index], axis=-1
+            ),
+            new_x_matrix=this_x_matrix,
+            valid_flag_matrix=this_real_flag_matrix
+        )[..., 0]
+
+        sounding_matrix[these_indices, :, this_field_index] = numpy.where(
+            this_real_flag_matrix,
+            sounding_matrix[these_indices, :, this_field_index],
+            this_interp_matrix
+        )
 
     keep_sounding_indices = numpy.where(keep_sounding_flags)[0]
     sounding_dict_pressure_coords[SOUNDING_MATRIX_KEY] = (
@@ -937,33 +1014,29 @@ def _pressure_to_height_coords(
 
     pressure_index = field_names.index(PRESSURE_NAME)
 
-    for j in range(len(field_names_to_interp)):
-        this_field_index = field_names.index(field_names_to_interp[j])
+    new_height_matrix_m_asl = (
+        numpy.expand_dims(storm_elevations_m_asl, axis=-1) +
+        numpy.expand_dims(height_levels_m_agl, axis=0)
+    )
 
-        for i in range(num_soundings):
-            if field_names_to_interp[j] == PRESSURE_NAME:
-                this_interp_object = scipy_interp1d(
-                    x=orig_height_matrix_m_asl[i, ...],
-                    y=numpy.log(orig_sounding_matrix[i, ..., this_field_index]),
-                    kind='linear', bounds_error=False, fill_value='extrapolate',
-                    assume_sorted=False)
+    new_sounding_matrix[..., pressure_index] = numpy.exp(
+        _interp_soundings_linear(
+            x_matrix=orig_height_matrix_m_asl,
+            y_matrix=numpy.log(orig_sounding_matrix[..., [pressure_index]]),
+            new_x_matrix=new_height_matrix_m_asl
+        )[..., 0]
+    )
 
-                new_sounding_matrix[i, ..., this_field_index] = numpy.exp(
-                    this_interp_object(
-                        storm_elevations_m_asl[i] + height_levels_m_agl)
-                )
-            else:
-                this_interp_object = scipy_interp1d(
-                    x=orig_sounding_matrix[i, ..., pressure_index],
-                    y=orig_sounding_matrix[i, ..., this_field_index],
-                    kind='linear', bounds_error=False, fill_value='extrapolate',
-                    assume_sorted=False)
-
-                new_sounding_matrix[i, ..., this_field_index] = (
-                    this_interp_object(
-                        new_sounding_matrix[i, ..., pressure_index]
-                    )
-                )
+    other_field_indices = numpy.array([
+        field_names.index(f) for f in field_names_to_interp
+        if f != PRESSURE_NAME
+    ], dtype=int)
+
+    new_sounding_matrix[..., other_field_indices] = _interp_soundings_linear(
+        x_matrix=orig_sounding_matrix[..., pressure_index],
+        y_matrix=orig_sounding_matrix[..., other_field_indices],
+        new_x_matrix=new_sounding_matrix[..., pressure_index]
+    )
 
     sounding_dict_height_coords[FIELD_NAMES_KEY] = field_names
     sounding_dict_height_coords[SOUNDING_MATRIX_KEY] = new_sounding_matrix
@@ -1044,7 +1117,7 @@ def interp_soundings_to_storm_objects(
         DEFAULT_LAG_TIME_FOR_CONVECTIVE_CONTAMINATION_SEC,
         wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
         wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
-        raise_error_if_missing=False):
+        raise_error_if_missing=False, grib_cache_dir_name=None):
     """Interpolates NWP sounding to each storm object at each lead time.
 
     :param storm_object_table: pandas DataFrame with columns listed in
@@ -1073,6 +1146,9 @@ def interp_soundings_to_storm_objects(
         and `raise_error_if_missing = True`, this method will error out.  If any
         grib file is missing and `raise_error_if_missing = False`, this method
         will carry on, leaving the affected values as NaN.
+    :param grib_cache_dir_name: Name of cache directory for decoded grib
+        fields (see doc for `grib_io.read_field_from_grib_file`).  If None,
+        there is no caching.
     :return: sounding_dict_by_lead_time: length-T list of dictionaries, each
         containing the keys listed in `_pressure_to_height_coords`.
     """
@@ -1117,7 +1193,8 @@ def interp_soundings_to_storm_objects(
         top_grib_directory_name=top_grib_directory_name, include_surface=False,
         model_name=model_name, use_all_grids=use_all_grids, grid_id=grid_id,
         wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
-        raise_error_if_missing=raise_error_if_missing)
+        raise_error_if_missing=raise_error_if_missing,
+        grib_cache_dir_name=grib_cache_dir_name)
     print(SEPARATOR_STRING)
 
     print('Converting interpolated values to soundings...')
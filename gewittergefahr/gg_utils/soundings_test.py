@@ -439,6 +439,32 @@ SOUNDING_DICT_P_COORDS_WITH_THETA_V = {
     soundings.FIELD_NAMES_KEY: NEW_FIELD_NAMES
 }
 
+# The following constants are used to test _interp_soundings_linear.
+X_MATRIX_FOR_INTERP = numpy.array([
+    [3, 1, 2],
+    [1, 2, 4]
+], dtype=float)
+
+Y_MATRIX_FOR_INTERP = numpy.expand_dims(numpy.array([
+    [30, 10, 20],
+    [5, 7, 100]
+], dtype=float), axis=-1)
+
+NEW_X_MATRIX_FOR_INTERP = numpy.array([
+    [0, 1.5, 4],
+    [0, 3, 1.5]
+])
+
+VALID_FLAG_MATRIX_FOR_INTERP = numpy.array([
+    [1, 1, 1],
+    [1, 1, 0]
+], dtype=bool)
+
+NEW_Y_MATRIX_FOR_INTERP = numpy.expand_dims(numpy.array([
+    [0, 15, 40],
+    [3, 9, 6]
+], dtype=float), axis=-1)
+
 # The following constants are used to test _fill_nans_in_soundings.
 THESE_PRESSURE_LEVELS_MB = numpy.array([
     500, 600, 700, 850, 925, 1000, numpy.nan
@@ -945,6 +971,18 @@ class SoundingsTests(unittest.TestCase):
             copy.deepcopy(SOUNDING_DICT_P_COORDS_WITH_THETA_V)
         ))
 
+    def test_interp_soundings_linear(self):
+        """Ensures correct output from _interp_soundings_linear."""
+
+        this_new_y_matrix = soundings._interp_soundings_linear(
+            x_matrix=X_MATRIX_FOR_INTERP, y_matrix=Y_MATRIX_FOR_INTERP,
+            new_x_matrix=NEW_X_MATRIX_FOR_INTERP,
+            valid_flag_matrix=VALID_FLAG_MATRIX_FOR_INTERP)
+
+        self.assertTrue(numpy.allclose(
+            this_new_y_matrix, NEW_Y_MATRIX_FOR_INTERP, atol=TOLERANCE
+        ))
+
     def test_fill_nans_in_soundings(self):
         """Ensures correct output from _fill_nans_in_soundings."""
 
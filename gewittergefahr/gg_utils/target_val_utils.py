@@ -7,6 +7,7 @@ from gewittergefahr.gg_io import netcdf_io
 from gewittergefahr.gg_io import tornado_io
 from gewittergefahr.gg_utils import linkage
 from gewittergefahr.gg_utils import number_rounding
+from gewittergefahr.gg_utils import general_utils
 from gewittergefahr.gg_utils import time_conversion
 from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
 from gewittergefahr.gg_utils import classification_utils as classifn_utils
@@ -210,6 +211,21 @@ def _find_dead_storms(storm_to_events_table, min_lead_time_sec):
     return numpy.where(remaining_lifetimes_sec < min_lead_time_sec)[0]
 
 
+def _flatten_event_column(storm_to_events_table, column_name):
+    """Concatenates one event variable over all storm objects.
+
+    :param storm_to_events_table: See doc for `linkage.read_linkage_file`.
+    :param column_name: Name of column with one array per storm object (e.g.,
+        "relative_event_times_unix_sec").
+    :return: flat_values: 1-D numpy array, containing the arrays for all storm
+        objects in order.
+    """
+
+    return numpy.concatenate(
+        [numpy.array([])] + storm_to_events_table[column_name].values.tolist()
+    )
+
+
 def target_params_to_name(
         min_lead_time_sec, max_lead_time_sec, min_link_distance_metres,
         max_link_distance_metres, tornadogenesis_only=None, min_fujita_rating=0,
@@ -448,24 +464,25 @@ def target_name_to_num_classes(target_name, include_dead_storms=False):
     return len(wind_speed_cutoffs_kt) + 1 + int(include_dead_storms)
 
 
-def create_wind_regression_targets(
-        storm_to_winds_table, min_lead_time_sec=DEFAULT_MIN_LEAD_TIME_SEC,
-        max_lead_time_sec=DEFAULT_MAX_LEAD_TIME_SEC,
-        min_link_distance_metres=DEFAULT_MIN_LINK_DISTANCE_METRES,
-        max_link_distance_metres=DEFAULT_MAX_LINK_DISTANCE_METRES,
-        percentile_level=DEFAULT_WIND_SPEED_PERCENTILE_LEVEL, test_mode=False):
-    """For each storm object, creates regression target based on wind speed.
+def create_wind_targets(storm_to_winds_table, target_names, test_mode=False):
+    """For each storm object, creates many targets based on wind speed.
+
+    Wind observations linked to all storm objects are flattened into one array,
+    sorted by storm object and then by speed.  Thus, each target needs only one
+    mask (lead-time window and distance buffer) and one segment reduction,
+    rather than a loop over storm objects.
 
     :param storm_to_winds_table: See doc for `linkage.read_linkage_file`.
-    :param min_lead_time_sec: See doc for `_check_target_params`.
-    :param max_lead_time_sec: Same.
-    :param min_link_distance_metres: Same.
-    :param max_link_distance_metres: Same.
-    :param percentile_level: Same.
+    :param target_names: 1-D list with names of wind-based target variables
+        (regression or classification).  See `target_params_to_name` for
+        format.
     :param test_mode: Just leave this alone.
-    :return: storm_to_winds_table: Same as input, but with additional column
-        containing target values.  The name of this column is determined by
-        `target_params_to_name`.
+    :return: storm_to_winds_table: Same as input, but with one additional
+        column for each target variable.  For each classification target, the
+        regression target with the same parameters (lead-time window, distance
+        buffer, and percentile level) is also added.
+    :raises: ValueError: if any element of `target_names` is not a wind-based
+        target.
     """
 
     error_checking.assert_is_boolean(test_mode)
@@ -473,89 +490,134 @@ def create_wind_regression_targets(
         error_string = 'This method does not yet handle merging predecessors!'
         raise ValueError(error_string)
 
-    target_param_dict = _check_target_params(
-        min_lead_time_sec=min_lead_time_sec,
-        max_lead_time_sec=max_lead_time_sec,
-        min_link_distance_metres=min_link_distance_metres,
-        max_link_distance_metres=max_link_distance_metres,
-        wind_speed_percentile_level=percentile_level,
-        wind_speed_cutoffs_kt=None)
-
-    min_link_distance_metres = target_param_dict[MIN_LINKAGE_DISTANCE_KEY]
-    max_link_distance_metres = target_param_dict[MAX_LINKAGE_DISTANCE_KEY]
-    percentile_level = target_param_dict[PERCENTILE_LEVEL_KEY]
+    error_checking.assert_is_string_list(target_names)
+    target_param_dicts = [target_name_to_params(n) for n in target_names]
 
-    end_of_period_indices = _find_storms_near_end_of_period(
-        storm_to_events_table=storm_to_winds_table,
-        max_lead_time_sec=max_lead_time_sec)
+    for this_name, this_param_dict in zip(target_names, target_param_dicts):
+        if (this_param_dict is not None and
+                this_param_dict[EVENT_TYPE_KEY] == linkage.WIND_EVENT_STRING):
+            continue
 
-    dead_storm_indices = _find_dead_storms(
-        storm_to_events_table=storm_to_winds_table,
-        min_lead_time_sec=min_lead_time_sec)
+        error_string = '"{0:s}" is not a valid wind-based target.'.format(
+            this_name)
+        raise ValueError(error_string)
 
     num_storm_objects = len(storm_to_winds_table.index)
-    labels_m_s01 = numpy.full(num_storm_objects, numpy.nan)
-    labels_m_s01[end_of_period_indices] = INVALID_STORM_INTEGER
-    labels_m_s01[dead_storm_indices] = DEAD_STORM_INTEGER
+    num_winds_by_storm = numpy.array([
+        len(t) for t in
+        storm_to_winds_table[linkage.RELATIVE_EVENT_TIMES_COLUMN].values
+    ], dtype=int)
+
+    storm_indices = numpy.repeat(
+        numpy.linspace(
+            0, num_storm_objects - 1, num=num_storm_objects, dtype=int
+        ),
+        num_winds_by_storm
+    )
 
-    for i in range(num_storm_objects):
-        if i in end_of_period_indices or i in dead_storm_indices:
-            continue
+    relative_times_sec = _flatten_event_column(
+        storm_to_winds_table, linkage.RELATIVE_EVENT_TIMES_COLUMN)
+    link_distances_metres = _flatten_event_column(
+        storm_to_winds_table, linkage.LINKAGE_DISTANCES_COLUMN)
+    wind_speeds_m_s01 = numpy.sqrt(
+        _flatten_event_column(storm_to_winds_table, linkage.U_WINDS_COLUMN)
+        ** 2 +
+        _flatten_event_column(storm_to_winds_table, linkage.V_WINDS_COLUMN)
+        ** 2
+    )
 
-        these_relative_times_sec = storm_to_winds_table[
-            linkage.RELATIVE_EVENT_TIMES_COLUMN].values[i]
+    # Sorting once by storm object, then by speed, keeps every masked subset
+    # sorted too.
+    sort_indices = numpy.lexsort((wind_speeds_m_s01, storm_indices))
+    storm_indices = storm_indices[sort_indices]
+    relative_times_sec = relative_times_sec[sort_indices]
+    link_distances_metres = link_distances_metres[sort_indices]
+    wind_speeds_m_s01 = wind_speeds_m_s01[sort_indices]
+
+    new_column_dict = {}
+
+    for this_name, this_param_dict in zip(target_names, target_param_dicts):
+        this_min_lead_time_sec = this_param_dict[MIN_LEAD_TIME_KEY]
+        this_max_lead_time_sec = this_param_dict[MAX_LEAD_TIME_KEY]
+        this_min_distance_metres = this_param_dict[MIN_LINKAGE_DISTANCE_KEY]
+        this_max_distance_metres = this_param_dict[MAX_LINKAGE_DISTANCE_KEY]
+
+        this_regression_name = target_params_to_name(
+            min_lead_time_sec=this_min_lead_time_sec,
+            max_lead_time_sec=this_max_lead_time_sec,
+            min_link_distance_metres=this_min_distance_metres,
+            max_link_distance_metres=this_max_distance_metres,
+            wind_speed_percentile_level=this_param_dict[PERCENTILE_LEVEL_KEY],
+            wind_speed_cutoffs_kt=None)
+
+        if this_regression_name not in new_column_dict:
+            these_good_flags = numpy.logical_and(
+                numpy.logical_and(
+                    relative_times_sec >= this_min_lead_time_sec,
+                    relative_times_sec <= this_max_lead_time_sec
+                ),
+                numpy.logical_and(
+                    link_distances_metres >= this_min_distance_metres,
+                    link_distances_metres <= this_max_distance_metres
+                )
+            )
 
-        these_link_distances_metres = storm_to_winds_table[
-            linkage.LINKAGE_DISTANCES_COLUMN].values[i]
+            these_labels_m_s01 = general_utils.get_segment_percentiles(
+                sorted_values=wind_speeds_m_s01[these_good_flags],
+                sorted_segment_indices=storm_indices[these_good_flags],
+                num_segments=num_storm_objects,
+                percentile_levels=numpy.array(
+                    [this_param_dict[PERCENTILE_LEVEL_KEY]], dtype=float
+                )
+            )[:, 0]
+
+            these_labels_m_s01[numpy.isnan(these_labels_m_s01)] = (
+                INVALID_STORM_INTEGER
+            )
 
-        these_good_time_flags = numpy.logical_and(
-            these_relative_times_sec >= min_lead_time_sec,
-            these_relative_times_sec <= max_lead_time_sec)
+            these_end_of_period_indices = _find_storms_near_end_of_period(
+                storm_to_events_table=storm_to_winds_table,
+                max_lead_time_sec=this_max_lead_time_sec)
+            these_labels_m_s01[these_end_of_period_indices] = (
+                INVALID_STORM_INTEGER
+            )
 
-        these_good_distance_flags = numpy.logical_and(
-            these_link_distances_metres >= min_link_distance_metres,
-            these_link_distances_metres <= max_link_distance_metres)
+            these_dead_storm_indices = _find_dead_storms(
+                storm_to_events_table=storm_to_winds_table,
+                min_lead_time_sec=this_min_lead_time_sec)
+            these_labels_m_s01[these_dead_storm_indices] = DEAD_STORM_INTEGER
 
-        these_good_indices = numpy.where(numpy.logical_and(
-            these_good_time_flags, these_good_distance_flags
-        ))[0]
+            new_column_dict[this_regression_name] = these_labels_m_s01
 
-        if len(these_good_indices == 0):
-            # labels_m_s01[i] = 0.
-            labels_m_s01[i] = INVALID_STORM_INTEGER
+        if this_param_dict[WIND_SPEED_CUTOFFS_KEY] is None:
             continue
 
-        these_wind_speeds_m_s01 = numpy.sqrt(
-            storm_to_winds_table[linkage.U_WINDS_COLUMN].values[i][
-                these_good_indices] ** 2 +
-            storm_to_winds_table[linkage.V_WINDS_COLUMN].values[i][
-                these_good_indices] ** 2
-        )
+        these_labels_m_s01 = new_column_dict[this_regression_name] + 0.
+        these_invalid_flags = these_labels_m_s01 == INVALID_STORM_INTEGER
+        these_dead_flags = these_labels_m_s01 == DEAD_STORM_INTEGER
+        these_labels_m_s01[these_invalid_flags] = 0.
+        these_labels_m_s01[these_dead_flags] = 0.
 
-        labels_m_s01[i] = numpy.percentile(
-            these_wind_speeds_m_s01, percentile_level)
+        these_classes = classifn_utils.classify_values(
+            input_values=these_labels_m_s01,
+            class_cutoffs=
+            this_param_dict[WIND_SPEED_CUTOFFS_KEY] * KT_TO_METRES_PER_SECOND,
+            non_negative_only=True)
 
-    target_name = target_params_to_name(
-        min_lead_time_sec=min_lead_time_sec,
-        max_lead_time_sec=max_lead_time_sec,
-        min_link_distance_metres=min_link_distance_metres,
-        max_link_distance_metres=max_link_distance_metres,
-        wind_speed_percentile_level=percentile_level,
-        wind_speed_cutoffs_kt=None)
+        these_classes[these_invalid_flags] = INVALID_STORM_INTEGER
+        these_classes[these_dead_flags] = DEAD_STORM_INTEGER
+        new_column_dict[this_name] = these_classes
 
-    return storm_to_winds_table.assign(**{
-        target_name: labels_m_s01
-    })
+    return storm_to_winds_table.assign(**new_column_dict)
 
 
-def create_wind_classification_targets(
+def create_wind_regression_targets(
         storm_to_winds_table, min_lead_time_sec=DEFAULT_MIN_LEAD_TIME_SEC,
         max_lead_time_sec=DEFAULT_MAX_LEAD_TIME_SEC,
         min_link_distance_metres=DEFAULT_MIN_LINK_DISTANCE_METRES,
         max_link_distance_metres=DEFAULT_MAX_LINK_DISTANCE_METRES,
-        percentile_level=DEFAULT_WIND_SPEED_PERCENTILE_LEVEL,
-        class_cutoffs_kt=DEFAULT_WIND_SPEED_CUTOFFS_KT, test_mode=False):
-    """For each storm object, creates classification target based on wind speed.
+        percentile_level=DEFAULT_WIND_SPEED_PERCENTILE_LEVEL, test_mode=False):
+    """For each storm object, creates regression target based on wind speed.
 
     :param storm_to_winds_table: See doc for `linkage.read_linkage_file`.
     :param min_lead_time_sec: See doc for `_check_target_params`.
@@ -563,32 +625,12 @@ def create_wind_classification_targets(
     :param min_link_distance_metres: Same.
     :param max_link_distance_metres: Same.
     :param percentile_level: Same.
-    :param class_cutoffs_kt: Same.
     :param test_mode: Just leave this alone.
     :return: storm_to_winds_table: Same as input, but with additional column
         containing target values.  The name of this column is determined by
         `target_params_to_name`.
     """
 
-    target_param_dict = _check_target_params(
-        min_lead_time_sec=min_lead_time_sec,
-        max_lead_time_sec=max_lead_time_sec,
-        min_link_distance_metres=min_link_distance_metres,
-        max_link_distance_metres=max_link_distance_metres,
-        wind_speed_percentile_level=percentile_level,
-        wind_speed_cutoffs_kt=class_cutoffs_kt)
-
-    class_cutoffs_kt = target_param_dict[WIND_SPEED_CUTOFFS_KEY]
-    class_cutoffs_m_s01 = class_cutoffs_kt * KT_TO_METRES_PER_SECOND
-
-    storm_to_winds_table = create_wind_regression_targets(
-        storm_to_winds_table=storm_to_winds_table,
-        min_lead_time_sec=min_lead_time_sec,
-        max_lead_time_sec=max_lead_time_sec,
-        min_link_distance_metres=min_link_distance_metres,
-        max_link_distance_metres=max_link_distance_metres,
-        percentile_level=percentile_level, test_mode=test_mode)
-
     target_name = target_params_to_name(
         min_lead_time_sec=min_lead_time_sec,
         max_lead_time_sec=max_lead_time_sec,
@@ -597,24 +639,32 @@ def create_wind_classification_targets(
         wind_speed_percentile_level=percentile_level,
         wind_speed_cutoffs_kt=None)
 
-    regression_labels_m_s01 = storm_to_winds_table[target_name].values
+    return create_wind_targets(
+        storm_to_winds_table=storm_to_winds_table, target_names=[target_name],
+        test_mode=test_mode)
 
-    invalid_storm_indices = numpy.where(
-        regression_labels_m_s01 == INVALID_STORM_INTEGER
-    )[0]
-    dead_storm_indices = numpy.where(
-        regression_labels_m_s01 == DEAD_STORM_INTEGER
-    )[0]
 
-    regression_labels_m_s01[invalid_storm_indices] = 0.
-    regression_labels_m_s01[dead_storm_indices] = 0.
-
-    storm_classes = classifn_utils.classify_values(
-        input_values=regression_labels_m_s01, class_cutoffs=class_cutoffs_m_s01,
-        non_negative_only=True)
+def create_wind_classification_targets(
+        storm_to_winds_table, min_lead_time_sec=DEFAULT_MIN_LEAD_TIME_SEC,
+        max_lead_time_sec=DEFAULT_MAX_LEAD_TIME_SEC,
+        min_link_distance_metres=DEFAULT_MIN_LINK_DISTANCE_METRES,
+        max_link_distance_metres=DEFAULT_MAX_LINK_DISTANCE_METRES,
+        percentile_level=DEFAULT_WIND_SPEED_PERCENTILE_LEVEL,
+        class_cutoffs_kt=DEFAULT_WIND_SPEED_CUTOFFS_KT, test_mode=False):
+    """For each storm object, creates classification target based on wind speed.
 
-    storm_classes[invalid_storm_indices] = INVALID_STORM_INTEGER
-    storm_classes[dead_storm_indices] = DEAD_STORM_INTEGER
+    :param storm_to_winds_table: See doc for `linkage.read_linkage_file`.
+    :param min_lead_time_sec: See doc for `_check_target_params`.
+    :param max_lead_time_sec: Same.
+    :param min_link_distance_metres: Same.
+    :param max_link_distance_metres: Same.
+    :param percentile_level: Same.
+    :param class_cutoffs_kt: Same.
+    :param test_mode: Just leave this alone.
+    :return: storm_to_winds_table: Same as input, but with additional column
+        containing target values.  The name of this column is determined by
+        `target_params_to_name`.
+    """
 
     target_name = target_params_to_name(
         min_lead_time_sec=min_lead_time_sec,
@@ -624,7 +674,9 @@ def create_wind_classification_targets(
         wind_speed_percentile_level=percentile_level,
         wind_speed_cutoffs_kt=class_cutoffs_kt)
 
-    return storm_to_winds_table.assign(**{target_name: storm_classes})
+    return create_wind_targets(
+        storm_to_winds_table=storm_to_winds_table, target_names=[target_name],
+        test_mode=test_mode)
 
 
 def create_tornado_targets(
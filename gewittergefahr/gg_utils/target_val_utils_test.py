@@ -193,6 +193,60 @@ MAIN_TORNADOGENESIS_TARGET_VALUES = numpy.array(
     [0, 0, INVALID_STORM_INTEGER, 1, INVALID_STORM_INTEGER], dtype=int
 )
 
+# The following constants are used to test create_wind_targets.
+THESE_TIMES_UNIX_SEC = numpy.array([0, 0, 0, 0, 0], dtype=int)
+THESE_TRACKING_END_TIMES_UNIX_SEC = numpy.array(
+    [7200, 7200, 7200, 7200, 7200], dtype=int
+)
+THESE_CELL_END_TIMES_UNIX_SEC = numpy.array(
+    [7200, 7200, 7200, 600, 7200], dtype=int
+)
+
+THESE_RELATIVE_TIMES_UNIX_SEC = [
+    numpy.array([1000, 2000, 3000]), numpy.array([0, 4000]),
+    numpy.array([1800, 1800]), numpy.array([1000]), numpy.array([])
+]
+THESE_LINK_DIST_METRES = [
+    numpy.array([100, 100, 100]), numpy.array([100, 100]),
+    numpy.array([0, 2000]), numpy.array([100]), numpy.array([])
+]
+THESE_U_WINDS_M_S01 = [
+    numpy.array([20, 10, 30]), numpy.array([50, 50]),
+    numpy.array([50, 6]), numpy.array([40]), numpy.array([])
+]
+THESE_V_WINDS_M_S01 = [
+    numpy.array([0, 0, 0]), numpy.array([0, 0]),
+    numpy.array([0, 8]), numpy.array([0]), numpy.array([])
+]
+
+for k in range(len(THESE_TIMES_UNIX_SEC)):
+    THESE_RELATIVE_TIMES_UNIX_SEC[k] = THESE_RELATIVE_TIMES_UNIX_SEC[k].astype(
+        int)
+    THESE_LINK_DIST_METRES[k] = THESE_LINK_DIST_METRES[k].astype(float)
+    THESE_U_WINDS_M_S01[k] = THESE_U_WINDS_M_S01[k].astype(float)
+    THESE_V_WINDS_M_S01[k] = THESE_V_WINDS_M_S01[k].astype(float)
+
+THIS_DICT = {
+    tracking_utils.VALID_TIME_COLUMN: THESE_TIMES_UNIX_SEC,
+    tracking_utils.TRACKING_END_TIME_COLUMN: THESE_TRACKING_END_TIMES_UNIX_SEC,
+    tracking_utils.CELL_END_TIME_COLUMN: THESE_CELL_END_TIMES_UNIX_SEC,
+    linkage.RELATIVE_EVENT_TIMES_COLUMN: THESE_RELATIVE_TIMES_UNIX_SEC,
+    linkage.LINKAGE_DISTANCES_COLUMN: THESE_LINK_DIST_METRES,
+    linkage.U_WINDS_COLUMN: THESE_U_WINDS_M_S01,
+    linkage.V_WINDS_COLUMN: THESE_V_WINDS_M_S01
+}
+
+STORM_TO_WINDS_TABLE = pandas.DataFrame.from_dict(THIS_DICT)
+
+DEAD_STORM_INTEGER = target_val_utils.DEAD_STORM_INTEGER
+WIND_REGRESSION_VALUES_M_S01 = numpy.array(
+    [29.5, INVALID_STORM_INTEGER, 10, DEAD_STORM_INTEGER, INVALID_STORM_INTEGER]
+)
+WIND_CLASSIFICATION_VALUES = numpy.array(
+    [5, INVALID_STORM_INTEGER, 1, DEAD_STORM_INTEGER, INVALID_STORM_INTEGER],
+    dtype=int
+)
+
 # The following constants are used to test find_target_file.
 TOP_DIRECTORY_NAME = 'target_values'
 FILE_TIME_UNIX_SEC = 1517523991  # 222631 1 Feb 2018
@@ -435,6 +489,35 @@ class TargetValUtilsTests(unittest.TestCase):
             this_dict, WIND_CLASSIFICATION_PARAM_DICT_0LEAD
         ))
 
+    def test_create_wind_targets(self):
+        """Ensures correct output from create_wind_targets."""
+
+        this_storm_to_winds_table = target_val_utils.create_wind_targets(
+            storm_to_winds_table=copy.deepcopy(STORM_TO_WINDS_TABLE),
+            target_names=[WIND_CLASSIFICATION_NAME], test_mode=True)
+
+        self.assertTrue(numpy.allclose(
+            this_storm_to_winds_table[WIND_REGRESSION_NAME].values,
+            WIND_REGRESSION_VALUES_M_S01, atol=TOLERANCE
+        ))
+        self.assertTrue(numpy.array_equal(
+            this_storm_to_winds_table[WIND_CLASSIFICATION_NAME].values,
+            WIND_CLASSIFICATION_VALUES
+        ))
+
+    def test_create_wind_targets_bad_name(self):
+        """Ensures correct output from create_wind_targets.
+
+        In this case, one target name is not wind-based, so this method should
+        raise an error.
+        """
+
+        with self.assertRaises(ValueError):
+            target_val_utils.create_wind_targets(
+                storm_to_winds_table=copy.deepcopy(STORM_TO_WINDS_TABLE),
+                target_names=[WIND_REGRESSION_NAME, TORNADO_TARGET_NAME],
+                test_mode=True)
+
     def test_create_tornado_targets_occurrence(self):
         """Ensures correct output from create_tornado_targets.
 
@@ -1543,6 +1543,222 @@ class TemporalTrackingPredsuccTests(unittest.TestCase):
                 these_predecessor_rows, these_expected_rows
             ))
 
+    def test_create_graph_index_first(self):
+        """Ensures correct output from create_graph_index.
+
+        In this case, working on the first table.  The graph index does not
+        depend on max time difference, and no immediate predecessor or successor
+        in this table is > 5 seconds away from the target object.
+        """
+
+        this_graph_index_dict = temporal_tracking.create_graph_index(
+            FIRST_STORM_OBJECT_TABLE)
+
+        this_num_storm_objects = len(FIRST_STORM_OBJECT_TABLE.index)
+
+        for i in range(this_num_storm_objects):
+            this_first_index = this_graph_index_dict[
+                temporal_tracking.PREDECESSOR_INDPTR_KEY][i]
+            this_last_index = this_graph_index_dict[
+                temporal_tracking.PREDECESSOR_INDPTR_KEY][i + 1]
+
+            these_predecessor_rows = numpy.sort(this_graph_index_dict[
+                temporal_tracking.PREDECESSOR_ROWS_KEY
+            ][this_first_index:this_last_index])
+
+            these_expected_rows = numpy.sort(numpy.array(
+                FIRST_IMMED_PREDECESSOR_DICT_5SEC[i], dtype=int
+            ))
+
+            self.assertTrue(numpy.array_equal(
+                these_predecessor_rows, these_expected_rows
+            ))
+
+            this_first_index = this_graph_index_dict[
+                temporal_tracking.SUCCESSOR_INDPTR_KEY][i]
+            this_last_index = this_graph_index_dict[
+                temporal_tracking.SUCCESSOR_INDPTR_KEY][i + 1]
+
+            these_successor_rows = numpy.sort(this_graph_index_dict[
+                temporal_tracking.SUCCESSOR_ROWS_KEY
+            ][this_first_index:this_last_index])
+
+            these_expected_rows = numpy.sort(numpy.array(
+                FIRST_IMMED_SUCCESSOR_DICT_5SEC[i], dtype=int
+            ))
+
+            self.assertTrue(numpy.array_equal(
+                these_successor_rows, these_expected_rows
+            ))
+
+    def test_find_predecessors_many_first_5sec(self):
+        """Ensures correct output from find_predecessors_many.
+
+        In this case, working on the first table with max time difference =
+        5 seconds.
+        """
+
+        this_num_storm_objects = len(FIRST_STORM_OBJECT_TABLE.index)
+
+        these_predecessor_rows_by_target = (
+            temporal_tracking.find_predecessors_many(
+                storm_object_table=FIRST_STORM_OBJECT_TABLE,
+                target_rows=numpy.linspace(
+                    0, this_num_storm_objects - 1, num=this_num_storm_objects,
+                    dtype=int),
+                num_seconds_back=5)
+        )
+
+        for i in range(this_num_storm_objects):
+            these_predecessor_rows = numpy.sort(
+                these_predecessor_rows_by_target[i]
+            )
+            these_expected_rows = numpy.sort(numpy.array(
+                FIRST_PREDECESSOR_DICT_5SEC[i], dtype=int
+            ))
+
+            self.assertTrue(numpy.array_equal(
+                these_predecessor_rows, these_expected_rows
+            ))
+
+    def test_find_successors_many_first_5sec(self):
+        """Ensures correct output from find_successors_many.
+
+        In this case, working on the first table with max time difference =
+        5 seconds.
+        """
+
+        this_num_storm_objects = len(FIRST_STORM_OBJECT_TABLE.index)
+
+        these_successor_rows_by_target = temporal_tracking.find_successors_many(
+            storm_object_table=FIRST_STORM_OBJECT_TABLE,
+            target_rows=numpy.linspace(
+                0, this_num_storm_objects - 1, num=this_num_storm_objects,
+                dtype=int),
+            num_seconds_forward=5)
+
+        for i in range(this_num_storm_objects):
+            these_successor_rows = numpy.sort(
+                these_successor_rows_by_target[i]
+            )
+            these_expected_rows = numpy.sort(numpy.array(
+                FIRST_SUCCESSOR_DICT_5SEC[i], dtype=int
+            ))
+
+            self.assertTrue(numpy.array_equal(
+                these_successor_rows, these_expected_rows
+            ))
+
+    def test_find_predecessors_many_second_15sec(self):
+        """Ensures correct output from find_predecessors_many.
+
+        In this case, working on the second table with max time difference =
+        15 seconds.
+        """
+
+        this_num_storm_objects = len(SECOND_STORM_OBJECT_TABLE.index)
+
+        these_predecessor_rows_by_target = (
+            temporal_tracking.find_predecessors_many(
+                storm_object_table=SECOND_STORM_OBJECT_TABLE,
+                target_rows=numpy.linspace(
+                    0, this_num_storm_objects - 1, num=this_num_storm_objects,
+                    dtype=int),
+                num_seconds_back=15)
+        )
+
+        for i in range(this_num_storm_objects):
+            these_predecessor_rows = numpy.sort(
+                these_predecessor_rows_by_target[i]
+            )
+            these_expected_rows = numpy.sort(numpy.array(
+                SECOND_PREDECESSOR_DICT_15SEC[i], dtype=int
+            ))
+
+            self.assertTrue(numpy.array_equal(
+                these_predecessor_rows, these_expected_rows
+            ))
+
+    def test_find_many_all_change_types(self):
+        """Ensures that bulk methods match single-object methods.
+
+        In this case, trying every combination of time difference, max number
+        of secondary-ID changes, change type, and `return_all_on_path`.
+        """
+
+        for this_table in [FIRST_STORM_OBJECT_TABLE, SECOND_STORM_OBJECT_TABLE]:
+            this_graph_index_dict = temporal_tracking.create_graph_index(
+                this_table)
+            this_num_storm_objects = len(this_table.index)
+            these_target_rows = numpy.linspace(
+                0, this_num_storm_objects - 1, num=this_num_storm_objects,
+                dtype=int)
+
+            for this_num_seconds in [1, 5, 15]:
+                for this_max_changes in [0, 1, 2]:
+                    for this_change_type_string in (
+                            temporal_tracking.SECONDARY_ID_CHANGE_TYPE_STRINGS
+                    ):
+                        for this_return_all_flag in [False, True]:
+                            these_pred_rows_by_target = (
+                                temporal_tracking.find_predecessors_many(
+                                    storm_object_table=this_table,
+                                    target_rows=these_target_rows,
+                                    num_seconds_back=this_num_seconds,
+                                    max_num_sec_id_changes=this_max_changes,
+                                    change_type_string=this_change_type_string,
+                                    return_all_on_path=this_return_all_flag,
+                                    graph_index_dict=this_graph_index_dict)
+                            )
+
+                            these_succ_rows_by_target = (
+                                temporal_tracking.find_successors_many(
+                                    storm_object_table=this_table,
+                                    target_rows=these_target_rows,
+                                    num_seconds_forward=this_num_seconds,
+                                    max_num_sec_id_changes=this_max_changes,
+                                    change_type_string=this_change_type_string,
+                                    return_all_on_path=this_return_all_flag,
+                                    graph_index_dict=this_graph_index_dict)
+                            )
+
+                            for i in these_target_rows:
+                                these_expected_rows = (
+                                    temporal_tracking.find_predecessors(
+                                        storm_object_table=this_table,
+                                        target_row=i,
+                                        num_seconds_back=this_num_seconds,
+                                        max_num_sec_id_changes=
+                                        this_max_changes,
+                                        change_type_string=
+                                        this_change_type_string,
+                                        return_all_on_path=
+                                        this_return_all_flag)
+                                )
+
+                                self.assertTrue(numpy.array_equal(
+                                    these_pred_rows_by_target[i],
+                                    these_expected_rows
+                                ))
+
+                                these_expected_rows = (
+                                    temporal_tracking.find_successors(
+                                        storm_object_table=this_table,
+                                        target_row=i,
+                                        num_seconds_forward=this_num_seconds,
+                                        max_num_sec_id_changes=
+                                        this_max_changes,
+                                        change_type_string=
+                                        this_change_type_string,
+                                        return_all_on_path=
+                                        this_return_all_flag)
+                                )
+
+                                self.assertTrue(numpy.array_equal(
+                                    these_succ_rows_by_target[i],
+                                    these_expected_rows
+                                ))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,177 @@
+"""Benchmarks event-to-storm linkage with and without spatial index.
+
+This script creates a synthetic day of storm objects and wind observations,
+then times `linkage._find_nearest_storms_one_time` with and without the
+spatial index.  The spatial index pairs events with nearby storm vertices via
+k-d trees, drops storms whose bounding box does not contain the event, and
+tests each remaining storm polygon against all of its candidate events at once.
+"""
+
+import time
+import argparse
+import numpy
+import pandas
+from gewittergefahr.gg_utils import linkage
+from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
+
+NUM_VERTICES_PER_STORM = 25
+DOMAIN_SIZE_METRES = 4e6
+MIN_STORM_RADIUS_METRES = 3000.
+MAX_STORM_RADIUS_METRES = 15000.
+
+NUM_STORMS_ARG_NAME = 'num_storms_per_time'
+NUM_EVENTS_ARG_NAME = 'num_events_per_time'
+NUM_TIMES_ARG_NAME = 'num_times'
+MAX_DISTANCE_ARG_NAME = 'max_link_distance_metres'
+CHECK_ARG_NAME = 'check_equality'
+
+NUM_STORMS_HELP_STRING = 'Number of storm cells at each time.'
+NUM_EVENTS_HELP_STRING = 'Number of wind observations at each time.'
+NUM_TIMES_HELP_STRING = 'Number of interpolation times.'
+MAX_DISTANCE_HELP_STRING = 'Max linkage distance.'
+CHECK_HELP_STRING = (
+    'Boolean flag.  If 1, will make sure that both methods return the same '
+    'linkages.')
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_STORMS_ARG_NAME, type=int, required=False, default=2000,
+    help=NUM_STORMS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_EVENTS_ARG_NAME, type=int, required=False, default=10000,
+    help=NUM_EVENTS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_TIMES_ARG_NAME, type=int, required=False, default=5,
+    help=NUM_TIMES_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + MAX_DISTANCE_ARG_NAME, type=float, required=False,
+    default=linkage.DEFAULT_MAX_WIND_DISTANCE_METRES,
+    help=MAX_DISTANCE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + CHECK_ARG_NAME, type=int, required=False, default=1,
+    help=CHECK_HELP_STRING)
+
+
+def _create_vertex_table(num_storms):
+    """Creates synthetic storm outlines at one time.
+
+    :param num_storms: Number of storm cells.
+    :return: interp_vertex_table: See doc for
+        `linkage._interp_storms_in_time`.
+    """
+
+    centroid_x_coords_metres = numpy.random.uniform(
+        low=0., high=DOMAIN_SIZE_METRES, size=num_storms)
+    centroid_y_coords_metres = numpy.random.uniform(
+        low=0., high=DOMAIN_SIZE_METRES, size=num_storms)
+    radii_metres = numpy.random.uniform(
+        low=MIN_STORM_RADIUS_METRES, high=MAX_STORM_RADIUS_METRES,
+        size=num_storms)
+
+    angles_radians = numpy.linspace(
+        0, 2 * numpy.pi, num=NUM_VERTICES_PER_STORM)
+
+    vertex_x_coords_metres = (
+        centroid_x_coords_metres[:, numpy.newaxis] +
+        radii_metres[:, numpy.newaxis] * numpy.cos(angles_radians)
+    )
+    vertex_y_coords_metres = (
+        centroid_y_coords_metres[:, numpy.newaxis] +
+        radii_metres[:, numpy.newaxis] * numpy.sin(angles_radians)
+    )
+
+    secondary_id_strings = numpy.repeat(
+        numpy.array(['{0:06d}'.format(k) for k in range(num_storms)],
+                    dtype=object),
+        NUM_VERTICES_PER_STORM
+    )
+
+    return pandas.DataFrame.from_dict({
+        tracking_utils.SECONDARY_ID_COLUMN: secondary_id_strings,
+        linkage.STORM_VERTEX_X_COLUMN: numpy.ravel(vertex_x_coords_metres),
+        linkage.STORM_VERTEX_Y_COLUMN: numpy.ravel(vertex_y_coords_metres)
+    })
+
+
+def _run(num_storms_per_time, num_events_per_time, num_times,
+         max_link_distance_metres, check_equality):
+    """Benchmarks event-to-storm linkage with and without spatial index.
+
+    This is effectively the main method.
+
+    :param num_storms_per_time: See documentation at top of file.
+    :param num_events_per_time: Same.
+    :param num_times: Same.
+    :param max_link_distance_metres: Same.
+    :param check_equality: Same.
+    """
+
+    numpy.random.seed(6695)
+    indexed_time_sec = 0.
+    brute_force_time_sec = 0.
+
+    for i in range(num_times):
+        this_vertex_table = _create_vertex_table(num_storms_per_time)
+        these_event_x_metres = numpy.random.uniform(
+            low=0., high=DOMAIN_SIZE_METRES, size=num_events_per_time)
+        these_event_y_metres = numpy.random.uniform(
+            low=0., high=DOMAIN_SIZE_METRES, size=num_events_per_time)
+
+        exec_start_time_unix_sec = time.time()
+        these_indexed_id_strings, these_indexed_distances_metres = (
+            linkage._find_nearest_storms_one_time(
+                interp_vertex_table=this_vertex_table,
+                event_x_coords_metres=these_event_x_metres,
+                event_y_coords_metres=these_event_y_metres,
+                max_link_distance_metres=max_link_distance_metres,
+                use_spatial_index=True)
+        )
+        indexed_time_sec += time.time() - exec_start_time_unix_sec
+
+        exec_start_time_unix_sec = time.time()
+        these_brute_id_strings, these_brute_distances_metres = (
+            linkage._find_nearest_storms_one_time(
+                interp_vertex_table=this_vertex_table,
+                event_x_coords_metres=these_event_x_metres,
+                event_y_coords_metres=these_event_y_metres,
+                max_link_distance_metres=max_link_distance_metres,
+                use_spatial_index=False)
+        )
+        brute_force_time_sec += time.time() - exec_start_time_unix_sec
+
+        print((
+            'Time {0:d} of {1:d} ... cumulative elapsed time with index = '
+            '{2:.4f} s ... without index = {3:.4f} s'
+        ).format(
+            i + 1, num_times, indexed_time_sec, brute_force_time_sec
+        ))
+
+        if not check_equality:
+            continue
+
+        assert these_indexed_id_strings == these_brute_id_strings
+        assert numpy.array_equal(
+            these_indexed_distances_metres, these_brute_distances_metres,
+            equal_nan=True
+        )
+
+    print('Speedup from spatial index = {0:.2f}x'.format(
+        brute_force_time_sec / indexed_time_sec
+    ))
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        num_storms_per_time=getattr(INPUT_ARG_OBJECT, NUM_STORMS_ARG_NAME),
+        num_events_per_time=getattr(INPUT_ARG_OBJECT, NUM_EVENTS_ARG_NAME),
+        num_times=getattr(INPUT_ARG_OBJECT, NUM_TIMES_ARG_NAME),
+        max_link_distance_metres=getattr(
+            INPUT_ARG_OBJECT, MAX_DISTANCE_ARG_NAME),
+        check_equality=bool(getattr(INPUT_ARG_OBJECT, CHECK_ARG_NAME))
+    )
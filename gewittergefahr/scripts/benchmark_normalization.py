@@ -0,0 +1,234 @@
+"""Benchmarks normalization of radar images.
+
+This script creates a synthetic batch of 3-D GridRad images (dimensions
+E x M x N x H_r x F_r) and a synthetic normalization file, then times
+`deep_learning_utils.normalize_radar_images` against the original method,
+which reads the normalization file and loops over fields for every batch.
+Both methods do the same input checks, so the comparison is like-for-like.
+The time for `deep_learning_utils.Normalizer.normalize` alone (no checks or
+lookup of the normalizer) is also reported.
+"""
+
+import os
+import copy
+import time
+import shutil
+import tempfile
+import argparse
+import numpy
+import pandas
+from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import error_checking
+from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
+
+FIELD_NAMES = [
+    radar_utils.REFL_NAME, radar_utils.SPECTRUM_WIDTH_NAME,
+    radar_utils.VORTICITY_NAME, radar_utils.DIVERGENCE_NAME
+]
+
+NUM_EXAMPLES_ARG_NAME = 'num_examples_per_batch'
+NUM_ROWS_ARG_NAME = 'num_grid_rows'
+NUM_COLUMNS_ARG_NAME = 'num_grid_columns'
+NUM_HEIGHTS_ARG_NAME = 'num_heights'
+NUM_BATCHES_ARG_NAME = 'num_batches'
+
+NUM_EXAMPLES_HELP_STRING = 'Number of examples per batch.'
+NUM_ROWS_HELP_STRING = 'Number of rows in each radar image.'
+NUM_COLUMNS_HELP_STRING = 'Number of columns in each radar image.'
+NUM_HEIGHTS_HELP_STRING = 'Number of heights in each radar image.'
+NUM_BATCHES_HELP_STRING = 'Number of batches to normalize.'
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_EXAMPLES_ARG_NAME, type=int, required=False, default=512,
+    help=NUM_EXAMPLES_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_ROWS_ARG_NAME, type=int, required=False, default=32,
+    help=NUM_ROWS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_COLUMNS_ARG_NAME, type=int, required=False, default=32,
+    help=NUM_COLUMNS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_HEIGHTS_ARG_NAME, type=int, required=False, default=12,
+    help=NUM_HEIGHTS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_BATCHES_ARG_NAME, type=int, required=False, default=20,
+    help=NUM_BATCHES_HELP_STRING)
+
+
+def _write_normalization_file(pickle_file_name):
+    """Writes synthetic normalization file.
+
+    :param pickle_file_name: Path to output file.
+    """
+
+    num_fields = len(FIELD_NAMES)
+    mean_values = numpy.random.uniform(low=-10., high=10., size=num_fields)
+    standard_deviations = numpy.random.uniform(
+        low=1., high=10., size=num_fields)
+
+    table_no_height = pandas.DataFrame.from_dict({
+        dl_utils.MEAN_VALUE_COLUMN: mean_values,
+        dl_utils.STANDARD_DEVIATION_COLUMN: standard_deviations,
+        dl_utils.MIN_VALUE_COLUMN: mean_values - 3 * standard_deviations,
+        dl_utils.MAX_VALUE_COLUMN: mean_values + 3 * standard_deviations
+    })
+    table_no_height.index = FIELD_NAMES
+
+    table_with_height = pandas.DataFrame.from_dict({
+        dl_utils.MEAN_VALUE_COLUMN: mean_values,
+        dl_utils.STANDARD_DEVIATION_COLUMN: standard_deviations
+    })
+    table_with_height.index = pandas.MultiIndex.from_tuples(
+        [(f, 1000) for f in FIELD_NAMES]
+    )
+
+    dl_utils.write_normalization_params(
+        pickle_file_name=pickle_file_name,
+        radar_table_no_height=table_no_height,
+        radar_table_with_height=table_with_height,
+        sounding_table_no_height=table_no_height,
+        sounding_table_with_height=table_with_height)
+
+
+def _normalize_with_loop(radar_image_matrix, normalization_param_file_name):
+    """Normalizes radar images, one field at a time.
+
+    This is the original implementation of
+    `deep_learning_utils.normalize_radar_images`, for z-score normalization,
+    including its input checks.
+
+    :param radar_image_matrix: See doc for
+        `deep_learning_utils.normalize_radar_images`.
+    :param normalization_param_file_name: Same.
+    :return: radar_image_matrix: Same.
+    """
+
+    normalization_table = dl_utils.read_normalization_params_from_file(
+        normalization_param_file_name
+    )[0]
+
+    dl_utils.check_radar_images(
+        radar_image_matrix=radar_image_matrix, min_num_dimensions=4,
+        max_num_dimensions=5)
+    num_fields = radar_image_matrix.shape[-1]
+
+    error_checking.assert_is_string_list(FIELD_NAMES)
+    error_checking.assert_is_numpy_array(
+        numpy.array(FIELD_NAMES), exact_dimensions=numpy.array([num_fields])
+    )
+
+    for j in range(num_fields):
+        this_mean = normalization_table[
+            dl_utils.MEAN_VALUE_COLUMN].loc[FIELD_NAMES[j]]
+        this_standard_deviation = normalization_table[
+            dl_utils.STANDARD_DEVIATION_COLUMN].loc[FIELD_NAMES[j]]
+
+        radar_image_matrix[..., j] = (
+            (radar_image_matrix[..., j] - this_mean) /
+            this_standard_deviation)
+
+    return radar_image_matrix
+
+
+def _run(num_examples_per_batch, num_grid_rows, num_grid_columns, num_heights,
+         num_batches):
+    """Benchmarks normalization of radar images.
+
+    This is effectively the main method.
+
+    :param num_examples_per_batch: See documentation at top of file.
+    :param num_grid_rows: Same.
+    :param num_grid_columns: Same.
+    :param num_heights: Same.
+    :param num_batches: Same.
+    """
+
+    numpy.random.seed(6695)
+
+    temp_dir_name = tempfile.mkdtemp()
+    normalization_file_name = '{0:s}/normalization_params.p'.format(
+        temp_dir_name)
+    _write_normalization_file(normalization_file_name)
+
+    radar_image_matrix = numpy.random.uniform(
+        low=-20., high=70., size=(
+            num_examples_per_batch, num_grid_rows, num_grid_columns,
+            num_heights, len(FIELD_NAMES)
+        )
+    ).astype(numpy.float32)
+
+    print('Batch dimensions = {0:s} ... size = {1:.1f} MB'.format(
+        str(radar_image_matrix.shape), radar_image_matrix.nbytes * 1e-6
+    ))
+
+    normalizer_object = dl_utils.get_normalizer(
+        normalization_param_file_name=normalization_file_name,
+        field_names=FIELD_NAMES,
+        normalization_type_string=dl_utils.Z_NORMALIZATION_TYPE_STRING)
+
+    loop_time_sec = 0.
+    normalizer_time_sec = 0.
+    kernel_time_sec = 0.
+
+    try:
+        for i in range(num_batches):
+            this_loop_matrix = copy.deepcopy(radar_image_matrix)
+            this_normalizer_matrix = copy.deepcopy(radar_image_matrix)
+            this_kernel_matrix = copy.deepcopy(radar_image_matrix)
+
+            exec_start_time_unix_sec = time.time()
+            this_loop_matrix = _normalize_with_loop(
+                radar_image_matrix=this_loop_matrix,
+                normalization_param_file_name=normalization_file_name)
+            loop_time_sec += time.time() - exec_start_time_unix_sec
+
+            exec_start_time_unix_sec = time.time()
+            this_normalizer_matrix = dl_utils.normalize_radar_images(
+                radar_image_matrix=this_normalizer_matrix,
+                field_names=FIELD_NAMES,
+                normalization_type_string=dl_utils.Z_NORMALIZATION_TYPE_STRING,
+                normalization_param_file_name=normalization_file_name)
+            normalizer_time_sec += time.time() - exec_start_time_unix_sec
+
+            exec_start_time_unix_sec = time.time()
+            this_kernel_matrix = normalizer_object.normalize(this_kernel_matrix)
+            kernel_time_sec += time.time() - exec_start_time_unix_sec
+
+            assert numpy.allclose(
+                this_loop_matrix, this_normalizer_matrix, atol=1e-4)
+            assert numpy.allclose(
+                this_loop_matrix, this_kernel_matrix, atol=1e-4)
+    finally:
+        if os.path.isdir(temp_dir_name):
+            shutil.rmtree(temp_dir_name)
+
+    print((
+        'Mean time per batch with loop = {0:.4f} s ... with normalizer = '
+        '{1:.4f} s ... speedup = {2:.2f}x'
+    ).format(
+        loop_time_sec / num_batches, normalizer_time_sec / num_batches,
+        loop_time_sec / normalizer_time_sec
+    ))
+
+    print((
+        'Mean time per batch for `Normalizer.normalize` alone = {0:.4f} s'
+    ).format(
+        kernel_time_sec / num_batches
+    ))
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        num_examples_per_batch=getattr(INPUT_ARG_OBJECT, NUM_EXAMPLES_ARG_NAME),
+        num_grid_rows=getattr(INPUT_ARG_OBJECT, NUM_ROWS_ARG_NAME),
+        num_grid_columns=getattr(INPUT_ARG_OBJECT, NUM_COLUMNS_ARG_NAME),
+        num_heights=getattr(INPUT_ARG_OBJECT, NUM_HEIGHTS_ARG_NAME),
+        num_batches=getattr(INPUT_ARG_OBJECT, NUM_BATCHES_ARG_NAME)
+    )
@@ -0,0 +1,588 @@
+"""Benchmarks conversion of echo-top maxima from points to polygons.
+
+This script creates a synthetic echo-top field with many storms (similar to a
+busy convective day), finds local maxima, then times
+`echo_top_tracking._local_maxima_to_polygons` against the original method,
+which assigns grid cells to local maxima one cell at a time and then finds grid
+points one region at a time.  Outputs from the two methods must be equal.
+"""
+
+import copy
+import time
+import argparse
+import numpy
+from scipy.stats import mode as scipy_mode
+from skimage.measure import label as label_image
+from gewittergefahr.gg_utils import echo_top_tracking
+from gewittergefahr.gg_utils import temporal_tracking
+from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import grids
+from gewittergefahr.gg_utils import projections
+from gewittergefahr.gg_utils import polygons
+
+NW_GRID_POINT_LATITUDE_DEG = 55.
+NW_GRID_POINT_LONGITUDE_DEG = 230.
+GRID_SPACING_DEG = 0.01
+MIN_ECHO_TOP_KM = echo_top_tracking.DEFAULT_MIN_ECHO_TOP_KM
+
+NUM_ROWS_ARG_NAME = 'num_grid_rows'
+NUM_COLUMNS_ARG_NAME = 'num_grid_columns'
+NUM_STORMS_ARG_NAME = 'num_storms'
+
+NUM_ROWS_HELP_STRING = 'Number of rows in radar grid.'
+NUM_COLUMNS_HELP_STRING = 'Number of columns in radar grid.'
+NUM_STORMS_HELP_STRING = 'Number of synthetic storms (echo-top blobs).'
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_ROWS_ARG_NAME, type=int, required=False, default=1000,
+    help=NUM_ROWS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_COLUMNS_ARG_NAME, type=int, required=False, default=2000,
+    help=NUM_COLUMNS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_STORMS_ARG_NAME, type=int, required=False, default=1000,
+    help=NUM_STORMS_HELP_STRING)
+
+
+def _create_echo_tops(num_grid_rows, num_grid_columns, num_storms):
+    """Creates synthetic echo-top field.
+
+    M = number of rows in radar grid
+    N = number of columns in radar grid
+
+    :param num_grid_rows: M in the above discussion.
+    :param num_grid_columns: N in the above discussion.
+    :param num_storms: See documentation at top of file.
+    :return: echo_top_matrix_km: M-by-N numpy array of echo tops.
+    :return: radar_metadata_dict: Dictionary in format returned by
+        `myrorss_and_mrms_io.read_metadata_from_raw_file`.
+    """
+
+    row_index_matrix, column_index_matrix = numpy.meshgrid(
+        numpy.linspace(0, num_grid_rows - 1, num=num_grid_rows),
+        numpy.linspace(0, num_grid_columns - 1, num=num_grid_columns),
+        indexing='ij'
+    )
+
+    echo_top_matrix_km = numpy.full((num_grid_rows, num_grid_columns), 0.)
+
+    for _ in range(num_storms):
+        this_row = numpy.random.uniform(low=0., high=num_grid_rows - 1)
+        this_column = numpy.random.uniform(low=0., high=num_grid_columns - 1)
+        this_radius_pixels = numpy.random.uniform(low=3., high=15.)
+        this_max_echo_top_km = numpy.random.uniform(low=5., high=15.)
+
+        these_distances_pixels2 = (
+            (row_index_matrix - this_row) ** 2 +
+            (column_index_matrix - this_column) ** 2
+        )
+
+        echo_top_matrix_km = numpy.maximum(
+            echo_top_matrix_km,
+            this_max_echo_top_km *
+            numpy.exp(-these_distances_pixels2 / (2 * this_radius_pixels ** 2))
+        )
+
+    radar_metadata_dict = {
+        radar_utils.NW_GRID_POINT_LAT_COLUMN: NW_GRID_POINT_LATITUDE_DEG,
+        radar_utils.NW_GRID_POINT_LNG_COLUMN: NW_GRID_POINT_LONGITUDE_DEG,
+        radar_utils.LAT_SPACING_COLUMN: GRID_SPACING_DEG,
+        radar_utils.LNG_SPACING_COLUMN: GRID_SPACING_DEG,
+        radar_utils.NUM_LAT_COLUMN: num_grid_rows,
+        radar_utils.NUM_LNG_COLUMN: num_grid_columns
+    }
+
+    return echo_top_matrix_km, radar_metadata_dict
+
+
+def _make_regions_contiguous_orig(
+        region_to_grid_rows, region_to_grid_columns, grid_cell_to_region,
+        num_grid_rows, num_grid_columns):
+    """Makes regions (local maxima) contiguous.
+
+    This is the original implementation of
+    `echo_top_tracking._make_regions_contiguous`, which handles one region and
+    one grid cell at a time.
+
+    :param region_to_grid_rows: 1-D list, where the [k]th element is a numpy
+        array with row indices of grid cells in the [k]th region.
+    :param region_to_grid_columns: Same but for columns.
+    :param grid_cell_to_region: Double-indexed dictionary.  If key [i, j] has
+        value k, grid cell [i, j] belongs to region k.
+    :param num_grid_rows: Number of rows in radar grid.
+    :param num_grid_columns: Number of columns in radar grid.
+    :return: radar_to_region_matrix: See doc for
+        `echo_top_tracking._make_regions_contiguous`.
+    """
+
+    num_maxima = len(region_to_grid_rows)
+    radar_to_region_matrix = numpy.full(
+        (num_grid_rows, num_grid_columns), -1, dtype=int
+    )
+
+    for k in range(num_maxima):
+        radar_to_region_matrix[
+            region_to_grid_rows[k], region_to_grid_columns[k]
+        ] = k
+
+        if len(region_to_grid_rows[k]) == 1:
+            continue
+
+        isolated_rows = []
+        isolated_columns = []
+
+        for i, j in zip(region_to_grid_rows[k], region_to_grid_columns[k]):
+            neigh_row_flags = numpy.logical_and(
+                region_to_grid_rows[k] >= i - 1, region_to_grid_rows[k] <= i + 1
+            )
+            neigh_column_flags = numpy.logical_and(
+                region_to_grid_columns[k] >= j - 1,
+                region_to_grid_columns[k] <= j + 1
+            )
+
+            num_neighbours = -1 + numpy.sum(numpy.logical_and(
+                neigh_row_flags, neigh_column_flags
+            ))
+
+            if num_neighbours > 0:
+                continue
+
+            isolated_rows.append(i)
+            isolated_columns.append(j)
+
+        isolated_rows = numpy.array(isolated_rows, dtype=int)
+        isolated_columns = numpy.array(isolated_columns, dtype=int)
+
+        for i, j in zip(isolated_rows, isolated_columns):
+            these_region_indices = []
+
+            for i_new in range(i - 1, i + 2):
+                for j_new in range(j - 1, j + 2):
+                    if (i_new, j_new) in grid_cell_to_region:
+                        these_region_indices.append(
+                            grid_cell_to_region[i_new, j_new]
+                        )
+                    else:
+                        these_region_indices.append(numpy.nan)
+
+            these_region_indices = numpy.array(these_region_indices)
+            these_region_indices[these_region_indices == k] = numpy.nan
+            this_mode_object = scipy_mode(
+                these_region_indices, axis=None, nan_policy='omit')
+
+            radar_to_region_matrix[i, j] = int(numpy.round(
+                this_mode_object.mode
+            ))
+
+    return radar_to_region_matrix
+
+
+def _local_maxima_to_regions_orig(
+        local_max_dict, echo_top_matrix_km, min_echo_top_km,
+        radar_latitudes_deg, radar_longitudes_deg):
+    """Converts local maxima at one time from points to regions.
+
+    This is the original implementation of
+    `echo_top_tracking._local_maxima_to_regions`, which handles one grid cell
+    at a time.
+
+    :param local_max_dict: See doc for
+        `echo_top_tracking._local_maxima_to_regions`.
+    :param echo_top_matrix_km: Same.
+    :param min_echo_top_km: Same.
+    :param radar_latitudes_deg: Same.
+    :param radar_longitudes_deg: Same.
+    :return: radar_to_region_matrix: Same.
+    """
+
+    orig_region_id_matrix = label_image(
+        echo_top_matrix_km >= min_echo_top_km, connectivity=2)
+    rows_in_any_region, columns_in_any_region = numpy.where(
+        orig_region_id_matrix > 0)
+
+    num_maxima = len(local_max_dict[temporal_tracking.LATITUDES_KEY])
+
+    region_to_grid_rows = [None] * num_maxima
+    region_to_grid_columns = [None] * num_maxima
+    grid_cell_to_regions = {}
+
+    for k in range(num_maxima):
+        this_row = numpy.argmin(numpy.absolute(
+            local_max_dict[temporal_tracking.LATITUDES_KEY][k] -
+            radar_latitudes_deg
+        ))
+
+        this_column = numpy.argmin(numpy.absolute(
+            local_max_dict[temporal_tracking.LONGITUDES_KEY][k] -
+            radar_longitudes_deg
+        ))
+
+        this_region_id = orig_region_id_matrix[this_row, this_column]
+
+        if this_region_id == 0:
+            region_to_grid_rows[k] = numpy.array([this_row], dtype=int)
+            region_to_grid_columns[k] = numpy.array([this_column], dtype=int)
+        else:
+            these_subindices = numpy.where(
+                orig_region_id_matrix[rows_in_any_region, columns_in_any_region]
+                == this_region_id
+            )
+
+            region_to_grid_rows[k] = rows_in_any_region[these_subindices]
+            region_to_grid_columns[k] = columns_in_any_region[these_subindices]
+
+        for i, j in zip(region_to_grid_rows[k], region_to_grid_columns[k]):
+            if (i, j) in grid_cell_to_regions:
+                grid_cell_to_regions[i, j].append(k)
+            else:
+                grid_cell_to_regions[i, j] = [k]
+
+    for this_key in grid_cell_to_regions:
+        grid_cell_to_regions[this_key] = numpy.array(
+            grid_cell_to_regions[this_key], dtype=int
+        )
+
+    these_keys = list(grid_cell_to_regions.keys())
+    rows_in_any_region = numpy.array([a[0] for a in these_keys], dtype=int)
+    columns_in_any_region = numpy.array([a[1] for a in these_keys], dtype=int)
+
+    projection_object = projections.init_azimuthal_equidistant_projection(
+        central_latitude_deg=numpy.mean(radar_latitudes_deg),
+        central_longitude_deg=numpy.mean(radar_longitudes_deg)
+    )
+
+    x_in_any_region_metres, y_in_any_region_metres = (
+        projections.project_latlng_to_xy(
+            latitudes_deg=radar_latitudes_deg[rows_in_any_region],
+            longitudes_deg=radar_longitudes_deg[columns_in_any_region],
+            projection_object=projection_object)
+    )
+
+    point_x_coords_metres, point_y_coords_metres = (
+        projections.project_latlng_to_xy(
+            latitudes_deg=local_max_dict[temporal_tracking.LATITUDES_KEY],
+            longitudes_deg=local_max_dict[temporal_tracking.LONGITUDES_KEY],
+            projection_object=projection_object)
+    )
+
+    region_to_grid_rows = [numpy.array([], dtype=int)] * num_maxima
+    region_to_grid_columns = [numpy.array([], dtype=int)] * num_maxima
+    grid_cell_to_region = {}
+
+    for m in range(len(rows_in_any_region)):
+        i = rows_in_any_region[m]
+        j = columns_in_any_region[m]
+        these_region_indices = grid_cell_to_regions[i, j]
+
+        if len(these_region_indices) == 1:
+            k = these_region_indices[0]
+        else:
+            these_x_diffs_metres = (
+                x_in_any_region_metres[m] -
+                point_x_coords_metres[these_region_indices]
+            )
+
+            these_y_diffs_metres = (
+                y_in_any_region_metres[m] -
+                point_y_coords_metres[these_region_indices]
+            )
+
+            these_distances_metres2 = (
+                these_x_diffs_metres ** 2 + these_y_diffs_metres ** 2
+            )
+
+            k = these_region_indices[numpy.nanargmin(these_distances_metres2)]
+
+        region_to_grid_rows[k] = numpy.concatenate((
+            region_to_grid_rows[k], numpy.array([i], dtype=int)
+        ))
+        region_to_grid_columns[k] = numpy.concatenate((
+            region_to_grid_columns[k], numpy.array([j], dtype=int)
+        ))
+        grid_cell_to_region[i, j] = k
+
+    return _make_regions_contiguous_orig(
+        region_to_grid_rows=region_to_grid_rows,
+        region_to_grid_columns=region_to_grid_columns,
+        grid_cell_to_region=grid_cell_to_region,
+        num_grid_rows=echo_top_matrix_km.shape[0],
+        num_grid_columns=echo_top_matrix_km.shape[1]
+    )
+
+
+def _local_maxima_to_polygons_orig(
+        local_max_dict, echo_top_matrix_km, min_echo_top_km,
+        radar_metadata_dict, recompute_centroids=True):
+    """Converts local maxima at one time from points to polygons.
+
+    This is the original implementation of
+    `echo_top_tracking._local_maxima_to_polygons`, which finds grid points one
+    region at a time.
+
+    :param local_max_dict: See doc for
+        `echo_top_tracking._local_maxima_to_polygons`.
+    :param echo_top_matrix_km: Same.
+    :param min_echo_top_km: Same.
+    :param radar_metadata_dict: Same.
+    :param recompute_centroids: Same.
+    :return: local_max_dict: Same.
+    """
+
+    latitude_extent_deg = (
+        radar_metadata_dict[radar_utils.LAT_SPACING_COLUMN] *
+        (radar_metadata_dict[radar_utils.NUM_LAT_COLUMN] - 1)
+    )
+
+    min_latitude_deg = (
+        radar_metadata_dict[radar_utils.NW_GRID_POINT_LAT_COLUMN] -
+        latitude_extent_deg
+    )
+
+    radar_latitudes_deg, radar_longitudes_deg = grids.get_latlng_grid_points(
+        min_latitude_deg=min_latitude_deg,
+        min_longitude_deg=radar_metadata_dict[
+            radar_utils.NW_GRID_POINT_LNG_COLUMN],
+        lat_spacing_deg=radar_metadata_dict[radar_utils.LAT_SPACING_COLUMN],
+        lng_spacing_deg=radar_metadata_dict[radar_utils.LNG_SPACING_COLUMN],
+        num_rows=radar_metadata_dict[radar_utils.NUM_LAT_COLUMN],
+        num_columns=radar_metadata_dict[radar_utils.NUM_LNG_COLUMN]
+    )
+
+    radar_latitudes_deg = radar_latitudes_deg[::-1]
+
+    radar_to_region_matrix = _local_maxima_to_regions_orig(
+        local_max_dict=local_max_dict, echo_top_matrix_km=echo_top_matrix_km,
+        min_echo_top_km=min_echo_top_km,
+        radar_latitudes_deg=radar_latitudes_deg,
+        radar_longitudes_deg=radar_longitudes_deg)
+
+    num_maxima = len(local_max_dict[temporal_tracking.LATITUDES_KEY])
+
+    local_max_dict[temporal_tracking.GRID_POINT_ROWS_KEY] = [[]] * num_maxima
+    local_max_dict[temporal_tracking.GRID_POINT_COLUMNS_KEY] = [[]] * num_maxima
+    local_max_dict[temporal_tracking.GRID_POINT_LATITUDES_KEY] = (
+        [[]] * num_maxima
+    )
+    local_max_dict[temporal_tracking.GRID_POINT_LONGITUDES_KEY] = (
+        [[]] * num_maxima
+    )
+    local_max_dict[temporal_tracking.POLYGON_OBJECTS_ROWCOL_KEY] = numpy.full(
+        num_maxima, numpy.nan, dtype=object
+    )
+    local_max_dict[temporal_tracking.POLYGON_OBJECTS_LATLNG_KEY] = numpy.full(
+        num_maxima, numpy.nan, dtype=object
+    )
+
+    good_indices = []
+
+    for k in range(num_maxima):
+        (local_max_dict[temporal_tracking.GRID_POINT_ROWS_KEY][k],
+         local_max_dict[temporal_tracking.GRID_POINT_COLUMNS_KEY][k]
+        ) = numpy.where(radar_to_region_matrix == k)
+
+        if len(local_max_dict[temporal_tracking.GRID_POINT_ROWS_KEY][k]) == 0:
+            continue
+
+        good_indices.append(k)
+
+        these_vertex_rows, these_vertex_columns = (
+            polygons.grid_points_in_poly_to_vertices(
+                grid_point_row_indices=local_max_dict[
+                    temporal_tracking.GRID_POINT_ROWS_KEY][k],
+                grid_point_column_indices=local_max_dict[
+                    temporal_tracking.GRID_POINT_COLUMNS_KEY][k]
+            )
+        )
+
+        (local_max_dict[temporal_tracking.GRID_POINT_LATITUDES_KEY][k],
+         local_max_dict[temporal_tracking.GRID_POINT_LONGITUDES_KEY][k]
+        ) = radar_utils.rowcol_to_latlng(
+            grid_rows=local_max_dict[temporal_tracking.GRID_POINT_ROWS_KEY][k],
+            grid_columns=local_max_dict[
+                temporal_tracking.GRID_POINT_COLUMNS_KEY][k],
+            nw_grid_point_lat_deg=radar_metadata_dict[
+                radar_utils.NW_GRID_POINT_LAT_COLUMN],
+            nw_grid_point_lng_deg=radar_metadata_dict[
+                radar_utils.NW_GRID_POINT_LNG_COLUMN],
+            lat_spacing_deg=radar_metadata_dict[
+                radar_utils.LAT_SPACING_COLUMN],
+            lng_spacing_deg=radar_metadata_dict[radar_utils.LNG_SPACING_COLUMN]
+        )
+
+        these_vertex_latitudes_deg, these_vertex_longitudes_deg = (
+            radar_utils.rowcol_to_latlng(
+                grid_rows=these_vertex_rows, grid_columns=these_vertex_columns,
+                nw_grid_point_lat_deg=radar_metadata_dict[
+                    radar_utils.NW_GRID_POINT_LAT_COLUMN],
+                nw_grid_point_lng_deg=radar_metadata_dict[
+                    radar_utils.NW_GRID_POINT_LNG_COLUMN],
+                lat_spacing_deg=radar_metadata_dict[
+                    radar_utils.LAT_SPACING_COLUMN],
+                lng_spacing_deg=radar_metadata_dict[
+                    radar_utils.LNG_SPACING_COLUMN]
+            )
+        )
+
+        local_max_dict[temporal_tracking.POLYGON_OBJECTS_ROWCOL_KEY][k] = (
+            polygons.vertex_arrays_to_polygon_object(
+                exterior_x_coords=these_vertex_columns,
+                exterior_y_coords=these_vertex_rows)
+        )
+
+        local_max_dict[temporal_tracking.POLYGON_OBJECTS_LATLNG_KEY][k] = (
+            polygons.vertex_arrays_to_polygon_object(
+                exterior_x_coords=these_vertex_longitudes_deg,
+                exterior_y_coords=these_vertex_latitudes_deg)
+        )
+
+        if not recompute_centroids:
+            continue
+
+        this_centroid_object_latlng = local_max_dict[
+            temporal_tracking.POLYGON_OBJECTS_LATLNG_KEY
+        ][k].centroid
+
+        local_max_dict[temporal_tracking.LATITUDES_KEY][k] = (
+            this_centroid_object_latlng.y
+        )
+        local_max_dict[temporal_tracking.LONGITUDES_KEY][k] = (
+            this_centroid_object_latlng.x
+        )
+
+    if len(good_indices) == num_maxima:
+        return local_max_dict
+
+    print((
+        'REMOVED {0:d} of {1:d} regions (presumably because it was not '
+        'contiguous).'
+    ).format(
+        num_maxima - len(good_indices), num_maxima
+    ))
+
+    good_indices = numpy.array(good_indices, dtype=int)
+
+    for this_key in local_max_dict:
+        if isinstance(local_max_dict[this_key], list):
+            local_max_dict[this_key] = [
+                local_max_dict[this_key][k] for k in good_indices
+            ]
+        elif isinstance(local_max_dict[this_key], numpy.ndarray):
+            local_max_dict[this_key] = local_max_dict[this_key][good_indices]
+
+    return local_max_dict
+
+
+def _compare_outputs(first_local_max_dict, second_local_max_dict):
+    """Ensures that two versions of `local_max_dict` are equal.
+
+    :param first_local_max_dict: Dictionary created by
+        `echo_top_tracking._local_maxima_to_polygons`.
+    :param second_local_max_dict: Same.
+    """
+
+    assert set(first_local_max_dict.keys()) == set(second_local_max_dict.keys())
+
+    for this_key in first_local_max_dict:
+        these_first_values = first_local_max_dict[this_key]
+        these_second_values = second_local_max_dict[this_key]
+        assert len(these_first_values) == len(these_second_values)
+
+        if this_key in [
+                temporal_tracking.POLYGON_OBJECTS_ROWCOL_KEY,
+                temporal_tracking.POLYGON_OBJECTS_LATLNG_KEY
+        ]:
+            for a, b in zip(these_first_values, these_second_values):
+                assert numpy.array_equal(
+                    numpy.array(a.exterior.coords),
+                    numpy.array(b.exterior.coords)
+                )
+
+            continue
+
+        if isinstance(these_first_values, list):
+            for a, b in zip(these_first_values, these_second_values):
+                assert numpy.array_equal(a, b)
+
+            continue
+
+        assert numpy.array_equal(these_first_values, these_second_values)
+
+
+def _run(num_grid_rows, num_grid_columns, num_storms):
+    """Benchmarks conversion of echo-top maxima from points to polygons.
+
+    This is effectively the main method.
+
+    :param num_grid_rows: See documentation at top of file.
+    :param num_grid_columns: Same.
+    :param num_storms: Same.
+    """
+
+    numpy.random.seed(6695)
+
+    echo_top_matrix_km, radar_metadata_dict = _create_echo_tops(
+        num_grid_rows=num_grid_rows, num_grid_columns=num_grid_columns,
+        num_storms=num_storms)
+
+    echo_top_matrix_km[echo_top_matrix_km < MIN_ECHO_TOP_KM] = 0.
+
+    half_width_pixels = int(numpy.round(
+        echo_top_tracking.DEFAULT_HALF_WIDTH_FOR_MAX_FILTER_DEG_LAT /
+        GRID_SPACING_DEG
+    ))
+
+    local_max_dict = echo_top_tracking._find_local_maxima(
+        radar_matrix=echo_top_matrix_km + 0.,
+        radar_metadata_dict=radar_metadata_dict,
+        neigh_half_width_pixels=half_width_pixels)
+
+    good_indices = numpy.where(
+        local_max_dict[echo_top_tracking.MAX_VALUES_KEY] >= MIN_ECHO_TOP_KM
+    )[0]
+
+    for this_key in local_max_dict:
+        local_max_dict[this_key] = local_max_dict[this_key][good_indices]
+
+    print((
+        'Grid dimensions = {0:d} x {1:d} ... number of local maxima = {2:d}'
+    ).format(
+        num_grid_rows, num_grid_columns, len(good_indices)
+    ))
+
+    exec_start_time_unix_sec = time.time()
+    orig_local_max_dict = _local_maxima_to_polygons_orig(
+        local_max_dict=copy.deepcopy(local_max_dict),
+        echo_top_matrix_km=echo_top_matrix_km,
+        min_echo_top_km=MIN_ECHO_TOP_KM,
+        radar_metadata_dict=radar_metadata_dict)
+    orig_time_sec = time.time() - exec_start_time_unix_sec
+
+    exec_start_time_unix_sec = time.time()
+    new_local_max_dict = echo_top_tracking._local_maxima_to_polygons(
+        local_max_dict=copy.deepcopy(local_max_dict),
+        echo_top_matrix_km=echo_top_matrix_km,
+        min_echo_top_km=MIN_ECHO_TOP_KM,
+        radar_metadata_dict=radar_metadata_dict)
+    new_time_sec = time.time() - exec_start_time_unix_sec
+
+    _compare_outputs(orig_local_max_dict, new_local_max_dict)
+
+    print((
+        'Time with original method = {0:.2f} s ... with labelled regions = '
+        '{1:.2f} s ... speedup = {2:.2f}x'
+    ).format(
+        orig_time_sec, new_time_sec, orig_time_sec / new_time_sec
+    ))
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        num_grid_rows=getattr(INPUT_ARG_OBJECT, NUM_ROWS_ARG_NAME),
+        num_grid_columns=getattr(INPUT_ARG_OBJECT, NUM_COLUMNS_ARG_NAME),
+        num_storms=getattr(INPUT_ARG_OBJECT, NUM_STORMS_ARG_NAME)
+    )
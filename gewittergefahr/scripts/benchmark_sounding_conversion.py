@@ -0,0 +1,325 @@
+"""Benchmarks NaN-filling and pressure-to-height conversion of soundings.
+
+This script creates a synthetic set of soundings in pressure coordinates, then
+times `soundings._fill_nans_in_soundings` and
+`soundings._pressure_to_height_coords` against the original method, which
+interpolates one sounding and one field at a time.  Outputs from the two methods
+must be bitwise-equal.
+"""
+
+import copy
+import time
+import argparse
+import numpy
+from scipy.interpolate import interp1d as scipy_interp1d
+from gewittergefahr.gg_utils import soundings
+
+PRESSURE_LEVELS_MB = numpy.linspace(100, 1000, num=37)
+FIELD_NAMES = [
+    soundings.GEOPOTENTIAL_HEIGHT_NAME, soundings.U_WIND_NAME,
+    soundings.V_WIND_NAME, soundings.TEMPERATURE_NAME,
+    soundings.SPECIFIC_HUMIDITY_NAME
+]
+
+NUM_SOUNDINGS_ARG_NAME = 'num_soundings'
+NAN_FRACTION_ARG_NAME = 'nan_fraction'
+
+NUM_SOUNDINGS_HELP_STRING = (
+    'Number of soundings (storm objects times lead times).')
+NAN_FRACTION_HELP_STRING = (
+    'Fraction of sounding values to replace with NaN before NaN-filling.')
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_SOUNDINGS_ARG_NAME, type=int, required=False, default=20000,
+    help=NUM_SOUNDINGS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NAN_FRACTION_ARG_NAME, type=float, required=False, default=0.02,
+    help=NAN_FRACTION_HELP_STRING)
+
+
+def _create_soundings(num_soundings, nan_fraction):
+    """Creates synthetic soundings in pressure coordinates.
+
+    :param num_soundings: See documentation at top of file.
+    :param nan_fraction: Same.
+    :return: sounding_dict_pressure_coords: Dictionary in format required by
+        `soundings._fill_nans_in_soundings`, plus storm elevations.
+    """
+
+    pressure_matrix_mb = numpy.tile(PRESSURE_LEVELS_MB, (num_soundings, 1))
+    pressure_matrix_mb += numpy.random.normal(
+        loc=0., scale=2., size=pressure_matrix_mb.shape)
+
+    height_matrix_m_asl = 44331. * (
+        1. - (pressure_matrix_mb / 1013.25) ** 0.19
+    )
+    temperature_matrix_kelvins = (
+        288. - 0.0065 * height_matrix_m_asl +
+        numpy.random.normal(loc=0., scale=2., size=pressure_matrix_mb.shape)
+    )
+    spec_humidity_matrix_kg_kg01 = 0.015 * numpy.exp(
+        -height_matrix_m_asl / 2500
+    )
+
+    u_wind_matrix_m_s01 = numpy.random.normal(
+        loc=10., scale=10., size=pressure_matrix_mb.shape)
+    v_wind_matrix_m_s01 = numpy.random.normal(
+        loc=5., scale=10., size=pressure_matrix_mb.shape)
+
+    sounding_matrix = numpy.stack((
+        height_matrix_m_asl, u_wind_matrix_m_s01, v_wind_matrix_m_s01,
+        temperature_matrix_kelvins, spec_humidity_matrix_kg_kg01
+    ), axis=-1)
+
+    nan_flag_matrix = numpy.random.uniform(
+        low=0., high=1., size=sounding_matrix.shape
+    ) < nan_fraction
+    sounding_matrix[nan_flag_matrix] = numpy.nan
+
+    return {
+        soundings.FULL_IDS_KEY: [str(i) for i in range(num_soundings)],
+        soundings.INITIAL_TIMES_KEY: numpy.full(num_soundings, 0, dtype=int),
+        soundings.LEAD_TIMES_KEY: numpy.full(num_soundings, 0, dtype=int),
+        soundings.STORM_ELEVATIONS_KEY: numpy.random.uniform(
+            low=0., high=1500., size=num_soundings),
+        soundings.SOUNDING_MATRIX_KEY: sounding_matrix,
+        soundings.PRESSURE_LEVELS_WITH_SFC_KEY: PRESSURE_LEVELS_MB,
+        soundings.FIELD_NAMES_KEY: copy.deepcopy(FIELD_NAMES),
+        soundings.SURFACE_PRESSURES_KEY: None
+    }
+
+
+def _fill_nans_with_loop(sounding_matrix, pressure_matrix_pascals,
+                         min_num_pressure_levels_without_nan=15):
+    """Fills NaN's in each sounding, one sounding and field at a time.
+
+    This is the original implementation of `soundings._fill_nans_in_soundings`.
+
+    :param sounding_matrix: N-by-P-by-F numpy array of sounding values, with
+        fields in the order given by `FIELD_NAMES`.
+    :param pressure_matrix_pascals: N-by-P numpy array of pressures.
+    :param min_num_pressure_levels_without_nan: See doc for
+        `soundings._fill_nans_in_soundings`.
+    :return: sounding_matrix: Same as input, but keeping only soundings that
+        were not thrown out and with NaN's replaced.
+    """
+
+    height_index = FIELD_NAMES.index(soundings.GEOPOTENTIAL_HEIGHT_NAME)
+    num_soundings = sounding_matrix.shape[0]
+    keep_sounding_flags = numpy.full(num_soundings, True, dtype=bool)
+
+    for i in range(num_soundings):
+        for this_field_index in range(len(FIELD_NAMES)):
+            these_real_flags = numpy.invert(numpy.isnan(
+                sounding_matrix[i, :, this_field_index]
+            ))
+
+            if numpy.all(these_real_flags):
+                continue
+
+            if (numpy.sum(these_real_flags) <
+                    min_num_pressure_levels_without_nan):
+                keep_sounding_flags[i] = False
+                break
+
+            these_nan_indices = numpy.where(numpy.invert(these_real_flags))[0]
+            these_real_indices = numpy.where(these_real_flags)[0]
+
+            if this_field_index == height_index:
+                these_x_values = numpy.log(pressure_matrix_pascals[i, :])
+            else:
+                these_x_values = sounding_matrix[i, :, height_index]
+
+            interp_object = scipy_interp1d(
+                x=these_x_values[these_real_indices],
+                y=sounding_matrix[i, these_real_indices, this_field_index],
+                kind='linear', bounds_error=False, fill_value='extrapolate',
+                assume_sorted=False)
+
+            sounding_matrix[i, these_nan_indices, this_field_index] = (
+                interp_object(these_x_values[these_nan_indices])
+            )
+
+    return sounding_matrix[keep_sounding_flags, ...]
+
+
+def _height_interp_with_loop(
+        orig_sounding_matrix, pressure_matrix_pascals, storm_elevations_m_asl,
+        height_levels_m_agl):
+    """Interpolates soundings to height levels, one sounding at a time.
+
+    This is the interpolation step of the original implementation of
+    `soundings._pressure_to_height_coords`.
+
+    :param orig_sounding_matrix: N-by-P-by-F numpy array of sounding values,
+        with fields in the order given by `FIELD_NAMES`.
+    :param pressure_matrix_pascals: N-by-P numpy array of pressures.
+    :param storm_elevations_m_asl: length-N numpy array of storm elevations.
+    :param height_levels_m_agl: length-H numpy array of height levels.
+    :return: new_sounding_matrix: N-by-H-by-F numpy array of sounding values,
+        with pressure in place of geopotential height.
+    """
+
+    height_index = FIELD_NAMES.index(soundings.GEOPOTENTIAL_HEIGHT_NAME)
+    orig_height_matrix_m_asl = orig_sounding_matrix[..., height_index] + 0.
+    orig_sounding_matrix[..., height_index] = pressure_matrix_pascals + 0.
+
+    num_soundings = orig_sounding_matrix.shape[0]
+    num_fields = orig_sounding_matrix.shape[-1]
+    new_sounding_matrix = numpy.full(
+        (num_soundings, len(height_levels_m_agl), num_fields), numpy.nan
+    )
+
+    field_indices = [height_index] + [
+        j for j in range(num_fields) if j != height_index
+    ]
+
+    for this_field_index in field_indices:
+        for i in range(num_soundings):
+            if this_field_index == height_index:
+                this_interp_object = scipy_interp1d(
+                    x=orig_height_matrix_m_asl[i, ...],
+                    y=numpy.log(orig_sounding_matrix[i, ..., this_field_index]),
+                    kind='linear', bounds_error=False, fill_value='extrapolate',
+                    assume_sorted=False)
+
+                new_sounding_matrix[i, ..., this_field_index] = numpy.exp(
+                    this_interp_object(
+                        storm_elevations_m_asl[i] + height_levels_m_agl)
+                )
+            else:
+                this_interp_object = scipy_interp1d(
+                    x=orig_sounding_matrix[i, ..., height_index],
+                    y=orig_sounding_matrix[i, ..., this_field_index],
+                    kind='linear', bounds_error=False, fill_value='extrapolate',
+                    assume_sorted=False)
+
+                new_sounding_matrix[i, ..., this_field_index] = (
+                    this_interp_object(
+                        new_sounding_matrix[i, ..., height_index]
+                    )
+                )
+
+    return new_sounding_matrix
+
+
+def _are_bitwise_equal(first_matrix, second_matrix):
+    """Determines whether or not two arrays are bitwise-equal.
+
+    :param first_matrix: numpy array.
+    :param second_matrix: numpy array.
+    :return: are_arrays_equal: Boolean flag.
+    """
+
+    if first_matrix.shape != second_matrix.shape:
+        return False
+
+    first_nan_flags = numpy.isnan(first_matrix)
+    if not numpy.array_equal(first_nan_flags, numpy.isnan(second_matrix)):
+        return False
+
+    real_flags = numpy.invert(first_nan_flags)
+    return numpy.array_equal(
+        first_matrix[real_flags], second_matrix[real_flags]
+    )
+
+
+def _run(num_soundings, nan_fraction):
+    """Benchmarks NaN-filling and pressure-to-height conversion of soundings.
+
+    This is effectively the main method.
+
+    :param num_soundings: See documentation at top of file.
+    :param nan_fraction: Same.
+    """
+
+    numpy.random.seed(6695)
+
+    sounding_dict_pressure_coords = _create_soundings(
+        num_soundings=num_soundings, nan_fraction=nan_fraction)
+    pressure_matrix_pascals = soundings._get_pressures(
+        sounding_dict_pressure_coords)
+
+    print('Number of soundings = {0:d} ... dimensions = {1:s}'.format(
+        num_soundings,
+        str(sounding_dict_pressure_coords[soundings.SOUNDING_MATRIX_KEY].shape)
+    ))
+
+    exec_start_time_unix_sec = time.time()
+    loop_sounding_matrix = _fill_nans_with_loop(
+        sounding_matrix=copy.deepcopy(
+            sounding_dict_pressure_coords[soundings.SOUNDING_MATRIX_KEY]),
+        pressure_matrix_pascals=pressure_matrix_pascals)
+    loop_time_sec = time.time() - exec_start_time_unix_sec
+
+    exec_start_time_unix_sec = time.time()
+    sounding_dict_pressure_coords = soundings._fill_nans_in_soundings(
+        sounding_dict_pressure_coords=sounding_dict_pressure_coords,
+        pressure_matrix_pascals=pressure_matrix_pascals)
+    vectorized_time_sec = time.time() - exec_start_time_unix_sec
+
+    assert _are_bitwise_equal(
+        loop_sounding_matrix,
+        sounding_dict_pressure_coords[soundings.SOUNDING_MATRIX_KEY]
+    )
+
+    print((
+        'NaN-filling with loop = {0:.3f} s ... vectorized = {1:.3f} s ... '
+        'speedup = {2:.2f}x'
+    ).format(
+        loop_time_sec, vectorized_time_sec, loop_time_sec / vectorized_time_sec
+    ))
+
+    keep_indices = numpy.array([
+        int(s) for s in sounding_dict_pressure_coords[soundings.FULL_IDS_KEY]
+    ], dtype=int)
+    sounding_dict_pressure_coords[soundings.STORM_ELEVATIONS_KEY] = (
+        sounding_dict_pressure_coords[soundings.STORM_ELEVATIONS_KEY][
+            keep_indices]
+    )
+    storm_elevations_m_asl = (
+        sounding_dict_pressure_coords[soundings.STORM_ELEVATIONS_KEY] + 0.
+    )
+
+    pressure_matrix_pascals = soundings._get_pressures(
+        sounding_dict_pressure_coords)
+    height_levels_m_agl = soundings.DEFAULT_HEIGHT_LEVELS_M_AGL
+
+    exec_start_time_unix_sec = time.time()
+    loop_sounding_matrix = _height_interp_with_loop(
+        orig_sounding_matrix=copy.deepcopy(
+            sounding_dict_pressure_coords[soundings.SOUNDING_MATRIX_KEY]),
+        pressure_matrix_pascals=pressure_matrix_pascals,
+        storm_elevations_m_asl=storm_elevations_m_asl,
+        height_levels_m_agl=height_levels_m_agl)
+    loop_time_sec = time.time() - exec_start_time_unix_sec
+
+    exec_start_time_unix_sec = time.time()
+    sounding_dict_height_coords = soundings._pressure_to_height_coords(
+        sounding_dict_pressure_coords=sounding_dict_pressure_coords,
+        height_levels_m_agl=height_levels_m_agl)
+    vectorized_time_sec = time.time() - exec_start_time_unix_sec
+
+    assert _are_bitwise_equal(
+        loop_sounding_matrix,
+        sounding_dict_height_coords[soundings.SOUNDING_MATRIX_KEY][
+            ..., :len(FIELD_NAMES)]
+    )
+
+    print((
+        'Pressure-to-height conversion with loop = {0:.3f} s ... vectorized '
+        '(including humidity conversion) = {1:.3f} s ... speedup = {2:.2f}x'
+    ).format(
+        loop_time_sec, vectorized_time_sec, loop_time_sec / vectorized_time_sec
+    ))
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        num_soundings=getattr(INPUT_ARG_OBJECT, NUM_SOUNDINGS_ARG_NAME),
+        nan_fraction=getattr(INPUT_ARG_OBJECT, NAN_FRACTION_ARG_NAME)
+    )
@@ -0,0 +1,207 @@
+"""Benchmarks conversion of radar data from sparse to full grid.
+
+This script creates a synthetic sparse grid (run-length-encoded, in the format
+returned by `myrorss_and_mrms_io.read_data_from_sparse_grid_file`) on a grid
+the size of MYRORSS, then times `radar_sparse_to_full._convert` against the
+original loop over runs.
+"""
+
+import time
+import argparse
+import numpy
+import pandas
+from gewittergefahr.gg_io import myrorss_and_mrms_io
+from gewittergefahr.gg_utils import radar_sparse_to_full as radar_s2f
+from gewittergefahr.gg_utils import radar_utils
+
+FIELD_NAME = radar_utils.REFL_NAME
+MIN_REFLECTIVITY_DBZ = 0.
+MAX_REFLECTIVITY_DBZ = 75.
+
+NUM_ROWS_ARG_NAME = 'num_grid_rows'
+NUM_COLUMNS_ARG_NAME = 'num_grid_columns'
+NUM_RUNS_ARG_NAME = 'num_runs'
+MEAN_RUN_LENGTH_ARG_NAME = 'mean_run_length'
+NUM_ITERATIONS_ARG_NAME = 'num_iterations'
+
+NUM_ROWS_HELP_STRING = 'Number of rows in full grid.'
+NUM_COLUMNS_HELP_STRING = 'Number of columns in full grid.'
+NUM_RUNS_HELP_STRING = 'Number of runs (rows in sparse table).'
+MEAN_RUN_LENGTH_HELP_STRING = 'Mean number of grid cells per run.'
+NUM_ITERATIONS_HELP_STRING = 'Number of times to convert the sparse grid.'
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_ROWS_ARG_NAME, type=int, required=False, default=3501,
+    help=NUM_ROWS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_COLUMNS_ARG_NAME, type=int, required=False, default=7001,
+    help=NUM_COLUMNS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_RUNS_ARG_NAME, type=int, required=False, default=300000,
+    help=NUM_RUNS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + MEAN_RUN_LENGTH_ARG_NAME, type=int, required=False, default=10,
+    help=MEAN_RUN_LENGTH_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_ITERATIONS_ARG_NAME, type=int, required=False, default=3,
+    help=NUM_ITERATIONS_HELP_STRING)
+
+
+def _create_sparse_grid_table(num_grid_rows, num_grid_columns, num_runs,
+                              mean_run_length):
+    """Creates synthetic sparse grid with non-overlapping runs.
+
+    :param num_grid_rows: See documentation at top of file.
+    :param num_grid_columns: Same.
+    :param num_runs: Same.
+    :param mean_run_length: Same.
+    :return: sparse_grid_table: pandas DataFrame in format returned by
+        `myrorss_and_mrms_io.read_data_from_sparse_grid_file`.
+    """
+
+    num_grid_points = num_grid_rows * num_grid_columns
+    start_indices_flat = numpy.sort(numpy.random.choice(
+        num_grid_points, size=num_runs, replace=False
+    ))
+
+    max_run_lengths = numpy.diff(numpy.concatenate((
+        start_indices_flat, numpy.array([num_grid_points], dtype=int)
+    )))
+    run_lengths = numpy.minimum(
+        numpy.random.geometric(p=1. / mean_run_length, size=num_runs),
+        max_run_lengths
+    )
+
+    start_rows, start_columns = numpy.unravel_index(
+        start_indices_flat, (num_grid_rows, num_grid_columns)
+    )
+
+    return pandas.DataFrame.from_dict({
+        myrorss_and_mrms_io.GRID_ROW_COLUMN: start_rows,
+        myrorss_and_mrms_io.GRID_COLUMN_COLUMN: start_columns,
+        myrorss_and_mrms_io.NUM_GRID_CELL_COLUMN: run_lengths,
+        FIELD_NAME: numpy.random.uniform(
+            low=MIN_REFLECTIVITY_DBZ, high=MAX_REFLECTIVITY_DBZ, size=num_runs)
+    })
+
+
+def _convert_with_loop(sparse_grid_table, num_grid_rows, num_grid_columns):
+    """Converts data from sparse to full grid, one run at a time.
+
+    This is the original implementation of `radar_sparse_to_full._convert`.
+
+    :param sparse_grid_table: See doc for `radar_sparse_to_full._convert`.
+    :param num_grid_rows: Same.
+    :param num_grid_columns: Same.
+    :return: full_radar_matrix: Same.
+    """
+
+    start_indices_flat = numpy.ravel_multi_index(
+        (sparse_grid_table[myrorss_and_mrms_io.GRID_ROW_COLUMN].values,
+         sparse_grid_table[myrorss_and_mrms_io.GRID_COLUMN_COLUMN].values),
+        (num_grid_rows, num_grid_columns)
+    )
+    end_indices_flat = (
+        start_indices_flat +
+        sparse_grid_table[myrorss_and_mrms_io.NUM_GRID_CELL_COLUMN].values - 1
+    )
+    data_values_flat = sparse_grid_table[FIELD_NAME].values
+
+    full_matrix = numpy.full(num_grid_rows * num_grid_columns, numpy.nan)
+
+    for i, j, k in zip(start_indices_flat, end_indices_flat, data_values_flat):
+        full_matrix[i:(j + 1)] = k
+
+    return numpy.reshape(full_matrix, (num_grid_rows, num_grid_columns))
+
+
+def _run(num_grid_rows, num_grid_columns, num_runs, mean_run_length,
+         num_iterations):
+    """Benchmarks conversion of radar data from sparse to full grid.
+
+    This is effectively the main method.
+
+    :param num_grid_rows: See documentation at top of file.
+    :param num_grid_columns: Same.
+    :param num_runs: Same.
+    :param mean_run_length: Same.
+    :param num_iterations: Same.
+    """
+
+    numpy.random.seed(6695)
+    sparse_grid_table = _create_sparse_grid_table(
+        num_grid_rows=num_grid_rows, num_grid_columns=num_grid_columns,
+        num_runs=num_runs, mean_run_length=mean_run_length)
+
+    print((
+        'Number of runs = {0:d} ... number of grid cells in runs = {1:d}'
+    ).format(
+        num_runs,
+        numpy.sum(sparse_grid_table[myrorss_and_mrms_io.NUM_GRID_CELL_COLUMN])
+    ))
+
+    loop_time_sec = 0.
+    vectorized_time_sec = 0.
+    preallocated_time_sec = 0.
+    buffer_matrix = numpy.full(
+        (num_grid_rows, num_grid_columns), numpy.nan, dtype=numpy.float32
+    )
+
+    for i in range(num_iterations):
+        exec_start_time_unix_sec = time.time()
+        loop_matrix = _convert_with_loop(
+            sparse_grid_table=sparse_grid_table, num_grid_rows=num_grid_rows,
+            num_grid_columns=num_grid_columns)
+        loop_time_sec += time.time() - exec_start_time_unix_sec
+
+        exec_start_time_unix_sec = time.time()
+        vectorized_matrix = radar_s2f._convert(
+            sparse_grid_table=sparse_grid_table, field_name=FIELD_NAME,
+            num_grid_rows=num_grid_rows, num_grid_columns=num_grid_columns)
+        vectorized_time_sec += time.time() - exec_start_time_unix_sec
+
+        exec_start_time_unix_sec = time.time()
+        radar_s2f._convert(
+            sparse_grid_table=sparse_grid_table, field_name=FIELD_NAME,
+            num_grid_rows=num_grid_rows, num_grid_columns=num_grid_columns,
+            full_matrix=buffer_matrix)
+        preallocated_time_sec += time.time() - exec_start_time_unix_sec
+
+        assert numpy.array_equal(
+            loop_matrix, vectorized_matrix, equal_nan=True)
+        assert numpy.allclose(
+            loop_matrix, buffer_matrix, atol=1e-4, equal_nan=True)
+
+        print((
+            'Iteration {0:d} of {1:d} ... cumulative elapsed time with loop = '
+            '{2:.4f} s ... vectorized = {3:.4f} s ... vectorized into float32 '
+            'buffer = {4:.4f} s'
+        ).format(
+            i + 1, num_iterations, loop_time_sec, vectorized_time_sec,
+            preallocated_time_sec
+        ))
+
+    print((
+        'Speedup from vectorization = {0:.2f}x ... with preallocated buffer = '
+        '{1:.2f}x'
+    ).format(
+        loop_time_sec / vectorized_time_sec,
+        loop_time_sec / preallocated_time_sec
+    ))
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        num_grid_rows=getattr(INPUT_ARG_OBJECT, NUM_ROWS_ARG_NAME),
+        num_grid_columns=getattr(INPUT_ARG_OBJECT, NUM_COLUMNS_ARG_NAME),
+        num_runs=getattr(INPUT_ARG_OBJECT, NUM_RUNS_ARG_NAME),
+        mean_run_length=getattr(INPUT_ARG_OBJECT, MEAN_RUN_LENGTH_ARG_NAME),
+        num_iterations=getattr(INPUT_ARG_OBJECT, NUM_ITERATIONS_ARG_NAME)
+    )
@@ -0,0 +1,235 @@
+"""Benchmarks creation of wind-based target values.
+
+This script reads one linkage file (wind observations linked to storm objects),
+creates the same target names as `compute_target_values.py`, then times
+`target_val_utils.create_wind_targets` (all targets in one pass) against the
+original method, which handles one target and one storm object at a time.
+"""
+
+import copy
+import time
+import argparse
+import numpy
+from gewittergefahr.gg_utils import linkage
+from gewittergefahr.gg_utils import target_val_utils
+from gewittergefahr.gg_utils import classification_utils as classifn_utils
+from gewittergefahr.scripts import compute_target_values
+
+LINKAGE_FILE_ARG_NAME = 'input_linkage_file_name'
+PERCENTILE_LEVEL_ARG_NAME = 'wind_speed_percentile_level'
+
+LINKAGE_FILE_HELP_STRING = (
+    'Path to linkage file for wind (will be read by '
+    '`linkage.read_linkage_file`).')
+
+PERCENTILE_LEVEL_HELP_STRING = (
+    'Target values will be based on this percentile of wind speeds linked to '
+    'each storm object.')
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + LINKAGE_FILE_ARG_NAME, type=str, required=True,
+    help=LINKAGE_FILE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + PERCENTILE_LEVEL_ARG_NAME, type=float, required=False,
+    default=compute_target_values.DEFAULT_PERCENTILE_LEVEL,
+    help=PERCENTILE_LEVEL_HELP_STRING)
+
+
+def _create_targets_with_loop(storm_to_winds_table, target_name):
+    """Creates one wind-based classification target, one storm at a time.
+
+    This is the original implementation of
+    `target_val_utils.create_wind_classification_targets`, except that storm
+    objects with no linked winds in the lead-time window and distance buffer
+    are labelled invalid (the original used `len(x == 0)` for this check).
+
+    :param storm_to_winds_table: See doc for
+        `target_val_utils.create_wind_targets`.
+    :param target_name: Name of target variable.
+    :return: storm_to_winds_table: See doc for
+        `target_val_utils.create_wind_targets`.
+    """
+
+    target_param_dict = target_val_utils.target_name_to_params(target_name)
+    min_lead_time_sec = target_param_dict[target_val_utils.MIN_LEAD_TIME_KEY]
+    max_lead_time_sec = target_param_dict[target_val_utils.MAX_LEAD_TIME_KEY]
+    min_link_distance_metres = target_param_dict[
+        target_val_utils.MIN_LINKAGE_DISTANCE_KEY]
+    max_link_distance_metres = target_param_dict[
+        target_val_utils.MAX_LINKAGE_DISTANCE_KEY]
+    percentile_level = target_param_dict[target_val_utils.PERCENTILE_LEVEL_KEY]
+
+    end_of_period_indices = target_val_utils._find_storms_near_end_of_period(
+        storm_to_events_table=storm_to_winds_table,
+        max_lead_time_sec=max_lead_time_sec)
+
+    dead_storm_indices = target_val_utils._find_dead_storms(
+        storm_to_events_table=storm_to_winds_table,
+        min_lead_time_sec=min_lead_time_sec)
+
+    num_storm_objects = len(storm_to_winds_table.index)
+    labels_m_s01 = numpy.full(num_storm_objects, numpy.nan)
+    labels_m_s01[end_of_period_indices] = target_val_utils.INVALID_STORM_INTEGER
+    labels_m_s01[dead_storm_indices] = target_val_utils.DEAD_STORM_INTEGER
+
+    for i in range(num_storm_objects):
+        if i in end_of_period_indices or i in dead_storm_indices:
+            continue
+
+        these_relative_times_sec = storm_to_winds_table[
+            linkage.RELATIVE_EVENT_TIMES_COLUMN].values[i]
+
+        these_link_distances_metres = storm_to_winds_table[
+            linkage.LINKAGE_DISTANCES_COLUMN].values[i]
+
+        these_good_time_flags = numpy.logical_and(
+            these_relative_times_sec >= min_lead_time_sec,
+            these_relative_times_sec <= max_lead_time_sec)
+
+        these_good_distance_flags = numpy.logical_and(
+            these_link_distances_metres >= min_link_distance_metres,
+            these_link_distances_metres <= max_link_distance_metres)
+
+        these_good_indices = numpy.where(numpy.logical_and(
+            these_good_time_flags, these_good_distance_flags
+        ))[0]
+
+        if len(these_good_indices) == 0:
+            labels_m_s01[i] = target_val_utils.INVALID_STORM_INTEGER
+            continue
+
+        these_wind_speeds_m_s01 = numpy.sqrt(
+            storm_to_winds_table[linkage.U_WINDS_COLUMN].values[i][
+                these_good_indices] ** 2 +
+            storm_to_winds_table[linkage.V_WINDS_COLUMN].values[i][
+                these_good_indices] ** 2
+        )
+
+        labels_m_s01[i] = numpy.percentile(
+            these_wind_speeds_m_s01, percentile_level)
+
+    regression_target_name = target_val_utils.target_params_to_name(
+        min_lead_time_sec=min_lead_time_sec,
+        max_lead_time_sec=max_lead_time_sec,
+        min_link_distance_metres=min_link_distance_metres,
+        max_link_distance_metres=max_link_distance_metres,
+        wind_speed_percentile_level=percentile_level,
+        wind_speed_cutoffs_kt=None)
+
+    invalid_storm_indices = numpy.where(
+        labels_m_s01 == target_val_utils.INVALID_STORM_INTEGER
+    )[0]
+    dead_storm_indices = numpy.where(
+        labels_m_s01 == target_val_utils.DEAD_STORM_INTEGER
+    )[0]
+
+    regression_labels_m_s01 = labels_m_s01 + 0.
+    regression_labels_m_s01[invalid_storm_indices] = 0.
+    regression_labels_m_s01[dead_storm_indices] = 0.
+
+    storm_classes = classifn_utils.classify_values(
+        input_values=regression_labels_m_s01,
+        class_cutoffs=
+        target_param_dict[target_val_utils.WIND_SPEED_CUTOFFS_KEY] *
+        target_val_utils.KT_TO_METRES_PER_SECOND,
+        non_negative_only=True)
+
+    storm_classes[invalid_storm_indices] = (
+        target_val_utils.INVALID_STORM_INTEGER
+    )
+    storm_classes[dead_storm_indices] = target_val_utils.DEAD_STORM_INTEGER
+
+    return storm_to_winds_table.assign(**{
+        regression_target_name: labels_m_s01,
+        target_name: storm_classes
+    })
+
+
+def _run(linkage_file_name, wind_speed_percentile_level):
+    """Benchmarks creation of wind-based target values.
+
+    This is effectively the main method.
+
+    :param linkage_file_name: See documentation at top of file.
+    :param wind_speed_percentile_level: Same.
+    """
+
+    print('Reading data from: "{0:s}"...'.format(linkage_file_name))
+    storm_to_winds_table = linkage.read_linkage_file(linkage_file_name)[0]
+
+    target_names = []
+    min_lead_times_sec = compute_target_values.DEFAULT_MIN_LEAD_TIMES_SEC
+    max_lead_times_sec = compute_target_values.DEFAULT_MAX_LEAD_TIMES_SEC
+    min_link_distances_metres = (
+        compute_target_values.DEFAULT_MIN_LINK_DISTANCES_METRES
+    )
+    max_link_distances_metres = (
+        compute_target_values.DEFAULT_MAX_LINK_DISTANCES_METRES
+    )
+
+    for i in range(len(min_lead_times_sec)):
+        for j in range(len(min_link_distances_metres)):
+            target_names.append(target_val_utils.target_params_to_name(
+                min_lead_time_sec=min_lead_times_sec[i],
+                max_lead_time_sec=max_lead_times_sec[i],
+                min_link_distance_metres=min_link_distances_metres[j],
+                max_link_distance_metres=max_link_distances_metres[j],
+                wind_speed_percentile_level=wind_speed_percentile_level,
+                wind_speed_cutoffs_kt=compute_target_values.DEFAULT_CUTOFFS_KT
+            ))
+
+    num_linked_winds = numpy.sum(numpy.array([
+        len(t) for t in
+        storm_to_winds_table[linkage.RELATIVE_EVENT_TIMES_COLUMN].values
+    ]))
+
+    print((
+        'Number of storm objects = {0:d} ... linked wind observations = {1:d} '
+        '... targets = {2:d}'
+    ).format(
+        len(storm_to_winds_table.index), num_linked_winds, len(target_names)
+    ))
+
+    exec_start_time_unix_sec = time.time()
+    loop_table = copy.deepcopy(storm_to_winds_table)
+
+    for this_target_name in target_names:
+        loop_table = _create_targets_with_loop(
+            storm_to_winds_table=loop_table, target_name=this_target_name)
+
+    loop_time_sec = time.time() - exec_start_time_unix_sec
+
+    exec_start_time_unix_sec = time.time()
+    one_pass_table = target_val_utils.create_wind_targets(
+        storm_to_winds_table=copy.deepcopy(storm_to_winds_table),
+        target_names=target_names, test_mode=True)
+    one_pass_time_sec = time.time() - exec_start_time_unix_sec
+
+    assert list(loop_table) == list(one_pass_table)
+
+    for this_column in list(loop_table):
+        if this_column in list(storm_to_winds_table):
+            continue
+
+        assert numpy.array_equal(
+            loop_table[this_column].values, one_pass_table[this_column].values
+        )
+
+    print((
+        'Time with loop = {0:.2f} s ... in one pass = {1:.2f} s ... speedup = '
+        '{2:.2f}x'
+    ).format(
+        loop_time_sec, one_pass_time_sec, loop_time_sec / one_pass_time_sec
+    ))
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        linkage_file_name=getattr(INPUT_ARG_OBJECT, LINKAGE_FILE_ARG_NAME),
+        wind_speed_percentile_level=getattr(
+            INPUT_ARG_OBJECT, PERCENTILE_LEVEL_ARG_NAME)
+    )
@@ -299,25 +299,15 @@ def _compute_wind_targets_one_day(
 
                 target_names.append(this_target_name)
 
-                print((
-                    'Creating labels for "{0:s}" on SPC date "{1:s}"...'
-                ).format(
-                    this_target_name, spc_date_string
-                ))
+    print('Creating labels for {0:d} targets on SPC date "{1:s}"...'.format(
+        len(target_names), spc_date_string
+    ))
 
-                storm_to_winds_table = (
-                    target_val_utils.create_wind_classification_targets(
-                        storm_to_winds_table=storm_to_winds_table,
-                        min_lead_time_sec=min_lead_times_sec[i],
-                        max_lead_time_sec=max_lead_times_sec[i],
-                        min_link_distance_metres=min_link_distances_metres[j],
-                        max_link_distance_metres=max_link_distances_metres[j],
-                        percentile_level=wind_speed_percentile_level,
-                        class_cutoffs_kt=list_of_cutoff_arrays_kt[k]
-                    )
-                )
+    # All targets are computed in one pass over the linked wind observations.
+    storm_to_winds_table = target_val_utils.create_wind_targets(
+        storm_to_winds_table=storm_to_winds_table, target_names=target_names)
 
-                print(SEPARATOR_STRING)
+    print(SEPARATOR_STRING)
 
     target_file_name = target_val_utils.find_target_file(
         top_directory_name=top_output_dir_name,
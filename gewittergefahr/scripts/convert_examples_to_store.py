@@ -0,0 +1,147 @@
+"""Converts NetCDF example files to memory-mapped example stores.
+
+Example stores can be read by every generator in `training_validation_io` and
+`testing_io`, just like NetCDF files, but reading a subset of examples does not
+require decoding the whole file.
+"""
+
+import os.path
+import argparse
+from gewittergefahr.deep_learning import input_examples
+
+INPUT_DIR_ARG_NAME = 'input_example_dir_name'
+SHUFFLED_ARG_NAME = 'shuffled'
+FIRST_DATE_ARG_NAME = 'first_spc_date_string'
+LAST_DATE_ARG_NAME = 'last_spc_date_string'
+FIRST_BATCH_ARG_NAME = 'first_batch_number'
+LAST_BATCH_ARG_NAME = 'last_batch_number'
+NUM_EXAMPLES_PER_CHUNK_ARG_NAME = 'num_examples_per_chunk'
+OUTPUT_DIR_ARG_NAME = 'output_example_dir_name'
+
+INPUT_DIR_HELP_STRING = (
+    'Name of top-level directory with NetCDF example files.  Files therein '
+    'will be found by `input_examples.find_many_example_files`.')
+
+SHUFFLED_HELP_STRING = (
+    'Boolean flag.  If 1, will convert shuffled files (from batch numbers '
+    '`{0:s}`...`{1:s}`).  If 0, will convert unshuffled files (from SPC dates '
+    '`{2:s}`...`{3:s}`).'
+).format(FIRST_BATCH_ARG_NAME, LAST_BATCH_ARG_NAME, FIRST_DATE_ARG_NAME,
+         LAST_DATE_ARG_NAME)
+
+SPC_DATE_HELP_STRING = (
+    'SPC date (format "yyyymmdd").  Used only if `{0:s} = 0`.'
+).format(SHUFFLED_ARG_NAME)
+
+BATCH_NUMBER_HELP_STRING = 'Batch number.  Used only if `{0:s} = 1`.'.format(
+    SHUFFLED_ARG_NAME)
+
+NUM_EXAMPLES_PER_CHUNK_HELP_STRING = (
+    'Number of examples copied at once from each NetCDF file.')
+
+OUTPUT_DIR_HELP_STRING = (
+    'Name of top-level directory for example stores.  Stores will be written by'
+    ' `input_examples.convert_example_file_to_store` to locations therein '
+    'determined by `input_examples.find_example_file`.')
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + INPUT_DIR_ARG_NAME, type=str, required=True,
+    help=INPUT_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + SHUFFLED_ARG_NAME, type=int, required=False, default=1,
+    help=SHUFFLED_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + FIRST_DATE_ARG_NAME, type=str, required=False, default='',
+    help=SPC_DATE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + LAST_DATE_ARG_NAME, type=str, required=False, default='',
+    help=SPC_DATE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + FIRST_BATCH_ARG_NAME, type=int, required=False, default=-1,
+    help=BATCH_NUMBER_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + LAST_BATCH_ARG_NAME, type=int, required=False, default=-1,
+    help=BATCH_NUMBER_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_EXAMPLES_PER_CHUNK_ARG_NAME, type=int, required=False,
+    default=input_examples.DEFAULT_NUM_EXAMPLES_PER_STORE_CHUNK,
+    help=NUM_EXAMPLES_PER_CHUNK_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
+    help=OUTPUT_DIR_HELP_STRING)
+
+
+def _run(top_input_dir_name, shuffled, first_spc_date_string,
+         last_spc_date_string, first_batch_number, last_batch_number,
+         num_examples_per_chunk, top_output_dir_name):
+    """Converts NetCDF example files to memory-mapped example stores.
+
+    This is effectively the main method.
+
+    :param top_input_dir_name: See documentation at top of file.
+    :param shuffled: Same.
+    :param first_spc_date_string: Same.
+    :param last_spc_date_string: Same.
+    :param first_batch_number: Same.
+    :param last_batch_number: Same.
+    :param num_examples_per_chunk: Same.
+    :param top_output_dir_name: Same.
+    """
+
+    input_file_names = input_examples.find_many_example_files(
+        top_directory_name=top_input_dir_name, shuffled=shuffled,
+        first_spc_date_string=first_spc_date_string,
+        last_spc_date_string=last_spc_date_string,
+        first_batch_number=first_batch_number,
+        last_batch_number=last_batch_number, raise_error_if_any_missing=False)
+
+    for this_input_file_name in input_file_names:
+        if shuffled:
+            this_output_dir_name = input_examples.find_example_file(
+                top_directory_name=top_output_dir_name, shuffled=True,
+                batch_number=input_examples._file_name_to_batch_number(
+                    this_input_file_name),
+                raise_error_if_missing=False, use_example_store=True)
+        else:
+            this_pathless_file_name = os.path.split(this_input_file_name)[-1]
+            this_spc_date_string = os.path.splitext(
+                this_pathless_file_name
+            )[0].split('_')[-1]
+
+            this_output_dir_name = input_examples.find_example_file(
+                top_directory_name=top_output_dir_name, shuffled=False,
+                spc_date_string=this_spc_date_string,
+                raise_error_if_missing=False, use_example_store=True)
+
+        print('Converting "{0:s}" to example store at "{1:s}"...'.format(
+            this_input_file_name, this_output_dir_name
+        ))
+
+        input_examples.convert_example_file_to_store(
+            netcdf_file_name=this_input_file_name,
+            store_dir_name=this_output_dir_name,
+            num_examples_per_chunk=num_examples_per_chunk)
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        top_input_dir_name=getattr(INPUT_ARG_OBJECT, INPUT_DIR_ARG_NAME),
+        shuffled=bool(getattr(INPUT_ARG_OBJECT, SHUFFLED_ARG_NAME)),
+        first_spc_date_string=getattr(INPUT_ARG_OBJECT, FIRST_DATE_ARG_NAME),
+        last_spc_date_string=getattr(INPUT_ARG_OBJECT, LAST_DATE_ARG_NAME),
+        first_batch_number=getattr(INPUT_ARG_OBJECT, FIRST_BATCH_ARG_NAME),
+        last_batch_number=getattr(INPUT_ARG_OBJECT, LAST_BATCH_ARG_NAME),
+        num_examples_per_chunk=getattr(
+            INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_CHUNK_ARG_NAME),
+        top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME)
+    )
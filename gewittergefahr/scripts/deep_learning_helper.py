@@ -42,6 +42,8 @@ NUM_EX_PER_VALIDN_ARG_NAME = 'num_ex_per_validn_batch'
 NUM_EPOCHS_ARG_NAME = 'num_epochs'
 NUM_TRAINING_BATCHES_ARG_NAME = 'num_training_batches_per_epoch'
 NUM_VALIDATION_BATCHES_ARG_NAME = 'num_validation_batches_per_epoch'
+NUM_PREFETCH_WORKERS_ARG_NAME = 'num_prefetch_workers'
+USE_PREFETCH_PROCESSES_ARG_NAME = 'use_prefetch_processes'
 OUTPUT_DIR_ARG_NAME = 'output_dir_name'
 
 INPUT_MODEL_FILE_HELP_STRING = (
@@ -164,6 +166,16 @@ NUM_TRAINING_BATCHES_HELP_STRING = 'Number of training batches in each epoch.'
 NUM_VALIDATION_BATCHES_HELP_STRING = (
     'Number of validation batches in each epoch.')
 
+NUM_PREFETCH_WORKERS_HELP_STRING = (
+    'Number of background workers used to prefetch training and validation '
+    'batches (see `training_validation_io.prefetch_generator`).  If 0, batches '
+    'will be created in the foreground, with no prefetching.')
+
+USE_PREFETCH_PROCESSES_HELP_STRING = (
+    '[used only if `{0:s}` > 0] Boolean flag.  If 1, prefetch workers will be '
+    'processes.  If 0, they will be threads.'
+).format(NUM_PREFETCH_WORKERS_ARG_NAME)
+
 OUTPUT_DIR_HELP_STRING = (
     'Path to output directory.  The newly trained CNN and metafiles will be '
     'saved here.')
@@ -195,6 +207,8 @@ DEFAULT_NUM_EXAMPLES_PER_BATCH = 512
 DEFAULT_NUM_EPOCHS = 100
 DEFAULT_NUM_TRAINING_BATCHES_PER_EPOCH = 32
 DEFAULT_NUM_VALIDATION_BATCHES_PER_EPOCH = 16
+DEFAULT_NUM_PREFETCH_WORKERS = 0
+DEFAULT_USE_PREFETCH_PROCESSES_FLAG = 0
 
 
 def add_input_args(argument_parser):
@@ -332,6 +346,16 @@ def add_input_args(argument_parser):
         default=DEFAULT_NUM_VALIDATION_BATCHES_PER_EPOCH,
         help=NUM_VALIDATION_BATCHES_HELP_STRING)
 
+    argument_parser.add_argument(
+        '--' + NUM_PREFETCH_WORKERS_ARG_NAME, type=int, required=False,
+        default=DEFAULT_NUM_PREFETCH_WORKERS,
+        help=NUM_PREFETCH_WORKERS_HELP_STRING)
+
+    argument_parser.add_argument(
+        '--' + USE_PREFETCH_PROCESSES_ARG_NAME, type=int, required=False,
+        default=DEFAULT_USE_PREFETCH_PROCESSES_FLAG,
+        help=USE_PREFETCH_PROCESSES_HELP_STRING)
+
     argument_parser.add_argument(
         '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
         help=OUTPUT_DIR_HELP_STRING)
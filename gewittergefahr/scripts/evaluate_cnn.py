@@ -24,6 +24,8 @@ PROB_THRESHOLD_ARG_NAME = 'best_prob_threshold'
 UPGRADED_MIN_RATING_ARG_NAME = 'upgraded_min_ef_rating'
 TARGET_DIR_ARG_NAME = 'input_target_dir_name'
 NUM_BOOTSTRAP_ARG_NAME = 'num_bootstrap_reps'
+BATCHED_BOOTSTRAP_ARG_NAME = 'batched_bootstrap'
+NUM_PROCESSES_ARG_NAME = 'num_bootstrap_processes'
 DS_FRACTIONS_ARG_NAME = 'downsampling_fractions'
 OUTPUT_DIR_ARG_NAME = 'output_dir_name'
 
@@ -54,6 +56,16 @@ NUM_BOOTSTRAP_HELP_STRING = (
     'Number of bootstrap replicates.  If you do not want bootstrapping, leave '
     'this alone.'
 )
+BATCHED_BOOTSTRAP_HELP_STRING = (
+    'Boolean flag.  If 1, all bootstrap replicates will be evaluated at once '
+    'by `model_evaluation.run_bootstrapped_evaluation`.  If 0, replicates will '
+    'be drawn and evaluated one at a time.')
+
+NUM_PROCESSES_HELP_STRING = (
+    '[used only if `{0:s}` = 1] Number of processes over which to spread '
+    'bootstrap replicates.'
+).format(BATCHED_BOOTSTRAP_ARG_NAME)
+
 DS_FRACTIONS_HELP_STRING = (
     'List of downsampling fractions.  This should contain two values (class 0, '
     'then class 1), summing to 1.0.  If you do not want downsampling, leave '
@@ -86,6 +98,14 @@ INPUT_ARG_PARSER.add_argument(
     '--' + NUM_BOOTSTRAP_ARG_NAME, type=int, required=False, default=1,
     help=NUM_BOOTSTRAP_HELP_STRING
 )
+INPUT_ARG_PARSER.add_argument(
+    '--' + BATCHED_BOOTSTRAP_ARG_NAME, type=int, required=False, default=0,
+    help=BATCHED_BOOTSTRAP_HELP_STRING
+)
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_PROCESSES_ARG_NAME, type=int, required=False, default=1,
+    help=NUM_PROCESSES_HELP_STRING
+)
 INPUT_ARG_PARSER.add_argument(
     '--' + DS_FRACTIONS_ARG_NAME, type=float, nargs=2, required=False,
     default=[-1, -1], help=DS_FRACTIONS_HELP_STRING
@@ -176,7 +196,8 @@ def _read_new_target_values(
 
 def _compute_scores(
         forecast_probabilities, observed_labels, num_bootstrap_reps,
-        output_file_name, best_prob_threshold=None, downsampling_dict=None):
+        output_file_name, best_prob_threshold=None, downsampling_dict=None,
+        batched_bootstrap=False, num_bootstrap_processes=1):
     """Computes evaluation scores.
 
     E = number of examples (storm objects)
@@ -193,6 +214,8 @@ def _compute_scores(
     :param downsampling_dict: Dictionary with downsampling fractions.  See doc
         for `deep_learning_utils.sample_by_class`.  If this is None,
         downsampling will not be used.
+    :param batched_bootstrap: See documentation at top of file.
+    :param num_bootstrap_processes: Same.
     """
 
     num_examples = len(observed_labels)
@@ -262,6 +285,42 @@ def _compute_scores(
         num_forecast_bins=model_eval.DEFAULT_NUM_RELIABILITY_BINS
     )[-1]
 
+    if batched_bootstrap and num_bootstrap_reps > 1:
+        num_examples_by_class = numpy.array([
+            numpy.sum(observed_labels[these_indices] == 0),
+            numpy.sum(observed_labels[these_indices] == 1)
+        ], dtype=int)
+
+        print((
+            'Computing scores for {0:d} bootstrap replicates at once...'
+        ).format(
+            num_bootstrap_reps
+        ))
+
+        evaluation_table = model_eval.run_bootstrapped_evaluation(
+            forecast_probabilities=forecast_probabilities,
+            observed_labels=observed_labels,
+            best_prob_threshold=best_prob_threshold,
+            all_prob_thresholds=all_prob_thresholds,
+            num_bootstrap_reps=num_bootstrap_reps,
+            num_examples_by_class=num_examples_by_class,
+            num_processes=num_bootstrap_processes)
+
+        print(SEPARATOR_STRING)
+        print('Writing results to: "{0:s}"...'.format(output_file_name))
+
+        model_eval.write_evaluation(
+            pickle_file_name=output_file_name,
+            forecast_probabilities=forecast_probabilities,
+            observed_labels=observed_labels,
+            best_prob_threshold=best_prob_threshold,
+            all_prob_thresholds=all_prob_thresholds,
+            num_examples_by_forecast_bin=num_examples_by_forecast_bin,
+            downsampling_dict=downsampling_dict,
+            evaluation_table=evaluation_table)
+
+        return
+
     list_of_evaluation_tables = []
 
     for i in range(num_bootstrap_reps):
@@ -352,8 +411,8 @@ def _compute_scores(
 
 
 def _run(prediction_file_name, best_prob_threshold, upgraded_min_ef_rating,
-         top_target_dir_name, num_bootstrap_reps, downsampling_fractions,
-         output_dir_name):
+         top_target_dir_name, num_bootstrap_reps, batched_bootstrap,
+         num_bootstrap_processes, downsampling_fractions, output_dir_name):
     """Evaluates CNN predictions.
 
     This is effectively the main method.
@@ -363,6 +422,8 @@ def _run(prediction_file_name, best_prob_threshold, upgraded_min_ef_rating,
     :param upgraded_min_ef_rating: Same.
     :param top_target_dir_name: Same.
     :param num_bootstrap_reps: Same.
+    :param batched_bootstrap: Same.
+    :param num_bootstrap_processes: Same.
     :param downsampling_fractions: Same.
     :param output_dir_name: Same.
     :raises: ValueError: if file contains no examples (storm objects).
@@ -473,7 +534,9 @@ def _run(prediction_file_name, best_prob_threshold, upgraded_min_ef_rating,
         forecast_probabilities=forecast_probabilities,
         observed_labels=observed_labels, num_bootstrap_reps=num_bootstrap_reps,
         best_prob_threshold=best_prob_threshold,
-        downsampling_dict=downsampling_dict, output_file_name=output_file_name
+        downsampling_dict=downsampling_dict, output_file_name=output_file_name,
+        batched_bootstrap=bool(batched_bootstrap),
+        num_bootstrap_processes=num_bootstrap_processes
     )
 
 
@@ -489,6 +552,9 @@ if __name__ == '__main__':
         ),
         top_target_dir_name=getattr(INPUT_ARG_OBJECT, TARGET_DIR_ARG_NAME),
         num_bootstrap_reps=getattr(INPUT_ARG_OBJECT, NUM_BOOTSTRAP_ARG_NAME),
+        batched_bootstrap=getattr(INPUT_ARG_OBJECT, BATCHED_BOOTSTRAP_ARG_NAME),
+        num_bootstrap_processes=getattr(
+            INPUT_ARG_OBJECT, NUM_PROCESSES_ARG_NAME),
         downsampling_fractions=numpy.array(
             getattr(INPUT_ARG_OBJECT, DS_FRACTIONS_ARG_NAME), dtype=float
         ),
@@ -1,7 +1,21 @@
-"""Interpolates NWP sounding to each storm object at each lead time."""
-
+"""Interpolates NWP sounding to each storm object at each lead time.
+
+This script handles either one SPC date or a range of SPC dates.  With many
+dates, the dates may be spread across a pool of worker processes.  All workers
+share one on-disk cache of decoded NWP fields (see
+`grib_io.read_field_from_grib_file`), so a field needed by several dates --
+which is common, since grids for adjacent dates overlap -- is decoded only
+once.
+"""
+
+import os
+import time
+import shutil
 import socket
 import argparse
+import tempfile
+import functools
+import multiprocessing
 import numpy
 from gewittergefahr.gg_io import storm_tracking_io as tracking_io
 from gewittergefahr.gg_utils import nwp_model_utils
@@ -21,6 +35,9 @@ FIRST_RAP_TIME_UNIX_SEC = time_conversion.string_to_unix_sec(
     FIRST_RAP_TIME_STRING, MODEL_INIT_TIME_FORMAT)
 
 SPC_DATE_ARG_NAME = 'spc_date_string'
+FIRST_SPC_DATE_ARG_NAME = 'first_spc_date_string'
+LAST_SPC_DATE_ARG_NAME = 'last_spc_date_string'
+NUM_WORKERS_ARG_NAME = 'num_workers'
 LEAD_TIMES_ARG_NAME = 'lead_times_seconds'
 LAG_TIME_ARG_NAME = 'lag_time_for_convective_contamination_sec'
 RUC_DIRECTORY_ARG_NAME = 'input_ruc_directory_name'
@@ -29,6 +46,7 @@ ELEVATION_DIR_ARG_NAME = 'input_elevation_dir_name'
 TRACKING_DIR_ARG_NAME = 'input_tracking_dir_name'
 TRACKING_SCALE_ARG_NAME = 'tracking_scale_metres2'
 OUTPUT_DIR_ARG_NAME = 'output_sounding_dir_name'
+GRIB_CACHE_DIR_ARG_NAME = 'grib_cache_dir_name'
 
 SPC_DATE_HELP_STRING = (
     'SPC (Storm Prediction Center) date in format "yyyymmdd".  The RUC (Rapid '
@@ -36,6 +54,15 @@ SPC_DATE_HELP_STRING = (
     'date, at each lead time in `{0:s}`.'
 ).format(LEAD_TIMES_ARG_NAME)
 
+SPC_DATE_RANGE_HELP_STRING = (
+    '[used only if `{0:s}` is empty] First and last SPC dates in range (format '
+    '"yyyymmdd").  Soundings will be interpolated for each date in the range, '
+    'with one set of output files per date.'
+).format(SPC_DATE_ARG_NAME)
+
+NUM_WORKERS_HELP_STRING = (
+    'Number of worker processes.  Each SPC date will be handled by one worker.')
+
 LEAD_TIMES_HELP_STRING = 'See help string for `{0:s}`.'.format(
     SPC_DATE_ARG_NAME)
 
@@ -72,13 +99,33 @@ OUTPUT_DIR_HELP_STRING = (
     'Name of top-level directory for soundings (one file per SPC date, written '
     'by `soundings.write_soundings`).')
 
+GRIB_CACHE_DIR_HELP_STRING = (
+    'Name of directory for cache of decoded grib fields.  Fields decoded in '
+    'previous runs (e.g., for overlapping SPC dates) will be read from here '
+    'rather than decoded again.  If you leave this empty and `{0:s}` > 1, '
+    'workers will share a temporary cache, deleted at the end of the run.  If '
+    'you leave this empty and `{0:s}` = 1, there will be no caching.'
+).format(NUM_WORKERS_ARG_NAME)
+
 DEFAULT_LEAD_TIMES_SECONDS = [0]
 
 INPUT_ARG_PARSER = argparse.ArgumentParser()
 INPUT_ARG_PARSER.add_argument(
-    '--' + SPC_DATE_ARG_NAME, type=str, required=True,
+    '--' + SPC_DATE_ARG_NAME, type=str, required=False, default='',
     help=SPC_DATE_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + FIRST_SPC_DATE_ARG_NAME, type=str, required=False, default='',
+    help=SPC_DATE_RANGE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + LAST_SPC_DATE_ARG_NAME, type=str, required=False, default='',
+    help=SPC_DATE_RANGE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_WORKERS_ARG_NAME, type=int, required=False, default=1,
+    help=NUM_WORKERS_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + LEAD_TIMES_ARG_NAME, type=int, nargs='+', required=False,
     default=[0], help=LEAD_TIMES_HELP_STRING)
@@ -113,17 +160,20 @@ INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
     help=OUTPUT_DIR_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + GRIB_CACHE_DIR_ARG_NAME, type=str, required=False, default='',
+    help=GRIB_CACHE_DIR_HELP_STRING)
 
-def _run(spc_date_string, lead_times_seconds,
-         lag_time_for_convective_contamination_sec, top_ruc_directory_name,
-         top_rap_directory_name, elevation_dir_name, top_tracking_dir_name,
-         tracking_scale_metres2, top_output_dir_name):
-    """Interpolates NWP sounding to each storm object at each lead time.
 
-    This is effectively the main method.
+def _interp_one_spc_date(
+        spc_date_string, lead_times_seconds,
+        lag_time_for_convective_contamination_sec, top_ruc_directory_name,
+        top_rap_directory_name, elevation_dir_name, top_tracking_dir_name,
+        tracking_scale_metres2, top_output_dir_name, grib_cache_dir_name):
+    """Interpolates NWP sounding to each storm object on one SPC date.
 
-    :param spc_date_string: See documentation at top of file.
-    :param lead_times_seconds: Same.
+    :param spc_date_string: SPC date (format "yyyymmdd").
+    :param lead_times_seconds: See documentation at top of file.
     :param lag_time_for_convective_contamination_sec: Same.
     :param top_ruc_directory_name: Same.
     :param top_rap_directory_name: Same.
@@ -131,12 +181,15 @@ def _run(spc_date_string, lead_times_seconds,
     :param top_tracking_dir_name: Same.
     :param tracking_scale_metres2: Same.
     :param top_output_dir_name: Same.
+    :param grib_cache_dir_name: Same.
+    :return: num_storm_objects: Number of storm objects on this date.
+    :return: elapsed_time_sec: Time spent on this date.
+    :return: process_id: ID of process that handled this date.
     :raises: ValueError: if model-initialization times needed are on opposite
         sides of 0000 UTC 1 May 2012 (the cutoff between RUC and RAP models).
     """
 
-    if elevation_dir_name in ['', 'None']:
-        elevation_dir_name = None
+    exec_start_time_unix_sec = time.time()
 
     host_name = socket.gethostname()
 
@@ -232,7 +285,7 @@ def _run(spc_date_string, lead_times_seconds,
         lag_time_for_convective_contamination_sec=
         lag_time_for_convective_contamination_sec,
         wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
-        raise_error_if_missing=False)
+        raise_error_if_missing=False, grib_cache_dir_name=grib_cache_dir_name)
 
     print(SEPARATOR_STRING)
     num_lead_times = len(lead_times_seconds)
@@ -256,12 +309,115 @@ def _run(spc_date_string, lead_times_seconds,
             lag_time_for_convective_contamination_sec=
             lag_time_for_convective_contamination_sec)
 
+    return (
+        len(storm_object_table.index), time.time() - exec_start_time_unix_sec,
+        os.getpid()
+    )
+
+
+def _run(spc_date_string, first_spc_date_string, last_spc_date_string,
+         num_workers, lead_times_seconds,
+         lag_time_for_convective_contamination_sec, top_ruc_directory_name,
+         top_rap_directory_name, elevation_dir_name, top_tracking_dir_name,
+         tracking_scale_metres2, top_output_dir_name, grib_cache_dir_name):
+    """Interpolates NWP sounding to each storm object at each lead time.
+
+    This is effectively the main method.
+
+    :param spc_date_string: See documentation at top of file.
+    :param first_spc_date_string: Same.
+    :param last_spc_date_string: Same.
+    :param num_workers: Same.
+    :param lead_times_seconds: Same.
+    :param lag_time_for_convective_contamination_sec: Same.
+    :param top_ruc_directory_name: Same.
+    :param top_rap_directory_name: Same.
+    :param elevation_dir_name: Same.
+    :param top_tracking_dir_name: Same.
+    :param tracking_scale_metres2: Same.
+    :param top_output_dir_name: Same.
+    :param grib_cache_dir_name: Same.
+    """
+
+    if spc_date_string in ['', 'None']:
+        spc_date_strings = time_conversion.get_spc_dates_in_range(
+            first_spc_date_string=first_spc_date_string,
+            last_spc_date_string=last_spc_date_string)
+    else:
+        spc_date_strings = [spc_date_string]
+
+    if elevation_dir_name in ['', 'None']:
+        elevation_dir_name = None
+    if grib_cache_dir_name in ['', 'None']:
+        grib_cache_dir_name = None
+
+    num_workers = max([min([num_workers, len(spc_date_strings)]), 1])
+    delete_grib_cache = grib_cache_dir_name is None and num_workers > 1
+    if delete_grib_cache:
+        grib_cache_dir_name = tempfile.mkdtemp()
+
+    interp_function = functools.partial(
+        _interp_one_spc_date, lead_times_seconds=lead_times_seconds,
+        lag_time_for_convective_contamination_sec=
+        lag_time_for_convective_contamination_sec,
+        top_ruc_directory_name=top_ruc_directory_name,
+        top_rap_directory_name=top_rap_directory_name,
+        elevation_dir_name=elevation_dir_name,
+        top_tracking_dir_name=top_tracking_dir_name,
+        tracking_scale_metres2=tracking_scale_metres2,
+        top_output_dir_name=top_output_dir_name,
+        grib_cache_dir_name=grib_cache_dir_name)
+
+    worker_pool = None
+
+    try:
+        if num_workers == 1:
+            result_tuples = [interp_function(d) for d in spc_date_strings]
+        else:
+            worker_pool = multiprocessing.Pool(num_workers)
+            result_tuples = worker_pool.map(
+                interp_function, spc_date_strings, chunksize=1)
+    finally:
+        if worker_pool is not None:
+            worker_pool.terminate()
+            worker_pool.join()
+
+        if delete_grib_cache and os.path.isdir(grib_cache_dir_name):
+            shutil.rmtree(grib_cache_dir_name)
+
+    print(SEPARATOR_STRING)
+
+    process_ids = numpy.array([t[2] for t in result_tuples], dtype=int)
+    num_storm_objects_by_date = numpy.array(
+        [t[0] for t in result_tuples], dtype=int)
+    elapsed_time_by_date_sec = numpy.array([t[1] for t in result_tuples])
+
+    for this_process_id in numpy.unique(process_ids):
+        these_indices = numpy.where(process_ids == this_process_id)[0]
+        this_num_storm_objects = numpy.sum(
+            num_storm_objects_by_date[these_indices])
+        this_elapsed_time_sec = numpy.sum(
+            elapsed_time_by_date_sec[these_indices])
+
+        print((
+            'Worker {0:d} handled {1:d} SPC dates and {2:d} storm objects in '
+            '{3:.1f} seconds ({4:.2f} storm objects per second).'
+        ).format(
+            this_process_id, len(these_indices), this_num_storm_objects,
+            this_elapsed_time_sec,
+            this_num_storm_objects / max([this_elapsed_time_sec, 1e-6])
+        ))
+
 
 if __name__ == '__main__':
     INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
 
     _run(
         spc_date_string=getattr(INPUT_ARG_OBJECT, SPC_DATE_ARG_NAME),
+        first_spc_date_string=getattr(
+            INPUT_ARG_OBJECT, FIRST_SPC_DATE_ARG_NAME),
+        last_spc_date_string=getattr(INPUT_ARG_OBJECT, LAST_SPC_DATE_ARG_NAME),
+        num_workers=getattr(INPUT_ARG_OBJECT, NUM_WORKERS_ARG_NAME),
         lead_times_seconds=getattr(INPUT_ARG_OBJECT, LEAD_TIMES_ARG_NAME),
         lag_time_for_convective_contamination_sec=getattr(
             INPUT_ARG_OBJECT, LAG_TIME_ARG_NAME),
@@ -273,5 +429,6 @@ if __name__ == '__main__':
         top_tracking_dir_name=getattr(INPUT_ARG_OBJECT, TRACKING_DIR_ARG_NAME),
         tracking_scale_metres2=getattr(
             INPUT_ARG_OBJECT, TRACKING_SCALE_ARG_NAME),
-        top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME)
+        top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME),
+        grib_cache_dir_name=getattr(INPUT_ARG_OBJECT, GRIB_CACHE_DIR_ARG_NAME)
     )
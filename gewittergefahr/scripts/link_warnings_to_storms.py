@@ -172,19 +172,19 @@ def _find_one_polygon_distance(
         distance to polygon interior over all storm vertices).
     """
 
+    in_polygon_flags = polygons.points_in_or_on_polygon(
+        polygon_object=warning_polygon_object_xy,
+        query_x_coords=storm_x_vertices_metres,
+        query_y_coords=storm_y_vertices_metres
+    )
+
+    if numpy.any(in_polygon_flags):
+        return 0.
+
     num_vertices = len(storm_x_vertices_metres)
     distance_metres = LARGE_NUMBER
 
     for k in range(num_vertices):
-        this_flag = polygons.point_in_or_on_polygon(
-            polygon_object=warning_polygon_object_xy,
-            query_x_coordinate=storm_x_vertices_metres[k],
-            query_y_coordinate=storm_y_vertices_metres[k]
-        )
-
-        if this_flag:
-            return 0.
-
         this_point_object = shapely.geometry.Point(
             storm_x_vertices_metres[k], storm_y_vertices_metres[k]
         )
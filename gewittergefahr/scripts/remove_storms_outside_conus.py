@@ -163,17 +163,15 @@ def _handle_one_storm_cell(
     object_not_in_conus_indices = numpy.unique(
         query_object_indices[in_conus_flags == False]
     )
-    bad_object_indices = numpy.array([], dtype=int)
-
-    for i in object_not_in_conus_indices:
-        these_indices = temporal_tracking.find_predecessors(
-            storm_object_table=storm_object_table, target_row=i,
-            num_seconds_back=max_lead_time_sec, max_num_sec_id_changes=1,
-            return_all_on_path=True)
-
-        bad_object_indices = numpy.concatenate((
-            bad_object_indices, these_indices
-        ))
+    predecessor_indices_by_object = temporal_tracking.find_predecessors_many(
+        storm_object_table=storm_object_table,
+        target_rows=object_not_in_conus_indices,
+        num_seconds_back=max_lead_time_sec, max_num_sec_id_changes=1,
+        return_all_on_path=True)
+
+    bad_object_indices = numpy.concatenate(
+        [numpy.array([], dtype=int)] + predecessor_indices_by_object
+    )
 
     return numpy.unique(bad_object_indices)
 
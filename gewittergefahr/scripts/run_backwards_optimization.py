@@ -44,6 +44,9 @@ LEARNING_RATE_ARG_NAME = 'learning_rate'
 L2_WEIGHT_ARG_NAME = 'l2_weight'
 RADAR_CONSTRAINT_WEIGHT_ARG_NAME = 'radar_constraint_weight'
 MINMAX_CONSTRAINT_WEIGHT_ARG_NAME = 'minmax_constraint_weight'
+NUM_EXAMPLES_PER_BATCH_ARG_NAME = 'num_examples_per_batch'
+PATIENCE_ARG_NAME = 'early_stopping_patience'
+NUM_EXAMPLES_PER_FILE_ARG_NAME = 'num_examples_per_file'
 OUTPUT_FILE_ARG_NAME = 'output_file_name'
 
 MODEL_FILE_HELP_STRING = (
@@ -107,6 +110,25 @@ MINMAX_CONSTRAINT_WEIGHT_HELP_STRING = (
     'realistic values.  If you do not want to enforce min-max constraints, '
     'leave this argument alone.')
 
+NUM_EXAMPLES_PER_BATCH_HELP_STRING = (
+    '[used only if `{0:s}` is empty] Number of examples to optimize at once.  '
+    'If 1, examples will be optimized one at a time.  If > 1, each batch will '
+    'be optimized in one Keras graph by `backwards_opt.optimize_many_inputs`.'
+).format(INIT_FUNCTION_ARG_NAME)
+
+PATIENCE_HELP_STRING = (
+    '[used only if `{0:s}` > 1] Each example will stop being optimized after '
+    'its loss has failed to decrease for this many iterations in a row.  If '
+    'you do not want early stopping, leave this argument alone.'
+).format(NUM_EXAMPLES_PER_BATCH_ARG_NAME)
+
+NUM_EXAMPLES_PER_FILE_HELP_STRING = (
+    '[used only if `{0:s}` is empty] Number of examples per output file.  '
+    'Results will be written after each group of this many examples, to a file '
+    'name derived from `{1:s}`.  If you want all results in one file '
+    '(`{1:s}`), leave this argument alone.'
+).format(INIT_FUNCTION_ARG_NAME, OUTPUT_FILE_ARG_NAME)
+
 OUTPUT_FILE_HELP_STRING = (
     'Path to output file (will be written by '
     '`backwards_opt.write_standard_file`).')
@@ -179,6 +201,18 @@ INPUT_ARG_PARSER.add_argument(
     '--' + MINMAX_CONSTRAINT_WEIGHT_ARG_NAME, type=float, required=False,
     default=-1., help=MINMAX_CONSTRAINT_WEIGHT_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_EXAMPLES_PER_BATCH_ARG_NAME, type=int, required=False,
+    default=1, help=NUM_EXAMPLES_PER_BATCH_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + PATIENCE_ARG_NAME, type=int, required=False, default=-1,
+    help=PATIENCE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_EXAMPLES_PER_FILE_ARG_NAME, type=int, required=False,
+    default=-1, help=NUM_EXAMPLES_PER_FILE_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_FILE_ARG_NAME, type=str, required=True,
     help=OUTPUT_FILE_HELP_STRING)
@@ -242,22 +276,28 @@ def _create_initializer(init_function_name, model_metadata_dict):
         model_metadata_dict=model_metadata_dict)
 
 
-def _run(model_file_name, init_function_name, storm_metafile_name, num_examples,
-         top_example_dir_name, component_type_string, target_class, layer_name,
-         neuron_indices, channel_index, num_iterations, ideal_activation,
-         learning_rate, l2_weight, radar_constraint_weight,
-         minmax_constraint_weight, output_file_name):
-    """Runs backwards optimization on a trained CNN.
+def _optimize_one_by_one(
+        model_object, model_metadata_dict, component_type_string,
+        input_matrices, init_function, num_examples, target_class, layer_name,
+        neuron_indices, channel_index, num_iterations, ideal_activation,
+        learning_rate, l2_weight, radar_constraint_weight,
+        minmax_constraint_weight):
+    """Runs backwards optimization for one example at a time.
 
-    This is effectively the main method.
+    E = number of examples
 
-    :param model_file_name: See documentation at top of file.
-    :param init_function_name: Same.
-    :param storm_metafile_name: Same.
-    :param num_examples: Same.
-    :param top_example_dir_name: Same.
-    :param component_type_string: Same.
-    :param target_class: Same.
+    :param model_object: Trained CNN (instance of `keras.models.Model` or
+        `keras.models.Sequential`).
+    :param model_metadata_dict: Dictionary returned by
+        `cnn.read_model_metadata`.
+    :param component_type_string: See documentation at top of file.
+    :param input_matrices: List of normalized input matrices, where the first
+        axis of each has length E.  If `init_function` is specified, this may
+        be None.
+    :param init_function: Initialization function (used only if
+        `input_matrices` is None).
+    :param num_examples: E in the above discussion.
+    :param target_class: See documentation at top of file.
     :param layer_name: Same.
     :param neuron_indices: Same.
     :param channel_index: Same.
@@ -267,78 +307,19 @@ def _run(model_file_name, init_function_name, storm_metafile_name, num_examples,
     :param l2_weight: Same.
     :param radar_constraint_weight: Same.
     :param minmax_constraint_weight: Same.
-    :param output_file_name: Same.
+    :return: result_dict: See doc for `backwards_opt.optimize_many_inputs`.
     """
 
-    if l2_weight <= 0:
-        l2_weight = None
-    if radar_constraint_weight <= 0:
-        radar_constraint_weight = None
-    if minmax_constraint_weight <= 0:
-        minmax_constraint_weight = None
-    if ideal_activation <= 0:
-        ideal_activation = None
-    if init_function_name in ['', 'None']:
-        init_function_name = None
-
-    model_interpretation.check_component_type(component_type_string)
-
-    model_metafile_name = '{0:s}/model_metadata.p'.format(
-        os.path.split(model_file_name)[0]
-    )
-
-    print('Reading model metadata from: "{0:s}"...'.format(model_metafile_name))
-    model_metadata_dict = cnn.read_model_metadata(model_metafile_name)
-
-    input_matrices = None
-    init_function = None
-    full_storm_id_strings = None
-    storm_times_unix_sec = None
-    sounding_pressure_matrix_pa = None
-
-    if init_function_name is None:
-        print('Reading storm metadata from: "{0:s}"...'.format(
-            storm_metafile_name))
-
-        full_storm_id_strings, storm_times_unix_sec = (
-            tracking_io.read_ids_and_times(storm_metafile_name)
-        )
-
-        if 0 < num_examples < len(full_storm_id_strings):
-            full_storm_id_strings = full_storm_id_strings[:num_examples]
-            storm_times_unix_sec = storm_times_unix_sec[:num_examples]
-
-        example_dict = testing_io.read_predictors_specific_examples(
-            top_example_dir_name=top_example_dir_name,
-            desired_full_id_strings=full_storm_id_strings,
-            desired_times_unix_sec=storm_times_unix_sec,
-            option_dict=model_metadata_dict[cnn.TRAINING_OPTION_DICT_KEY],
-            layer_operation_dicts=model_metadata_dict[cnn.LAYER_OPERATIONS_KEY]
-        )
-        print(SEPARATOR_STRING)
-
-        input_matrices = example_dict[testing_io.INPUT_MATRICES_KEY]
-        sounding_pressure_matrix_pa = example_dict[
-            testing_io.SOUNDING_PRESSURES_KEY]
-        num_examples = input_matrices[0].shape[0]
-    else:
-        num_examples = 1
-        init_function = _create_initializer(
-            init_function_name=init_function_name,
-            model_metadata_dict=model_metadata_dict)
-
-    print('Reading model from: "{0:s}"...'.format(model_file_name))
-    model_object = cnn.read_model(model_file_name)
-
     output_matrices = None
     initial_activations = numpy.full(num_examples, numpy.nan)
     final_activations = numpy.full(num_examples, numpy.nan)
+    new_input_matrices = None
 
     for i in range(num_examples):
-        if init_function_name is None:
-            this_init_arg = [a[[i], ...] for a in input_matrices]
-        else:
+        if input_matrices is None:
             this_init_arg = init_function
+        else:
+            this_init_arg = [a[[i], ...] for a in input_matrices]
 
         if component_type_string == CLASS_COMPONENT_TYPE_STRING:
             print((
@@ -411,29 +392,78 @@ def _run(model_file_name, init_function_name, storm_metafile_name, num_examples,
                     (output_matrices[k], these_output_matrices[k]), axis=0
                 )
 
-        if init_function_name is None:
+        if input_matrices is not None:
             continue
 
         these_input_matrices = this_result_dict[
             backwards_opt.NORM_INPUT_MATRICES_KEY]
 
-        if input_matrices is None:
-            input_matrices = [None] * len(these_input_matrices)
+        if new_input_matrices is None:
+            new_input_matrices = [None] * len(these_input_matrices)
 
-        for k in range(len(input_matrices)):
-            if input_matrices[k] is None:
-                input_matrices[k] = these_input_matrices[k] + 0.
+        for k in range(len(new_input_matrices)):
+            if new_input_matrices[k] is None:
+                new_input_matrices[k] = these_input_matrices[k] + 0.
             else:
-                input_matrices[k] = numpy.concatenate(
-                    (input_matrices[k], these_input_matrices[k]), axis=0
+                new_input_matrices[k] = numpy.concatenate(
+                    (new_input_matrices[k], these_input_matrices[k]), axis=0
                 )
 
-    print(SEPARATOR_STRING)
+    if input_matrices is None:
+        input_matrices = new_input_matrices
+
+    return {
+        backwards_opt.NORM_INPUT_MATRICES_KEY: input_matrices,
+        backwards_opt.NORM_OUTPUT_MATRICES_KEY: output_matrices,
+        backwards_opt.INITIAL_ACTIVATIONS_KEY: initial_activations,
+        backwards_opt.FINAL_ACTIVATIONS_KEY: final_activations
+    }
+
+
+def _get_chunk_file_name(output_file_name, first_example_index,
+                         last_example_index):
+    """Returns name of output file for one chunk of examples.
+
+    :param output_file_name: See documentation at top of file.
+    :param first_example_index: Index of first example in chunk.
+    :param last_example_index: Index of last example in chunk.
+    :return: chunk_file_name: Path to output file for chunk.
+    """
+
+    output_file_name_prefix, output_file_extension = os.path.splitext(
+        output_file_name)
+
+    return '{0:s}_examples={1:06d}-{2:06d}{3:s}'.format(
+        output_file_name_prefix, first_example_index, last_example_index,
+        output_file_extension
+    )
+
+
+def _write_results(
+        result_dict, model_file_name, model_metadata_dict, bwo_metadata_dict,
+        full_storm_id_strings, storm_times_unix_sec,
+        sounding_pressure_matrix_pa, output_file_name):
+    """Denormalizes results of backwards optimization and writes them to file.
+
+    :param result_dict: See doc for `backwards_opt.optimize_many_inputs`.
+    :param model_file_name: See documentation at top of file.
+    :param model_metadata_dict: Dictionary returned by
+        `cnn.read_model_metadata`.
+    :param bwo_metadata_dict: Dictionary returned by
+        `backwards_opt.check_metadata`.
+    :param full_storm_id_strings: See doc for
+        `backwards_opt.write_standard_file`.
+    :param storm_times_unix_sec: Same.
+    :param sounding_pressure_matrix_pa: Same.
+    :param output_file_name: Path to output file.
+    """
+
     training_option_dict = model_metadata_dict[cnn.TRAINING_OPTION_DICT_KEY]
 
     print('Denormalizing input examples...')
     input_matrices = trainval_io.separate_shear_and_reflectivity(
-        list_of_input_matrices=input_matrices,
+        list_of_input_matrices=result_dict[
+            backwards_opt.NORM_INPUT_MATRICES_KEY],
         training_option_dict=training_option_dict)
 
     input_matrices = model_interpretation.denormalize_data(
@@ -442,7 +472,8 @@ def _run(model_file_name, init_function_name, storm_metafile_name, num_examples,
 
     print('Denormalizing optimized examples...')
     output_matrices = trainval_io.separate_shear_and_reflectivity(
-        list_of_input_matrices=output_matrices,
+        list_of_input_matrices=result_dict[
+            backwards_opt.NORM_OUTPUT_MATRICES_KEY],
         training_option_dict=training_option_dict)
 
     output_matrices = model_interpretation.denormalize_data(
@@ -450,6 +481,116 @@ def _run(model_file_name, init_function_name, storm_metafile_name, num_examples,
         model_metadata_dict=model_metadata_dict)
 
     print('Writing results to: "{0:s}"...'.format(output_file_name))
+    backwards_opt.write_standard_file(
+        pickle_file_name=output_file_name,
+        denorm_input_matrices=input_matrices,
+        denorm_output_matrices=output_matrices,
+        initial_activations=result_dict[backwards_opt.INITIAL_ACTIVATIONS_KEY],
+        final_activations=result_dict[backwards_opt.FINAL_ACTIVATIONS_KEY],
+        model_file_name=model_file_name, metadata_dict=bwo_metadata_dict,
+        full_storm_id_strings=full_storm_id_strings,
+        storm_times_unix_sec=storm_times_unix_sec,
+        sounding_pressure_matrix_pa=sounding_pressure_matrix_pa)
+
+
+def _run(model_file_name, init_function_name, storm_metafile_name, num_examples,
+         top_example_dir_name, component_type_string, target_class, layer_name,
+         neuron_indices, channel_index, num_iterations, ideal_activation,
+         learning_rate, l2_weight, radar_constraint_weight,
+         minmax_constraint_weight, num_examples_per_batch,
+         early_stopping_patience, num_examples_per_file, output_file_name):
+    """Runs backwards optimization on a trained CNN.
+
+    This is effectively the main method.
+
+    :param model_file_name: See documentation at top of file.
+    :param init_function_name: Same.
+    :param storm_metafile_name: Same.
+    :param num_examples: Same.
+    :param top_example_dir_name: Same.
+    :param component_type_string: Same.
+    :param target_class: Same.
+    :param layer_name: Same.
+    :param neuron_indices: Same.
+    :param channel_index: Same.
+    :param num_iterations: Same.
+    :param ideal_activation: Same.
+    :param learning_rate: Same.
+    :param l2_weight: Same.
+    :param radar_constraint_weight: Same.
+    :param minmax_constraint_weight: Same.
+    :param num_examples_per_batch: Same.
+    :param early_stopping_patience: Same.
+    :param num_examples_per_file: Same.
+    :param output_file_name: Same.
+    """
+
+    if l2_weight <= 0:
+        l2_weight = None
+    if radar_constraint_weight <= 0:
+        radar_constraint_weight = None
+    if minmax_constraint_weight <= 0:
+        minmax_constraint_weight = None
+    if ideal_activation <= 0:
+        ideal_activation = None
+    if early_stopping_patience <= 0:
+        early_stopping_patience = None
+    if init_function_name in ['', 'None']:
+        init_function_name = None
+
+    model_interpretation.check_component_type(component_type_string)
+
+    model_metafile_name = '{0:s}/model_metadata.p'.format(
+        os.path.split(model_file_name)[0]
+    )
+
+    print('Reading model metadata from: "{0:s}"...'.format(model_metafile_name))
+    model_metadata_dict = cnn.read_model_metadata(model_metafile_name)
+
+    input_matrices = None
+    init_function = None
+    full_storm_id_strings = None
+    storm_times_unix_sec = None
+    sounding_pressure_matrix_pa = None
+
+    if init_function_name is None:
+        print('Reading storm metadata from: "{0:s}"...'.format(
+            storm_metafile_name))
+
+        full_storm_id_strings, storm_times_unix_sec = (
+            tracking_io.read_ids_and_times(storm_metafile_name)
+        )
+
+        if 0 < num_examples < len(full_storm_id_strings):
+            full_storm_id_strings = full_storm_id_strings[:num_examples]
+            storm_times_unix_sec = storm_times_unix_sec[:num_examples]
+
+        example_dict = testing_io.read_predictors_specific_examples(
+            top_example_dir_name=top_example_dir_name,
+            desired_full_id_strings=full_storm_id_strings,
+            desired_times_unix_sec=storm_times_unix_sec,
+            option_dict=model_metadata_dict[cnn.TRAINING_OPTION_DICT_KEY],
+            layer_operation_dicts=model_metadata_dict[cnn.LAYER_OPERATIONS_KEY]
+        )
+        print(SEPARATOR_STRING)
+
+        input_matrices = example_dict[testing_io.INPUT_MATRICES_KEY]
+        sounding_pressure_matrix_pa = example_dict[
+            testing_io.SOUNDING_PRESSURES_KEY]
+        num_examples = input_matrices[0].shape[0]
+    else:
+        num_examples = 1
+        num_examples_per_batch = 1
+        init_function = _create_initializer(
+            init_function_name=init_function_name,
+            model_metadata_dict=model_metadata_dict)
+
+    if num_examples_per_file <= 0:
+        num_examples_per_file = num_examples + 0
+
+    print('Reading model from: "{0:s}"...'.format(model_file_name))
+    model_object = cnn.read_model(model_file_name)
+
     bwo_metadata_dict = backwards_opt.check_metadata(
         component_type_string=component_type_string,
         num_iterations=num_iterations, learning_rate=learning_rate,
@@ -459,16 +600,102 @@ def _run(model_file_name, init_function_name, storm_metafile_name, num_examples,
         radar_constraint_weight=radar_constraint_weight,
         minmax_constraint_weight=minmax_constraint_weight)
 
-    backwards_opt.write_standard_file(
-        pickle_file_name=output_file_name,
-        denorm_input_matrices=input_matrices,
-        denorm_output_matrices=output_matrices,
-        initial_activations=initial_activations,
-        final_activations=final_activations, model_file_name=model_file_name,
-        metadata_dict=bwo_metadata_dict,
-        full_storm_id_strings=full_storm_id_strings,
-        storm_times_unix_sec=storm_times_unix_sec,
-        sounding_pressure_matrix_pa=sounding_pressure_matrix_pa)
+    # The Keras graph has a variable batch dimension, so build it only once and
+    # reuse it for every output file.
+    if num_examples_per_batch > 1:
+        gradient_function = (
+            backwards_opt.create_many_input_gradient_function(
+                model_object=model_object,
+                component_type_string=component_type_string,
+                target_class=target_class, layer_name=layer_name,
+                neuron_indices=neuron_indices, channel_index=channel_index,
+                stat_function_for_neuron_activations=K.max,
+                l2_weight=l2_weight, ideal_activation=ideal_activation,
+                radar_constraint_weight=radar_constraint_weight,
+                minmax_constraint_weight=minmax_constraint_weight,
+                model_metadata_dict=model_metadata_dict)
+        )
+    else:
+        gradient_function = None
+
+    for i in range(0, num_examples, num_examples_per_file):
+        this_first_index = i
+        this_last_index = min([i + num_examples_per_file, num_examples]) - 1
+        these_indices = numpy.linspace(
+            this_first_index, this_last_index,
+            num=this_last_index - this_first_index + 1, dtype=int)
+
+        if input_matrices is None:
+            these_input_matrices = None
+        else:
+            these_input_matrices = [
+                a[these_indices, ...] for a in input_matrices
+            ]
+
+        if num_examples_per_batch > 1:
+            this_result_dict = backwards_opt.optimize_many_inputs(
+                model_object=model_object,
+                component_type_string=component_type_string,
+                input_matrices=these_input_matrices,
+                num_examples_per_batch=num_examples_per_batch,
+                target_class=target_class, layer_name=layer_name,
+                neuron_indices=neuron_indices, channel_index=channel_index,
+                stat_function_for_neuron_activations=K.max,
+                num_iterations=num_iterations, learning_rate=learning_rate,
+                l2_weight=l2_weight, ideal_activation=ideal_activation,
+                radar_constraint_weight=radar_constraint_weight,
+                minmax_constraint_weight=minmax_constraint_weight,
+                model_metadata_dict=model_metadata_dict,
+                early_stopping_patience=early_stopping_patience,
+                gradient_function=gradient_function)
+        else:
+            this_result_dict = _optimize_one_by_one(
+                model_object=model_object,
+                model_metadata_dict=model_metadata_dict,
+                component_type_string=component_type_string,
+                input_matrices=these_input_matrices,
+                init_function=init_function, num_examples=len(these_indices),
+                target_class=target_class, layer_name=layer_name,
+                neuron_indices=neuron_indices, channel_index=channel_index,
+                num_iterations=num_iterations,
+                ideal_activation=ideal_activation, learning_rate=learning_rate,
+                l2_weight=l2_weight,
+                radar_constraint_weight=radar_constraint_weight,
+                minmax_constraint_weight=minmax_constraint_weight)
+
+        print(SEPARATOR_STRING)
+
+        if num_examples_per_file >= num_examples:
+            this_output_file_name = output_file_name
+        else:
+            this_output_file_name = _get_chunk_file_name(
+                output_file_name=output_file_name,
+                first_example_index=this_first_index,
+                last_example_index=this_last_index)
+
+        if init_function_name is None:
+            these_full_id_strings = [
+                full_storm_id_strings[j] for j in these_indices
+            ]
+            these_times_unix_sec = storm_times_unix_sec[these_indices]
+        else:
+            these_full_id_strings = None
+            these_times_unix_sec = None
+
+        if sounding_pressure_matrix_pa is None:
+            this_pressure_matrix_pa = None
+        else:
+            this_pressure_matrix_pa = sounding_pressure_matrix_pa[
+                these_indices, ...]
+
+        _write_results(
+            result_dict=this_result_dict, model_file_name=model_file_name,
+            model_metadata_dict=model_metadata_dict,
+            bwo_metadata_dict=bwo_metadata_dict,
+            full_storm_id_strings=these_full_id_strings,
+            storm_times_unix_sec=these_times_unix_sec,
+            sounding_pressure_matrix_pa=this_pressure_matrix_pa,
+            output_file_name=this_output_file_name)
 
 
 if __name__ == '__main__':
@@ -499,5 +726,10 @@ if __name__ == '__main__':
             INPUT_ARG_OBJECT, RADAR_CONSTRAINT_WEIGHT_ARG_NAME),
         minmax_constraint_weight=getattr(
             INPUT_ARG_OBJECT, MINMAX_CONSTRAINT_WEIGHT_ARG_NAME),
+        num_examples_per_batch=getattr(
+            INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_BATCH_ARG_NAME),
+        early_stopping_patience=getattr(INPUT_ARG_OBJECT, PATIENCE_ARG_NAME),
+        num_examples_per_file=getattr(
+            INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_FILE_ARG_NAME),
         output_file_name=getattr(INPUT_ARG_OBJECT, OUTPUT_FILE_ARG_NAME)
     )
@@ -23,6 +23,7 @@ MIN_SIZE_ARG_NAME = 'min_size_pixels'
 MIN_INTERMAX_DISTANCE_ARG_NAME = 'min_intermax_distance_metres'
 MAX_VELOCITY_DIFF_ARG_NAME = 'max_velocity_diff_m_s01'
 MAX_LINK_DISTANCE_ARG_NAME = 'max_link_distance_m_s01'
+NUM_PROCESSES_ARG_NAME = 'num_processes'
 OUTPUT_DIR_ARG_NAME = 'output_tracking_dir_name'
 
 RADAR_DIR_HELP_STRING = (
@@ -71,6 +72,10 @@ MAX_LINK_DISTANCE_HELP_STRING = (
     'Used to connect local maxima (storm objects) between times.  See '
     '`echo_top_tracking._link_local_maxima_in_time` for details.')
 
+NUM_PROCESSES_HELP_STRING = (
+    'Number of processes used to find local maxima at different radar times.  '
+    'Linking maxima over time is always done in the main process.')
+
 OUTPUT_DIR_HELP_STRING = (
     'Name of top-level output directory.  Output files will be written by '
     '`storm_tracking_io.write_processed_file`, to locations therein determined '
@@ -127,6 +132,10 @@ INPUT_ARG_PARSER.add_argument(
     default=echo_top_tracking.DEFAULT_MAX_LINK_DISTANCE_M_S01,
     help=MAX_LINK_DISTANCE_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_PROCESSES_ARG_NAME, type=int, required=False, default=1,
+    help=NUM_PROCESSES_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
     help=OUTPUT_DIR_HELP_STRING)
@@ -136,7 +145,7 @@ def _run(top_radar_dir_name, top_radar_dir_name_tarred,
          top_echo_classifn_dir_name, first_spc_date_string,
          last_spc_date_string, echo_top_field_name, min_echo_top_km,
          min_size_pixels, min_intermax_distance_metres, max_velocity_diff_m_s01,
-         max_link_distance_m_s01, top_output_dir_name):
+         max_link_distance_m_s01, num_processes, top_output_dir_name):
     """Tracks storms based on echo top.
 
     This is effectively the main method.
@@ -152,6 +161,7 @@ def _run(top_radar_dir_name, top_radar_dir_name_tarred,
     :param min_intermax_distance_metres: Same.
     :param max_velocity_diff_m_s01: Same.
     :param max_link_distance_m_s01: Same.
+    :param num_processes: Same.
     :param top_output_dir_name: Same.
     """
 
@@ -188,7 +198,7 @@ def _run(top_radar_dir_name, top_radar_dir_name_tarred,
         min_polygon_size_pixels=min_size_pixels,
         max_velocity_diff_m_s01=max_velocity_diff_m_s01,
         max_link_distance_m_s01=max_link_distance_m_s01,
-        min_track_duration_seconds=0)
+        min_track_duration_seconds=0, num_processes=num_processes)
 
     print(SEPARATOR_STRING)
 
@@ -222,5 +232,6 @@ if __name__ == '__main__':
             INPUT_ARG_OBJECT, MAX_VELOCITY_DIFF_ARG_NAME),
         max_link_distance_m_s01=getattr(
             INPUT_ARG_OBJECT, MAX_LINK_DISTANCE_ARG_NAME),
+        num_processes=getattr(INPUT_ARG_OBJECT, NUM_PROCESSES_ARG_NAME),
         top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME)
     )
@@ -33,6 +33,7 @@ STORM_METAFILE_ARG_NAME = 'input_storm_metafile_name'
 NUM_EXAMPLES_ARG_NAME = 'num_examples'
 RANDOMIZE_ARG_NAME = 'randomize_weights'
 CASCADING_ARG_NAME = 'cascading_random'
+NUM_EXAMPLES_PER_BATCH_ARG_NAME = 'num_examples_per_batch'
 OUTPUT_FILE_ARG_NAME = 'output_file_name'
 
 MODEL_FILE_HELP_STRING = (
@@ -75,6 +76,11 @@ CASCADING_HELP_STRING = (
     ' where weights for only one layer are randomized at a time.'
 ).format(RANDOMIZE_ARG_NAME)
 
+NUM_EXAMPLES_PER_BATCH_HELP_STRING = (
+    'Number of examples per batch.  Grad-CAM and guided Grad-CAM will be run '
+    'for this many examples at once.'
+)
+
 OUTPUT_FILE_HELP_STRING = (
     'Path to output file (will be written by `gradcam.write_standard_file`).'
 )
@@ -112,6 +118,10 @@ INPUT_ARG_PARSER.add_argument(
     '--' + CASCADING_ARG_NAME, type=int, required=False, default=0,
     help=CASCADING_HELP_STRING
 )
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_EXAMPLES_PER_BATCH_ARG_NAME, type=int, required=False,
+    default=100, help=NUM_EXAMPLES_PER_BATCH_HELP_STRING
+)
 INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_FILE_ARG_NAME, type=str, required=True,
     help=OUTPUT_FILE_HELP_STRING
@@ -153,7 +163,7 @@ def _reset_weights_in_layer(model_object, layer_name):
 
 def _run_gradcam_one_weight_set(
         model_object, target_class, target_layer_name, predictor_matrices,
-        training_option_dict):
+        training_option_dict, num_examples_per_batch):
     """Runs Grad-CAM with one set of weights.
 
     T = number of input tensors to model
@@ -166,6 +176,7 @@ def _run_gradcam_one_weight_set(
         normalized predictor matrices.
     :param training_option_dict: Dictionary returned by
         `cnn.read_model_metadata`.
+    :param num_examples_per_batch: See documentation at top of file.
     :return: cam_matrices: length-T list of numpy arrays, containing unguided
         class activations.
     :return: guided_cam_matrices: length-T list of numpy arrays, containing
@@ -179,20 +190,28 @@ def _run_gradcam_one_weight_set(
     guided_cam_matrices = [None] * num_matrices
     new_model_object = None
 
-    for i in range(num_examples):
-        print('Running Grad-CAM for example {0:d} of {1:d}...'.format(
-            i + 1, num_examples
+    for i in range(0, num_examples, num_examples_per_batch):
+        this_first_index = i
+        this_last_index = min([i + num_examples_per_batch, num_examples]) - 1
+
+        print('Running Grad-CAM for examples {0:d}-{1:d} of {2:d}...'.format(
+            this_first_index + 1, this_last_index + 1, num_examples
         ))
 
-        these_predictor_matrices = [a[[i], ...] for a in predictor_matrices]
+        these_predictor_matrices = [
+            a[this_first_index:(this_last_index + 1), ...]
+            for a in predictor_matrices
+        ]
         these_cam_matrices = gradcam.run_gradcam(
             model_object=model_object,
             list_of_input_matrices=these_predictor_matrices,
             target_class=target_class, target_layer_name=target_layer_name
         )
 
-        print('Running guided Grad-CAM for example {0:d} of {1:d}...'.format(
-            i + 1, num_examples
+        print((
+            'Running guided Grad-CAM for examples {0:d}-{1:d} of {2:d}...'
+        ).format(
+            this_first_index + 1, this_last_index + 1, num_examples
         ))
 
         these_guided_cam_matrices, new_model_object = (
@@ -224,10 +243,12 @@ def _run_gradcam_one_weight_set(
             if these_cam_matrices[k] is None:
                 continue
 
-            cam_matrices[k][i, ...] = these_cam_matrices[k][0, ...]
-            guided_cam_matrices[k][i, ...] = (
-                these_guided_cam_matrices[k][0, ...]
+            cam_matrices[k][this_first_index:(this_last_index + 1), ...] = (
+                these_cam_matrices[k]
             )
+            guided_cam_matrices[k][
+                this_first_index:(this_last_index + 1), ...
+            ] = these_guided_cam_matrices[k]
 
     upsample_refl = training_option_dict[trainval_io.UPSAMPLE_REFLECTIVITY_KEY]
 
@@ -257,7 +278,7 @@ def _run_gradcam_one_weight_set(
 
 def _run(model_file_name, target_class, target_layer_name, top_example_dir_name,
          storm_metafile_name, num_examples, randomize_weights, cascading_random,
-         output_file_name):
+         num_examples_per_batch, output_file_name):
     """Runs Grad-CAM (gradient-weighted class-activation maps).
 
     This is effectively the main method.
@@ -270,6 +291,7 @@ def _run(model_file_name, target_class, target_layer_name, top_example_dir_name,
     :param num_examples: Same.
     :param randomize_weights: Same.
     :param cascading_random: Same.
+    :param num_examples_per_batch: Same.
     :param output_file_name: Same.
     """
 
@@ -380,7 +402,8 @@ def _run(model_file_name, target_class, target_layer_name, top_example_dir_name,
                 model_object=this_model_object,
                 target_class=target_class, target_layer_name=target_layer_name,
                 predictor_matrices=predictor_matrices,
-                training_option_dict=training_option_dict)
+                training_option_dict=training_option_dict,
+                num_examples_per_batch=num_examples_per_batch)
         )
 
         print('Writing results to file: "{0:s}"...'.format(
@@ -413,5 +436,7 @@ if __name__ == '__main__':
         num_examples=getattr(INPUT_ARG_OBJECT, NUM_EXAMPLES_ARG_NAME),
         randomize_weights=bool(getattr(INPUT_ARG_OBJECT, RANDOMIZE_ARG_NAME)),
         cascading_random=bool(getattr(INPUT_ARG_OBJECT, CASCADING_ARG_NAME)),
+        num_examples_per_batch=getattr(
+            INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_BATCH_ARG_NAME),
         output_file_name=getattr(INPUT_ARG_OBJECT, OUTPUT_FILE_ARG_NAME)
     )
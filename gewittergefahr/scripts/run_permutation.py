@@ -7,6 +7,7 @@ import argparse
 import numpy
 from keras import backend as K
 from gewittergefahr.gg_utils import time_conversion
+from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
 from gewittergefahr.deep_learning import cnn
 from gewittergefahr.deep_learning import input_examples
 from gewittergefahr.deep_learning import testing_io
@@ -33,6 +34,9 @@ SEPARATE_HEIGHTS_ARG_NAME = 'separate_radar_heights'
 DOWNSAMPLING_KEYS_ARG_NAME = 'downsampling_keys'
 DOWNSAMPLING_VALUES_ARG_NAME = 'downsampling_values'
 NUM_BOOTSTRAP_ARG_NAME = 'num_bootstrap_reps'
+NUM_PROCESSES_ARG_NAME = 'num_processes'
+CHECKPOINT_FILE_ARG_NAME = 'checkpoint_file_name'
+CACHE_BRANCHES_ARG_NAME = 'cache_branch_features'
 OUTPUT_FILE_ARG_NAME = 'output_file_name'
 
 MODEL_FILE_HELP_STRING = (
@@ -75,6 +79,26 @@ NUM_BOOTSTRAP_HELP_STRING = (
     'Number of bootstrap replicates (used to compute the cost function after '
     'each permutation).  If you do not want bootstrapping, make this <= 1.')
 
+NUM_PROCESSES_HELP_STRING = (
+    'Number of worker processes used to evaluate candidate predictors at each '
+    'step.  Each worker reads its own copy of the model.  If 1, everything will'
+    ' be done in the main process.')
+
+CHECKPOINT_FILE_HELP_STRING = (
+    'Path to checkpoint file, written after every step.  If the file exists, '
+    'the test will resume after the last completed step.  The file is deleted '
+    'after the output file is written.  When resuming, exactly the examples '
+    'listed in the checkpoint are read again (`{1:s}` is ignored).  If you '
+    'leave this empty, it will be '
+    '`{0:s}` with the extension ".checkpoint" appended.'
+).format(OUTPUT_FILE_ARG_NAME, NUM_EXAMPLES_ARG_NAME)
+
+CACHE_BRANCHES_HELP_STRING = (
+    'Boolean flag.  If 1, for models with more than one input tensor, features '
+    'from the branch fed by each input tensor will be cached, so that only the '
+    'branch fed by the permuted tensor (and layers after the merge) will be '
+    're-run for each permutation.')
+
 OUTPUT_FILE_HELP_STRING = (
     'Path to output (Pickle) file.  Will be written by '
     '`permutation_utils.write_results`.')
@@ -121,6 +145,18 @@ INPUT_ARG_PARSER.add_argument(
     '--' + NUM_BOOTSTRAP_ARG_NAME, type=int, required=False, default=1,
     help=NUM_BOOTSTRAP_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_PROCESSES_ARG_NAME, type=int, required=False, default=1,
+    help=NUM_PROCESSES_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + CHECKPOINT_FILE_ARG_NAME, type=str, required=False, default='',
+    help=CHECKPOINT_FILE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + CACHE_BRANCHES_ARG_NAME, type=int, required=False, default=0,
+    help=CACHE_BRANCHES_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_FILE_ARG_NAME, type=str, required=True,
     help=OUTPUT_FILE_HELP_STRING)
@@ -129,7 +165,8 @@ INPUT_ARG_PARSER.add_argument(
 def _run(model_file_name, top_example_dir_name, first_spc_date_string,
          last_spc_date_string, num_examples, do_backwards_test,
          separate_radar_heights, downsampling_keys, downsampling_values,
-         num_bootstrap_reps, output_file_name):
+         num_bootstrap_reps, num_processes, checkpoint_file_name,
+         cache_branch_features, output_file_name):
     """Runs permutation test for predictor importance.
 
     This is effectively the main method.
@@ -144,9 +181,15 @@ def _run(model_file_name, top_example_dir_name, first_spc_date_string,
     :param downsampling_keys: Same.
     :param downsampling_values: Same.
     :param num_bootstrap_reps: Same.
+    :param num_processes: Same.
+    :param checkpoint_file_name: Same.
+    :param cache_branch_features: Same.
     :param output_file_name: Same.
     """
 
+    if checkpoint_file_name in ['', 'None']:
+        checkpoint_file_name = '{0:s}.checkpoint'.format(output_file_name)
+
     print('Reading model from: "{0:s}"...'.format(model_file_name))
     model_object = cnn.read_model(model_file_name)
 
@@ -181,10 +224,30 @@ def _run(model_file_name, top_example_dir_name, first_spc_date_string,
         NUM_EXAMPLES_PER_BATCH
     )
 
+    # The generators draw a random subset of examples, so a resumed test must
+    # read exactly the examples used before the interruption.
+    if os.path.isfile(checkpoint_file_name):
+        print('Reading examples to use from checkpoint: "{0:s}"...'.format(
+            checkpoint_file_name
+        ))
+        checkpoint_dict = permutation_utils.read_checkpoint(
+            checkpoint_file_name)
+
+        desired_full_id_strings = checkpoint_dict[
+            permutation_utils.FULL_IDS_KEY]
+        desired_times_unix_sec = checkpoint_dict[
+            permutation_utils.STORM_TIMES_KEY]
+        num_examples = None
+    else:
+        desired_full_id_strings = None
+        desired_times_unix_sec = None
+
     if cnn_metadata_dict[cnn.LAYER_OPERATIONS_KEY] is not None:
         generator_object = testing_io.gridrad_generator_2d_reduced(
             option_dict=training_option_dict,
             desired_num_examples=num_examples,
+            desired_full_id_strings=desired_full_id_strings,
+            desired_times_unix_sec=desired_times_unix_sec,
             list_of_operation_dicts=cnn_metadata_dict[
                 cnn.LAYER_OPERATIONS_KEY]
         )
@@ -192,11 +255,15 @@ def _run(model_file_name, top_example_dir_name, first_spc_date_string,
     elif cnn_metadata_dict[cnn.CONV_2D3D_KEY]:
         generator_object = testing_io.myrorss_generator_2d3d(
             option_dict=training_option_dict,
-            desired_num_examples=num_examples)
+            desired_num_examples=num_examples,
+            desired_full_id_strings=desired_full_id_strings,
+            desired_times_unix_sec=desired_times_unix_sec)
     else:
         generator_object = testing_io.generator_2d_or_3d(
             option_dict=training_option_dict,
-            desired_num_examples=num_examples)
+            desired_num_examples=num_examples,
+            desired_full_id_strings=desired_full_id_strings,
+            desired_times_unix_sec=desired_times_unix_sec)
 
     full_storm_id_strings = []
     storm_times_unix_sec = numpy.array([], dtype=int)
@@ -239,6 +306,23 @@ def _run(model_file_name, top_example_dir_name, first_spc_date_string,
                     predictor_matrices[k], these_predictor_matrices[k]
                 ))
 
+    if desired_full_id_strings is not None:
+        sort_indices = tracking_utils.find_storm_objects(
+            all_id_strings=full_storm_id_strings,
+            all_times_unix_sec=storm_times_unix_sec,
+            id_strings_to_keep=desired_full_id_strings,
+            times_to_keep_unix_sec=desired_times_unix_sec,
+            allow_missing=False)
+
+        full_storm_id_strings = [
+            full_storm_id_strings[k] for k in sort_indices
+        ]
+        storm_times_unix_sec = storm_times_unix_sec[sort_indices]
+        target_values = target_values[sort_indices]
+        predictor_matrices = [
+            m[sort_indices, ...] for m in predictor_matrices
+        ]
+
     print(SEPARATOR_STRING)
     correlation_matrix, predictor_names = correlation.get_pearson_correlations(
         predictor_matrices=predictor_matrices,
@@ -264,14 +348,24 @@ def _run(model_file_name, top_example_dir_name, first_spc_date_string,
             target_values=target_values, cnn_metadata_dict=cnn_metadata_dict,
             cost_function=permutation_utils.negative_auc_function,
             separate_radar_heights=separate_radar_heights,
-            num_bootstrap_reps=num_bootstrap_reps)
+            num_bootstrap_reps=num_bootstrap_reps, num_processes=num_processes,
+            model_file_name=model_file_name,
+            checkpoint_file_name=checkpoint_file_name,
+            cache_branch_features=cache_branch_features,
+            full_storm_id_strings=full_storm_id_strings,
+            storm_times_unix_sec=storm_times_unix_sec)
     else:
         result_dict = permutation.run_forward_test(
             model_object=model_object, predictor_matrices=predictor_matrices,
             target_values=target_values, cnn_metadata_dict=cnn_metadata_dict,
             cost_function=permutation_utils.negative_auc_function,
             separate_radar_heights=separate_radar_heights,
-            num_bootstrap_reps=num_bootstrap_reps)
+            num_bootstrap_reps=num_bootstrap_reps, num_processes=num_processes,
+            model_file_name=model_file_name,
+            checkpoint_file_name=checkpoint_file_name,
+            cache_branch_features=cache_branch_features,
+            full_storm_id_strings=full_storm_id_strings,
+            storm_times_unix_sec=storm_times_unix_sec)
 
     print(SEPARATOR_STRING)
 
@@ -284,6 +378,12 @@ def _run(model_file_name, top_example_dir_name, first_spc_date_string,
     permutation_utils.write_results(
         result_dict=result_dict, pickle_file_name=output_file_name)
 
+    if os.path.isfile(checkpoint_file_name):
+        print('Deleting checkpoint file: "{0:s}"...'.format(
+            checkpoint_file_name
+        ))
+        os.remove(checkpoint_file_name)
+
 
 if __name__ == '__main__':
     INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
@@ -308,5 +408,11 @@ if __name__ == '__main__':
             dtype=float
         ),
         num_bootstrap_reps=getattr(INPUT_ARG_OBJECT, NUM_BOOTSTRAP_ARG_NAME),
+        num_processes=getattr(INPUT_ARG_OBJECT, NUM_PROCESSES_ARG_NAME),
+        checkpoint_file_name=getattr(
+            INPUT_ARG_OBJECT, CHECKPOINT_FILE_ARG_NAME),
+        cache_branch_features=bool(getattr(
+            INPUT_ARG_OBJECT, CACHE_BRANCHES_ARG_NAME
+        )),
         output_file_name=getattr(INPUT_ARG_OBJECT, OUTPUT_FILE_ARG_NAME)
     )
@@ -12,6 +12,8 @@ SPC_DATE_INPUT_ARG = 'spc_date_string'
 TRACKING_DIR_INPUT_ARG = 'input_tracking_dir_name'
 TRACKING_SCALE_INPUT_ARG = 'tracking_scale_metres2'
 OUTPUT_DIR_INPUT_ARG = 'output_dir_name'
+NUM_PROCESSES_INPUT_ARG = 'num_processes'
+CACHE_DIR_INPUT_ARG = 'cache_dir_name'
 
 SPC_DATE_HELP_STRING = (
     'SPC (Storm Prediction Center) date in format "yyyymmdd".  Shape statistics'
@@ -27,6 +29,13 @@ OUTPUT_DIR_HELP_STRING = (
     'Name of output directory.  A single Pickle file, with shape statistics for'
     ' each storm object, will be written here.')
 
+NUM_PROCESSES_HELP_STRING = (
+    'Number of processes used to compute shape statistics.')
+
+CACHE_DIR_HELP_STRING = (
+    'Name of directory with cached shape statistics, which are reused across '
+    'runs.  If you leave this empty, statistics will be cached only in memory.')
+
 INPUT_ARG_PARSER = argparse.ArgumentParser()
 INPUT_ARG_PARSER.add_argument(
     '--' + SPC_DATE_INPUT_ARG, type=str, required=True,
@@ -45,10 +54,18 @@ INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_DIR_INPUT_ARG, type=str, required=True,
     help=OUTPUT_DIR_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_PROCESSES_INPUT_ARG, type=int, required=False, default=1,
+    help=NUM_PROCESSES_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + CACHE_DIR_INPUT_ARG, type=str, required=False, default='',
+    help=CACHE_DIR_HELP_STRING)
+
 
 def _compute_shape_stats(
         spc_date_string, top_tracking_dir_name, tracking_scale_metres2,
-        output_dir_name):
+        output_dir_name, num_processes=1, cache_dir_name=''):
     """Computes shape statistics for each storm object.
 
     :param spc_date_string: SPC (Storm Prediction Center) date in format
@@ -60,8 +77,14 @@ def _compute_shape_stats(
         used to find input data.
     :param output_dir_name: Name of output directory.  A single Pickle file,
         with shape statistics for each storm object, will be written here.
+    :param num_processes: Number of processes used to compute shape statistics.
+    :param cache_dir_name: Name of directory with cached shape statistics.  If
+        empty, statistics will be cached only in memory.
     """
 
+    if cache_dir_name in ['', 'None']:
+        cache_dir_name = None
+
     tracking_file_names = tracking_io.find_files_one_spc_date(
         spc_date_string=spc_date_string,
         source_name=tracking_utils.SEGMOTION_NAME,
@@ -73,7 +96,8 @@ def _compute_shape_stats(
     print(SEPARATOR_STRING)
 
     shape_statistic_table = shape_stats.get_stats_for_storm_objects(
-        storm_object_table)
+        storm_object_table, num_processes=num_processes,
+        cache_dir_name=cache_dir_name)
     print(SEPARATOR_STRING)
 
     shape_statistic_file_name = '{0:s}/shape_statistics_{1:s}.p'.format(
@@ -108,6 +132,14 @@ def add_input_arguments(argument_parser_object):
         '--' + OUTPUT_DIR_INPUT_ARG, type=str, required=True,
         help=OUTPUT_DIR_HELP_STRING)
 
+    argument_parser_object.add_argument(
+        '--' + NUM_PROCESSES_INPUT_ARG, type=int, required=False, default=1,
+        help=NUM_PROCESSES_HELP_STRING)
+
+    argument_parser_object.add_argument(
+        '--' + CACHE_DIR_INPUT_ARG, type=str, required=False, default='',
+        help=CACHE_DIR_HELP_STRING)
+
     return argument_parser_object
 
 
@@ -119,5 +151,7 @@ if __name__ == '__main__':
         top_tracking_dir_name=getattr(INPUT_ARG_OBJECT, TRACKING_DIR_INPUT_ARG),
         tracking_scale_metres2=getattr(
             INPUT_ARG_OBJECT, TRACKING_SCALE_INPUT_ARG),
-        output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_INPUT_ARG)
+        output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_INPUT_ARG),
+        num_processes=getattr(INPUT_ARG_OBJECT, NUM_PROCESSES_INPUT_ARG),
+        cache_dir_name=getattr(INPUT_ARG_OBJECT, CACHE_DIR_INPUT_ARG)
     )
@@ -132,7 +132,7 @@ def _run(input_model_file_name, radar_field_name_by_channel,
          top_validation_dir_name, first_validation_time_string,
          last_validation_time_string, num_examples_per_validn_batch, num_epochs,
          num_training_batches_per_epoch, num_validation_batches_per_epoch,
-         output_dir_name):
+         num_prefetch_workers, use_prefetch_processes, output_dir_name):
     """Trains CNN with 2-D GridRad images.
 
     This is effectively the main method.
@@ -171,6 +171,8 @@ def _run(input_model_file_name, radar_field_name_by_channel,
     :param num_epochs: Same.
     :param num_training_batches_per_epoch: Same.
     :param num_validation_batches_per_epoch: Same.
+    :param num_prefetch_workers: Same.
+    :param use_prefetch_processes: Same.
     :param output_dir_name: Same.
     """
 
@@ -356,7 +358,9 @@ def _run(input_model_file_name, radar_field_name_by_channel,
         validation_file_names=validation_file_names,
         first_validn_time_unix_sec=first_validation_time_unix_sec,
         last_validn_time_unix_sec=last_validation_time_unix_sec,
-        num_examples_per_validn_batch=num_examples_per_validn_batch)
+        num_examples_per_validn_batch=num_examples_per_validn_batch,
+        num_prefetch_workers=num_prefetch_workers,
+        use_prefetch_processes=use_prefetch_processes)
 
 
 if __name__ == '__main__':
@@ -436,5 +440,9 @@ if __name__ == '__main__':
             INPUT_ARG_OBJECT, dl_helper.NUM_TRAINING_BATCHES_ARG_NAME),
         num_validation_batches_per_epoch=getattr(
             INPUT_ARG_OBJECT, dl_helper.NUM_VALIDATION_BATCHES_ARG_NAME),
+        num_prefetch_workers=getattr(
+            INPUT_ARG_OBJECT, dl_helper.NUM_PREFETCH_WORKERS_ARG_NAME),
+        use_prefetch_processes=bool(getattr(
+            INPUT_ARG_OBJECT, dl_helper.USE_PREFETCH_PROCESSES_ARG_NAME)),
         output_dir_name=getattr(INPUT_ARG_OBJECT, dl_helper.OUTPUT_DIR_ARG_NAME)
     )